@@ -7,6 +7,7 @@ import streamlit as st
 import sys
 import os
 import re
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -23,7 +24,10 @@ BASE_DIR = Path(__file__).parent
 sys.path.insert(0, str(BASE_DIR))
 sys.path.insert(0, str(BASE_DIR / "scripts"))
 
-# Import des fonctions du script generate_article.py
+# Annulation des brouillons spéculatifs (bouton "Recommencer" de la barre latérale, avant l'authentification)
+from utils.speculative import cancel_drafts
+
+# Fonctions du script generate_article.py : chargées après l'authentification (voir plus bas)
 # On initialise les fonctions à None pour éviter les erreurs
 generate_topic_variants = None
 generate_article = None
@@ -43,8 +47,16 @@ apply_style_refinement = None
 score_article_quality = None
 regenerate_article_with_scoring = None
 
-try:
-    # On importe le module directement
+
+@st.cache_resource(show_spinner=False)
+def load_generate_module():
+    """
+    Charge scripts/generate_article.py une seule fois par process.
+
+    Le module crée le client OpenAI, lit le .env et prépare le dossier articles/ :
+    le mettre en cache évite de refaire ce travail à chaque rerun et partage
+    le client entre les sessions.
+    """
     import importlib.util
     spec = importlib.util.spec_from_file_location(
         "generate_article", 
@@ -53,31 +65,69 @@ try:
     if spec is None or spec.loader is None:
         raise ImportError("Impossible de charger le module generate_article")
     
-    generate_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(generate_module)
-    
-    # Import des fonctions nécessaires
-    generate_topic_variants = generate_module.generate_topic_variants
-    generate_article = generate_module.generate_article
-    optimize_seo = generate_module.optimize_seo
-    generate_english_version = generate_module.generate_english_version
-    search_web = generate_module.search_web
-    search_web_with_sources = generate_module.search_web_with_sources
-    load_existing_articles = generate_module.load_existing_articles
-    check_topic_exists = generate_module.check_topic_exists
-    get_existing_blog_topics = generate_module.get_existing_blog_topics
-    publish_to_production = generate_module.publish_to_production
-    fetch_sanity_references = generate_module.fetch_sanity_references
-    save_article_for_review = generate_module.save_article_for_review
-    load_target_keywords = generate_module.load_target_keywords
-    select_target_keywords = generate_module.select_target_keywords
-    apply_style_refinement = generate_module.apply_style_refinement
-    score_article_quality = generate_module.score_article_quality
-    regenerate_article_with_scoring = generate_module.regenerate_article_with_scoring
-    
-except Exception as e:
-    # On stocke l'erreur pour l'afficher après l'authentification
-    st.session_state.import_error = str(e)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def file_mtime(path: Path) -> int:
+    """mtime (ns) d'un fichier ou dossier, 0 s'il n'existe pas : sert de clé aux caches st.cache_data"""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+TOKEN_HISTORY_PATH = BASE_DIR / "data" / "token_history.json"
+ANALYTICS_PATH = BASE_DIR / "data" / "analytics.json"
+KEYWORDS_PATH = BASE_DIR / "data" / "keywords.json"
+KEYWORDS_METADATA_PATH = BASE_DIR / "data" / "keywords_metadata.json"
+ARTICLES_PATH = BASE_DIR / "articles"
+ARCHIVE_INDEX_PATH = ARTICLES_PATH / "archive" / "index.json"
+TRACES_PATH = BASE_DIR / "data" / "traces.jsonl"
+SCORE_HISTORY_PATH = BASE_DIR / "data" / "score_history.jsonl"
+
+
+# Les fonctions cachées reçoivent les mtimes des fichiers lus : toute écriture invalide le cache
+@st.cache_data(show_spinner=False)
+def cached_token_statistics(history_mtime: int):
+    from utils.token_tracker import get_token_statistics
+    return get_token_statistics()
+
+
+@st.cache_data(show_spinner=False)
+def cached_token_history(history_mtime: int):
+    from utils.token_tracker import load_token_history
+    return load_token_history()
+
+
+@st.cache_data(show_spinner=False)
+def cached_comprehensive_stats(history_mtime: int, analytics_mtime: int, articles_mtime: int, traces_mtime: int,
+                               scores_mtime: int, archive_mtime: int):
+    from utils.analytics import get_comprehensive_stats
+    return get_comprehensive_stats()
+
+
+@st.cache_data(show_spinner=False)
+def cached_score_breakdowns(scores_mtime: int, days: int):
+    from utils.score_history import breakdown, improvement_stats
+    return {
+        "keywords": breakdown("keyword", days=days),
+        "sectors": breakdown("sector", days=days),
+        "improvement": improvement_stats(days),
+    }
+
+
+@st.cache_data(show_spinner=False)
+def cached_keywords_with_stats(keywords_mtime: int, metadata_mtime: int, articles_mtime: int, archive_mtime: int):
+    from utils.keywords_manager import get_all_keywords_with_stats
+    return get_all_keywords_with_stats()
+
+
+@st.cache_data(show_spinner=False)
+def cached_target_keywords(keywords_mtime: int):
+    return load_target_keywords()
+
 
 # CSS personnalisé
 st.markdown("""
@@ -208,9 +258,11 @@ with st.sidebar:
     st.markdown("---")
     
     if st.button("Recommencer", use_container_width=True):
+        cancel_drafts(st.session_state.get('speculative_group'))
         for key in list(st.session_state.keys()):
             if key not in ['page']:
                 del st.session_state[key]
+        st.query_params.clear()
         st.session_state.step = 'input'
         st.rerun()
     
@@ -337,12 +389,71 @@ if not st.session_state.get('authenticated', False):
     
     st.stop()
 
-# Vérifier les erreurs d'import après authentification
-if st.session_state.get('import_error'):
-    st.error(f"❌ Erreur d'import : {st.session_state.import_error}")
+# Import des fonctions du script generate_article.py (une seule fois par process, après authentification)
+try:
+    generate_module = load_generate_module()
+    
+    # Import des fonctions nécessaires
+    generate_topic_variants = generate_module.generate_topic_variants
+    generate_article = generate_module.generate_article
+    optimize_seo = generate_module.optimize_seo
+    generate_english_version = generate_module.generate_english_version
+    search_web = generate_module.search_web
+    search_web_with_sources = generate_module.search_web_with_sources
+    load_existing_articles = generate_module.load_existing_articles
+    check_topic_exists = generate_module.check_topic_exists
+    get_existing_blog_topics = generate_module.get_existing_blog_topics
+    publish_to_production = generate_module.publish_to_production
+    fetch_sanity_references = generate_module.fetch_sanity_references
+    save_article_for_review = generate_module.save_article_for_review
+    load_target_keywords = generate_module.load_target_keywords
+    select_target_keywords = generate_module.select_target_keywords
+    apply_style_refinement = generate_module.apply_style_refinement
+    score_article_quality = generate_module.score_article_quality
+    regenerate_article_with_scoring = generate_module.regenerate_article_with_scoring
+    
+except Exception as e:
+    st.error(f"❌ Erreur d'import : {e}")
     st.error("Vérifiez que tous les fichiers nécessaires sont présents dans le repository.")
     st.stop()
 
+# Exécution du pipeline de génération en arrière-plan (utils.jobs)
+from utils.jobs import submit_job, get_job, resume_job, list_jobs, get_live_output, follow_live_output
+from utils.tracing import new_run_id, trace_run
+from utils.markdown_renderer import markdown_to_html
+from utils.rate_governor import get_stats as get_rate_governor_stats
+from utils.article_archive import delete_archived, is_archived, read_review_text
+
+run_article_pipeline = generate_module.run_article_pipeline
+start_speculative_drafts = generate_module.start_speculative_drafts
+JOB_POLL_INTERVAL_SECONDS = 2
+
+
+def open_generation_job(job_id: str) -> bool:
+    """Rattache la session à un job de génération existant (reprise après rafraîchissement)"""
+    job = get_job(job_id)
+    if not job or job.get("kind") != "article":
+        st.query_params.pop("job", None)
+        return False
+    params = job.get("params", {})
+    st.session_state.generation_job_id = job_id
+    st.session_state.chosen_variant = params.get("chosen_variant")
+    st.session_state.topic = params.get("topic", "")
+    st.session_state.target_keywords = params.get("target_keywords") or []
+    st.session_state.web_results = params.get("web_results", "")
+    st.session_state.trace_run_id = params.get("trace_run_id") or job_id
+    st.session_state.final_article = None
+    st.session_state.english_article = None
+    st.session_state.article_saved = False
+    st.session_state.step = 'generation'
+    st.query_params["job"] = job_id
+    return True
+
+
+job_param = st.query_params.get("job")
+if job_param and st.session_state.get('generation_job_id') != job_param:
+    open_generation_job(job_param)
+
 # Vérifier que toutes les fonctions sont chargées
 if any(f is None for f in [generate_topic_variants, generate_article, optimize_seo]):
     st.error("❌ Erreur : Les fonctions nécessaires n'ont pas pu être chargées.")
@@ -355,9 +466,12 @@ st.markdown('<div class="main-header">Assistant Rédaction Blog Rounded</div>',
 # --- GESTION DE LA SUPPRESSION ---
 if st.session_state.get('delete_article'):
     article_to_delete = BASE_DIR / "articles" / st.session_state.delete_article
-    if article_to_delete.exists():
+    if article_to_delete.exists() or is_archived(article_to_delete.name):
         try:
-            article_to_delete.unlink()
+            from utils.review_metadata import delete_review_files
+            if article_to_delete.exists():
+                delete_review_files(article_to_delete)
+            delete_archived(article_to_delete.name)
             st.success(f"Article {st.session_state.delete_article} supprimé avec succès")
             del st.session_state.delete_article
             if st.session_state.get('page') == 'view_article':
@@ -374,8 +488,12 @@ if st.session_state.get('delete_article'):
 # --- PAGE CONSULTATION D'UN ARTICLE ---
 if st.session_state.get('page') == 'view_article' and st.session_state.get('selected_article'):
     article_file = BASE_DIR / "articles" / st.session_state.selected_article
-    if article_file.exists():
+    # Repli transparent sur l'archive compressée (articles/archive/)
+    content = read_review_text(article_file)
+    if content is not None:
         st.header("Consultation de l'article")
+        if not article_file.exists():
+            st.caption("🗄️ Article archivé (lu depuis articles/archive/)")
         
         col_back, col_delete = st.columns([1, 1])
         with col_back:
@@ -386,7 +504,10 @@ if st.session_state.get('page') == 'view_article' and st.session_state.get('sele
         with col_delete:
             if st.button("Supprimer cet article", type="secondary", use_container_width=True):
                 try:
-                    article_file.unlink()
+                    from utils.review_metadata import delete_review_files
+                    if article_file.exists():
+                        delete_review_files(article_file)
+                    delete_archived(article_file.name)
                     st.success("Article supprimé avec succès")
                     st.session_state.page = "history"
                     st.session_state.selected_article = None
@@ -394,8 +515,6 @@ if st.session_state.get('page') == 'view_article' and st.session_state.get('sele
                 except Exception as e:
                     st.error(f"Erreur lors de la suppression : {e}")
         
-        content = article_file.read_text(encoding='utf-8')
-        
         # Extraire les sections
         sections = re.split(r'\n---\n', content)
         
@@ -416,61 +535,101 @@ if st.session_state.get('page') == 'view_article' and st.session_state.get('sele
 if st.session_state.get('page') == 'history':
     st.header("Historique des articles")
     
-    # Charger tous les articles
+    from utils.article_catalog import query_catalog, get_catalog_facets
+    
+    HISTORY_PAGE_SIZE = 20
+    sort_options = {
+        "Plus récents": ("date", True),
+        "Plus anciens": ("date", False),
+        "Titre (A-Z)": ("title", False),
+        "Meilleur score": ("score", True),
+        "Plus longs": ("words", True),
+    }
+    
+    # Catalogue en cache (sidecars .meta.json), reconstruit seulement si le dossier articles/ change
     articles_dir = BASE_DIR / "articles"
     if articles_dir.exists():
-        article_files = sorted(articles_dir.glob("*.md"), key=lambda x: x.stat().st_mtime, reverse=True)
+        facets = get_catalog_facets()
+        
+        # Recherche, tri et filtres
+        col_search, col_sort = st.columns([3, 1])
+        with col_search:
+            search_term = st.text_input("Rechercher un article", placeholder="Titre, slug, résumé ou mot-clé...", key="history_search")
+        with col_sort:
+            sort_label = st.selectbox("Trier par", list(sort_options.keys()), key="history_sort")
+        
+        col_tag, col_keyword, col_score = st.columns(3)
+        with col_tag:
+            tag_filter = st.selectbox("Catégorie", ["Toutes"] + facets["tags"], key="history_tag")
+        with col_keyword:
+            keyword_filter = st.selectbox("Mot-clé", ["Tous"] + facets["keywords"], key="history_keyword")
+        with col_score:
+            min_score = st.slider("Score global minimum", 0, 100, 0, step=5, key="history_min_score")
         
-        if article_files:
-            st.info(f"{len(article_files)} article(s) trouvé(s)")
+        # Revenir à la première page quand la recherche ou les filtres changent
+        filters_signature = (search_term, sort_label, tag_filter, keyword_filter, min_score)
+        if st.session_state.get('history_filters') != filters_signature:
+            st.session_state.history_filters = filters_signature
+            st.session_state.history_page = 1
+        
+        sort_by, descending = sort_options[sort_label]
+        result = query_catalog(
+            search=search_term,
+            sort_by=sort_by,
+            descending=descending,
+            tag=None if tag_filter == "Toutes" else tag_filter,
+            keyword=None if keyword_filter == "Tous" else keyword_filter,
+            min_score=min_score or None,
+            page=st.session_state.get('history_page', 1),
+            page_size=HISTORY_PAGE_SIZE,
+        )
+        st.session_state.history_page = result["page"]
+        
+        if result["catalog_size"] == 0:
+            st.info("Aucun article trouvé dans le dossier `articles/`")
+        elif result["total"] == 0:
+            st.info(f"Aucun article ne correspond à la recherche ({result['catalog_size']} article(s) au total)")
+        else:
+            st.info(f"{result['total']} article(s) trouvé(s) sur {result['catalog_size']}")
             
-            # Recherche et filtre
-            search_term = st.text_input("Rechercher un article", placeholder="Titre, slug, ou mot-clé...")
+            # Afficher uniquement la page courante
+            for entry in result["items"]:
+                filename = entry["filename"]
+                score = entry["global_score"]
+                label = entry["title"] if score is None else f"{entry['title']} — {score}/100"
+                with st.expander(label, expanded=False):
+                    col1, col2, col3 = st.columns([3, 1, 1])
+                    with col1:
+                        st.markdown(f"**Slug :** `{entry['slug'] or 'N/A'}`")
+                        st.markdown(f"**Date :** {entry['date']}")
+                        st.markdown(f"**Résumé :** {entry['summary'] or 'Aucun résumé'}")
+                        if entry["keywords"]:
+                            st.caption("Mots-clés : " + ", ".join(entry["keywords"]))
+                        if entry["archived"]:
+                            st.caption("🗄️ Archivé (fichier compressé dans articles/archive/)")
+                    with col2:
+                        if st.button("Lire", key=f"read_{filename}"):
+                            st.session_state.selected_article = filename
+                            st.session_state.page = "view_article"
+                            st.rerun()
+                    with col3:
+                        if st.button("Supprimer", key=f"delete_{filename}", type="secondary"):
+                            st.session_state.delete_article = filename
+                            st.rerun()
             
-            # Afficher les articles
-            for article_file in article_files:
-                try:
-                    content = article_file.read_text(encoding='utf-8')
-                    
-                    # Extraire les métadonnées
-                    title_match = re.search(r'^# (.+)$', content, re.MULTILINE)
-                    slug_match = re.search(r'\*\*Slug:\*\* (.+)', content)
-                    date_match = re.search(r'\*\*Généré le:\*\* (.+)', content)
-                    summary_match = re.search(r'## Résumé SEO\s*\n\n(.+?)(?=\n---|\n##)', content, re.DOTALL)
-                    
-                    title = title_match.group(1) if title_match else article_file.stem
-                    slug = slug_match.group(1).strip() if slug_match else "N/A"
-                    date = date_match.group(1).strip() if date_match else "Date inconnue"
-                    summary = summary_match.group(1).strip() if summary_match else "Aucun résumé"
-                    
-                    # Filtrer par recherche
-                    if search_term:
-                        search_lower = search_term.lower()
-                        if (search_lower not in title.lower() and 
-                            search_lower not in slug.lower() and 
-                            search_lower not in summary.lower()):
-                            continue
-                    
-                    with st.expander(f"{title}", expanded=False):
-                        col1, col2, col3 = st.columns([3, 1, 1])
-                        with col1:
-                            st.markdown(f"**Slug :** `{slug}`")
-                            st.markdown(f"**Date :** {date}")
-                            st.markdown(f"**Résumé :** {summary}")
-                        with col2:
-                            if st.button("Lire", key=f"read_{article_file.name}"):
-                                st.session_state.selected_article = article_file.name
-                                st.session_state.page = "view_article"
-                                st.rerun()
-                        with col3:
-                            if st.button("Supprimer", key=f"delete_{article_file.name}", type="secondary"):
-                                st.session_state.delete_article = article_file.name
-                                st.rerun()
-                    
-                except Exception as e:
-                    st.warning(f"Erreur lors de la lecture de {article_file.name}: {e}")
-        else:
-            st.info("Aucun article trouvé dans le dossier `articles/`")
+            # Pagination
+            if result["pages"] > 1:
+                col_prev, col_info, col_next = st.columns([1, 2, 1])
+                with col_prev:
+                    if st.button("Page précédente", disabled=result["page"] <= 1, use_container_width=True):
+                        st.session_state.history_page = result["page"] - 1
+                        st.rerun()
+                with col_info:
+                    st.markdown(f"<div style='text-align: center'>Page {result['page']} / {result['pages']}</div>", unsafe_allow_html=True)
+                with col_next:
+                    if st.button("Page suivante", disabled=result["page"] >= result["pages"], use_container_width=True):
+                        st.session_state.history_page = result["page"] + 1
+                        st.rerun()
     else:
         st.warning("Le dossier `articles/` n'existe pas")
     
@@ -482,10 +641,11 @@ if st.session_state.get('page') == 'tokens':
     st.header("📊 Historique des Tokens OpenAI")
     
     try:
-        from utils.token_tracker import get_token_statistics, estimate_cost, load_token_history
+        from utils.token_tracker import estimate_cost, estimate_cache_savings
         
-        stats = get_token_statistics()
-        history = load_token_history()
+        history_mtime = file_mtime(TOKEN_HISTORY_PATH)
+        stats = cached_token_statistics(history_mtime)
+        history = cached_token_history(history_mtime)
         
         if stats["total_entries"] == 0:
             st.info("Aucun historique de tokens disponible. Les tokens seront enregistrés lors de la génération d'articles.")
@@ -504,6 +664,24 @@ if st.session_state.get('page') == 'tokens':
                 estimated_cost_val = estimate_cost(stats["total_tokens"])
                 st.metric("Coût Estimé", f"${estimated_cost_val:.4f}")
             
+            # Cache de prompt du fournisseur (préfixes système identiques d'un appel à l'autre)
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Tokens Prompt en Cache", f"{stats.get('total_cached_tokens', 0):,}")
+            with col2:
+                st.metric("Taux de Cache", f"{stats.get('cache_hit_rate', 0):.1%}")
+            with col3:
+                st.metric("Économie Cache", f"${estimate_cache_savings(stats.get('total_cached_tokens', 0)):.4f}")
+            
+            # File d'attente du régulateur de débit (process courant uniquement)
+            for model, governor in get_rate_governor_stats().items():
+                st.caption(
+                    f"⏳ Régulateur OpenAI {model} : {governor['requests']} requêtes, "
+                    f"{governor['queued']} mises en attente (moyenne {governor['wait_avg_ms']:.0f} ms, "
+                    f"p95 {governor['wait_p95_ms']:.0f} ms), {governor['rate_limited']} × 429, "
+                    f"concurrence {governor['concurrency']:.1f}"
+                )
+            
             st.markdown("---")
             
             # Par opération
@@ -518,7 +696,17 @@ if st.session_state.get('page') == 'tokens':
                             st.metric("Prompt Tokens", f"{data['prompt_tokens']:,}")
                         with col3:
                             st.metric("Completion Tokens", f"{data['completion_tokens']:,}")
-                        st.caption(f"Coût estimé: ${estimate_cost(data['total_tokens']):.4f}")
+                        st.caption(
+                            f"Coût estimé: ${sum(m['cost'] for m in data.get('by_model', {}).values()):.4f} | "
+                            f"Prompt en cache: {data.get('cached_tokens', 0):,} tokens"
+                        )
+                        # Répartition par modèle (routage par étape, replis, plafond journalier)
+                        for model, per_model in data.get("by_model", {}).items():
+                            latency = per_model.get("avg_latency_seconds")
+                            st.caption(
+                                f"🤖 {model} : {per_model['count']} appels, ${per_model['cost']:.4f}, "
+                                f"latence moyenne {f'{latency:.1f}s' if latency is not None else 'n/d'}"
+                            )
             
             st.markdown("---")
             
@@ -531,6 +719,7 @@ if st.session_state.get('page') == 'tokens':
                         st.metric(f"{model}", f"{data['count']} appels")
                     with col2:
                         st.metric("Total Tokens", f"{data['total_tokens']:,}")
+                    st.caption(f"Coût estimé ({model}) : ${data.get('cost', 0):.4f}")
             
             st.markdown("---")
             
@@ -584,7 +773,6 @@ if st.session_state.get('page') == 'analytics':
     
     try:
         from utils.analytics import (
-            get_comprehensive_stats,
             export_stats_csv,
             export_stats_json
         )
@@ -592,7 +780,14 @@ if st.session_state.get('page') == 'analytics':
         import plotly.graph_objects as go
         import pandas as pd
         
-        stats = get_comprehensive_stats()
+        stats = cached_comprehensive_stats(
+            file_mtime(TOKEN_HISTORY_PATH),
+            file_mtime(ANALYTICS_PATH),
+            file_mtime(ARTICLES_PATH),
+            file_mtime(TRACES_PATH),
+            file_mtime(SCORE_HISTORY_PATH),
+            file_mtime(ARCHIVE_INDEX_PATH),
+        )
         
         # Métriques principales
         st.subheader("📈 Métriques Principales")
@@ -638,6 +833,65 @@ if st.session_state.get('page') == 'analytics':
         
         st.markdown("---")
         
+        # Évolution des scores (historique indexé : data/score_history.jsonl)
+        st.subheader("🎯 Évolution des Scores")
+        score_evolution = stats["scores"]["evolution"]
+        if score_evolution:
+            df_scores = pd.DataFrame(score_evolution)
+            df_scores["date"] = pd.to_datetime(df_scores["date"])
+            fig_scores = go.Figure()
+            fig_scores.add_trace(go.Scatter(
+                x=df_scores["date"], y=df_scores["average"], mode="markers", name="Moyenne du jour",
+                marker=dict(color="#9ecae1", size=7),
+            ))
+            fig_scores.add_trace(go.Scatter(
+                x=df_scores["date"], y=df_scores["rolling_average"], mode="lines", name="Moyenne glissante 7 j",
+                line=dict(color="#1f77b4", width=2),
+            ))
+            fig_scores.update_layout(title="Score global moyen (90 derniers jours)", yaxis_title="Score /100")
+            st.plotly_chart(fig_scores, use_container_width=True)
+
+            score_stats = cached_score_breakdowns(file_mtime(SCORE_HISTORY_PATH), 30)
+            improvement = score_stats["improvement"]
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Scorings (90 j)", int(df_scores["count"].sum()))
+            with col2:
+                st.metric("Générations (30 j)", improvement["runs"])
+            with col3:
+                st.metric(
+                    "Score final moyen",
+                    f"{improvement['avg_after']}/100" if improvement["avg_after"] is not None else "N/A",
+                    f"{improvement['avg_gain']:+.1f}" if improvement["avg_gain"] is not None else None,
+                )
+            with col4:
+                rate = improvement["improved_rate"]
+                st.metric("Articles améliorés", f"{rate:.0%}" if rate is not None else "N/A")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**Par mot-clé cible (30 j) :**")
+                if score_stats["keywords"]:
+                    st.dataframe(pd.DataFrame([
+                        {"Mot-clé": row["key"], "Scorings": row["count"], "Score moyen": row["average"],
+                         "Coût ($)": round(row["cost_usd"], 4)}
+                        for row in score_stats["keywords"][:20]
+                    ]), use_container_width=True, hide_index=True)
+                else:
+                    st.caption("Aucun scoring avec mots-clés cibles.")
+            with col2:
+                st.markdown("**Par secteur (30 j) :**")
+                if score_stats["sectors"]:
+                    st.dataframe(pd.DataFrame([
+                        {"Secteur": row["key"], "Scorings": row["count"], "Score moyen": row["average"],
+                         "Coût ($)": round(row["cost_usd"], 4)}
+                        for row in score_stats["sectors"]
+                    ]), use_container_width=True, hide_index=True)
+        else:
+            st.info("Aucun scoring enregistré pour l'instant (data/score_history.jsonl).")
+        
+        st.markdown("---")
+        
         # Statistiques de publication
         st.subheader("📝 Statistiques de Publication")
         pub_stats = stats["publication"]
@@ -682,6 +936,31 @@ if st.session_state.get('page') == 'analytics':
                 st.metric("Temps Total", f"{total_time_min:.1f} min")
             with col3:
                 st.metric("Temps Moyen/Article", f"{gen_stats.get('avg_time_per_article_minutes', 0):.1f} min")
+            st.caption(
+                f"Durée mesurée par génération : p50 {gen_stats.get('p50_time_per_article_seconds', 0):.0f} s · "
+                f"p95 {gen_stats.get('p95_time_per_article_seconds', 0):.0f} s"
+            )
+            
+            # Latences réelles par étape (data/traces.jsonl)
+            stage_stats = gen_stats.get("stages") or {}
+            if stage_stats:
+                st.markdown("**Latence par étape (30 derniers jours) :**")
+                df_stages = pd.DataFrame([
+                    {
+                        "Étape": stage,
+                        "Appels": values["count"],
+                        "Erreurs": values["errors"],
+                        "p50 (s)": round(values["p50_ms"] / 1000, 1),
+                        "p95 (s)": round(values["p95_ms"] / 1000, 1),
+                        "Moyenne (s)": round(values["mean_ms"] / 1000, 1),
+                        "1er token p50 (s)": round(values["ttft_p50_ms"] / 1000, 1) if values.get("ttft_p50_ms") is not None else None,
+                        "Budget prompt p50": f"{values['prompt_utilisation_p50']:.0%}" if values.get("prompt_utilisation_p50") is not None else None,
+                    }
+                    for stage, values in sorted(stage_stats.items(), key=lambda item: -item[1]["p50_ms"])
+                ])
+                st.dataframe(df_stages, use_container_width=True, hide_index=True)
+        else:
+            st.info("Aucune génération tracée pour l'instant (data/traces.jsonl).")
         
         st.markdown("---")
         
@@ -739,7 +1018,6 @@ if st.session_state.get('page') == 'keywords':
     
     try:
         from utils.keywords_manager import (
-            get_all_keywords_with_stats,
             add_keyword,
             update_keyword,
             delete_keyword,
@@ -778,7 +1056,12 @@ if st.session_state.get('page') == 'keywords':
         st.markdown("---")
         
         # Charger tous les mots-clés avec stats
-        keywords_data = get_all_keywords_with_stats()
+        keywords_data = cached_keywords_with_stats(
+            file_mtime(KEYWORDS_PATH),
+            file_mtime(KEYWORDS_METADATA_PATH),
+            file_mtime(ARTICLES_PATH),
+            file_mtime(ARCHIVE_INDEX_PATH),
+        )
         
         if not keywords_data:
             st.info("Aucun mot-clé configuré. Ajoutez-en un pour commencer.")
@@ -942,6 +1225,26 @@ if st.session_state.step == 'input':
         st.markdown("<br>", unsafe_allow_html=True)
         generate_btn = st.button("Générer des idées", type="primary", use_container_width=True)
     
+    # Générations lancées récemment (en cours, terminées ou interrompues)
+    recent_jobs = list_jobs(kind="article", limit=5)
+    if recent_jobs:
+        with st.expander(f"⏳ Générations récentes ({len(recent_jobs)})", expanded=False):
+            status_labels = {
+                "pending": "En attente",
+                "running": "En cours",
+                "done": "Terminée",
+                "failed": "Échec",
+                "interrupted": "Interrompue",
+            }
+            for job in recent_jobs:
+                col_job, col_open = st.columns([4, 1])
+                with col_job:
+                    st.markdown(f"**{job.get('label') or job['id']}** — {status_labels.get(job['status'], job['status'])} ({job.get('progress', 0)}%)")
+                with col_open:
+                    if st.button("Ouvrir", key=f"open_job_{job['id']}", use_container_width=True):
+                        open_generation_job(job["id"])
+                        st.rerun()
+    
     if generate_btn:
         if not topic or not topic.strip():
             st.warning("⚠️ Veuillez entrer un sujet.")
@@ -952,55 +1255,68 @@ if st.session_state.step == 'input':
             progress_bar = st.progress(0)
             status_text = st.empty()
             
+            # Un run id de trace commun à toute la génération (idées, rédaction, publication)
+            st.session_state.trace_run_id = new_run_id()
+            # Brouillons spéculatifs d'une recherche précédente : abandonnés
+            cancel_drafts(st.session_state.get('speculative_group'))
+            st.session_state.speculative_group = None
+            
             try:
-                # Charger les mots-clés cibles
-                status_text.text("📝 Chargement des mots-clés cibles...")
-                progress_bar.progress(10)
-                all_keywords = load_target_keywords()
-                # Sélectionner 2 à 4 mots-clés pertinents en fonction du sujet
-                st.session_state.target_keywords = select_target_keywords(topic, all_keywords)
+                with trace_run(st.session_state.trace_run_id):
+                    # Charger les mots-clés cibles
+                    status_text.text("📝 Chargement des mots-clés cibles...")
+                    progress_bar.progress(10)
+                    all_keywords = cached_target_keywords(file_mtime(KEYWORDS_PATH))
+                    # Sélectionner 2 à 4 mots-clés pertinents en fonction du sujet
+                    st.session_state.target_keywords = select_target_keywords(topic, all_keywords)
                 
-                # Charger les articles existants
-                status_text.text("📚 Chargement des articles existants...")
-                progress_bar.progress(20)
-                existing_articles = load_existing_articles()
+                    # Charger les articles existants
+                    status_text.text("📚 Chargement des articles existants...")
+                    progress_bar.progress(20)
+                    existing_articles = load_existing_articles()
                 
-                # Vérification des doublons
-                status_text.text("🔍 Vérification des doublons...")
-                progress_bar.progress(30)
-                existing_topics = get_existing_blog_topics()
-                duplicate_warning = check_topic_exists(topic, existing_topics)
+                    # Vérification des doublons
+                    status_text.text("🔍 Vérification des doublons...")
+                    progress_bar.progress(30)
+                    existing_topics = get_existing_blog_topics()
+                    duplicate_warning = check_topic_exists(topic, existing_topics)
                 
-                if duplicate_warning:
-                    st.warning("⚠️ Attention : Un article similaire existe déjà sur le blog.")
+                    if duplicate_warning:
+                        st.warning("⚠️ Attention : Un article similaire existe déjà sur le blog.")
                 
-                # Recherche Web
-                status_text.text("🌍 Recherche Web (Perplexity)...")
-                progress_bar.progress(50)
-                search_query = f"Recherche des données récentes, études de cas, statistiques 2025 sur {topic}, agents vocaux IA, secrétariat médical, cabinets médicaux, automatisation téléphonique"
-                web_data = search_web_with_sources(search_query)
-                st.session_state.web_results = web_data.get("content", "")
-                st.session_state.web_sources = web_data.get("sources", [])
+                    # Recherche Web
+                    status_text.text("🌍 Recherche Web (Perplexity)...")
+                    progress_bar.progress(50)
+                    search_query = f"Recherche des données récentes, études de cas, statistiques 2025 sur {topic}, agents vocaux IA, secrétariat médical, cabinets médicaux, automatisation téléphonique"
+                    web_data = search_web_with_sources(search_query)
+                    st.session_state.web_results = web_data.get("content", "")
+                    st.session_state.web_sources = web_data.get("sources", [])
                 
-                # Afficher les sources trouvées
-                if st.session_state.web_sources:
-                    status_text.text(f"✅ {len(st.session_state.web_sources)} source(s) trouvée(s)")
+                    # Afficher les sources trouvées
+                    if st.session_state.web_sources:
+                        status_text.text(f"✅ {len(st.session_state.web_sources)} source(s) trouvée(s)")
                 
-                # Génération des variantes
-                status_text.text("💡 Génération de 3 variantes de sujets...")
-                progress_bar.progress(70)
-                variants = generate_topic_variants(
-                    topic,
-                    existing_articles,
-                    st.session_state.target_keywords
-                )
-                st.session_state.variants = variants
+                    # Génération des variantes
+                    status_text.text("💡 Génération de 3 variantes de sujets...")
+                    progress_bar.progress(70)
+                    variants = generate_topic_variants(
+                        topic,
+                        existing_articles,
+                        st.session_state.target_keywords
+                    )
+                    st.session_state.variants = variants
+
+                    # Pré-rédaction en arrière-plan pendant le choix (SPECULATIVE_DRAFTS=top|all)
+                    st.session_state.speculative_group = start_speculative_drafts(
+                        variants, st.session_state.web_results, st.session_state.target_keywords,
+                        generation_mode=st.session_state.get('generation_mode'),
+                    )
                 
-                progress_bar.progress(100)
-                status_text.text("✅ Idées générées avec succès !")
+                    progress_bar.progress(100)
+                    status_text.text("✅ Idées générées avec succès !")
                 
-                st.session_state.step = 'variants'
-                st.rerun()
+                    st.session_state.step = 'variants'
+                    st.rerun()
                 
             except Exception as e:
                 st.error(f"❌ Erreur : {e}")
@@ -1073,6 +1389,41 @@ elif st.session_state.step == 'variants':
             st.session_state.step = 'input'
             st.rerun()
     else:
+        # Mode de rédaction choisi pour ce run (sections en parallèle : plus rapide sur les articles longs)
+        generation_modes = {
+            "sequential": "Séquentielle (un seul appel, sortie en direct)",
+            "sections": "Par sections en parallèle (plus rapide)",
+        }
+        current_mode = st.session_state.get("generation_mode") or getattr(generate_module, "GENERATION_MODE", "sequential")
+        if current_mode not in generation_modes:
+            current_mode = "sequential"
+        st.session_state.generation_mode = st.radio(
+            "Mode de rédaction",
+            list(generation_modes),
+            index=list(generation_modes).index(current_mode),
+            format_func=generation_modes.get,
+            horizontal=True,
+        )
+
+        # Réécriture après scoring : article complet, ou seulement les sections visées par le scoring
+        regeneration_modes = {
+            "full": "Réécriture complète à chaque itération",
+            "incremental": "Réécriture ciblée des sections signalées (moins de tokens)",
+        }
+        current_regeneration = st.session_state.get("regeneration_mode") or getattr(generate_module, "REGENERATION_MODE", "full")
+        if current_regeneration not in regeneration_modes:
+            current_regeneration = "full"
+        st.session_state.regeneration_mode = st.radio(
+            "Amélioration après scoring",
+            list(regeneration_modes),
+            index=list(regeneration_modes).index(current_regeneration),
+            format_func=regeneration_modes.get,
+            horizontal=True,
+        )
+
+        if st.session_state.get('speculative_group'):
+            st.caption("⚡ Pré-rédaction en cours en arrière-plan : l'article de l'option choisie sera prêt plus vite.")
+
         # Afficher les 3 variantes en colonnes
         cols = st.columns(3)
         
@@ -1092,11 +1443,15 @@ elif st.session_state.step == 'variants':
                 
                 if st.button(f"Choisir l'option {idx+1}", key=f"btn_{idx}", use_container_width=True):
                     st.session_state.chosen_variant = variant
+                    st.session_state.speculative_key = idx
+                    st.session_state.generation_job_id = None
                     st.session_state.step = 'generation'
                     st.rerun()
         
         st.markdown("---")
         if st.button("Retour", use_container_width=True):
+            cancel_drafts(st.session_state.get('speculative_group'))
+            st.session_state.speculative_group = None
             st.session_state.step = 'input'
             st.rerun()
 
@@ -1110,103 +1465,77 @@ elif st.session_state.step == 'generation':
             st.session_state.step = 'variants'
             st.rerun()
     else:
-        # Génération de l'article si pas encore fait
+        # Génération de l'article en arrière-plan si pas encore fait
         if not st.session_state.final_article:
-            with st.spinner("⏳ Rédaction de l'article complet, scoring et optimisation SEO en cours..."):
-                try:
-                    # 1. Génération de l'article brut
-                    raw_article = generate_article(
-                        st.session_state.chosen_variant,
-                        st.session_state.web_results,
-                        st.session_state.target_keywords
-                    )
-                    
-                    # 2. Raffinement du style
-                    styled_article = apply_style_refinement(raw_article)
-                    
-                    # 3. Scoring initial de l'article (avant réécriture finale)
-                    article_title = st.session_state.chosen_variant.get("title", st.session_state.topic)
-                    scoring_before = score_article_quality(
-                        styled_article,
-                        st.session_state.topic,
-                        st.session_state.target_keywords,
-                        article_title=article_title
-                    )
-                    st.session_state.article_scoring_before = scoring_before
-                    
-                    # 4. Régénération de l'article en appliquant les recommandations de scoring
-                    # Itération jusqu'à ce que le score s'améliore
-                    improved_article = styled_article
-                    scoring_after = None
-                    score_before_value = scoring_before.get('global_score') or 0
-                    max_iterations = 3
-                    
-                    for iteration in range(max_iterations):
-                        # Régénérer l'article
-                        improved_article = regenerate_article_with_scoring(
-                            improved_article if iteration > 0 else styled_article,
-                            scoring_before.get("markdown", "") if scoring_before else "",
-                            st.session_state.topic,
-                            st.session_state.target_keywords,
-                        )
-                        
-                        # Re-scorer l'article amélioré
-                        scoring_after = score_article_quality(
-                            improved_article,
-                            st.session_state.topic,
-                            st.session_state.target_keywords,
-                            article_title=article_title
-                        )
-                        
-                        score_after_value = scoring_after.get('global_score') or 0
-                        
-                        # Si le score s'est amélioré, on s'arrête
-                        if score_after_value > score_before_value:
-                            print(f"✅ Score amélioré : {score_before_value} → {score_after_value} (itération {iteration + 1})")
-                            break
-                        elif iteration < max_iterations - 1:
-                            # Si le score n'a pas amélioré, on réitère avec le nouveau scoring
-                            print(f"⚠️  Score non amélioré ({score_after_value} vs {score_before_value}), réitération {iteration + 2}/{max_iterations}")
-                            # Utiliser le nouveau scoring comme base pour la prochaine itération
-                            scoring_before = scoring_after
-                        else:
-                            # Dernière itération, on garde quand même la version améliorée
-                            print(f"⚠️  Score final : {score_after_value} (itération {iteration + 1}/{max_iterations})")
-                    
-                    st.session_state.article_scoring_after = scoring_after
-                    
-                    # 6. Optimisation SEO sur la version améliorée
-                    optimized = optimize_seo(improved_article, st.session_state.target_keywords)
-                    optimized["original_content"] = improved_article
-                    st.session_state.final_article = optimized
-                    
-                    # 6.5. Analyse SEO avancée
-                    try:
-                        from utils.seo_analyzer import analyze_seo_comprehensive
-                        seo_analysis = analyze_seo_comprehensive(
-                            improved_article,
-                            optimized.get("title", ""),
-                            optimized.get("metaTitle", ""),
-                            optimized.get("metaDescription", ""),
-                            st.session_state.target_keywords or [],
-                            optimized.get("focusKeyword")
-                        )
-                        st.session_state.seo_analysis = seo_analysis
-                    except Exception as e:
-                        print(f"⚠️  Erreur analyse SEO: {e}")
-                        st.session_state.seo_analysis = None
-                    
-                    # 7. Génération version anglaise
-                    english = generate_english_version(optimized)
-                    st.session_state.english_article = english
-                    
-                    st.success("✅ Article généré avec succès !")
+            job_id = st.session_state.get('generation_job_id')
+            if not job_id:
+                job_id = submit_job(
+                    "article",
+                    {
+                        "chosen_variant": st.session_state.chosen_variant,
+                        "web_results": st.session_state.web_results,
+                        "target_keywords": st.session_state.target_keywords,
+                        "topic": st.session_state.topic,
+                        "trace_run_id": st.session_state.get('trace_run_id'),
+                        "generation_mode": st.session_state.get('generation_mode'),
+                        "regeneration_mode": st.session_state.get('regeneration_mode'),
+                        "speculative_draft": {
+                            "group": st.session_state.get('speculative_group'),
+                            "key": st.session_state.get('speculative_key'),
+                        },
+                    },
+                    run_article_pipeline,
+                    label=st.session_state.chosen_variant.get("title", st.session_state.topic),
+                )
+                st.session_state.generation_job_id = job_id
+                # Brouillons réclamés (ou annulés) par le job
+                st.session_state.speculative_group = None
+                # Le job reste accessible après un rafraîchissement via l'URL (?job=...)
+                st.query_params["job"] = job_id
+            
+            job = get_job(job_id)
+            if job is None:
+                st.error("❌ Job de génération introuvable.")
+                st.session_state.generation_job_id = None
+                st.query_params.pop("job", None)
+            elif job["status"] == "done":
+                result = job.get("result") or {}
+                st.session_state.final_article = result.get("final_article")
+                st.session_state.english_article = result.get("english_article")
+                st.session_state.article_scoring_before = result.get("scoring_before")
+                st.session_state.article_scoring_after = result.get("scoring_after")
+                st.session_state.seo_analysis = result.get("seo_analysis")
+                st.success("✅ Article généré avec succès !")
+                st.rerun()
+            elif job["status"] in ("failed", "interrupted"):
+                done_stages = [name for name, stage in job.get("stages", {}).items() if stage.get("status") == "done"]
+                if job["status"] == "failed":
+                    st.error(f"❌ Erreur lors de la génération : {job.get('error')}")
+                    if job.get("traceback"):
+                        with st.expander("Détails de l'erreur"):
+                            st.code(job["traceback"])
+                else:
+                    st.warning("⚠️ La génération a été interrompue (redémarrage de l'application).")
+                if done_stages:
+                    st.caption(f"Étapes déjà terminées (conservées) : {', '.join(done_stages)}")
+                if st.button("Reprendre la génération", type="primary", use_container_width=True):
+                    resume_job(job_id, run_article_pipeline)
                     st.rerun()
-                    
-                except Exception as e:
-                    st.error(f"❌ Erreur lors de la génération : {e}")
-                    import traceback
-                    st.code(traceback.format_exc())
+            else:
+                # Job en file ou en cours : on affiche la progression et on repasse dans 2 s
+                st.info("⏳ Rédaction de l'article complet, scoring et optimisation SEO en cours... "
+                        "Vous pouvez changer de page ou revenir plus tard avec ce lien.")
+                st.progress(job.get("progress", 0))
+                st.caption(job.get("message", ""))
+                
+                live = get_live_output(job_id)
+                if live and not live["done"]:
+                    # Étape en streaming : le texte s'affiche au fil de la génération
+                    with st.container(border=True):
+                        st.write_stream(follow_live_output(job_id))
+                else:
+                    time.sleep(JOB_POLL_INTERVAL_SECONDS)
+                st.rerun()
         
         # Affichage de l'article généré
         if st.session_state.final_article:
@@ -1368,7 +1697,7 @@ elif st.session_state.step == 'generation':
                     st.markdown("---")
                     
                     # Lisibilité
-                    st.subheader("📖 Score de Lisibilité (Flesch Reading Ease)")
+                    st.subheader("📖 Score de Lisibilité (Kandel–Moles FR / Flesch EN)")
                     readability = seo_analysis.get("readability", {})
                     if readability:
                         col1, col2, col3 = st.columns(3)
@@ -1380,7 +1709,15 @@ elif st.session_state.step == 'generation':
                             st.metric("Phrases", readability.get("sentences", 0))
                         
                         st.caption(f"Mots : {readability.get('words', 0)} | "
-                                 f"Longueur moyenne phrase : {readability.get('avg_sentence_length', 0):.1f} mots")
+                                 f"Longueur moyenne phrase : {readability.get('avg_sentence_length', 0):.1f} mots | "
+                                 f"Indice : {readability.get('index', 'N/A')}")
+                        
+                        readability_en = seo_analysis.get("readability_en")
+                        if readability_en:
+                            indices_en = readability_en.get("indices", {})
+                            st.caption(f"Version EN — Flesch : {readability_en.get('score', 0):.1f}/100 "
+                                     f"({readability_en.get('level', 'N/A')}) | "
+                                     f"Flesch–Kincaid Grade : {indices_en.get('flesch_kincaid_grade', 'N/A')}")
                         
                         # Recommandation lisibilité
                         if readability.get("score", 0) < 50:
@@ -1527,10 +1864,10 @@ elif st.session_state.step == 'generation':
                     # Appliquer les modifications
                     if st.session_state.edited_content_fr:
                         st.session_state.final_article['original_content'] = st.session_state.edited_content_fr
-                        st.session_state.final_article['blog_post'] = st.session_state.edited_content_fr
+                        st.session_state.final_article['blog_post'] = markdown_to_html(st.session_state.edited_content_fr)
                     if st.session_state.english_article and st.session_state.edited_content_en:
                         st.session_state.english_article['original_content'] = st.session_state.edited_content_en
-                        st.session_state.english_article['blog_post'] = st.session_state.edited_content_en
+                        st.session_state.english_article['blog_post'] = markdown_to_html(st.session_state.edited_content_en)
                     st.success("Modifications appliquées !")
                     st.session_state.article_saved = False  # Réinitialiser pour sauvegarder à nouveau
                     st.rerun()
@@ -1659,19 +1996,20 @@ elif st.session_state.step == 'generation':
                         article_to_save = st.session_state.final_article.copy()
                         if st.session_state.edited_content_fr:
                             article_to_save['original_content'] = st.session_state.edited_content_fr
-                            article_to_save['blog_post'] = st.session_state.edited_content_fr
+                            article_to_save['blog_post'] = markdown_to_html(st.session_state.edited_content_fr)
                         
                         en_article_to_save = None
                         if st.session_state.english_article:
                             en_article_to_save = st.session_state.english_article.copy()
                             if st.session_state.edited_content_en:
                                 en_article_to_save['original_content'] = st.session_state.edited_content_en
-                                en_article_to_save['blog_post'] = st.session_state.edited_content_en
+                                en_article_to_save['blog_post'] = markdown_to_html(st.session_state.edited_content_en)
                         
                         filepath = save_article_for_review(
                             article_to_save,
                             st.session_state.chosen_variant.get('title', st.session_state.topic),
-                            en_article_to_save
+                            en_article_to_save,
+                            scoring=st.session_state.get('article_scoring_after') or st.session_state.get('article_scoring_before')
                         )
                         st.session_state.article_saved = True
                         st.session_state.saved_filepath = filepath.name
@@ -1686,19 +2024,20 @@ elif st.session_state.step == 'generation':
                             article_to_save = st.session_state.final_article.copy()
                             if st.session_state.edited_content_fr:
                                 article_to_save['original_content'] = st.session_state.edited_content_fr
-                                article_to_save['blog_post'] = st.session_state.edited_content_fr
+                                article_to_save['blog_post'] = markdown_to_html(st.session_state.edited_content_fr)
                             
                             en_article_to_save = None
                             if st.session_state.english_article:
                                 en_article_to_save = st.session_state.english_article.copy()
                                 if st.session_state.edited_content_en:
                                     en_article_to_save['original_content'] = st.session_state.edited_content_en
-                                    en_article_to_save['blog_post'] = st.session_state.edited_content_en
+                                    en_article_to_save['blog_post'] = markdown_to_html(st.session_state.edited_content_en)
                             
                             filepath = save_article_for_review(
                                 article_to_save,
                                 st.session_state.chosen_variant.get('title', st.session_state.topic),
-                                en_article_to_save
+                                en_article_to_save,
+                                scoring=st.session_state.get('article_scoring_after') or st.session_state.get('article_scoring_before')
                             )
                             st.session_state.saved_filepath = filepath.name
                             st.success(f"Sauvegardé dans : `{filepath.name}`")
@@ -1710,55 +2049,56 @@ elif st.session_state.step == 'generation':
                 if st.button("Publier sur Sanity", type="primary", use_container_width=True):
                     with st.spinner("Publication en cours..."):
                         try:
-                            # S'assurer que les modifications sont appliquées avant publication
-                            article_to_publish = st.session_state.final_article.copy()
+                            with trace_run(st.session_state.get('trace_run_id')):
+                                # S'assurer que les modifications sont appliquées avant publication
+                                article_to_publish = st.session_state.final_article.copy()
                             
-                            # Si du contenu a été modifié, l'utiliser
-                            if st.session_state.edited_content_fr:
-                                article_to_publish['original_content'] = st.session_state.edited_content_fr
-                                article_to_publish['blog_post'] = st.session_state.edited_content_fr
+                                # Si du contenu a été modifié, l'utiliser
+                                if st.session_state.edited_content_fr:
+                                    article_to_publish['original_content'] = st.session_state.edited_content_fr
+                                    article_to_publish['blog_post'] = markdown_to_html(st.session_state.edited_content_fr)
                             
-                            cat_slug = article_to_publish.get("tag", "actualites-tendances")
-                            refs = fetch_sanity_references(cat_slug)
+                                cat_slug = article_to_publish.get("tag", "actualites-tendances")
+                                refs = fetch_sanity_references(cat_slug)
                             
-                            # Publication FR
-                            res_fr = publish_to_production(
-                                article_to_publish,
-                                refs,
-                                "fr"
-                            )
+                                # Publication FR
+                                res_fr = publish_to_production(
+                                    article_to_publish,
+                                    refs,
+                                    "fr"
+                                )
                             
-                            # Publication EN si disponible
-                            res_en = False
-                            if st.session_state.english_article:
-                                en_article_to_publish = st.session_state.english_article.copy()
+                                # Publication EN si disponible
+                                res_en = False
+                                if st.session_state.english_article:
+                                    en_article_to_publish = st.session_state.english_article.copy()
                                 
-                                # Si du contenu EN a été modifié, l'utiliser
-                                if st.session_state.edited_content_en:
-                                    en_article_to_publish['original_content'] = st.session_state.edited_content_en
-                                    en_article_to_publish['blog_post'] = st.session_state.edited_content_en
+                                    # Si du contenu EN a été modifié, l'utiliser
+                                    if st.session_state.edited_content_en:
+                                        en_article_to_publish['original_content'] = st.session_state.edited_content_en
+                                        en_article_to_publish['blog_post'] = markdown_to_html(st.session_state.edited_content_en)
                                 
-                                res_en = publish_to_production(
-                                    en_article_to_publish,
-                                    refs,
-                                    "en"
-                                )
+                                    res_en = publish_to_production(
+                                        en_article_to_publish,
+                                        refs,
+                                        "en"
+                                    )
                             
-                            if res_fr:
-                                st.success("Article français publié avec succès !")
-                                if res_en:
-                                    st.success("Article anglais publié avec succès !")
-                                st.balloons()
+                                if res_fr:
+                                    st.success("Article français publié avec succès !")
+                                    if res_en:
+                                        st.success("Article anglais publié avec succès !")
+                                    st.balloons()
                                 
-                                # Mettre à jour l'article dans session_state avec les modifications
-                                st.session_state.final_article = article_to_publish
-                                if st.session_state.english_article:
-                                    st.session_state.english_article = en_article_to_publish if st.session_state.edited_content_en else st.session_state.english_article
+                                    # Mettre à jour l'article dans session_state avec les modifications
+                                    st.session_state.final_article = article_to_publish
+                                    if st.session_state.english_article:
+                                        st.session_state.english_article = en_article_to_publish if st.session_state.edited_content_en else st.session_state.english_article
                                 
-                                # Réinitialiser le flag de sauvegarde pour sauvegarder la version modifiée
-                                st.session_state.article_saved = False
-                            else:
-                                st.error("Erreur lors de la publication FR")
+                                    # Réinitialiser le flag de sauvegarde pour sauvegarder la version modifiée
+                                    st.session_state.article_saved = False
+                                else:
+                                    st.error("Erreur lors de la publication FR")
                                 
                         except Exception as e:
                             st.error(f"Erreur : {e}")
@@ -1770,6 +2110,8 @@ elif st.session_state.step == 'generation':
                 with col3a:
                     if st.button("Régénérer", type="secondary", use_container_width=True):
                         st.session_state.final_article = None
+                        st.session_state.generation_job_id = None
+                        st.query_params.pop("job", None)
                         st.session_state.english_article = None
                         st.session_state.article_saved = False
                         st.rerun()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Maintenance du dossier articles/ : archivage des fichiers de review anciens ou
+déjà publiés (utils/article_archive.py) et blob store des HTML (utils/blob_store.py)
+- run : déplace dans articles/archive/ (compressés) les articles générés il y a
+  plus de N jours (ARCHIVE_AFTER_DAYS), et avec --published ceux déjà présents
+  dans la base de connaissances
+- restore : remet un article archivé dans articles/
+- compact : sort les HTML des fichiers de review écrits avant le blob store
+- gc : supprime les blobs qui ne sont plus référencés par aucun sidecar
+- status : taille de l'archive et du blob store
+
+Les articles archivés restent visibles dans l'historique, les analytics et le
+compteur de mots-clés (index de l'archive) ; la consultation, les traitements
+batch et la publication les relisent ou les restaurent automatiquement.
+
+Usage :
+    python scripts/archive_articles.py run [--days 90] [--published] [--dry-run]
+    python scripts/archive_articles.py restore <fichier.md>
+    python scripts/archive_articles.py compact
+    python scripts/archive_articles.py gc [--dry-run]
+    python scripts/archive_articles.py status
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.article_archive import (
+    ARCHIVE_AFTER_DAYS,
+    ARCHIVE_DIR,
+    ARTICLES_DIR,
+    archive_articles,
+    archive_stats,
+    list_archived,
+    restore_article,
+)
+from utils.blob_store import blob_stats, collect_garbage
+from utils.review_metadata import compact_review_file
+
+
+def format_size(size: int) -> str:
+    return f"{size / 1_000_000:.1f} Mo" if size >= 1_000_000 else f"{size / 1000:.0f} Ko"
+
+
+def print_status():
+    blobs = blob_stats(ARTICLES_DIR)
+    print(f"📦 Blob store : {blobs['blobs']} corps HTML, {format_size(blobs['size'])}")
+    stats = archive_stats()
+    if not stats["articles"]:
+        print("ℹ️  Archive vide")
+        return
+    print(
+        f"🗄️  {stats['articles']} article(s) archivé(s) : {format_size(stats['size'])} → "
+        f"{format_size(stats['compressed_size'])} (×{stats['ratio']})"
+    )
+    reasons = {}
+    for record in list_archived().values():
+        reasons[record["reason"]] = reasons.get(record["reason"], 0) + 1
+    for reason, count in sorted(reasons.items()):
+        print(f"   {reason} : {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archivage compressé des fichiers de review")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Archiver les articles anciens (et publiés avec --published)")
+    run.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS,
+                     help=f"Âge minimum en jours depuis la génération (défaut : {ARCHIVE_AFTER_DAYS})")
+    run.add_argument("--published", action="store_true",
+                     help="Archiver aussi les articles déjà publiés, quel que soit leur âge")
+    run.add_argument("--dry-run", action="store_true", help="Lister les articles sans les déplacer")
+
+    restore = sub.add_parser("restore", help="Remettre un article archivé dans articles/")
+    restore.add_argument("filename")
+
+    sub.add_parser("compact", help="Sortir les HTML des anciens fichiers de review (blob store)")
+
+    gc = sub.add_parser("gc", help="Supprimer les blobs non référencés")
+    gc.add_argument("--dry-run", action="store_true", help="Compter sans supprimer")
+
+    sub.add_parser("status", help="Taille de l'archive et du blob store")
+
+    args = parser.parse_args()
+
+    if args.command == "status":
+        print_status()
+        return
+
+    if args.command == "compact":
+        compacted = saved = 0
+        for path in sorted(ARTICLES_DIR.glob("*.md")):
+            try:
+                gained = compact_review_file(path)
+            except Exception as e:
+                print(f"⚠️  Erreur compactage {path.name}: {e}")
+                continue
+            if gained:
+                compacted += 1
+                saved += gained
+        print(f"✅ {compacted} fichier(s) compacté(s), {format_size(saved)} de moins dans articles/")
+        print_status()
+        return
+
+    if args.command == "gc":
+        result = collect_garbage(ARTICLES_DIR, [ARTICLES_DIR, ARCHIVE_DIR], dry_run=args.dry_run)
+        verb = "à supprimer" if args.dry_run else "supprimé(s)"
+        print(f"✅ {result['removed']} blob(s) {verb} ({format_size(result['freed'])})")
+        return
+
+    if args.command == "restore":
+        filename = Path(args.filename).name
+        if filename not in list_archived():
+            print(f"❌ Article absent de l'archive : {filename}")
+            sys.exit(1)
+        restore_article(filename)
+        return
+
+    done = archive_articles(args.days, args.published, dry_run=args.dry_run)
+    if not done:
+        print("ℹ️  Aucun article à archiver")
+        return
+    for item in done:
+        record = item.get("record")
+        detail = f"{format_size(record['size'])} → {format_size(record['compressed_size'])}" if record else "à archiver"
+        print(f"{'🗄️ ' if record else 'ℹ️ '} {item['path'].name} ({item['reason']}) : {detail}")
+    if not args.dry_run:
+        print(f"✅ {len(done)} article(s) archivé(s)")
+        print_status()
+
+
+if __name__ == "__main__":
+    main()
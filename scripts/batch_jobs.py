@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Traitements de masse via la Batch API OpenAI (moitié prix, résultats sous 24 h)
+- score : nouveau scoring des articles (scores du sidecar mis à jour)
+- seo : nouvelles métadonnées SEO FR (meta title / description, OG, mots-clés)
+- translate : nouvelle version anglaise (fichier de review réécrit, date conservée)
+
+Les fonctions d'étape de generate_article.py sont utilisées telles quelles
+(utils/batch_api.py) ; l'état de chaque traitement est dans data/batches/<id>/
+et un traitement interrompu reprend avec `resume`.
+
+Usage :
+    python scripts/batch_jobs.py submit score [--only-missing] [--limit 50] [--no-wait]
+    python scripts/batch_jobs.py resume <id> [--no-wait]
+    python scripts/batch_jobs.py status [<id>]
+
+Test hors ligne : serveur mock (scripts/bench/mock_server.py, endpoints /v1/files
+et /v1/batches) avec OPENAI_BASE_URL=http://127.0.0.1:8765/v1 et BATCH_POLL_SECONDS=1
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from generate_article import (
+    ARTICLES_DIR,
+    generate_english_version,
+    optimize_seo,
+    save_article_for_review,
+    score_article_quality,
+)
+from utils.article_archive import list_archived, load_metadata, read_review_body, restore_article, write_metadata
+from utils.batch_api import JOB_DONE, create_job, list_jobs, load_state, run_job
+from utils.llm_providers import get_provider
+from utils.review_metadata import extract_scores
+
+TASKS = ("score", "seo", "translate")
+
+# Champs SEO FR remplacés par la tâche seo (le titre et le slug ne changent pas)
+SEO_FIELDS = ("metaTitle", "metaDescription", "ogTitle", "ogDescription", "focusKeyword", "keywords")
+
+
+def load_article(filename: str) -> Optional[Dict[str, Any]]:
+    """
+    Article d'un fichier de review (format article_data de generate_article) à
+    partir du sidecar, dans articles/ ou dans l'archive ; None pour un ancien
+    fichier sans sidecar ou un corps modifié.
+    """
+    path = ARTICLES_DIR / filename
+    metadata = load_metadata(path)
+    fr = (metadata or {}).get("fr")
+    if not fr:
+        return None
+    markdown = read_review_body(path, fr.get("body_ref"))
+    if markdown is None:
+        return None
+    return {
+        "metadata": metadata,
+        "article_data": {
+            "title": fr.get("title", ""),
+            "slug": fr.get("slug", ""),
+            "tag": fr.get("tag"),
+            "readTime": fr.get("readTime"),
+            "focusKeyword": fr.get("focusKeyword"),
+            "summary": fr.get("excerpt", ""),
+            "keywords": fr.get("keywords") or [],
+            "metaTitle": fr.get("metaTitle", ""),
+            "metaDescription": fr.get("metaDescription", ""),
+            "ogTitle": fr.get("ogTitle", ""),
+            "ogDescription": fr.get("ogDescription", ""),
+            "canonicalUrl": fr.get("canonicalUrl", ""),
+            "translationGroup": fr.get("translationGroup", ""),
+            "blog_post": read_review_body(path, fr.get("html_ref")) or markdown,
+            "original_content": markdown.strip(),
+        },
+    }
+
+
+def select_articles(task: str, only_missing: bool, limit: Optional[int], contains: str) -> List[str]:
+    """Fichiers de review à traiter (avec sidecar, archivés compris), du plus récent au plus ancien"""
+    selected = []
+    filenames = {path.name for path in ARTICLES_DIR.glob("*.md")} | set(list_archived())
+    for filename in sorted(filenames, reverse=True):
+        if contains and contains not in filename:
+            continue
+        metadata = load_metadata(ARTICLES_DIR / filename)
+        if not (metadata or {}).get("fr"):
+            continue
+        if only_missing and task == "score" and metadata.get("scores"):
+            continue
+        if only_missing and task == "translate" and metadata.get("en"):
+            continue
+        selected.append(filename)
+        if limit and len(selected) >= limit:
+            break
+    return selected
+
+
+def run_item(task: str, filename: str) -> Any:
+    """Exécute l'étape de la tâche pour un article (appels collectés / rejoués par la session batch)"""
+    article = load_article(filename)
+    if article is None:
+        raise ValueError("sidecar absent ou corps modifié depuis la génération")
+    metadata, data = article["metadata"], article["article_data"]
+    if task == "score":
+        return score_article_quality(data["original_content"], metadata.get("topic", ""), data["keywords"], data["title"])
+    if task == "seo":
+        return optimize_seo(data["original_content"], data["keywords"])
+    return generate_english_version(data)
+
+
+def apply_item(task: str, filename: str, result: Any):
+    """
+    Enregistre le résultat d'un article dans son sidecar (ou réécrit le fichier de review).
+
+    score / seo : sidecar mis à jour sur place, y compris pour un article
+    archivé (qui reste compressé) ; translate : article archivé restauré.
+    """
+    path = ARTICLES_DIR / filename
+    if task == "translate":
+        # La traduction réécrit le fichier de review : un article archivé est d'abord restauré
+        path = restore_article(filename) or path
+    article = load_article(filename)
+    if article is None:
+        raise ValueError("article modifié pendant le traitement")
+    metadata, data = article["metadata"], article["article_data"]
+
+    if task == "score":
+        scores = extract_scores(result)
+        if not scores:
+            raise ValueError("scoring vide")
+        metadata["scores"] = scores
+        write_metadata(path, metadata)
+    elif task == "seo":
+        for field in SEO_FIELDS:
+            if result.get(field):
+                metadata["fr"][field] = result[field]
+        if result.get("summary"):
+            metadata["fr"]["excerpt"] = metadata["summary"] = result["summary"]
+        metadata["keywords"] = metadata["fr"]["keywords"]
+        write_metadata(path, metadata)
+    else:
+        if not result:
+            raise ValueError("traduction indisponible")
+        generated_at = datetime.fromisoformat(metadata["generated_at"]) if metadata.get("generated_at") else None
+        save_article_for_review(
+            data, metadata.get("topic", ""), result, custom_filename=filename,
+            scoring=metadata.get("scores"), generated_at=generated_at,
+        )
+    print(f"✅ {filename} : {task} enregistré")
+
+
+def advance(state: Dict[str, Any], wait: bool) -> Dict[str, Any]:
+    task = state["task"]
+    return run_job(
+        get_provider("openai").client(),
+        state,
+        lambda filename: run_item(task, filename),
+        lambda filename, result: apply_item(task, filename, result),
+        wait=wait,
+    )
+
+
+def print_status(state: Dict[str, Any]):
+    print(
+        f"📦 {state['id']} ({state['task']}) : {state['status']} | "
+        f"{len(state['done'])}/{len(state['items'])} terminé(s), {len(state['failed'])} en erreur"
+    )
+    for round_ in state["rounds"]:
+        print(
+            f"   tour {round_['number']} : {round_['requests']} requête(s), {round_['status']}"
+            f"{' / ' + round_['batch_status'] if round_.get('batch_status') else ''}"
+            f"{' (batch ' + round_['batch_id'] + ')' if round_.get('batch_id') else ''}"
+        )
+    for filename, error in state["failed"].items():
+        print(f"   ⚠️  {filename} : {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Traitements de masse via la Batch API OpenAI")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    submit = sub.add_parser("submit", help="Nouveau traitement")
+    submit.add_argument("task", choices=TASKS)
+    submit.add_argument("--only-missing", action="store_true",
+                        help="score : articles sans scores ; translate : articles sans version anglaise")
+    submit.add_argument("--limit", type=int, help="Nombre maximum d'articles")
+    submit.add_argument("--contains", default="", help="Seulement les fichiers dont le nom contient ce texte")
+    submit.add_argument("--no-wait", action="store_true", help="Rendre la main une fois le batch soumis")
+
+    resume = sub.add_parser("resume", help="Reprendre un traitement (suivi, téléchargement, application)")
+    resume.add_argument("job_id")
+    resume.add_argument("--no-wait", action="store_true", help="Rendre la main si le batch est encore en cours")
+
+    status = sub.add_parser("status", help="État des traitements")
+    status.add_argument("job_id", nargs="?")
+
+    args = parser.parse_args()
+
+    if args.command == "status":
+        states = [load_state(args.job_id)] if args.job_id else list_jobs()
+        if not any(states):
+            print("ℹ️  Aucun traitement batch")
+        for state in filter(None, states):
+            print_status(state)
+        return
+
+    if args.command == "resume":
+        state = load_state(args.job_id)
+        if state is None:
+            print(f"❌ Traitement introuvable : {args.job_id}")
+            sys.exit(1)
+    else:
+        items = select_articles(args.task, args.only_missing, args.limit, args.contains)
+        if not items:
+            print("ℹ️  Aucun article à traiter")
+            return
+        state = create_job(args.task, items, {"only_missing": args.only_missing})
+        print(f"📦 Traitement {state['id']} : {len(items)} article(s)")
+
+    state = advance(state, wait=not args.no_wait)
+    if state["status"] != JOB_DONE:
+        print(f"ℹ️  Batch en cours : reprendre avec `python scripts/batch_jobs.py resume {state['id']}`")
+    print_status(state)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Mesure du temps de démarrage et de rerun de l'app Streamlit (app.py)
+- Utilise streamlit.testing (AppTest), sans navigateur ni serveur
+- Premier run = démarrage à froid (import des modules, clients, etc.)
+- Reruns suivants = latence par interaction sur chaque page
+- Coût brut des chargeurs désormais mis en cache (module generate_article,
+  statistiques tokens / analytics / mots-clés), évité à chaque rerun
+
+Note : AppTest attend la fin du script par polling, ses temps ont un plancher
+d'environ 150 ms ; comparer les runs entre eux plutôt que la valeur absolue.
+
+Usage : python scripts/bench/bench_app.py [--reruns 5]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+BASE_DIR = Path(__file__).parent.parent.parent
+APP_FILE = BASE_DIR / "app.py"
+
+# Libellés du menu de navigation (radio de la sidebar)
+PAGES = ["Créer un article", "Historique", "Tokens OpenAI", "Analytics", "Mots-clés SEO"]
+
+
+def time_run(app: AppTest) -> float:
+    """Exécute un run du script et retourne sa durée en millisecondes"""
+    start = time.perf_counter()
+    app.run(timeout=120)
+    elapsed = (time.perf_counter() - start) * 1000
+    if app.exception:
+        print(f"⚠️  Exception pendant le run : {app.exception[0].message}")
+    return elapsed
+
+
+def time_call(func, repeat: int = 5) -> float:
+    """Durée médiane d'un appel en millisecondes"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def load_generate_module():
+    """Exécute scripts/generate_article.py comme le faisait app.py à chaque rerun"""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("generate_article", BASE_DIR / "scripts" / "generate_article.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_loaders(repeat: int):
+    """Coût d'un appel non caché des chargeurs (ce que st.cache_* évite à chaque rerun)"""
+    from utils.token_tracker import get_token_statistics
+    from utils.analytics import get_comprehensive_stats
+    from utils.keywords_manager import get_all_keywords_with_stats
+
+    module = load_generate_module()
+    loaders = {
+        "module generate_article": load_generate_module,
+        "get_token_statistics": get_token_statistics,
+        "get_comprehensive_stats": get_comprehensive_stats,
+        "get_all_keywords_with_stats": get_all_keywords_with_stats,
+        "load_target_keywords": module.load_target_keywords,
+    }
+    for name, func in loaders.items():
+        print(f"⏱️  {name:<28} {time_call(func, repeat):8.2f} ms / appel")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark démarrage / rerun de app.py")
+    parser.add_argument("--reruns", type=int, default=5, help="Nombre de reruns mesurés par page")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(BASE_DIR))
+    bench_loaders(args.reruns)
+
+    app = AppTest.from_file(str(APP_FILE), default_timeout=120)
+    app.session_state["authenticated"] = True
+
+    startup_ms = time_run(app)
+    print(f"🚀 Premier run (démarrage à froid) : {startup_ms:.0f} ms")
+
+    for page in PAGES:
+        app.sidebar.radio[0].set_value(page)
+        # Premier passage sur la page : imports et chargements éventuels
+        first_ms = time_run(app)
+        timings = [time_run(app) for _ in range(args.reruns)]
+        print(
+            f"📄 {page:<16} premier run {first_ms:7.0f} ms | "
+            f"rerun médian {statistics.median(timings):7.1f} ms | max {max(timings):7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks des chemins CPU purs du pipeline (sans réseau)
+- html_to_sanity_blocks, parse_text_with_marks (utils/sanity_utils.py)
+- markdown_to_html (utils/markdown_renderer.py, rendu local du blog_post)
+- convert_text_to_sanity_blocks (generate_article.py et publish_from_file.py)
+- convert_html_to_plain_text, check_topic_exists, select_target_keywords
+- analyze_seo_comprehensive (utils/seo_analyzer.py)
+- parse_review_file (sidecar) et parse_review_file_legacy (regex)
+- requêtes de l'historique des scores (utils/score_history.py) : moyenne
+  glissante, répartition par mot-clé, reconstruction de l'index
+
+Corpus synthétique (scripts/bench/corpus.py) : articles de 1k à 50k mots,
+10 à 10k titres existants et mots-clés.
+
+Chaque exécution est ajoutée à data/bench_history.jsonl (commit, machine,
+temps médian par cas). Un cas plus lent que la médiane des dernières
+exécutions de la même machine au-delà du seuil est signalé comme régression
+(code de sortie 1 avec --fail-on-regression).
+
+Usage : python scripts/bench/bench_hotpaths.py [--quick] [--filter sanity] [--threshold 0.2]
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import corpus
+
+HISTORY_FILE = BASE_DIR / "data" / "bench_history.jsonl"
+
+ARTICLE_SIZES = (1_000, 10_000, 50_000)
+LIST_SIZES = (10, 1_000, 10_000)
+QUICK_ARTICLE_SIZES = (1_000, 10_000)
+QUICK_LIST_SIZES = (10, 1_000)
+
+# Nombre d'exécutions précédentes (même machine) servant de référence
+BASELINE_RUNS = 5
+
+
+def load_generate_module():
+    spec = importlib.util.spec_from_file_location("generate_article", BASE_DIR / "scripts" / "generate_article.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_cases(article_sizes, list_sizes, review_dir: Path) -> List[Tuple[str, Callable[[], Any]]]:
+    """Liste des cas (nom, appel sans argument) sur le corpus synthétique"""
+    from utils.markdown_renderer import markdown_to_html
+    from utils.sanity_utils import html_to_sanity_blocks, parse_text_with_marks
+    from utils.seo_analyzer import analyze_seo_comprehensive
+    from utils import durable_io, score_history
+    import publish_from_file
+
+    durable_io.LOCKS_DIR = review_dir / ".locks"
+
+    generate = load_generate_module()
+    generate.ARTICLES_DIR = review_dir
+    keywords_pool = corpus.make_keywords(max(list_sizes))
+    titles_pool = corpus.make_titles(max(list_sizes))
+    topic = "Réduire les appels manqués du secrétariat médical grâce à un agent vocal"
+
+    cases = []
+    for words in article_sizes:
+        markdown = corpus.make_markdown(words)
+        html = corpus.make_html(words)
+        paragraph = max(html.split("<p>")[1:], key=len).split("</p>")[0]
+        review_file = corpus.make_review_file(generate.save_article_for_review, words)
+        keywords = keywords_pool[:4]
+        cases += [
+            (f"html_to_sanity_blocks[{words}w]", lambda html=html: html_to_sanity_blocks(html)),
+            (f"parse_text_with_marks[{words}w]", lambda p=paragraph: parse_text_with_marks(p)),
+            (f"markdown_to_html[{words}w]", lambda md=markdown: markdown_to_html(md)),
+            (f"convert_text_to_sanity_blocks.generate[{words}w]",
+             lambda md=markdown: generate.convert_text_to_sanity_blocks(md)),
+            (f"convert_text_to_sanity_blocks.publish[{words}w]",
+             lambda md=markdown: publish_from_file.convert_text_to_sanity_blocks(md)),
+            (f"convert_html_to_plain_text[{words}w]", lambda html=html: generate.convert_html_to_plain_text(html)),
+            (f"analyze_seo_comprehensive[{words}w]",
+             lambda md=markdown: analyze_seo_comprehensive(md, "Titre", "Meta title", "Meta description", keywords, keywords[0])),
+            (f"parse_review_file[{words}w]", lambda f=review_file: publish_from_file.parse_review_file(f)),
+            (f"parse_review_file_legacy[{words}w]", lambda f=review_file: publish_from_file.parse_review_file_legacy(f)),
+        ]
+    for count in list_sizes:
+        titles = titles_pool[:count]
+        keywords = keywords_pool[:count]
+        cases += [
+            (f"check_topic_exists[{count}t]", lambda t=titles: generate.check_topic_exists(topic, t)),
+            (f"select_target_keywords[{count}k]", lambda k=keywords: generate.select_target_keywords(topic, k)),
+        ]
+
+    def on_history(path: Path, query: Callable[[], Any], rebuild: bool = False) -> Callable[[], Any]:
+        def call():
+            score_history.SCORE_HISTORY_FILE = path
+            if rebuild:
+                score_history._cache.update(path=None, index=None)
+                score_history.index_path().unlink(missing_ok=True)
+            return query()
+        return call
+
+    for count in list_sizes:
+        path = corpus.make_score_history(review_dir / f"score_history_{count}.jsonl", count)
+        cases += [
+            (f"score_history.daily_scores[{count}e]", on_history(path, lambda: score_history.daily_scores(days=365))),
+            (f"score_history.breakdown[{count}e]", on_history(path, lambda: score_history.breakdown("keyword"))),
+            (f"score_history.improvement_stats[{count}e]", on_history(path, score_history.improvement_stats)),
+            (f"score_history.rebuild_index[{count}e]", on_history(path, score_history.history_size, rebuild=True)),
+        ]
+    return cases
+
+
+def time_case(func: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, float]:
+    """Temps par appel (µs) : calibrage automatique du nombre d'appels, puis `repeat` mesures"""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    timings = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    return {"median_us": statistics.median(timings), "min_us": min(timings), "calls": number}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def load_history() -> List[Dict[str, Any]]:
+    if not HISTORY_FILE.exists():
+        return []
+    records = []
+    with open(HISTORY_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def append_history(record: Dict[str, Any]):
+    HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def baseline(history: List[Dict[str, Any]], machine: str) -> Dict[str, float]:
+    """Médiane, par cas, des dernières exécutions de la même machine"""
+    runs = [r for r in history if r.get("machine") == machine][-BASELINE_RUNS:]
+    values: Dict[str, List[float]] = {}
+    for run in runs:
+        for name, result in run.get("results", {}).items():
+            values.setdefault(name, []).append(result["median_us"])
+    return {name: statistics.median(v) for name, v in values.items()}
+
+
+def format_us(value: float) -> str:
+    if value >= 1e6:
+        return f"{value / 1e6:.2f} s"
+    if value >= 1e3:
+        return f"{value / 1e3:.2f} ms"
+    return f"{value:.1f} µs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks des chemins CPU du pipeline")
+    parser.add_argument("--quick", action="store_true", help="Corpus réduit (sans les cas 50k mots / 10k entrées)")
+    parser.add_argument("--filter", default="", help="N'exécuter que les cas contenant ce texte")
+    parser.add_argument("--repeat", type=int, default=5, help="Nombre de mesures par cas")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Durée minimale d'une mesure (s)")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Ralentissement signalé (0.20 = +20 %%)")
+    parser.add_argument("--no-save", action="store_true", help="Ne pas enregistrer dans l'historique")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Code de sortie 1 si régression")
+    args = parser.parse_args()
+
+    article_sizes = QUICK_ARTICLE_SIZES if args.quick else ARTICLE_SIZES
+    list_sizes = QUICK_LIST_SIZES if args.quick else LIST_SIZES
+    machine = f"{platform.node()}|{platform.machine()}|py{platform.python_version()}"
+    reference = baseline(load_history(), machine)
+
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = []
+    with tempfile.TemporaryDirectory(prefix="bench_hotpaths_") as review_dir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            cases = build_cases(article_sizes, list_sizes, Path(review_dir))
+        print(f"{'Cas':<52} {'médiane':>10} {'min':>10} {'référence':>10} {'écart':>8}")
+        for name, func in cases:
+            if args.filter and args.filter not in name:
+                continue
+            # Les fonctions mesurées affichent des messages (doublons, parsing…)
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = time_case(func, args.repeat, args.min_time)
+            results[name] = result
+            ref = reference.get(name)
+            delta = (result["median_us"] - ref) / ref if ref else None
+            flag = ""
+            if delta is not None and delta > args.threshold:
+                flag = " ⚠️"
+                regressions.append((name, delta))
+            print(
+                f"{name:<52} {format_us(result['median_us']):>10} {format_us(result['min_us']):>10} "
+                f"{format_us(ref) if ref else '-':>10} {f'{delta:+.0%}' if delta is not None else '-':>8}{flag}"
+            )
+
+    if not args.no_save and results:
+        append_history({
+            "timestamp": datetime.now().isoformat(),
+            "commit": git_commit(),
+            "machine": machine,
+            "quick": args.quick,
+            "results": results,
+        })
+        print(f"\n💾 Résultats ajoutés à {HISTORY_FILE.relative_to(BASE_DIR)}")
+
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} régression(s) au-delà de +{args.threshold:.0%} :")
+        for name, delta in regressions:
+            print(f"   - {name} ({delta:+.0%})")
+        if args.fail_on_regression:
+            sys.exit(1)
+    elif reference:
+        print("\n✅ Aucune régression par rapport aux exécutions précédentes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Benchmark hors ligne du pipeline de génération contre le serveur mock
+(scripts/bench/mock_server.py) : aucun appel réseau réel, aucun coût.
+
+Scénarios :
+- cli : generate_article.main() de bout en bout (sujet → variantes → rédaction
+  → SEO → EN → fichier de review → publication), exécutions séquentielles
+- app : logique de l'étape "Génération" de l'app Streamlit — étape idées
+  (mots-clés, doublons, Perplexity, variantes) puis job run_article_pipeline
+  via utils.jobs suivi par polling + sortie live, N utilisateurs simultanés
+- publish : chemin de publication par lot de publish_from_file.py
+  (lecture des fichiers de review produits + références + mutations Sanity)
+
+Rapport : débit (articles/min), latence p50 / p95 par run, délai du premier
+delta (app), requêtes par endpoint côté serveur, et surcoût local par étape
+(durée du span moins le temps passé dans les appels HTTP : prompts, parsing
+JSON, conversion en blocs, E/S fichiers). Avec --tokens-per-second > 0, le
+temps de lecture des flux SSE est compté dans le surcoût des étapes streamées.
+
+Les fichiers produits (articles, jobs, traces, tokens) sont écrits dans un
+dossier temporaire, jamais dans articles/ ni data/.
+
+Usage : python scripts/bench/bench_pipeline.py --runs 5 --concurrency 3 \\
+            --latency openai=lognormal:600:0.4 --tokens-per-second 120
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+BASE_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mock_server import add_mock_arguments, config_from_args, start_mock_server
+
+SCENARIOS = ("cli", "app", "publish")
+
+TOPICS = [
+    "Réduire les appels manqués au cabinet",
+    "Gestion des urgences au secrétariat médical",
+    "Rappels automatiques de rendez-vous",
+    "Accueil téléphonique des centres de santé",
+    "Agent vocal IA et confidentialité des données",
+]
+
+
+def load_modules(sandbox: Path) -> Dict[str, Any]:
+    """
+    Importe le pipeline après configuration de l'environnement (les URL et
+    clés sont lues à l'import) et redirige ses fichiers vers le sandbox.
+    """
+    from utils import durable_io, jobs, knowledge_base, rate_governor, score_history, speculative, token_tracker, tracing
+
+    spec = importlib.util.spec_from_file_location("generate_article", BASE_DIR / "scripts" / "generate_article.py")
+    generate = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generate)
+    import publish_from_file
+
+    durable_io.LOCKS_DIR = sandbox / "data" / ".locks"
+    generate.ARTICLES_DIR = sandbox / "articles"
+    generate.ARTICLES_DIR.mkdir(parents=True, exist_ok=True)
+    token_tracker.TOKEN_HISTORY_FILE = sandbox / "data" / "token_history.json"
+    token_tracker.DAILY_COST_FILE = sandbox / "data" / "token_daily_costs.json"
+    tracing.TRACES_FILE = sandbox / "data" / "traces.jsonl"
+    score_history.SCORE_HISTORY_FILE = sandbox / "data" / "score_history.jsonl"
+    jobs.JOBS_DIR = sandbox / "data" / "jobs"
+    # Copie de la base de connaissances : les publications du scénario n'écrivent pas dans data/
+    knowledge_base.KNOWLEDGE_BASE_FILE = sandbox / "data" / "articles_existants.json"
+    shutil.copy(BASE_DIR / "data" / "articles_existants.json", knowledge_base.KNOWLEDGE_BASE_FILE)
+    # Publication sans confirmation interactive
+    generate.ask_validation = lambda: True
+    return {"generate": generate, "publish": publish_from_file, "jobs": jobs, "tracing": tracing, "speculative": speculative,
+            "rate_governor": rate_governor}
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool):
+    """Masque les print du pipeline pendant les mesures"""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def run_cli(modules: Dict[str, Any], runs: int) -> List[Dict[str, Any]]:
+    """generate_article.main() de bout en bout, une exécution après l'autre"""
+    generate = modules["generate"]
+    results = []
+    for index in range(runs):
+        sys.argv = ["generate_article.py", TOPICS[index % len(TOPICS)], "--variant", str(index % 3 + 1)]
+        start = time.perf_counter()
+        error = None
+        try:
+            with modules["tracing"].trace_run():
+                generate.main()
+        except SystemExit as e:
+            error = f"sys.exit({e.code})" if e.code else None
+        except Exception as e:
+            error = str(e)
+        results.append({"duration": time.perf_counter() - start, "error": error})
+    return results
+
+
+def _app_session(modules: Dict[str, Any], index: int, poll_interval: float, think_time: float = 0.0) -> Dict[str, Any]:
+    """
+    Un utilisateur : étape idées, choix de la variante après think_time secondes
+    (pré-rédaction spéculative pendant ce temps si SPECULATIVE_DRAFTS est actif),
+    puis job de génération suivi comme le fait l'app
+    """
+    generate = modules["generate"]
+    jobs = modules["jobs"]
+    tracing = modules["tracing"]
+    topic = TOPICS[index % len(TOPICS)]
+    start = time.perf_counter()
+
+    run_id = tracing.new_run_id()
+    with tracing.trace_run(run_id):
+        target_keywords = generate.select_target_keywords(topic, generate.load_target_keywords())
+        existing_articles = generate.load_existing_articles()
+        generate.check_topic_exists(topic, generate.get_existing_blog_topics())
+        web_data = generate.search_web_with_sources(f"Recherche des données récentes, statistiques 2025 sur {topic}")
+        variants = generate.generate_topic_variants(topic, existing_articles, target_keywords)
+        speculative_group = generate.start_speculative_drafts(variants, web_data.get("content", ""), target_keywords)
+    ideas_done = time.perf_counter()
+    time.sleep(think_time)
+    clicked = time.perf_counter()
+
+    job_id = jobs.submit_job(
+        "article",
+        {
+            "chosen_variant": variants[index % len(variants)],
+            "web_results": web_data.get("content", ""),
+            "target_keywords": target_keywords,
+            "topic": topic,
+            "trace_run_id": run_id,
+            "speculative_draft": {"group": speculative_group, "key": index % len(variants)},
+        },
+        generate.run_article_pipeline,
+        label=topic,
+    )
+
+    first_delta = None
+    while True:
+        job = jobs.get_job(job_id)
+        if job is None or job["status"] not in jobs.ACTIVE_STATUSES:
+            break
+        live = jobs.get_live_output(job_id)
+        if live and not live["done"]:
+            for _ in jobs.follow_live_output(job_id):
+                if first_delta is None:
+                    first_delta = time.perf_counter() - clicked
+        else:
+            time.sleep(poll_interval)
+
+    error = None if job and job["status"] == jobs.STATUS_DONE else (job or {}).get("error") or "job introuvable"
+    return {
+        "duration": time.perf_counter() - start,
+        "ideas": ideas_done - start,
+        "after_click": time.perf_counter() - clicked,
+        "first_delta": first_delta,
+        "error": error,
+    }
+
+
+def run_app(modules: Dict[str, Any], runs: int, concurrency: int, poll_interval: float,
+            think_time: float = 0.0) -> List[Dict[str, Any]]:
+    """runs sessions, dont `concurrency` simultanées (pool de jobs dimensionné en conséquence)"""
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(lambda i: _app_session(modules, i, poll_interval, think_time), range(runs)))
+
+
+def run_publish(modules: Dict[str, Any], sandbox: Path) -> List[Dict[str, Any]]:
+    """Publication par lot des fichiers de review du sandbox (FR puis EN)"""
+    publish = modules["publish"]
+    results = []
+    for filepath in sorted((sandbox / "articles").glob("*.md")):
+        start = time.perf_counter()
+        error = None
+        try:
+            with modules["tracing"].trace_run():
+                data = publish.parse_review_file(filepath)
+                references = publish.fetch_sanity_references()
+                if not data.get("fr") or not publish.publish_article(data["fr"], "fr", references):
+                    error = "publication FR échouée"
+                elif data.get("en") and not publish.publish_article(data["en"], "en", references):
+                    error = "publication EN échouée"
+        except Exception as e:
+            error = str(e)
+        results.append({"duration": time.perf_counter() - start, "error": error})
+    return results
+
+
+def report(name: str, results: List[Dict[str, Any]], wall: float, percentile):
+    ok = [r for r in results if not r["error"]]
+    if not results:
+        print(f"\n📊 {name} : aucune exécution")
+        return
+    durations = [r["duration"] for r in ok] or [0.0]
+    print(f"\n📊 {name} : {len(ok)}/{len(results)} réussies en {wall:.1f} s "
+          f"→ {len(ok) / wall * 60 if wall else 0:.1f} /min")
+    print(f"   latence p50 {percentile(durations, 50):.2f} s | p95 {percentile(durations, 95):.2f} s | "
+          f"max {max(durations):.2f} s")
+    deltas = [r["first_delta"] for r in ok if r.get("first_delta") is not None]
+    if deltas:
+        print(f"   premier delta live p50 {percentile(deltas, 50):.2f} s (après le choix de la variante)")
+    after_click = [r["after_click"] for r in ok if r.get("after_click") is not None]
+    if after_click:
+        print(f"   après le choix p50 {percentile(after_click, 50):.2f} s | p95 {percentile(after_click, 95):.2f} s")
+    for r in results:
+        if r["error"]:
+            print(f"   ❌ {r['error']}")
+
+
+def report_overhead(tracing):
+    """Surcoût local par étape : durée du span moins le temps des appels HTTP enregistrés"""
+    by_stage: Dict[str, List[tuple]] = {}
+    for record in tracing.load_spans():
+        if record.get("duration_ms") is None:
+            continue
+        http_ms = sum(call.get("duration_ms") or 0 for call in record.get("http") or [])
+        by_stage.setdefault(record["stage"], []).append((record["duration_ms"], http_ms))
+    if not by_stage:
+        return
+    print(f"\n⏱️  {'Étape':<34} {'appels':>6} {'durée moy.':>11} {'HTTP moy.':>10} {'local moy.':>11}")
+    for stage, values in sorted(by_stage.items(), key=lambda item: -sum(v[0] - v[1] for v in item[1])):
+        count = len(values)
+        duration = sum(v[0] for v in values) / count
+        http = sum(v[1] for v in values) / count
+        print(f"   {stage:<34} {count:>6} {duration:>9.1f}ms {http:>8.1f}ms {max(0.0, duration - http):>9.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne du pipeline contre le serveur mock")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="Scénario(s) à exécuter (par défaut : tous)")
+    parser.add_argument("--runs", type=int, default=3, help="Exécutions par scénario")
+    parser.add_argument("--concurrency", type=int, default=2, help="Utilisateurs simultanés (scénario app)")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="Intervalle de polling du job (s)")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Temps de choix de la variante (s, scénario app ; pré-rédaction si SPECULATIVE_DRAFTS=top|all)")
+    parser.add_argument("--keep", action="store_true", help="Conserver le dossier temporaire")
+    parser.add_argument("--verbose", action="store_true", help="Afficher la sortie du pipeline")
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+    scenarios = args.scenario or list(SCENARIOS)
+
+    server = start_mock_server(config_from_args(args))
+    os.environ.update(server.pipeline_env())
+    os.environ["JOB_WORKERS"] = str(max(1, args.concurrency))
+    print(f"🧪 Serveur mock : {server.base_url}")
+
+    sandbox = Path(tempfile.mkdtemp(prefix="bench_pipeline_"))
+    (sandbox / "data").mkdir()
+    cwd = os.getcwd()
+    os.chdir(sandbox)
+    try:
+        with quiet(not args.verbose):
+            modules = load_modules(sandbox)
+        percentile = modules["tracing"].percentile
+
+        for scenario in scenarios:
+            start = time.perf_counter()
+            with quiet(not args.verbose):
+                if scenario == "cli":
+                    results = run_cli(modules, args.runs)
+                elif scenario == "app":
+                    results = run_app(modules, args.runs, max(1, args.concurrency), args.poll_interval, args.think_time)
+                else:
+                    results = run_publish(modules, sandbox)
+            report(scenario, results, time.perf_counter() - start, percentile)
+
+        print("\n🌐 Requêtes servies par le mock :")
+        for endpoint, stats in sorted(server.config.snapshot().items()):
+            mean = stats["total_ms"] / stats["requests"] if stats["requests"] else 0
+            print(f"   {endpoint:<14} {int(stats['requests']):>5} requêtes | {int(stats['errors']):>3} erreurs | "
+                  f"{mean:8.1f} ms moy. | {int(stats['completion_tokens'])} tokens générés | "
+                  f"{int(stats.get('cached_tokens', 0))} tokens de prompt en cache")
+        for model, stats in modules["rate_governor"].get_stats().items():
+            print(f"\n⏳ Régulateur OpenAI {model} : {stats['requests']} appels, {stats['queued']} mis en file, "
+                  f"{stats['rate_limited']} × 429 | attente moy. {stats['wait_avg_ms']} ms, p95 {stats['wait_p95_ms']} ms, "
+                  f"max {stats['wait_max_ms']} ms | concurrence {stats['concurrency']} "
+                  f"(limites {stats['rpm_limit']} RPM / {stats['tpm_limit']} TPM)")
+        speculative = modules["speculative"].get_stats()
+        if speculative["drafts"]:
+            print(f"\n⚡ Brouillons spéculatifs : {speculative['drafts']} lancés, {speculative['reused']} réutilisés, "
+                  f"{speculative['cancelled']} annulés | {speculative['tokens']} tokens dont "
+                  f"{speculative['tokens_wasted']} perdus")
+        report_overhead(modules["tracing"])
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+        if args.keep:
+            print(f"\n📁 Fichiers conservés dans {sandbox}")
+        else:
+            shutil.rmtree(sandbox, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
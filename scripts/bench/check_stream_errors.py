@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Contrôle des flux OpenAI interrompus (_stream_completion de generate_article.py)
+- complet : un flux terminé normalement donne le contenu reçu
+- coupure : un flux qui lève une exception après N deltas donne le fallback
+  (l'article d'origine), jamais la réponse tronquée
+- sans fallback : l'exception remonte à l'appelant
+- style : apply_style_refinement(stream=True) coupé en cours de réécriture
+  rend l'article d'origine, comme le chemin non streamé
+
+Client OpenAI simulé en mémoire (aucun appel réseau) ; code de sortie 1 si un
+contrôle échoue.
+
+Usage : python scripts/bench/check_stream_errors.py [--chunks 5]
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+BASE_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "scripts"))
+
+ORIGINAL = "## 1. Article d'origine\n\nTexte complet de l'article avant réécriture.\n"
+DELTAS = [f"morceau {i} " for i in range(20)]
+
+
+class StreamDropped(ConnectionError):
+    """Connexion coupée au milieu d'une réponse streamée"""
+
+
+def _chunk(content: str) -> Any:
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))], usage=None)
+
+
+class FakeStream:
+    """Flux de chunks qui lève StreamDropped après fail_after deltas (None = flux complet)"""
+
+    def __init__(self, fail_after):
+        self.fail_after = fail_after
+        self.closed = False
+
+    def __iter__(self):
+        for index, delta in enumerate(DELTAS):
+            if self.fail_after is not None and index == self.fail_after:
+                raise StreamDropped("connexion interrompue")
+            yield _chunk(delta)
+
+    def close(self):
+        self.closed = True
+
+
+def fake_client(fail_after):
+    create = lambda **kwargs: FakeStream(fail_after)
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def load_generate_module(fail_after):
+    spec = importlib.util.spec_from_file_location("generate_article", BASE_DIR / "scripts" / "generate_article.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module._routed_client = lambda spec, routing, last: (fake_client(fail_after), "gpt-4o-mini")
+    module.llm_available = lambda operation: True
+    return module
+
+
+def run_stream(module, fallback) -> Dict[str, Any]:
+    """Consomme _stream_completion ; retourne deltas reçus, contenu final ou exception"""
+    deltas: List[str] = []
+    messages = [{"role": "user", "content": "Réécris l'article"}]
+    try:
+        content = module.collect_stream(
+            module._stream_completion("style_refinement", messages, 0.7, 1000, fallback=fallback),
+            on_delta=deltas.append,
+        )
+    except Exception as e:
+        return {"deltas": deltas, "content": None, "error": e}
+    return {"deltas": deltas, "content": content, "error": None}
+
+
+def check(results: List[Dict[str, Any]], name: str, ok: bool, detail: str):
+    results.append({"name": name, "ok": ok})
+    print(f"{'✅' if ok else '❌'} {name:<14} {detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Contrôle des flux OpenAI interrompus")
+    parser.add_argument("--chunks", type=int, default=5, help="Deltas transmis avant la coupure")
+    args = parser.parse_args()
+    results: List[Dict[str, Any]] = []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        complete = run_stream(load_generate_module(None), ORIGINAL)
+        dropped = run_stream(load_generate_module(args.chunks), ORIGINAL)
+        strict = run_stream(load_generate_module(args.chunks), None)
+        style_module = load_generate_module(args.chunks)
+        style = style_module.collect_stream(style_module.apply_style_refinement(ORIGINAL, stream=True))
+
+    check(results, "complet", complete["content"] == "".join(DELTAS),
+          f"{len(complete['deltas'])} deltas, contenu final complet")
+    check(results, "coupure", dropped["content"] == ORIGINAL and len(dropped["deltas"]) == args.chunks,
+          f"{len(dropped['deltas'])} deltas transmis puis coupure : contenu final = fallback")
+    check(results, "sans fallback", isinstance(strict["error"], StreamDropped),
+          f"exception remontée ({type(strict['error']).__name__})")
+    check(results, "style", style == ORIGINAL, "apply_style_refinement coupé : article d'origine conservé")
+
+    failed = [r["name"] for r in results if not r["ok"]]
+    if failed:
+        print(f"\n❌ Échec : {', '.join(failed)}")
+        sys.exit(1)
+    print("\n✅ Aucune réponse tronquée retenue")
+
+
+if __name__ == "__main__":
+    main()
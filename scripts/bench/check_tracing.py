@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Contrôle des statistiques et de la mémoire du traçage (utils/tracing.py)
+- percentile : rang le plus proche (ceil(p × n / 100)) sur de petits
+  échantillons de taille paire et impaire
+- trace_run : les compteurs de tentatives d'un run sont libérés à sa sortie
+  (sauf trace_run englobant du même run), la numérotation reste correcte
+- spans hors trace_run : un run par span, compteurs plafonnés à MAX_TRACKED_RUNS
+
+Traces écrites dans un dossier temporaire ; code de sortie 1 si un contrôle échoue.
+
+Usage : python scripts/bench/check_tracing.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+BASE_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+# (valeurs, percentile, attendu)
+PERCENTILE_CASES = [
+    ([1], 50, 1),
+    ([1], 95, 1),
+    ([1, 2], 50, 1),
+    ([1, 2], 95, 2),
+    ([1, 2, 3], 50, 2),
+    ([3, 1, 2], 95, 3),
+    (list(range(1, 7)), 50, 3),
+    (list(range(1, 8)), 50, 4),
+    (list(range(1, 21)), 95, 19),
+    (list(range(1, 21)), 50, 10),
+    (list(range(1, 101)), 7, 7),
+    (list(range(1, 11)), 100, 10),
+    (list(range(1, 11)), 0, 1),
+]
+
+
+def check(results: List[Dict[str, Any]], name: str, ok: bool, detail: str):
+    results.append({"name": name, "ok": ok})
+    print(f"{'✅' if ok else '❌'} {name:<14} {detail}")
+
+
+def main():
+    from utils import durable_io, tracing
+
+    sandbox = Path(tempfile.mkdtemp(prefix="check_tracing_"))
+    tracing.TRACES_FILE = sandbox / "traces.jsonl"
+    durable_io.LOCKS_DIR = sandbox / ".locks"
+    results: List[Dict[str, Any]] = []
+
+    wrong = [
+        f"p{pct}({len(values)})={tracing.percentile(values, pct)} au lieu de {expected}"
+        for values, pct, expected in PERCENTILE_CASES
+        if tracing.percentile(values, pct) != expected
+    ]
+    check(results, "percentile", not wrong,
+          ", ".join(wrong) if wrong else f"{len(PERCENTILE_CASES)} cas (tailles 1 à 100, paires et impaires)")
+
+    with tracing.trace_run() as run_id:
+        attempts = []
+        with tracing.trace_run(run_id):
+            for _ in range(3):
+                with tracing.span("generate") as current:
+                    attempts.append(current["attempt"])
+        # trace_run imbriqué du même run : les compteurs sont conservés
+        with tracing.span("generate") as current:
+            attempts.append(current["attempt"])
+        kept = run_id in tracing._attempts
+    check(results, "tentatives", attempts == [1, 2, 3, 4] and kept,
+          f"numéros {attempts}, compteurs conservés dans le trace_run englobant : {kept}")
+    check(results, "trace_run", run_id not in tracing._attempts,
+          f"compteurs libérés à la sortie du run ({len(tracing._attempts)} run(s) suivi(s))")
+
+    for _ in range(tracing.MAX_TRACKED_RUNS + 200):
+        with tracing.span("orphan"):
+            pass
+    check(results, "hors run", len(tracing._attempts) <= tracing.MAX_TRACKED_RUNS,
+          f"{len(tracing._attempts)} run(s) suivi(s) après {tracing.MAX_TRACKED_RUNS + 200} spans isolés "
+          f"(plafond {tracing.MAX_TRACKED_RUNS})")
+
+    failed = [r["name"] for r in results if not r["ok"]]
+    if failed:
+        print(f"\n❌ Échec : {', '.join(failed)}")
+        sys.exit(1)
+    print("\n✅ Percentiles exacts, compteurs de tentatives bornés")
+
+
+if __name__ == "__main__":
+    main()
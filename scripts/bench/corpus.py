@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Corpus synthétique pour les micro-benchmarks (déterministe, graine fixe)
+- Articles Markdown de 1k à 50k mots (titres H2/H3, listes, gras, liens)
+- Version HTML des mêmes articles (champ blog_post envoyé à Sanity)
+- Titres d'articles existants et mots-clés SEO (10 à 10k entrées)
+- Fichiers de review (FR + EN + sidecar) écrits par save_article_for_review
+- Historique des scores (data/score_history.jsonl) sur un an
+"""
+
+import json
+import random
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from utils.markdown_renderer import markdown_to_html
+from utils.mock_responses import FR_WORDS, generate_markdown_article
+
+LINK_PATTERN = re.compile(r"\*\*(.+?)\*\*")
+
+
+def make_markdown(words: int, seed: int = 0, english: bool = False) -> str:
+    """Article Markdown d'environ `words` mots, avec un lien tous les trois passages en gras"""
+    rng = random.Random(seed)
+    article = generate_markdown_article(rng, words, english=english)
+    counter = {"n": 0}
+
+    def add_link(match):
+        counter["n"] += 1
+        if counter["n"] % 3:
+            return match.group(0)
+        return f"[{match.group(1)}](https://callrounded.com/blog/{match.group(1).lower()})"
+
+    return LINK_PATTERN.sub(add_link, article)
+
+
+def make_html(words: int, seed: int = 0) -> str:
+    """Version HTML (h2, ul/li, p, strong, a) d'un article synthétique, rendue comme blog_post"""
+    return markdown_to_html(make_markdown(words, seed))
+
+
+def make_titles(count: int, seed: int = 1) -> List[str]:
+    """Titres d'articles existants (6 à 12 mots)"""
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(count):
+        title = " ".join(rng.choice(FR_WORDS) for _ in range(rng.randint(6, 12)))
+        titles.append(title[0].upper() + title[1:])
+    return titles
+
+
+def make_keywords(count: int, seed: int = 2) -> List[str]:
+    """Mots-clés SEO (1 à 4 mots)"""
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(FR_WORDS) for _ in range(rng.randint(1, 4))) for _ in range(count)]
+
+
+def make_review_file(save_article_for_review: Callable, words: int, seed: int = 0) -> Path:
+    """Fichier de review FR + EN écrit par la fonction du pipeline (dans son ARTICLES_DIR)"""
+    markdown_fr = make_markdown(words, seed)
+    markdown_en = make_markdown(words, seed, english=True)
+    slug = f"bench-{words}-{seed}"
+    article: Dict[str, Any] = {
+        "title": f"Article de benchmark {words} mots",
+        "slug": slug,
+        "summary": "Résumé SEO de l'article de benchmark.",
+        "keywords": make_keywords(5, seed),
+        "blog_post": make_html(words, seed),
+        "original_content": markdown_fr,
+        "tag": "guides-pratiques",
+        "readTime": f"{max(3, words // 200)} min",
+        "focusKeyword": "secrétariat médical",
+        "metaTitle": "Article de benchmark",
+        "metaDescription": "Description de l'article de benchmark.",
+        "translationGroup": slug,
+    }
+    english = {
+        "title": f"Benchmark article {words} words",
+        "slug": f"{slug}-en",
+        "summary": "SEO summary of the benchmark article.",
+        "blog_post": markdown_en,
+        "original_content": markdown_en,
+        "metaTitle": "Benchmark article",
+        "metaDescription": "Benchmark article description.",
+        "translationGroup": slug,
+        "language": "en",
+    }
+    return save_article_for_review(article, article["title"], english, custom_filename=f"{slug}.md")
+
+
+def make_score_history(path: Path, count: int, seed: int = 3) -> Path:
+    """Historique des scores (format utils.score_history) : générations de 2 à 4 scorings sur 365 jours"""
+    rng = random.Random(seed)
+    keywords = make_keywords(50, seed)
+    sectors = ["medical", "syndic", "agence_immobiliere", "general"]
+    start = datetime.now() - timedelta(days=365)
+    lines = []
+    run = 0
+    while len(lines) < count:
+        run += 1
+        when = start + timedelta(seconds=rng.randint(0, 365 * 86400))
+        score = rng.randint(55, 80)
+        run_keywords = rng.sample(keywords, 4)
+        sector = rng.choice(sectors)
+        for iteration in range(rng.randint(2, 4)):
+            score = min(100, score + rng.randint(-3, 8))
+            lines.append(json.dumps({
+                "timestamp": (when + timedelta(minutes=iteration)).isoformat(),
+                "run_id": f"run{run}",
+                "iteration": iteration,
+                "operation": "score_article",
+                "model": "gpt-4o-mini",
+                "scores": {"global_score": score, "seo_score": rng.randint(10, 20), "readability_score": rng.randint(10, 20)},
+                "total_tokens": 5000,
+                "cost_usd": 0.001,
+                "keywords": run_keywords,
+                "sector": sector,
+            }, ensure_ascii=False))
+    path.write_text("\n".join(lines[:count]) + "\n", encoding="utf-8")
+    return path
@@ -0,0 +1,628 @@
+#!/usr/bin/env python3
+"""
+Serveur local imitant les API externes du pipeline (benchmarks hors ligne, sans coût)
+- OpenAI : POST /v1/chat/completions (JSON ou streaming SSE avec chunk d'usage)
+- Perplexity : POST /chat/completions (modèle sonar-pro, citations)
+- Sanity : POST /<version>/data/query/<dataset> et /<version>/data/mutate/<dataset>
+- Blog Rounded : GET /blog ; révalidation Next.js : POST /api/revalidate
+- Latence configurable par endpoint (fixe, uniforme, log-normale) + vitesse de
+  génération en tokens/s pour OpenAI, taux d'erreur (500 / 429) et réponses
+  prédéfinies (fichier JSON, voir utils/mock_responses.load_canned_responses)
+- Limites de débit OpenAI simulées (--rate-limit rpm=60,tpm=40000) : en-têtes
+  x-ratelimit-* sur chaque réponse, 429 + retry-after-ms au-delà
+- Modèles indisponibles (--unavailable-models gpt-4o) : 503 pour ces modèles
+  (chaîne de repli du routage des modèles, utils/model_router.py)
+- Cache de prompt simulé : un message système déjà vu (≥ 1024 tokens) est
+  compté en prompt_tokens_details.cached_tokens, par blocs de 128 tokens
+- Batch API OpenAI : POST /v1/files (JSONL multipart), GET /v1/files/<id>/content,
+  POST / GET /v1/batches ; un batch reste "in_progress" --batch-seconds puis
+  "completed" avec un fichier de sortie (scripts/batch_jobs.py)
+- GET /__stats : compteurs par endpoint ; POST /__reset : remise à zéro
+
+Variables d'environnement pour pointer le pipeline vers le serveur (base = http://127.0.0.1:PORT) :
+    OPENAI_BASE_URL=<base>/v1  PERPLEXITY_API_URL=<base>/chat/completions
+    SANITY_API_URL=<base>/v2025-12-11  ROUNDED_BLOG_URL=<base>/blog
+    REVALIDATE_URL=<base>/api/revalidate
+
+Usage : python scripts/bench/mock_server.py --port 8765 --latency openai=lognormal:800:0.5 \\
+            --tokens-per-second 90 --error-rate openai=0.02
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from utils.mock_responses import (
+    blog_html,
+    chat_completion_body,
+    chat_completion_chunk,
+    chat_completion_content,
+    estimate_tokens,
+    find_canned,
+    load_canned_responses,
+    perplexity_body,
+    sanity_mutate_body,
+    sanity_query_body,
+)
+
+ENDPOINTS = ("openai", "perplexity", "sanity_query", "sanity_mutate", "blog", "revalidate")
+
+# Règles du cache de prompt OpenAI : préfixe d'au moins 1024 tokens, réutilisé par blocs de 128
+CACHE_MIN_PREFIX_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+
+
+class LatencySpec:
+    """
+    Distribution de latence (ms) : "fixed:200", "uniform:100:400",
+    "lognormal:800:0.5" (médiane, sigma) ou "0" (aucune).
+    """
+
+    def __init__(self, spec: str = "0"):
+        self.spec = spec
+        parts = spec.split(":")
+        if len(parts) == 1:
+            parts = ["fixed", parts[0]]
+        self.kind = parts[0]
+        self.values = [float(v) for v in parts[1:]]
+        if self.kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Distribution de latence inconnue : {spec}")
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.values[0]
+        if self.kind == "uniform":
+            return rng.uniform(self.values[0], self.values[1])
+        median, sigma = self.values
+        return rng.lognormvariate(math.log(max(median, 0.001)), sigma)
+
+
+class MockRateLimiter:
+    """Seaux RPM / TPM rechargés en continu, comme le compte OpenAI (prompt estimé + max_tokens)"""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = float(rpm)
+        self.tokens = float(tpm)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def check(self, tokens: int) -> Tuple[bool, Dict[str, str]]:
+        """(accepté, en-têtes x-ratelimit-*) ; un appel refusé ne consomme rien"""
+        with self.lock:
+            now = time.monotonic()
+            elapsed, self.updated = now - self.updated, now
+            self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60)
+            self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+            accepted = self.requests >= 1 and self.tokens >= min(tokens, self.tpm)
+            if accepted:
+                self.requests -= 1
+                self.tokens -= tokens
+            reset_requests = max(0.0, (1 - self.requests) * 60 / self.rpm)
+            reset_tokens = max(0.0, (min(tokens, self.tpm) - self.tokens) * 60 / self.tpm)
+            headers = {
+                "x-ratelimit-limit-requests": str(self.rpm),
+                "x-ratelimit-limit-tokens": str(self.tpm),
+                "x-ratelimit-remaining-requests": str(max(0, int(self.requests))),
+                "x-ratelimit-remaining-tokens": str(max(0, int(self.tokens))),
+                "x-ratelimit-reset-requests": f"{int(reset_requests * 1000)}ms",
+                "x-ratelimit-reset-tokens": f"{int(reset_tokens * 1000)}ms",
+            }
+            if not accepted:
+                headers["retry-after-ms"] = str(int(max(reset_requests, reset_tokens) * 1000) + 1)
+            return accepted, headers
+
+
+class MockConfig:
+    """Configuration du serveur (latences, erreurs, débit de génération, réponses prédéfinies)"""
+
+    def __init__(
+        self,
+        latency: Optional[Dict[str, str]] = None,
+        error_rate: Optional[Dict[str, float]] = None,
+        error_status: Tuple[int, ...] = (500, 429),
+        tokens_per_second: float = 0.0,
+        article_words: int = 1200,
+        canned_file: Optional[Path] = None,
+        seed: int = 42,
+        rate_limit: Optional[Dict[str, int]] = None,
+        unavailable_models: Tuple[str, ...] = (),
+        batch_seconds: float = 2.0,
+    ):
+        self.latency = {name: LatencySpec((latency or {}).get(name, "0")) for name in ENDPOINTS}
+        self.error_rate = {name: float((error_rate or {}).get(name, 0.0)) for name in ENDPOINTS}
+        self.error_status = error_status
+        self.tokens_per_second = tokens_per_second
+        self.article_words = article_words
+        self.canned = load_canned_responses(canned_file)
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self.seen_prefixes: set = set()
+        self.rate_limiter = MockRateLimiter(rate_limit["rpm"], rate_limit["tpm"]) if rate_limit else None
+        self.unavailable_models = set(unavailable_models)
+        self.batches = MockBatchStore(self, batch_seconds)
+
+    def cached_prefix_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        """Tokens du message système servis "depuis le cache" (préfixe identique déjà reçu)"""
+        if not messages or messages[0].get("role") != "system":
+            return 0
+        prefix = str(messages[0].get("content") or "")
+        tokens = estimate_tokens(prefix)
+        if tokens < CACHE_MIN_PREFIX_TOKENS:
+            return 0
+        digest = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        with self.stats_lock:
+            if digest not in self.seen_prefixes:
+                self.seen_prefixes.add(digest)
+                return 0
+        return tokens - tokens % CACHE_BLOCK_TOKENS
+
+    def sample_latency(self, endpoint: str) -> float:
+        with self.rng_lock:
+            return self.latency[endpoint].sample_ms(self.rng) / 1000
+
+    def should_fail(self, endpoint: str) -> Optional[int]:
+        rate = self.error_rate.get(endpoint, 0.0)
+        with self.rng_lock:
+            if rate > 0 and self.rng.random() < rate:
+                return self.rng.choice(self.error_status)
+        return None
+
+    def record(self, endpoint: str, status: int, duration: float, completion_tokens: int = 0, cached_tokens: int = 0):
+        with self.stats_lock:
+            stats = self.stats.setdefault(
+                endpoint, {"requests": 0, "errors": 0, "total_ms": 0.0, "completion_tokens": 0, "cached_tokens": 0}
+            )
+            stats["requests"] += 1
+            stats["errors"] += 1 if status >= 400 else 0
+            stats["total_ms"] += duration * 1000
+            stats["completion_tokens"] += completion_tokens
+            stats["cached_tokens"] += cached_tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.stats_lock:
+            return {name: dict(values) for name, values in self.stats.items()}
+
+    def reset(self):
+        with self.stats_lock:
+            self.stats = {}
+            self.seen_prefixes = set()
+
+
+class MockBatchStore:
+    """Fichiers et batchs de la Batch API, en mémoire ; réponses calculées à la création du batch"""
+
+    def __init__(self, config: "MockConfig", batch_seconds: float):
+        self.config = config
+        self.batch_seconds = batch_seconds
+        self.lock = threading.Lock()
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+
+    def add_file(self, data: bytes, filename: str, purpose: str) -> Dict[str, Any]:
+        file_id = f"file-mock-{uuid.uuid4().hex[:12]}"
+        entry = {"id": file_id, "object": "file", "bytes": len(data), "created_at": int(time.time()),
+                 "filename": filename, "purpose": purpose, "status": "processed"}
+        with self.lock:
+            self.files[file_id] = {**entry, "data": data}
+        return entry
+
+    def _answer(self, line: Dict[str, Any]) -> Dict[str, Any]:
+        body = line.get("body") or {}
+        model = body.get("model", "gpt-4o-mini")
+        result = {"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": line.get("custom_id"), "error": None}
+        if model in self.config.unavailable_models:
+            result["response"] = {"status_code": 503, "body": {"error": {"message": f"Model {model} unavailable (mock)"}}}
+            return result
+        messages = body.get("messages", [])
+        content = chat_completion_content(messages, body.get("response_format"), self.config.article_words)
+        prompt_tokens = sum(estimate_tokens(str(m.get("content") or "")) for m in messages)
+        result["response"] = {"status_code": 200, "request_id": uuid.uuid4().hex,
+                              "body": chat_completion_body(content, model, prompt_tokens)}
+        return result
+
+    def create_batch(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            source = self.files.get(payload.get("input_file_id"))
+        if source is None:
+            return None
+        lines = [json.loads(line) for line in source["data"].decode("utf-8").splitlines() if line.strip()]
+        results = [self._answer(line) for line in lines]
+        failed = sum(1 for r in results if r["response"]["status_code"] != 200)
+        output = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in results).encode("utf-8")
+        batch = {
+            "id": f"batch_mock_{uuid.uuid4().hex[:12]}",
+            "object": "batch",
+            "endpoint": payload.get("endpoint"),
+            "input_file_id": payload.get("input_file_id"),
+            "completion_window": payload.get("completion_window", "24h"),
+            "created_at": int(time.time()),
+            "metadata": payload.get("metadata") or {},
+            "request_counts": {"total": len(lines), "completed": len(lines) - failed, "failed": failed},
+            "_output": self.add_file(output, "batch_output.jsonl", "batch_output")["id"],
+            "_ready_at": time.time() + self.batch_seconds,
+        }
+        with self.lock:
+            self.batches[batch["id"]] = batch
+        return self.view(batch)
+
+    def view(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        """État public du batch : in_progress jusqu'à l'échéance, puis completed"""
+        data = {k: v for k, v in batch.items() if not k.startswith("_")}
+        if time.time() < batch["_ready_at"]:
+            data.update(status="in_progress", output_file_id=None,
+                        request_counts={**batch["request_counts"], "completed": 0, "failed": 0})
+        else:
+            data.update(status="completed", output_file_id=batch["_output"], completed_at=int(batch["_ready_at"]))
+        return data
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            batch = self.batches.get(batch_id)
+        return self.view(batch) if batch else None
+
+    def list_batches(self) -> Dict[str, Any]:
+        with self.lock:
+            batches = sorted(self.batches.values(), key=lambda b: b["created_at"], reverse=True)
+        data = [self.view(b) for b in batches]
+        return {"object": "list", "data": data, "has_more": False,
+                "first_id": data[0]["id"] if data else None, "last_id": data[-1]["id"] if data else None}
+
+    def file_content(self, file_id: str) -> Optional[bytes]:
+        with self.lock:
+            entry = self.files.get(file_id)
+        return entry["data"] if entry else None
+
+
+def parse_multipart_file(content_type: str, raw: bytes) -> Tuple[Optional[bytes], Dict[str, str]]:
+    """Contenu du champ "file" d'un corps multipart/form-data et valeurs des autres champs"""
+    boundary = content_type.partition("boundary=")[2].strip('"')
+    if not boundary:
+        return None, {}
+    data, fields = None, {}
+    for part in raw.split(b"--" + boundary.encode()):
+        head, sep, body = part.partition(b"\r\n\r\n")
+        if not sep:
+            continue
+        body = body[:-2] if body.endswith(b"\r\n") else body
+        disposition = head.decode("utf-8", "replace")
+        name = disposition.partition('name="')[2].partition('"')[0]
+        if name == "file":
+            data = body
+        elif name:
+            fields[name] = body.decode("utf-8", "replace")
+    return data, fields
+
+
+def _route(method: str, path: str) -> Optional[str]:
+    path = path.split("?", 1)[0]
+    if method == "POST" and path.endswith("/v1/chat/completions"):
+        return "openai"
+    if method == "POST" and path.endswith("/chat/completions"):
+        return "perplexity"
+    if method == "POST" and "/data/query/" in path:
+        return "sanity_query"
+    if method == "POST" and "/data/mutate/" in path:
+        return "sanity_mutate"
+    if method == "POST" and path.endswith("/api/revalidate"):
+        return "revalidate"
+    if method == "GET" and path.endswith("/blog"):
+        return "blog"
+    return None
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = "RoundedMock/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def config(self) -> MockConfig:
+        return self.server.config
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    def _send(self, status: int, body: Any, content_type: str = "application/json", headers: Optional[Dict[str, str]] = None):
+        data = body if isinstance(body, bytes) else (
+            body.encode("utf-8") if isinstance(body, str) else json.dumps(body, ensure_ascii=False).encode("utf-8")
+        )
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.startswith("/__stats"):
+            self._send(200, self.config.snapshot())
+            return
+        if "/v1/files" in self.path or "/v1/batches" in self.path:
+            self._handle_batch_api("GET")
+            return
+        self._handle("GET")
+
+    def do_POST(self):
+        if self.path.startswith("/__reset"):
+            self.config.reset()
+            self._send(200, {"ok": True})
+            return
+        if "/v1/files" in self.path or "/v1/batches" in self.path:
+            self._handle_batch_api("POST")
+            return
+        self._handle("POST")
+
+    def _handle_batch_api(self, method: str):
+        """Endpoints files / batches de la Batch API (sans latence ni erreurs simulées)"""
+        started = time.perf_counter()
+        store = self.config.batches
+        path = self.path.split("?", 1)[0].rstrip("/")
+        tail = path.split("/v1/", 1)[1].split("/")
+        status, body = 404, {"error": {"message": f"Route inconnue : {method} {self.path}"}}
+        if method == "POST" and tail == ["files"]:
+            length = int(self.headers.get("Content-Length") or 0)
+            data, fields = parse_multipart_file(self.headers.get("Content-Type", ""), self.rfile.read(length))
+            if data is not None:
+                status, body = 200, store.add_file(data, "batch_input.jsonl", fields.get("purpose", "batch"))
+        elif method == "GET" and len(tail) == 3 and tail[0] == "files" and tail[2] == "content":
+            content = store.file_content(tail[1])
+            if content is not None:
+                self._send(200, content, content_type="application/jsonl")
+                self.config.record("batch", 200, time.perf_counter() - started)
+                return
+        elif method == "POST" and tail == ["batches"]:
+            batch = store.create_batch(self._read_json())
+            status, body = (200, batch) if batch else (400, {"error": {"message": "input_file_id inconnu"}})
+        elif method == "GET" and tail == ["batches"]:
+            status, body = 200, store.list_batches()
+        elif method == "GET" and len(tail) == 2 and tail[0] == "batches":
+            batch = store.get_batch(tail[1])
+            if batch:
+                status, body = 200, batch
+        self._send(status, body)
+        self.config.record("batch", status, time.perf_counter() - started)
+
+    def _handle(self, method: str):
+        started = time.perf_counter()
+        endpoint = _route(method, self.path)
+        payload = self._read_json() if method == "POST" else {}
+        if endpoint is None:
+            self._send(404, {"error": {"message": f"Route inconnue : {method} {self.path}"}})
+            return
+
+        time.sleep(self.config.sample_latency(endpoint))
+
+        error_status = self.config.should_fail(endpoint)
+        if error_status:
+            headers = {"Retry-After": "1"} if error_status == 429 else {}
+            self._send(error_status, {"error": {"message": "Erreur simulée", "type": "mock_error"}}, headers=headers)
+            self.config.record(endpoint, error_status, time.perf_counter() - started)
+            return
+
+        completion_tokens = cached_tokens = 0
+        if endpoint == "openai":
+            if payload.get("model") in self.config.unavailable_models:
+                self._send(503, {"error": {"message": f"Model {payload.get('model')} unavailable (mock)",
+                                           "type": "server_error"}})
+                self.config.record(endpoint, 503, time.perf_counter() - started)
+                return
+            headers = {}
+            if self.config.rate_limiter:
+                reserved = sum(estimate_tokens(str(m.get("content") or "")) for m in payload.get("messages", []))
+                reserved += int(payload.get("max_tokens") or payload.get("max_completion_tokens") or 1024)
+                accepted, headers = self.config.rate_limiter.check(reserved)
+                if not accepted:
+                    self._send(429, {"error": {"message": "Rate limit reached (mock)", "type": "requests",
+                                               "code": "rate_limit_exceeded"}}, headers=headers)
+                    self.config.record(endpoint, 429, time.perf_counter() - started)
+                    return
+            completion_tokens, cached_tokens = self._chat_completion(payload, headers)
+        elif endpoint == "perplexity":
+            canned = find_canned(self.config.canned, endpoint, json.dumps(payload, ensure_ascii=False))
+            self._send(200, canned if canned is not None else perplexity_body(payload.get("messages", [])))
+        elif endpoint == "sanity_query":
+            canned = find_canned(self.config.canned, endpoint, payload.get("query", ""))
+            self._send(200, canned if canned is not None else sanity_query_body(payload.get("query", "")))
+        elif endpoint == "sanity_mutate":
+            canned = find_canned(self.config.canned, endpoint, json.dumps(payload, ensure_ascii=False))
+            self._send(200, canned if canned is not None else sanity_mutate_body(payload))
+        elif endpoint == "revalidate":
+            self._send(200, {"revalidated": True})
+        else:
+            canned = find_canned(self.config.canned, endpoint, self.path)
+            self._send(200, canned if canned is not None else blog_html(), content_type="text/html; charset=utf-8")
+
+        self.config.record(endpoint, 200, time.perf_counter() - started, completion_tokens, cached_tokens)
+
+    def _chat_completion(self, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Tuple[int, int]:
+        """Répond à un appel chat.completions (streamé ou non) ; retourne (tokens de complétion, tokens en cache)"""
+        messages = payload.get("messages", [])
+        model = payload.get("model", "gpt-4o-mini")
+        request_text = json.dumps(messages, ensure_ascii=False)
+
+        canned = find_canned(self.config.canned, "openai", request_text)
+        if canned is not None:
+            content = canned if isinstance(canned, str) else json.dumps(canned, ensure_ascii=False)
+        else:
+            content = chat_completion_content(messages, payload.get("response_format"), self.config.article_words)
+
+        finish_reason = "stop"
+        max_tokens = payload.get("max_tokens") or payload.get("max_completion_tokens")
+        if max_tokens and estimate_tokens(content) > max_tokens:
+            content = content[:max_tokens * 4]
+            finish_reason = "length"
+
+        prompt_tokens = sum(estimate_tokens(str(m.get("content") or "")) for m in messages)
+        cached_tokens = self.config.cached_prefix_tokens(messages)
+        completion_tokens = estimate_tokens(content)
+        tps = self.config.tokens_per_second
+
+        if not payload.get("stream"):
+            if tps > 0:
+                time.sleep(completion_tokens / tps)
+            self._send(200, chat_completion_body(content, model, prompt_tokens, finish_reason, cached_tokens), headers=headers)
+            return completion_tokens, cached_tokens
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.close_connection = True
+
+        completion_id = f"chatcmpl-mock-{int(time.time() * 1000)}"
+
+        def send_event(data: Any):
+            text = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False)
+            self.wfile.write(f"data: {text}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        send_event(chat_completion_chunk(completion_id, model, {"role": "assistant", "content": ""}))
+        # Deltas d'environ 4 tokens (16 caractères), cadencés au débit configuré
+        step = 16
+        for start in range(0, len(content), step):
+            piece = content[start:start + step]
+            if tps > 0:
+                time.sleep(estimate_tokens(piece) / tps)
+            send_event(chat_completion_chunk(completion_id, model, {"content": piece}))
+        send_event(chat_completion_chunk(completion_id, model, {}, finish_reason=finish_reason))
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                     "total_tokens": prompt_tokens + completion_tokens,
+                     "prompt_tokens_details": {"cached_tokens": cached_tokens}}
+            send_event(chat_completion_chunk(completion_id, model, {}, usage=usage))
+        send_event("[DONE]")
+        return completion_tokens, cached_tokens
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: MockConfig, verbose: bool = False):
+        super().__init__(address, MockHandler)
+        self.config = config
+        self.verbose = verbose
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def pipeline_env(self) -> Dict[str, str]:
+        """Variables d'environnement qui redirigent le pipeline vers ce serveur"""
+        base = self.base_url
+        return {
+            "OPENAI_API_KEY": "sk-mock",
+            "OPENAI_BASE_URL": f"{base}/v1",
+            "PERPLEXITY_API_KEY": "pplx-mock",
+            "PERPLEXITY_API_URL": f"{base}/chat/completions",
+            "SANITY_TOKEN": "sanity-mock",
+            "SANITY_API_URL": f"{base}/v2025-12-11",
+            "ROUNDED_BLOG_URL": f"{base}/blog",
+            "REVALIDATE_URL": f"{base}/api/revalidate",
+        }
+
+
+def start_mock_server(config: MockConfig, host: str = "127.0.0.1", port: int = 0, verbose: bool = False) -> MockServer:
+    """Démarre le serveur dans un thread (port 0 = port libre) et le retourne"""
+    server = MockServer((host, port), config, verbose=verbose)
+    threading.Thread(target=server.serve_forever, name="mock-server", daemon=True).start()
+    return server
+
+
+def parse_endpoint_values(items, cast=str) -> Dict[str, Any]:
+    """["openai=fixed:200", ...] → {"openai": "fixed:200"} ; "*" s'applique à tous les endpoints"""
+    values = {}
+    for item in items or []:
+        name, _, value = item.partition("=")
+        if name == "*":
+            values.update({endpoint: cast(value) for endpoint in ENDPOINTS})
+        elif name in ENDPOINTS:
+            values[name] = cast(value)
+        else:
+            raise ValueError(f"Endpoint inconnu : {name} (attendu : {', '.join(ENDPOINTS)})")
+    return values
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser):
+    """Options de configuration du serveur (partagées avec les scripts de benchmark)"""
+    parser.add_argument("--latency", action="append", metavar="ENDPOINT=SPEC",
+                        help="Latence avant réponse, ex: openai=lognormal:800:0.5, sanity_mutate=uniform:100:300, *=fixed:50")
+    parser.add_argument("--error-rate", action="append", metavar="ENDPOINT=P",
+                        help="Probabilité d'erreur (500 ou 429), ex: openai=0.05")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0,
+                        help="Débit de génération simulé pour OpenAI (0 = instantané)")
+    parser.add_argument("--rate-limit", metavar="rpm=N,tpm=N",
+                        help="Limites OpenAI simulées (en-têtes x-ratelimit-*, 429 au-delà), ex: rpm=60,tpm=40000")
+    parser.add_argument("--unavailable-models", default="", metavar="MODÈLE,...",
+                        help="Modèles OpenAI répondant 503 (test de la chaîne de repli), ex: gpt-4o")
+    parser.add_argument("--batch-seconds", type=float, default=2.0,
+                        help="Durée de traitement simulée d'un batch (Batch API)")
+    parser.add_argument("--article-words", type=int, default=1200, help="Longueur des articles générés (mots)")
+    parser.add_argument("--canned", type=Path, help="Fichier JSON de réponses prédéfinies")
+    parser.add_argument("--seed", type=int, default=42, help="Graine des tirages de latence et d'erreurs")
+
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(
+        latency=parse_endpoint_values(args.latency),
+        error_rate=parse_endpoint_values(args.error_rate, float),
+        tokens_per_second=args.tokens_per_second,
+        article_words=args.article_words,
+        canned_file=args.canned,
+        seed=args.seed,
+        rate_limit={key: int(value) for key, _, value in (item.partition("=") for item in args.rate_limit.split(","))}
+        if args.rate_limit else None,
+        unavailable_models=tuple(m.strip() for m in args.unavailable_models.split(",") if m.strip()),
+        batch_seconds=args.batch_seconds,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur mock OpenAI / Perplexity / Sanity pour benchmarks hors ligne")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--verbose", action="store_true", help="Journaliser chaque requête")
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockServer((args.host, args.port), config_from_args(args), verbose=args.verbose)
+    print(f"🧪 Serveur mock démarré sur {server.base_url}")
+    for key, value in server.pipeline_env().items():
+        print(f"   export {key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Arrêt du serveur mock")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Test de charge des écritures durables (utils/durable_io.py) depuis plusieurs process
+- counter : transactions update_json concurrentes (compteur + liste), aucune
+  mise à jour perdue ; des lecteurs relisent le fichier en boucle et ne doivent
+  jamais voir de JSON incomplet
+- tokens : track_openai_usage (token_tracker) depuis plusieurs process (historique
+  tronqué à 1000 entrées, agrégat journalier complet)
+- knowledge_base : ajouts concurrents d'articles (utils/knowledge_base.py)
+- kill : un écrivain tué (SIGKILL) en pleine boucle, le fichier reste lisible
+- naive : même charge en lecture / écriture directe (open "w"), pour comparaison
+  (mises à jour perdues attendues, non comptées comme échec)
+- locks : aucun fichier de verrou ne reste après les scénarios
+
+Tout se passe dans un dossier temporaire ; code de sortie 1 si un contrôle échoue.
+
+Usage : python scripts/bench/stress_durable_io.py [--processes 8] [--iterations 200] [--no-fsync]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+BASE_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+SCENARIOS = ("counter", "tokens", "knowledge_base", "kill", "naive")
+
+
+def _counter_writer(path: str, worker: int, iterations: int):
+    from utils.durable_io import update_json
+
+    for i in range(iterations):
+        with update_json(path) as data:
+            data["count"] = data.get("count", 0) + 1
+            data.setdefault("items", []).append(f"{worker}-{i}")
+
+
+def _naive_writer(path: str, worker: int, iterations: int):
+    for i in range(iterations):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data["count"] = data.get("count", 0) + 1
+        data.setdefault("items", []).append(f"{worker}-{i}")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+
+def _reader(path: str, stop, errors):
+    """Relit le fichier en boucle : toute lecture incomplète est comptée"""
+    while not stop.is_set():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                json.load(f)
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            with errors.get_lock():
+                errors.value += 1
+
+
+def _token_writer(path: str, worker: int, iterations: int):
+    import contextlib
+    import io
+    from utils import token_tracker
+
+    token_tracker.TOKEN_HISTORY_FILE = Path(path)
+    token_tracker.DAILY_COST_FILE = Path(path).parent / "token_daily_costs.json"
+    usage = {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150, "cached_tokens": 0}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(iterations):
+            token_tracker.track_openai_usage(f"stress_{worker}", "gpt-4o-mini", usage, topic=f"{worker}-{i}")
+
+
+def _knowledge_base_writer(path: str, worker: int, iterations: int):
+    from utils.knowledge_base import get_knowledge_base
+
+    kb = get_knowledge_base(Path(path))
+    for i in range(iterations):
+        kb.add(f"Article de charge {worker} numéro {i}", f"article-charge-{worker}-{i}")
+
+
+def run_processes(target, path: Path, processes: int, iterations: int, readers: int = 0) -> Dict[str, Any]:
+    ctx = multiprocessing.get_context("spawn")
+    stop = ctx.Event()
+    errors = ctx.Value("i", 0)
+    reader_procs = [ctx.Process(target=_reader, args=(str(path), stop, errors)) for _ in range(readers)]
+    writers = [ctx.Process(target=target, args=(str(path), w, iterations)) for w in range(processes)]
+    for proc in reader_procs + writers:
+        proc.start()
+    start = time.perf_counter()
+    for proc in writers:
+        proc.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for proc in reader_procs:
+        proc.join()
+    return {
+        "seconds": elapsed,
+        "read_errors": errors.value,
+        "exit_codes": [proc.exitcode for proc in writers],
+    }
+
+
+def leftover_temp_files(directory: Path) -> List[str]:
+    return sorted(p.name for p in directory.glob(".*.tmp"))
+
+
+def check(results: List[Dict[str, Any]], name: str, ok: bool, detail: str):
+    results.append({"name": name, "ok": ok})
+    print(f"{'✅' if ok else '❌'} {name:<16} {detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge multi-process de utils/durable_io.py")
+    parser.add_argument("--processes", type=int, default=8, help="Nombre de process écrivains")
+    parser.add_argument("--iterations", type=int, default=100, help="Écritures par process")
+    parser.add_argument("--readers", type=int, default=2, help="Process lecteurs (scénario counter)")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Scénario (répétable, défaut : tous)")
+    parser.add_argument("--no-fsync", action="store_true", help="DURABLE_IO_FSYNC=0 (atomicité et verrous conservés)")
+    args = parser.parse_args()
+    scenarios = args.scenario or list(SCENARIOS)
+    if args.no_fsync:
+        os.environ["DURABLE_IO_FSYNC"] = "0"
+
+    sandbox = Path(tempfile.mkdtemp(prefix="stress_durable_io_"))
+    # Fichiers de verrou dans le sandbox (lu à l'import par les process enfants)
+    locks_dir = sandbox / ".locks"
+    os.environ["DURABLE_IO_LOCKS_DIR"] = str(locks_dir)
+    expected = args.processes * args.iterations
+    results: List[Dict[str, Any]] = []
+    print(f"🧪 {args.processes} process × {args.iterations} écritures ({'sans' if args.no_fsync else 'avec'} fsync) | {sandbox}")
+
+    if "counter" in scenarios:
+        path = sandbox / "counter.json"
+        run = run_processes(_counter_writer, path, args.processes, args.iterations, args.readers)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        ok = (data["count"] == expected and len(set(data["items"])) == expected
+              and run["read_errors"] == 0 and not any(run["exit_codes"]))
+        check(results, "counter", ok,
+              f"{data['count']}/{expected} mises à jour, {run['read_errors']} lecture(s) incomplète(s), "
+              f"{expected / run['seconds']:.0f} transactions/s")
+
+    if "tokens" in scenarios:
+        path = sandbox / "token_history.json"
+        run = run_processes(_token_writer, path, args.processes, args.iterations)
+        history = json.loads(path.read_text(encoding="utf-8"))
+        daily = json.loads((sandbox / "token_daily_costs.json").read_text(encoding="utf-8"))
+        calls = sum(day["calls"] for day in daily.values())
+        ok = len(history) == min(expected, 1000) and calls == expected and not any(run["exit_codes"])
+        check(results, "tokens", ok,
+              f"{len(history)}/{min(expected, 1000)} entrées, {calls}/{expected} appels dans l'agrégat journalier, "
+              f"{run['seconds']:.2f} s")
+
+    if "knowledge_base" in scenarios:
+        path = sandbox / "articles_existants.json"
+        path.write_text("[]", encoding="utf-8")
+        run = run_processes(_knowledge_base_writer, path, args.processes, args.iterations)
+        articles = json.loads(path.read_text(encoding="utf-8"))
+        ok = len({a["slug"] for a in articles}) == expected and not any(run["exit_codes"])
+        check(results, "knowledge_base", ok, f"{len(articles)}/{expected} articles, {run['seconds']:.2f} s")
+
+    if "kill" in scenarios:
+        path = sandbox / "kill.json"
+        ctx = multiprocessing.get_context("spawn")
+        victim = ctx.Process(target=_counter_writer, args=(str(path), 0, 10 ** 6))
+        victim.start()
+        deadline = time.time() + 10
+        while not path.exists() and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.3)
+        os.kill(victim.pid, signal.SIGKILL)
+        victim.join()
+        try:
+            count = json.loads(path.read_text(encoding="utf-8"))["count"]
+            readable = True
+        except (OSError, ValueError, KeyError):
+            count, readable = 0, False
+        # Le verrou d'un process tué est libéré par le noyau : une nouvelle transaction passe
+        _counter_writer(str(path), 1, 1)
+        after = json.loads(path.read_text(encoding="utf-8"))["count"]
+        temps = leftover_temp_files(sandbox)
+        check(results, "kill", readable and after == count + 1,
+              f"fichier lisible après SIGKILL ({count} mises à jour), verrou libéré, "
+              f"{len(temps)} temporaire(s) abandonné(s)")
+
+    if "naive" in scenarios:
+        path = sandbox / "naive.json"
+        run = run_processes(_naive_writer, path, args.processes, args.iterations, args.readers)
+        try:
+            count = json.loads(path.read_text(encoding="utf-8")).get("count", 0)
+        except ValueError:
+            count = 0
+        print(f"ℹ️  naive            {count}/{expected} mises à jour conservées, "
+              f"{run['read_errors']} lecture(s) incomplète(s) (écriture directe, pour comparaison)")
+
+    # Un verrou n'existe que tant qu'il est tenu : rien ne doit rester une fois les écrivains terminés
+    leftover_locks = sorted(p.name for p in locks_dir.glob("*.lock")) if locks_dir.exists() else []
+    check(results, "locks", not leftover_locks, f"{len(leftover_locks)} fichier(s) de verrou restant(s)")
+
+    failed = [r["name"] for r in results if not r["ok"]]
+    if failed:
+        print(f"\n❌ Échec : {', '.join(failed)}")
+        sys.exit(1)
+    print("\n✅ Aucune mise à jour perdue ni fichier corrompu")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,8 +15,11 @@ import uuid
 import random
 import string
 import re
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Iterator, Union
 from dotenv import load_dotenv
 from pathlib import Path
 import sys
@@ -24,9 +27,22 @@ import os
 
 # Ajouter le chemin parent pour les imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.sanity_utils import html_to_sanity_blocks
-
+# Avant les imports utils : leurs réglages (LLM_PROVIDER, OPENAI_RPM_LIMIT...) sont lus à l'import
 load_dotenv()
+from utils.sanity_utils import html_to_sanity_blocks
+from utils.review_metadata import assemble_review_file, build_review_metadata, html_body_note, write_review_metadata
+from utils.knowledge_base import get_knowledge_base
+from utils.durable_io import atomic_write_bytes
+from utils.blob_store import put_blob
+from utils.tracing import traced, trace_run, requests_hooks, annotate_span
+from utils.markdown_renderer import markdown_to_html
+from utils.article_sections import join_sections, outline as sections_outline, plan_section_edits, split_sections
+from utils.speculative import cancel_drafts, claim_draft, start_drafts
+from utils.llm_providers import is_available as provider_available, qualified_model, resolve as resolve_model, response_from_dict
+from utils.batch_api import active_session as active_batch_session
+from utils.model_router import route as route_models
+from utils.prompt_budget import Section, build_prompt
+from utils.token_tracker import usage_to_dict
 
 def convert_text_to_sanity_blocks(text: str) -> list:
     """
@@ -199,10 +215,11 @@ PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
 SANITY_PROJECT_ID = os.getenv("SANITY_PROJECT_ID", "8y6orojx")
 SANITY_DATASET = os.getenv("SANITY_DATASET", "development")
 SANITY_TOKEN = os.getenv("SANITY_TOKEN")
-SANITY_API_URL = f"https://{SANITY_PROJECT_ID}.api.sanity.io/v2025-12-11"
+SANITY_API_URL = os.getenv("SANITY_API_URL", f"https://{SANITY_PROJECT_ID}.api.sanity.io/v2025-12-11")
+PERPLEXITY_API_URL = os.getenv("PERPLEXITY_API_URL", "https://api.perplexity.ai/chat/completions")
 
 # URLs
-ROUNDED_BLOG_URL = "https://callrounded.com/blog"
+ROUNDED_BLOG_URL = os.getenv("ROUNDED_BLOG_URL", "https://callrounded.com/blog")
 ROUNDED_DONNA_URL = "https://callrounded.com/cas-usage/secretariat-medical"
 
 # Dossier pour sauvegarder les articles (relatif à la racine du projet)
@@ -210,20 +227,26 @@ BASE_DIR = Path(__file__).parent.parent
 ARTICLES_DIR = BASE_DIR / "articles"
 ARTICLES_DIR.mkdir(exist_ok=True)
 
-# Initialiser OpenAI
-openai_client = None
-if OPENAI_API_KEY:
-    try:
-        from openai import OpenAI
-        openai_client = OpenAI(api_key=OPENAI_API_KEY)
-    except:
-        pass
+# Fournisseurs LLM (OpenAI, serveur local compatible, stub en process) : client créé au
+# premier appel, fournisseur choisi par étape via la table de routage (utils.model_router)
+
+# Erreurs pour lesquelles le modèle suivant de la chaîne de routage est essayé
+# (timeout, réseau, 429 persistant, panne ou modèle indisponible)
+try:
+    import openai as _openai
+    MODEL_FALLBACK_ERRORS = (
+        _openai.APITimeoutError, _openai.APIConnectionError, _openai.RateLimitError,
+        _openai.InternalServerError, _openai.NotFoundError, _openai.PermissionDeniedError,
+    )
+except ImportError:
+    MODEL_FALLBACK_ERRORS = ()
 
 
 def generate_key():
     return ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
 
 
+@traced()
 def get_existing_blog_topics() -> List[str]:
     """Récupère les sujets existants depuis la base de connaissances locale et le site web"""
     print("🔍 Vérification des sujets existants sur le blog Rounded...")
@@ -231,15 +254,9 @@ def get_existing_blog_topics() -> List[str]:
     titles = []
     
     # 1. Charger depuis le fichier JSON local (base de connaissances)
-    try:
-        json_path = BASE_DIR / "data" / "articles_existants.json"
-        if json_path.exists():
-            with open(json_path, 'r', encoding='utf-8') as f:
-                articles = json.load(f)
-                titles.extend([article["titre"] for article in articles])
-            print(f"✅ {len(titles)} articles chargés depuis la base de connaissances locale")
-    except Exception as e:
-        print(f"⚠️  Erreur chargement base locale: {e}")
+    titles.extend(get_knowledge_base().titles())
+    if titles:
+        print(f"✅ {len(titles)} articles chargés depuis la base de connaissances locale")
     
     # 2. Compléter avec le scraping du site web (optionnel)
     try:
@@ -248,7 +265,7 @@ def get_existing_blog_topics() -> List[str]:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
         
-        response = requests.get(url, headers=headers, timeout=30)
+        response = requests.get(url, headers=headers, timeout=30, hooks=requests_hooks())
         response.raise_for_status()
         
         html = response.text
@@ -319,6 +336,7 @@ def search_web(query: str) -> str:
     result = search_web_with_sources(query)
     return result.get("content", "") if isinstance(result, dict) else result
 
+@traced()
 def search_web_with_sources(query: str) -> dict:
     """Recherche web via Perplexity avec extraction des sources"""
     if not PERPLEXITY_API_KEY:
@@ -341,10 +359,11 @@ def search_web_with_sources(query: str) -> dict:
     
     try:
         response = requests.post(
-            "https://api.perplexity.ai/chat/completions",
+            PERPLEXITY_API_URL,
             headers=headers,
             json=payload,
-            timeout=60
+            timeout=60,
+            hooks=requests_hooks(),
         )
         response.raise_for_status()
         data = response.json()
@@ -453,20 +472,43 @@ def search_web_with_sources(query: str) -> dict:
         return {"content": "", "sources": []}
 
 
+# Secteurs cibles reconnus dans un sujet (premier secteur dont un mot apparaît) : libellé
+# des prompts de variantes et clé de l'historique des scores
+SECTORS = {
+    "syndic": {
+        "words": ["syndic", "copropriété", "gestionnaire immobilier", "immobilier"],
+        "hint": "syndics immobiliers / gestionnaires de copropriétés",
+    },
+    "medical": {
+        "words": ["médical", "médecin", "cabinet médical", "secrétaire médicale"],
+        "hint": "cabinets médicaux / secrétariat médical",
+    },
+    "agence_immobiliere": {
+        "words": ["agence immobilière", "immobilier"],
+        "hint": "agences immobilières",
+    },
+    "general": {
+        "words": [],
+        "hint": "entreprises / professionnels cherchant à automatiser leur accueil téléphonique",
+    },
+}
+
+
+def detect_sector(topic: str) -> str:
+    """Clé de SECTORS correspondant au sujet ("general" par défaut)"""
+    topic_lower = (topic or "").lower()
+    for sector, config in SECTORS.items():
+        if any(word in topic_lower for word in config["words"]):
+            return sector
+    return "general"
+
+
 def load_existing_articles() -> List[Dict[str, Any]]:
     """Charge tous les articles existants depuis data/articles_existants.json"""
-    json_path = BASE_DIR / "data" / "articles_existants.json"
-    try:
-        if not json_path.exists():
-            return []
-        with open(json_path, "r", encoding="utf-8") as f:
-            articles = json.load(f)
-        return articles if isinstance(articles, list) else []
-    except Exception as e:
-        print(f"⚠️  Erreur chargement articles existants: {e}")
-        return []
+    return get_knowledge_base().articles()
 
 
+@traced()
 def generate_topic_variants(
     topic: str,
     existing_articles: List[Dict[str, Any]],
@@ -478,8 +520,8 @@ def generate_topic_variants(
     - angle éditorial
     - mini-plan (3–5 points)
     """
-    if not openai_client:
-        raise ValueError("OPENAI_API_KEY non configurée dans .env")
+    if not llm_available("generate_variants"):
+        raise ValueError("Aucun fournisseur LLM configuré (OPENAI_API_KEY dans .env, ou LLM_PROVIDER=local / stub)")
 
     print("\n🧠 Génération de 3 variantes de sujets (titre + mini-plan)...")
 
@@ -507,34 +549,29 @@ Chaque élément doit avoir :
 """
 
     # Détecter le secteur cible depuis le sujet
-    sector_hint = ""
-    topic_lower = topic.lower()
-    if any(word in topic_lower for word in ["syndic", "copropriété", "gestionnaire immobilier", "immobilier"]):
-        sector_hint = "syndics immobiliers / gestionnaires de copropriétés"
-    elif any(word in topic_lower for word in ["médical", "médecin", "cabinet médical", "secrétaire médicale"]):
-        sector_hint = "cabinets médicaux / secrétariat médical"
-    elif any(word in topic_lower for word in ["agence immobilière", "immobilier"]):
-        sector_hint = "agences immobilières"
-    else:
-        sector_hint = "entreprises / professionnels cherchant à automatiser leur accueil téléphonique"
-    
-    user_prompt = {
-        "topic_seed": topic,
-        "existing_titles": existing_titles_snippet,
-        "target_keywords": keywords_snippet,
-        "instructions": f"Propose 3 idées d'articles différentes mais cohérentes avec le sujet de départ '{topic}', en évitant les doublons avec les titres existants. L'article doit être adapté au secteur : {sector_hint}. Concentre-toi STRICTEMENT sur le secteur mentionné dans le sujet de départ, ne dévie pas vers d'autres secteurs."
-    }
+    sector_hint = SECTORS[detect_sector(topic)]["hint"]
+    
+    def render(sections: Dict[str, str]) -> List[Dict[str, str]]:
+        user_prompt = {
+            "topic_seed": topic,
+            "existing_titles": sections["existing_titles"],
+            "target_keywords": keywords_snippet,
+            "instructions": f"Propose 3 idées d'articles différentes mais cohérentes avec le sujet de départ '{topic}', en évitant les doublons avec les titres existants. L'article doit être adapté au secteur : {sector_hint}. Concentre-toi STRICTEMENT sur le secteur mentionné dans le sujet de départ, ne dévie pas vers d'autres secteurs."
+        }
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": json.dumps(user_prompt, ensure_ascii=False)},
+        ]
+
+    plan = build_prompt("generate_variants", render, [Section("existing_titles", existing_titles_snippet, priority=1)])
 
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": json.dumps(user_prompt, ensure_ascii=False)},
-            ],
+        response, route = _create_completion(
+            "generate_variants",
+            messages=plan.messages,
             response_format={"type": "json_object"},
             temperature=0.8,
-            max_tokens=1200,
+            max_tokens=plan.max_tokens,
         )
         
         # Tracker les tokens
@@ -543,12 +580,9 @@ Chaque élément doit avoir :
                 from utils.token_tracker import track_openai_usage
                 track_openai_usage(
                     operation="generate_variants",
-                    model="gpt-4o-mini",
-                    usage={
-                        "prompt_tokens": response.usage.prompt_tokens,
-                        "completion_tokens": response.usage.completion_tokens,
-                        "total_tokens": response.usage.total_tokens
-                    },
+                    model=route["model"],
+                    latency_seconds=route["latency_seconds"],
+                    usage=usage_to_dict(response.usage),
                     topic=topic
                 )
             except Exception as e:
@@ -583,31 +617,174 @@ Chaque élément doit avoir :
         raise
 
 
-def generate_article(
-    variant: Dict[str, Any],
-    web_results: str = "",
-    target_keywords: Optional[List[str]] = None,
-) -> str:
-    """Génère l'article complet à partir d'une variante (titre + angle + mini-plan)."""
-    if not openai_client:
-        raise ValueError("OPENAI_API_KEY non configurée dans .env")
+def llm_available(operation: str) -> bool:
+    """True si un modèle de la chaîne de l'étape a un fournisseur utilisable"""
+    return any(provider_available(spec) for spec in route_models(operation)["models"])
 
-    title = variant.get("title", "").strip()
-    angle = variant.get("angle", "").strip()
-    outline = variant.get("outline", []) or []
 
-    print(f"📝 Génération de l'article complet pour la variante choisie : {title}")
+def _routed_models(operation: str) -> Tuple[Dict[str, Any], List[str]]:
+    """Routage de l'étape et modèles dont le fournisseur est configuré"""
+    routing = route_models(operation)
+    return routing, [spec for spec in routing["models"] if provider_available(spec)] or routing["models"]
 
-    current_date = datetime.now()
-    year = current_date.year
-    readable_date = current_date.strftime("%d/%m/%Y")
 
-    keywords_snippet = ", ".join(target_keywords or []) if target_keywords else ""
+def _routed_client(spec: str, routing: Dict[str, Any], last: bool):
+    """
+    Client du fournisseur du modèle avec le timeout de l'étape (sans nouvelle
+    tentative du SDK si un modèle de repli suit) et nom du modèle à envoyer.
+    """
+    provider, model = resolve_model(spec)
+    return provider.client(timeout=routing["timeout_seconds"], max_retries=None if last else 0), model
+
+
+def _create_completion(operation: str, **kwargs) -> Tuple[Any, Dict[str, Any]]:
+    """
+    chat.completions.create avec le modèle routé pour l'étape (utils.model_router) :
+    en cas d'erreur ou de timeout, le modèle suivant de la chaîne est essayé.
+
+    Returns:
+        (réponse, {"model": modèle utilisé, "latency_seconds": durée de l'appel}),
+        le second élément étant à passer à track_openai_usage
+    """
+    routing, models = _routed_models(operation)
+    batch = active_batch_session()
+    if batch is not None:
+        # Mode batch (scripts/batch_jobs.py) : réponse du batch rejouée, ou requête collectée (BatchDeferred)
+        model = resolve_model(models[0])[1]
+        response = response_from_dict(batch.intercept(operation, model, kwargs))
+        return response, {"model": f"batch:{model}", "latency_seconds": None}
+    for index, spec in enumerate(models):
+        last = index == len(models) - 1
+        started = time.perf_counter()
+        try:
+            client, model = _routed_client(spec, routing, last)
+            response = client.chat.completions.create(model=model, **kwargs)
+        except MODEL_FALLBACK_ERRORS as e:
+            if last:
+                raise
+            print(f"⚠️  {operation} : échec avec {spec} ({e}), repli sur {models[index + 1]}")
+            continue
+        annotate_span(model=qualified_model(spec), model_fallbacks=index or None)
+        return response, {"model": qualified_model(spec), "latency_seconds": time.perf_counter() - started}
+
+
+def _stream_completion(
+    operation: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    fallback: Optional[str] = None,
+    model: Optional[str] = None,
+    **track_kwargs,
+) -> Iterator[Union[str, Dict[str, Any]]]:
+    """
+    Appel OpenAI en streaming : yield chaque delta de texte (str), puis un
+    enregistrement final (dict) :
+        {"type": "final", "content": str, "usage": {...} | None, "ttft_seconds": float | None}
+
+    L'usage exact est demandé via stream_options.include_usage et tracké comme
+    pour les appels non streamés. Si fallback est fourni, une erreur (ou une
+    réponse vide) ne lève pas d'exception : le contenu final vaut fallback,
+    même si des deltas ont déjà été transmis (jamais de réponse tronquée).
+    Sans model explicite, le modèle est routé pour l'étape ; le repli sur le
+    modèle suivant n'est possible qu'avant le premier delta.
+    """
+    routing, models = _routed_models(operation)
+    models = [model] if model else models
+    started = time.perf_counter()
+    ttft = None
+    parts = []
+    usage = None
+    stream = None
+    completed = False
+    try:
+        for index, spec in enumerate(models):
+            last = index == len(models) - 1
+            started = time.perf_counter()
+            model = qualified_model(spec)
+            try:
+                client, served_model = _routed_client(spec, routing, last)
+                stream = client.chat.completions.create(
+                    model=served_model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+                for chunk in stream:
+                    if chunk.choices:
+                        delta = chunk.choices[0].delta.content
+                        if delta:
+                            if ttft is None:
+                                ttft = time.perf_counter() - started
+                            parts.append(delta)
+                            yield delta
+                    # Le dernier chunk (sans choices) porte l'usage de toute la réponse
+                    if getattr(chunk, "usage", None):
+                        usage = usage_to_dict(chunk.usage)
+                annotate_span(model=model, model_fallbacks=index or None)
+                completed = True
+                break
+            except MODEL_FALLBACK_ERRORS as e:
+                # Deltas déjà transmis : impossible de changer de modèle en cours de réponse
+                if parts or last:
+                    raise
+                print(f"⚠️  {operation} (stream) : échec avec {spec} ({e}), repli sur {models[index + 1]}")
+                if stream is not None and hasattr(stream, "close"):
+                    stream.close()
+                stream = None
+    except Exception as e:
+        if fallback is None:
+            print(f"❌ Erreur {operation} (stream): {e}")
+            raise
+        print(f"⚠️  Erreur {operation} (stream): {e}")
+    finally:
+        # Flux abandonné par le consommateur (brouillon spéculatif annulé) : connexion HTTP fermée
+        if stream is not None and hasattr(stream, "close"):
+            stream.close()
+
+    if usage:
+        try:
+            from utils.token_tracker import track_openai_usage
+            track_openai_usage(
+                operation=operation, model=model, usage=usage,
+                latency_seconds=time.perf_counter() - started, **track_kwargs,
+            )
+        except Exception as e:
+            print(f"⚠️  Erreur tracking tokens ({operation}): {e}")
+
+    content = "".join(parts)
+    if ttft is not None:
+        print(f"⚡ {operation} : premier token après {ttft:.1f}s, réponse complète en {time.perf_counter() - started:.1f}s")
+    if fallback is not None and (not completed or not content):
+        # Flux interrompu : les deltas reçus ne forment qu'une partie de la réponse
+        if content:
+            print(f"⚠️  {operation} (stream) : réponse interrompue après {len(content)} caractères, contenu d'origine conservé")
+        content = fallback
+    yield {
+        "type": "final",
+        "content": content,
+        "usage": usage,
+        "ttft_seconds": round(ttft, 3) if ttft is not None else None,
+    }
+
+
+def collect_stream(stream: Iterator[Union[str, Dict[str, Any]]], on_delta=None) -> str:
+    """Consomme un flux de _stream_completion et retourne le contenu final (on_delta reçoit chaque delta)"""
+    content = ""
+    for item in stream:
+        if isinstance(item, str):
+            if on_delta:
+                on_delta(item)
+        else:
+            content = item.get("content", "")
+    return content
 
-    # Style basé sur les exemples fournis
-    system_prompt = f"""Tu es un rédacteur professionnel spécialisé dans les agents vocaux IA, le secrétariat médical, et les technologies de téléphonie automatisée pour les cabinets médicaux.
 
-DATE ACTUELLE: {readable_date} ({year})
+# Prompts système statiques (jamais interpolés) : préfixe identique d'un appel à l'autre,
+# réutilisé par le cache de prompt du fournisseur. Le contenu variable va en fin de message.
+ARTICLE_SYSTEM_PROMPT = """Tu es un rédacteur professionnel spécialisé dans les agents vocaux IA, le secrétariat médical, et les technologies de téléphonie automatisée pour les cabinets médicaux.
 
 STYLE ET TON:
 - Professionnel mais accessible, humain
@@ -644,20 +821,7 @@ CONTEXTE:
 Tu écris pour des professionnels de santé (secrétaires médicales, médecins, responsables de cabinets) qui cherchent des solutions pratiques pour améliorer leur organisation.
 
 SEO:
-- Intègre naturellement les mots-clés suivants quand c'est pertinent (sans sur-optimisation) : {keywords_snippet}."""
-
-    plan_str = "\n".join(f"- {p}" for p in outline) if outline else ""
-
-    user_prompt = f"""Titre de l'article: {title}
-
-Angle éditorial à adopter:
-{angle}
-
-Plan (structure principale à respecter, tu peux détailler mais pas changer l'intention des points) :
-{plan_str}
-
-Données de recherche web récentes (utiliser comme source d'informations, sans copier/coller brut) :
-{web_results[:3000] if web_results else "Aucune donnée spécifique fournie. Utilise tes connaissances actuelles."}
+- Intègre naturellement les mots-clés SEO indiqués dans le message utilisateur quand c'est pertinent (sans sur-optimisation)
 
 IMPORTANT:
 - Écris un article complet de minimum 1200 mots
@@ -672,17 +836,76 @@ IMPORTANT:
 - Si et SEULEMENT SI pertinent (IA vocale + secrétariat médical), termine par un appel à découvrir Donna avec le lien https://callrounded.com/cas-usage/secretariat-medical
 - Si le sujet n'est PAS en rapport avec l'IA vocale pour secrétariat médical, NE PAS ajouter de lien vers Donna dans la conclusion
 
-Génère l'article maintenant."""
+Le message utilisateur fournit la date, le titre, l'angle, le plan puis les données de recherche web (en dernier). Génère l'article complet."""
+
+
+@traced()
+def generate_article(
+    variant: Dict[str, Any],
+    web_results: str = "",
+    target_keywords: Optional[List[str]] = None,
+    stream: bool = False,
+) -> Union[str, Iterator[Union[str, Dict[str, Any]]]]:
+    """
+    Génère l'article complet à partir d'une variante (titre + angle + mini-plan).
+
+    Avec stream=True, retourne un générateur de deltas suivi d'un
+    enregistrement final (voir _stream_completion).
+    """
+    if not llm_available("generate_article"):
+        raise ValueError("Aucun fournisseur LLM configuré (OPENAI_API_KEY dans .env, ou LLM_PROVIDER=local / stub)")
+
+    title = variant.get("title", "").strip()
+    angle = variant.get("angle", "").strip()
+    outline = variant.get("outline", []) or []
+
+    print(f"📝 Génération de l'article complet pour la variante choisie : {title}")
+
+    current_date = datetime.now()
+    year = current_date.year
+    readable_date = current_date.strftime("%d/%m/%Y")
+
+    keywords_snippet = ", ".join(target_keywords or []) if target_keywords else ""
+    keywords_line = f"\nMots-clés SEO à intégrer naturellement (sans sur-optimisation) : {keywords_snippet}" if keywords_snippet else ""
+
+    plan_str = "\n".join(f"- {p}" for p in outline) if outline else ""
+
+    def render(sections: Dict[str, str]) -> List[Dict[str, str]]:
+        user_prompt = f"""DATE ACTUELLE: {readable_date} ({year}){keywords_line}
+
+Titre de l'article: {title}
+
+Angle éditorial à adopter:
+{angle}
+
+Plan (structure principale à respecter, tu peux détailler mais pas changer l'intention des points) :
+{plan_str}
+
+Données de recherche web récentes (utiliser comme source d'informations, sans copier/coller brut) :
+{sections["web_results"] if web_results else "Aucune donnée spécifique fournie. Utilise tes connaissances actuelles."}"""
+        return [
+            {"role": "system", "content": ARTICLE_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    # La recherche web est la seule partie tronquable (plafonnée à ~1 500 tokens)
+    plan = build_prompt(
+        "generate_article", render,
+        [Section("web_results", web_results, priority=1, min_tokens=300, max_tokens=1500)],
+    )
+
+    if stream:
+        return _stream_completion(
+            "generate_article", plan.messages, temperature=0.8, max_tokens=plan.max_tokens,
+            article_title=variant.get("title", ""),
+        )
 
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+        response, route = _create_completion(
+            "generate_article",
+            messages=plan.messages,
             temperature=0.8,
-            max_tokens=4000,
+            max_tokens=plan.max_tokens,
         )
         
         # Tracker les tokens
@@ -692,12 +915,9 @@ Génère l'article maintenant."""
                 variant_title = variant.get("title", "")
                 track_openai_usage(
                     operation="generate_article",
-                    model="gpt-4o-mini",
-                    usage={
-                        "prompt_tokens": response.usage.prompt_tokens,
-                        "completion_tokens": response.usage.completion_tokens,
-                        "total_tokens": response.usage.total_tokens
-                    },
+                    model=route["model"],
+                    latency_seconds=route["latency_seconds"],
+                    usage=usage_to_dict(response.usage),
                     article_title=variant_title
                 )
             except Exception as e:
@@ -711,19 +931,270 @@ Génère l'article maintenant."""
         raise
 
 
-def apply_style_refinement(article: str) -> str:
+# Modes de rédaction : "sequential" (un seul appel) ou "sections" (intro + une section
+# par point du plan rédigées en parallèle, puis transitions + conclusion en un appel court)
+GENERATION_MODES = ("sequential", "sections")
+GENERATION_MODE = os.getenv("ARTICLE_GENERATION_MODE", "sequential")
+
+SECTION_SYSTEM_PROMPT = """Tu es un rédacteur professionnel spécialisé dans les agents vocaux IA, le secrétariat médical, et les technologies de téléphonie automatisée pour les cabinets médicaux.
+
+Tu rédiges UNE partie d'un article écrit en parallèle par plusieurs rédacteurs : chaque partie du plan
+est confiée à un rédacteur différent, puis les parties sont assemblées dans l'ordre du plan.
+
+STYLE ET TON:
+- Professionnel mais accessible, humain
+- Utilise des exemples concrets et des situations réelles
+- Ton rassurant et pratique pour les professionnels de santé
+- INTERDICTION ABSOLUE : Ne jamais mentionner de concurrents ou d'autres entreprises (CareCall, Plateya, Talan, airagent.ai, etc.). Utilise des formulations génériques comme "des études récentes", "certaines solutions IA", etc.
+- Ne mentionne PAS Donna : la mention éventuelle est réservée à la conclusion
+
+RÈGLES D'ASSEMBLAGE:
+- Ne rédige QUE la partie demandée : pas de conclusion, pas de résumé de l'article
+- Ne reprends pas le contenu des autres parties (le plan complet est fourni pour éviter les redites)
+- INTRODUCTION : commence par "# " suivi du titre de l'article, puis 2-3 paragraphes de contexte, sans sous-titre
+- SECTION : commence par "## " suivi du numéro et d'un titre court et percutant (ex: "## 2. Titre"),
+  puis des paragraphes courts, des **gras** pour les points importants, des listes à puces quand pertinent,
+  des sous-titres ### sans numéro si utile
+
+CONTEXTE:
+Tu écris pour des professionnels de santé (secrétaires médicales, médecins, responsables de cabinets) qui cherchent des solutions pratiques pour améliorer leur organisation.
+
+Le message utilisateur fournit le contexte commun de l'article (date, mots-clés, titre, angle, plan, recherche web)
+puis, en dernier, la partie à rédiger et sa longueur cible. Réponds uniquement avec le Markdown de cette partie."""
+
+MERGE_SYSTEM_PROMPT = """Tu es le rédacteur en chef d'un article écrit en parallèle par plusieurs rédacteurs (une section chacun).
+
+Ta mission : assurer la cohérence de l'ensemble SANS réécrire les sections.
+1. "transitions" : pour chaque passage d'une section à la suivante, UNE phrase de transition naturelle
+   (placée à la fin de la section précédente), dans l'ordre. Autant de transitions que de passages indiqués.
+2. "conclusion" : la conclusion de l'article en Markdown, commençant par "## Conclusion" :
+   - résume les points clés en 1-2 paragraphes
+   - Mentionne Donna (l'assistante vocale médicale de Rounded) UNIQUEMENT si l'article traite spécifiquement de l'IA vocale dans le secrétariat médical,
+     et termine alors par : Découvrir Donna : https://callrounded.com/cas-usage/secretariat-medical
+   - Si le sujet n'est PAS en rapport avec l'IA vocale pour secrétariat médical, NE PAS mentionner Donna ni ajouter de lien
+   - INTERDICTION ABSOLUE : Ne jamais citer de concurrents ou d'autres entreprises
+
+FORMAT JSON STRICT :
+{"transitions": ["phrase 1", "phrase 2", ...], "conclusion": "## Conclusion\n\n..."}
+
+Ne renvoie QUE le JSON, sans texte autour."""
+
+
+@traced("generate_section")
+def _generate_section(context: str, part: str, target_words: int, article_title: str) -> str:
+    """Rédige une partie de l'article (introduction ou section du plan) ; le contexte commun est en tête"""
+    def render(sections: Dict[str, str]) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": SECTION_SYSTEM_PROMPT},
+            {"role": "user", "content": f"{sections['context']}\n\nPARTIE À RÉDIGER : {part}\nLongueur cible : environ {target_words} mots."},
+        ]
+
+    # Contexte commun identique pour toutes les parties (préfixe réutilisable par le cache de prompt)
+    plan = build_prompt("generate_section", render, [Section("context", context, priority=1, min_tokens=600)])
+    response, route = _create_completion(
+        "generate_section",
+        messages=plan.messages,
+        temperature=0.8,
+        max_tokens=plan.max_tokens,
+    )
+    if hasattr(response, 'usage') and response.usage:
+        try:
+            from utils.token_tracker import track_openai_usage
+            track_openai_usage(
+                operation="generate_section",
+                model=route["model"],
+                latency_seconds=route["latency_seconds"],
+                usage=usage_to_dict(response.usage),
+                article_title=article_title
+            )
+        except Exception as e:
+            print(f"⚠️  Erreur tracking tokens: {e}")
+    return (response.choices[0].message.content or "").strip()
+
+
+@traced("merge_sections")
+def _merge_sections(parts: List[str], article_title: str) -> Tuple[List[str], str]:
     """
-    Applique un raffinement de style à l'article généré.
+    Passe de cohérence courte : une transition par passage entre sections
+    (parts[0] est l'introduction) + la conclusion.
+    """
+    draft = "\n\n".join(parts)
+    boundaries = max(0, len(parts) - 2)
 
-    Objectif :
-    - Donner du "grain" au texte
-    - Rendre la lecture plus rythmée et concrète
+    def render(sections: Dict[str, str]) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": MERGE_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Sections après l'introduction : {len(parts) - 1}\nPassages entre sections (transitions attendues) : {boundaries}\n\nARTICLE ASSEMBLÉ :\n---\n{sections['draft']}\n---"},
+        ]
+
+    plan = build_prompt("merge_sections", render, [Section("draft", draft, priority=1, min_tokens=2000)])
+    try:
+        response, route = _create_completion(
+            "merge_sections",
+            messages=plan.messages,
+            response_format={"type": "json_object"},
+            temperature=0.5,
+            max_tokens=plan.max_tokens,
+        )
+        if hasattr(response, 'usage') and response.usage:
+            try:
+                from utils.token_tracker import track_openai_usage
+                track_openai_usage(
+                    operation="merge_sections",
+                    model=route["model"],
+                    latency_seconds=route["latency_seconds"],
+                    usage=usage_to_dict(response.usage),
+                    article_title=article_title
+                )
+            except Exception as e:
+                print(f"⚠️  Erreur tracking tokens: {e}")
+        data = json.loads(response.choices[0].message.content)
+        transitions = [str(t).strip() for t in data.get("transitions") or []][:boundaries]
+        return transitions + [""] * (boundaries - len(transitions)), str(data.get("conclusion") or "").strip()
+    except Exception as e:
+        print(f"⚠️  Erreur passe de cohérence ({e}) : sections assemblées sans transitions ni conclusion générée")
+        return [""] * boundaries, ""
+
+
+@traced()
+def generate_article_by_sections(
+    variant: Dict[str, Any],
+    web_results: str = "",
+    target_keywords: Optional[List[str]] = None,
+    on_part=None,
+) -> str:
     """
-    if not openai_client:
-        # Si pas de client OpenAI, on renvoie l'article tel quel
-        return article
+    Génère l'article par sections en parallèle : l'introduction et chaque point
+    du plan sont rédigés simultanément avec le même contexte (titre, angle, plan
+    complet, recherche web), puis assemblés dans l'ordre du plan ; une passe
+    courte ajoute les transitions et la conclusion.
+
+    Latence ≈ section la plus lente + passe de cohérence (au lieu d'un seul
+    appel de ~4 000 tokens). Sans plan, repli sur generate_article.
+
+    on_part (optionnel) reçoit le Markdown de chaque partie dès que toutes les
+    parties précédentes sont prêtes (sortie live de l'interface).
+    """
+    if not llm_available("generate_section"):
+        raise ValueError("Aucun fournisseur LLM configuré (OPENAI_API_KEY dans .env, ou LLM_PROVIDER=local / stub)")
+
+    title = variant.get("title", "").strip()
+    outline = [str(p).strip() for p in (variant.get("outline") or []) if str(p).strip()]
+    if not outline:
+        print("ℹ️  Variante sans plan : rédaction séquentielle")
+        return generate_article(variant, web_results, target_keywords)
+
+    print(f"📝 Génération par sections en parallèle ({len(outline)} sections + introduction) : {title}")
+
+    current_date = datetime.now()
+    keywords_snippet = ", ".join(target_keywords or []) if target_keywords else ""
+    keywords_line = f"\nMots-clés SEO à intégrer naturellement (sans sur-optimisation) : {keywords_snippet}" if keywords_snippet else ""
+    plan_str = "\n".join(f"{i}. {p}" for i, p in enumerate(outline, 1))
+    web_context = web_results or "Aucune donnée spécifique fournie. Utilise tes connaissances actuelles."
+    context = f"""DATE ACTUELLE: {current_date.strftime("%d/%m/%Y")} ({current_date.year}){keywords_line}
+
+Titre de l'article: {title}
+
+Angle éditorial à adopter:
+{variant.get("angle", "").strip()}
+
+Plan complet de l'article :
+{plan_str}
+
+Données de recherche web récentes (utiliser comme source d'informations, sans copier/coller brut) :
+{web_context}"""
+
+    # ~1 200 mots au total : introduction courte, le reste réparti entre les sections
+    section_words = max(250, 1000 // len(outline))
+    parts_spec = [("INTRODUCTION de l'article", 180)] + [
+        (f"SECTION {i} du plan : {point}", section_words) for i, point in enumerate(outline, 1)
+    ]
+
+    parts: List[Optional[str]] = [None] * len(parts_spec)
+    emitted = 0
+    with ThreadPoolExecutor(max_workers=len(parts_spec)) as pool:
+        # Chaque tâche reçoit une copie du contexte (run id / span parent du tracing)
+        futures = {
+            pool.submit(contextvars.copy_context().run, _generate_section, context, part, words, title): index
+            for index, (part, words) in enumerate(parts_spec)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                parts[index] = future.result()
+            except Exception as e:
+                print(f"❌ Erreur rédaction de la partie {index}: {e}")
+                raise
+            while emitted < len(parts) and parts[emitted] is not None:
+                if on_part:
+                    on_part(parts[emitted] + "\n\n")
+                emitted += 1
+
+    transitions, conclusion = _merge_sections(parts, title)
+    article_parts = []
+    for index, part in enumerate(parts):
+        # Transition j en fin de section j (parts[j + 1]), avant la section suivante
+        if 0 <= index - 1 < len(transitions) and transitions[index - 1]:
+            part = f"{part}\n\n{transitions[index - 1]}"
+        article_parts.append(part)
+    if conclusion:
+        article_parts.append(conclusion)
+        if on_part:
+            on_part(conclusion)
+
+    article = "\n\n".join(article_parts)
+    print(f"✅ Article assemblé ({len(article.split())} mots, {len(parts)} parties)")
+    return article
+
+
+# Pré-rédaction spéculative pendant le choix de la variante : "off", "top" (variante
+# la mieux classée seulement) ou "all" (les trois) ; plafond : SPECULATIVE_TOKEN_CAP
+SPECULATIVE_MODES = ("off", "top", "all")
+SPECULATIVE_MODE = os.getenv("SPECULATIVE_DRAFTS", "off")
+
+
+def rank_variants(variants: List[Dict[str, Any]], target_keywords: Optional[List[str]] = None) -> List[int]:
+    """Index des variantes, la plus probable en premier (couverture des mots-clés cibles, puis ordre proposé)"""
+    def coverage(variant: Dict[str, Any]) -> int:
+        text = " ".join([variant.get("title", ""), variant.get("angle", "")] + [str(p) for p in variant.get("outline") or []]).lower()
+        return sum(1 for kw in target_keywords or [] if kw.lower() in text)
+
+    return sorted(range(len(variants)), key=lambda i: -coverage(variants[i]))
 
-    style_prompt = """
+
+def start_speculative_drafts(
+    variants: List[Dict[str, Any]],
+    web_results: str = "",
+    target_keywords: Optional[List[str]] = None,
+    mode: Optional[str] = None,
+    generation_mode: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Lance la rédaction (generate_article en streaming) des variantes dès
+    qu'elles sont proposées, pendant que l'utilisateur choisit. Les brouillons
+    sont indexés par position de la variante ("0", "1", "2") ; le choix est
+    récupéré par claim_draft (les autres brouillons sont annulés).
+
+    Les brouillons sont rédigés en un seul appel : en mode de rédaction
+    "sections" (generation_mode, défaut GENERATION_MODE), aucun brouillon
+    n'est lancé, l'article sera rédigé par sections après le choix.
+
+    Returns:
+        Identifiant du groupe de brouillons, ou None (mode "off", mode sections, pas de client OpenAI)
+    """
+    mode = mode or SPECULATIVE_MODE
+    if mode not in ("top", "all") or not llm_available("generate_article") or not variants:
+        return None
+    if (generation_mode or GENERATION_MODE) == "sections":
+        return None
+    indexes = rank_variants(variants, target_keywords)[:1 if mode == "top" else len(variants)]
+    return start_drafts({
+        str(i): (lambda variant=variants[i]: generate_article(variant, web_results, target_keywords, stream=True))
+        for i in indexes
+    })
+
+
+STYLE_SYSTEM_PROMPT = """
 Tu es un rédacteur senior B2B français, ton de marque Rounded : expert, direct, un peu mordant mais jamais vulgaire.
 
 Tu reçois ci-dessous un article déjà structuré (H2/H3, paragraphes, listes). 
@@ -819,9 +1290,32 @@ RÈGLES DE STYLE STRICTES :
   * S'assurer que chaque section apporte de la valeur
   * Vérifier que les transitions sont fluides
 
+INSTRUCTIONS SELON LE CONTEXTE FOURNI :
+- Si l'article contient des chiffres, mets-les particulièrement en valeur
+- Assure des transitions fluides entre chacune des sections H2 indiquées
+- Adapte le rythme à la longueur indiquée : privilégie la variété et l'équilibre
+
+L'article à réécrire est fourni à la fin du message utilisateur, après son contexte.
+
 Retourne UNIQUEMENT l'article réécrit, au format Markdown, sans commentaire autour.
 """
 
+@traced()
+def apply_style_refinement(article: str, stream: bool = False) -> Union[str, Iterator[Union[str, Dict[str, Any]]]]:
+    """
+    Applique un raffinement de style à l'article généré.
+
+    Objectif :
+    - Donner du "grain" au texte
+    - Rendre la lecture plus rythmée et concrète
+
+    Avec stream=True, retourne un générateur de deltas suivi d'un
+    enregistrement final (l'article d'origine en cas d'erreur).
+    """
+    if not llm_available("style_refinement"):
+        # Si pas de fournisseur LLM, on renvoie l'article tel quel
+        return iter([{"type": "final", "content": article, "usage": None, "ttft_seconds": None}]) if stream else article
+
     try:
         # Analyser l'article pour donner des instructions contextuelles
         word_count = len(article.split())
@@ -833,28 +1327,34 @@ CONTEXTE DE L'ARTICLE :
 - Longueur : {word_count} mots
 - Sections principales (H2) : {h2_count}
 - Présence de chiffres/statistiques : {"Oui" if has_numbers else "Non"}
-
-INSTRUCTIONS SPÉCIFIQUES :
-- Si l'article contient des chiffres, mets-les particulièrement en valeur
-- Si l'article a {h2_count} sections, assure-toi d'avoir des transitions fluides entre chacune
-- Adapte le rythme selon la longueur : pour {word_count} mots, privilégie la variété et l'équilibre
 """
         
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": style_prompt},
+        def render(sections: Dict[str, str]) -> List[Dict[str, str]]:
+            return [
+                {"role": "system", "content": STYLE_SYSTEM_PROMPT},
                 {
                     "role": "user",
                     "content": (
                         f"{context_instructions}\n\n"
                         "Voici l'article à réécrire en appliquant STRICTEMENT toutes les règles de style ci-dessus :\n\n"
-                        f"{article}"
+                        f"{sections['article']}"
                     ),
                 },
-            ],
+            ]
+
+        # max_tokens proportionnel à l'article (la réécriture est un peu plus longue)
+        plan = build_prompt("style_refinement", render, [Section("article", article, priority=0)], source_text=article)
+
+        if stream:
+            return _stream_completion(
+                "style_refinement", plan.messages, temperature=0.7, max_tokens=plan.max_tokens, fallback=article,
+            )
+
+        response, route = _create_completion(
+            "style_refinement",
+            messages=plan.messages,
             temperature=0.7,  # Légèrement réduit pour plus de cohérence
-            max_tokens=4500,  # Plus de tokens pour un style plus riche
+            max_tokens=plan.max_tokens,
         )
 
         styled_article = response.choices[0].message.content
@@ -866,12 +1366,9 @@ INSTRUCTIONS SPÉCIFIQUES :
 
                 track_openai_usage(
                     operation="style_refinement",
-                    model="gpt-4o-mini",
-                    usage={
-                        "prompt_tokens": response.usage.prompt_tokens,
-                        "completion_tokens": response.usage.completion_tokens,
-                        "total_tokens": response.usage.total_tokens,
-                    },
+                    model=route["model"],
+                    latency_seconds=route["latency_seconds"],
+                    usage=usage_to_dict(response.usage),
                 )
             except Exception as e:
                 print(f"⚠️  Erreur tracking tokens (style_refinement): {e}")
@@ -884,85 +1381,17 @@ INSTRUCTIONS SPÉCIFIQUES :
         return article
 
 
-def score_article_quality(article: str, topic: str, target_keywords: Optional[List[str]] = None, article_title: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Évalue l'article et retourne un rapport de scoring (éditorial + SEO) au format structuré.
+SCORING_SYSTEM_PROMPT = """
+Tu es un expert en évaluation de contenu éditorial et SEO pour des articles de blog B2B.
 
-    Retour :
-    {
-        "global_score": int | None,
-        "content_score": int | None,
-        "readability_score": int | None,
-        "seo_score": int | None,
-        "conversion_score": int | None,
-        "credibility_score": int | None,
-        "markdown": str  # rapport complet en Markdown (style exemple utilisateur)
-    }
-    """
-    if not openai_client:
-        return {
-            "global_score": None,
-            "content_score": None,
-            "readability_score": None,
-            "seo_score": None,
-            "conversion_score": None,
-            "credibility_score": None,
-            "markdown": "",
-        }
+Ta mission : analyser CHAQUE article de manière OBJECTIVE et donner un scoring PRÉCIS 
+basé sur des critères MESURABLES et le contenu réel de l'article.
 
-    keywords_str = ", ".join(target_keywords or []) if target_keywords else ""
-
-    # Calculs automatiques pour aider le scoring
-    word_count = len(article.split())
-    has_faq = "FAQ" in article or "faq" in article.lower() or "questions fréquentes" in article.lower()
-    has_cta = "découvrir" in article.lower() or "essayer" in article.lower() or "contact" in article.lower() or "appel" in article.lower()
-    h2_count = len(re.findall(r'^##\s+', article, re.MULTILINE))
-    h3_count = len(re.findall(r'^###\s+', article, re.MULTILINE))
-    
-    # Compter les mots-clés
-    keyword_matches = 0
-    if target_keywords:
-        article_lower = article.lower()
-        for kw in target_keywords:
-            keyword_matches += article_lower.count(kw.lower())
-    
-    # Estimer la longueur moyenne des phrases
-    sentences = re.split(r'[.!?]+\s+', article)
-    avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences) if sentences else 0
-    
-    scoring_system_prompt = """
-Tu es un expert en évaluation de contenu éditorial et SEO pour des articles de blog B2B.
-
-Ta mission : analyser CHAQUE article de manière OBJECTIVE et donner un scoring PRÉCIS 
-basé sur des critères MESURABLES et le contenu réel de l'article.
-
-RÈGLES DE SCORING STRICTES :
-- Sois OBJECTIF et PRÉCIS dans tes scores
-- Utilise les métriques fournies comme base, mais analyse aussi la QUALITÉ du contenu
-- Chaque dimension a des critères clairs (voir ci-dessous)
-- Les scores doivent refléter la RÉALITÉ de l'article, pas des standards génériques
-"""
-
-    article_title_context = f"\n- Titre de l'article : {article_title}" if article_title else ""
-    
-    scoring_user_prompt = f"""
-CONTEXTE :
-- Sujet de l'article : {topic}
-- Mots-clés ciblés : {keywords_str if keywords_str else "non précisés"}{article_title_context}
-
-MÉTRIQUES AUTOMATIQUES CALCULÉES :
-- Nombre de mots : {word_count}
-- Présence FAQ : {"OUI" if has_faq else "NON"}
-- Présence CTA : {"OUI" if has_cta else "NON"}
-- Nombre de H2 : {h2_count}
-- Nombre de H3 : {h3_count}
-- Occurrences mots-clés : {keyword_matches}
-- Longueur moyenne phrases : {avg_sentence_length:.1f} mots
-
-ARTICLE À ÉVALUER :
----
-{article}
----
+RÈGLES DE SCORING STRICTES :
+- Sois OBJECTIF et PRÉCIS dans tes scores
+- Utilise les métriques fournies comme base, mais analyse aussi la QUALITÉ du contenu
+- Chaque dimension a des critères clairs (voir ci-dessous)
+- Les scores doivent refléter la RÉALITÉ de l'article, pas des standards génériques
 
 INSTRUCTIONS D'ÉVALUATION STRICTES :
 
@@ -1026,126 +1455,239 @@ FORMAT DU RAPPORT :
 - En français, ton expert mais accessible
 
 IMPORTANT - FORMAT JSON STRICT :
-{{
+{
   "global_score": <score entre 50 et 95, calculé selon la formule>,
   "content_score": <score entre 0 et 20, basé sur les critères ci-dessus>,
   "readability_score": <score entre 0 et 20, basé sur les critères ci-dessus>,
   "seo_score": <score entre 0 et 30, basé sur les critères ci-dessus>,
   "conversion_score": <score entre 0 et 20, basé sur les critères ci-dessus>,
   "credibility_score": <score entre 0 et 10, basé sur les critères ci-dessus>,
-  "markdown_report": "<rapport complet en Markdown, très détaillé et personnalisé pour CET article>"
-}}
+  "markdown_report": "<rapport complet en Markdown, très détaillé et personnalisé pour CET article>",
+  "actions": [
+    {"section": "<titre EXACT d'une section H2 de l'article, ou \"introduction\", \"faq\", \"conclusion\", ou \"global\" si l'action concerne tout l'article>",
+     "action": "<recommandation concrète, applicable à cette section seule>"}
+  ]
+}
+
+"actions" reprend les 5 actions prioritaires du rapport, chacune rattachée à la section qu'elle concerne
+(utilise "faq" pour ajouter ou compléter une FAQ, "conclusion" pour les CTA de fin d'article).
 
 Ne renvoie QUE le JSON, sans texte autour.
 """
 
+
+def _empty_scoring() -> Dict[str, Any]:
+    """Rapport de scoring vide (pas de client OpenAI ou erreur)"""
+    return {
+        "global_score": None,
+        "content_score": None,
+        "readability_score": None,
+        "seo_score": None,
+        "conversion_score": None,
+        "credibility_score": None,
+        "markdown": "",
+        "actions": [],
+    }
+
+
+def _scoring_context(article: str, topic: str, target_keywords: Optional[List[str]] = None, article_title: Optional[str] = None) -> str:
+    """Contexte et métriques automatiques envoyés avant l'article à évaluer"""
+    keywords_str = ", ".join(target_keywords or []) if target_keywords else ""
+
+    # Calculs automatiques pour aider le scoring
+    word_count = len(article.split())
+    has_faq = "FAQ" in article or "faq" in article.lower() or "questions fréquentes" in article.lower()
+    has_cta = "découvrir" in article.lower() or "essayer" in article.lower() or "contact" in article.lower() or "appel" in article.lower()
+    h2_count = len(re.findall(r'^##\s+', article, re.MULTILINE))
+    h3_count = len(re.findall(r'^###\s+', article, re.MULTILINE))
+    
+    # Compter les mots-clés
+    keyword_matches = 0
+    if target_keywords:
+        article_lower = article.lower()
+        for kw in target_keywords:
+            keyword_matches += article_lower.count(kw.lower())
+    
+    # Estimer la longueur moyenne des phrases
+    sentences = re.split(r'[.!?]+\s+', article)
+    avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences) if sentences else 0
+    
+    article_title_context = f"\n- Titre de l'article : {article_title}" if article_title else ""
+
+    return f"""
+CONTEXTE :
+- Sujet de l'article : {topic}
+- Mots-clés ciblés : {keywords_str if keywords_str else "non précisés"}{article_title_context}
+
+MÉTRIQUES AUTOMATIQUES CALCULÉES :
+- Nombre de mots : {word_count}
+- Présence FAQ : {"OUI" if has_faq else "NON"}
+- Présence CTA : {"OUI" if has_cta else "NON"}
+- Nombre de H2 : {h2_count}
+- Nombre de H3 : {h3_count}
+- Occurrences mots-clés : {keyword_matches}
+- Longueur moyenne phrases : {avg_sentence_length:.1f} mots
+"""
+
+
+def _normalize_scoring(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Valide les scores renvoyés par le modèle (bornes, score global recalculé si absent)"""
+    def validate_score(score, min_val, max_val, default=None):
+        if score is None:
+            return default
+        try:
+            score = int(score)
+            return max(min_val, min(max_val, score))
+        except (ValueError, TypeError):
+            return default
+
+    content_score = validate_score(data.get("content_score"), 0, 20, 15)
+    readability_score = validate_score(data.get("readability_score"), 0, 20, 15)
+    seo_score = validate_score(data.get("seo_score"), 0, 30, 20)
+    conversion_score = validate_score(data.get("conversion_score"), 0, 20, 12)
+    credibility_score = validate_score(data.get("credibility_score"), 0, 10, 9)
+    
+    # Recalculer le score global si nécessaire
+    global_score = data.get("global_score")
+    if global_score is None:
+        # Calculer selon la formule pondérée
+        global_score = int(
+            (content_score * 0.25) +
+            (readability_score * 0.20) +
+            (seo_score * 0.30) +
+            (conversion_score * 0.20) +
+            (credibility_score * 0.05)
+        )
+    else:
+        global_score = validate_score(global_score, 0, 100, 75)
+
+    return {
+        "global_score": global_score,
+        "content_score": content_score,
+        "readability_score": readability_score,
+        "seo_score": seo_score,
+        "conversion_score": conversion_score,
+        "credibility_score": credibility_score,
+        "markdown": data.get("markdown_report", ""),
+        "actions": [
+            {"section": str(a.get("section") or "global"), "action": str(a.get("action") or "").strip()}
+            for a in (data.get("actions") or []) if isinstance(a, dict) and a.get("action")
+        ],
+    }
+
+
+def _record_scoring(
+    operation: str,
+    scoring: Dict[str, Any],
+    route: Dict[str, Any],
+    usage: Dict[str, int],
+    topic: str,
+    target_keywords: Optional[List[str]],
+    article_title: Optional[str],
+    iteration: Optional[int],
+):
+    """Ajoute le scoring à l'historique des scores (utils.score_history)"""
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": scoring_system_prompt},
-                {"role": "user", "content": scoring_user_prompt},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.2,  # Plus bas pour plus de cohérence dans le scoring
-            max_tokens=2500,  # Plus de tokens pour un rapport plus détaillé
+        from utils.score_history import record_score
+        from utils.token_tracker import estimate_entry_cost
+
+        record_score(
+            operation,
+            scoring,
+            model=route["model"],
+            usage=usage,
+            cost_usd=estimate_entry_cost({"model": route["model"], **usage}),
+            topic=topic,
+            article_title=article_title,
+            keywords=target_keywords,
+            sector=detect_sector(topic),
+            iteration=iteration,
         )
+    except Exception as e:
+        print(f"⚠️  Erreur historique des scores ({operation}): {e}")
 
-        data = json.loads(response.choices[0].message.content)
 
-        # Validation et normalisation des scores
-        def validate_score(score, min_val, max_val, default=None):
-            if score is None:
-                return default
-            try:
-                score = int(score)
-                return max(min_val, min(max_val, score))
-            except (ValueError, TypeError):
-                return default
-
-        content_score = validate_score(data.get("content_score"), 0, 20, 15)
-        readability_score = validate_score(data.get("readability_score"), 0, 20, 15)
-        seo_score = validate_score(data.get("seo_score"), 0, 30, 20)
-        conversion_score = validate_score(data.get("conversion_score"), 0, 20, 12)
-        credibility_score = validate_score(data.get("credibility_score"), 0, 10, 9)
-        
-        # Recalculer le score global si nécessaire
-        global_score = data.get("global_score")
-        if global_score is None:
-            # Calculer selon la formule pondérée
-            global_score = int(
-                (content_score * 0.25) +
-                (readability_score * 0.20) +
-                (seo_score * 0.30) +
-                (conversion_score * 0.20) +
-                (credibility_score * 0.05)
-            )
-        else:
-            global_score = validate_score(global_score, 0, 100, 75)
+@traced()
+def score_article_quality(
+    article: str,
+    topic: str,
+    target_keywords: Optional[List[str]] = None,
+    article_title: Optional[str] = None,
+    iteration: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Évalue l'article et retourne un rapport de scoring (éditorial + SEO) au format structuré.
 
-        result = {
-            "global_score": global_score,
-            "content_score": content_score,
-            "readability_score": readability_score,
-            "seo_score": seo_score,
-            "conversion_score": conversion_score,
-            "credibility_score": credibility_score,
-            "markdown": data.get("markdown_report", ""),
-        }
+    Retour :
+    {
+        "global_score": int | None,
+        "content_score": int | None,
+        "readability_score": int | None,
+        "seo_score": int | None,
+        "conversion_score": int | None,
+        "credibility_score": int | None,
+        "markdown": str,  # rapport complet en Markdown (style exemple utilisateur)
+        "actions": [{"section": str, "action": str}]  # actions prioritaires par section H2
+    }
 
-        # Tracking tokens
+    iteration : 0 pour le scoring initial du pipeline, N pour la N-ième réécriture
+    (enregistré avec le résultat dans l'historique des scores).
+    """
+    if not llm_available("score_article"):
+        return _empty_scoring()
+
+    context = _scoring_context(article, topic, target_keywords, article_title)
+
+    def render(sections: Dict[str, str]) -> List[Dict[str, str]]:
+        scoring_user_prompt = f"""{context}
+ARTICLE À ÉVALUER :
+---
+{sections["article"]}
+---
+"""
+        return [
+            {"role": "system", "content": SCORING_SYSTEM_PROMPT},
+            {"role": "user", "content": scoring_user_prompt},
+        ]
+
+    plan = build_prompt("score_article", render, [Section("article", article, priority=0)])
+
+    try:
+        response, route = _create_completion(
+            "score_article",
+            messages=plan.messages,
+            response_format={"type": "json_object"},
+            temperature=0.2,  # Plus bas pour plus de cohérence dans le scoring
+            max_tokens=plan.max_tokens,  # Rapport détaillé : budget de sortie large
+        )
+
+        result = _normalize_scoring(json.loads(response.choices[0].message.content))
+
+        # Tracking tokens (et historique des scores : une réponse rejouée par un batch n'a pas d'usage)
         if hasattr(response, "usage") and response.usage:
+            usage = usage_to_dict(response.usage)
             try:
                 from utils.token_tracker import track_openai_usage
 
                 track_openai_usage(
                     operation="score_article",
-                    model="gpt-4o-mini",
-                    usage={
-                        "prompt_tokens": response.usage.prompt_tokens,
-                        "completion_tokens": response.usage.completion_tokens,
-                        "total_tokens": response.usage.total_tokens,
-                    },
+                    model=route["model"],
+                    latency_seconds=route["latency_seconds"],
+                    usage=usage,
                     topic=topic,
                 )
             except Exception as e:
                 print(f"⚠️  Erreur tracking tokens (score_article): {e}")
+            _record_scoring("score_article", result, route, usage, topic, target_keywords, article_title, iteration)
 
         return result
 
     except Exception as e:
         print(f"⚠️  Erreur score_article_quality: {e}")
-        return {
-            "global_score": None,
-            "content_score": None,
-            "readability_score": None,
-            "seo_score": None,
-            "conversion_score": None,
-            "credibility_score": None,
-            "markdown": "",
-        }
+        return _empty_scoring()
 
 
-def regenerate_article_with_scoring(
-    article: str,
-    scoring_markdown: str,
-    topic: str,
-    target_keywords: Optional[List[str]] = None,
-    max_iterations: int = 3,
-) -> str:
-    """
-    Régénère l'article en s'appuyant sur le scoring et les recommandations.
-
-    - Objectif : passer d'un bon article à un article optimisé (90+ / 100).
-    - Ne doit PAS changer le message de fond, mais améliorer :
-      structure, SEO, conversion, clarté, impact.
-    """
-    if not openai_client:
-        return article
-
-    keywords_str = ", ".join(target_keywords or []) if target_keywords else ""
-
-    system_prompt = """
+REGENERATE_SYSTEM_PROMPT = """
 Tu es un expert en copywriting B2B et SEO pour le secteur médical, travaillant pour Rounded.
 
 Ta mission CRITIQUE : améliorer l'article en appliquant TOUTES les recommandations du scoring.
@@ -1171,80 +1713,405 @@ RÈGLES STRICTES :
 
 OBJECTIF : L'article final DOIT être meilleur que l'initial sur TOUS les critères mentionnés dans le scoring, avec une structure propre et professionnelle.
 
-Format attendu :
-- Retourne UNIQUEMENT l'article réécrit et amélioré, en Markdown propre.
+Le message utilisateur fournit le contexte, le rapport de scoring puis l'article initial (en dernier).
+
+Réécris l'article COMPLET en appliquant les recommandations.
+
+STRUCTURE FINALE OBLIGATOIRE :
+1. Introduction
+2. Sections H2 principales (contenu de l'article)
+3. FAQ (si recommandée dans le scoring) → PLACER ICI, juste avant la conclusion, JAMAIS en plein milieu
+4. Conclusion
+
+IMPORTANT : Si tu ajoutes une FAQ, elle DOIT être placée à la fin de l'article, juste avant la conclusion. 
+NE PLACE JAMAIS la FAQ en plein milieu du contenu - cela casse la structure et n'est pas professionnel.
+
+Retourne UNIQUEMENT l'article réécrit en Markdown, sans commentaire autour.
 """
 
-    user_prompt = f"""
+
+@traced()
+def regenerate_article_with_scoring(
+    article: str,
+    scoring_markdown: str,
+    topic: str,
+    target_keywords: Optional[List[str]] = None,
+    max_iterations: int = 3,
+    stream: bool = False,
+) -> Union[str, Iterator[Union[str, Dict[str, Any]]]]:
+    """
+    Régénère l'article en s'appuyant sur le scoring et les recommandations.
+
+    - Objectif : passer d'un bon article à un article optimisé (90+ / 100).
+    - Ne doit PAS changer le message de fond, mais améliorer :
+      structure, SEO, conversion, clarté, impact.
+    - Avec stream=True, retourne un générateur de deltas suivi d'un
+      enregistrement final (l'article d'origine en cas d'erreur).
+    """
+    if not llm_available("regenerate_with_scoring"):
+        return iter([{"type": "final", "content": article, "usage": None, "ttft_seconds": None}]) if stream else article
+
+    keywords_str = ", ".join(target_keywords or []) if target_keywords else ""
+
+    def render(sections: Dict[str, str]) -> List[Dict[str, str]]:
+        user_prompt = f"""
 Contexte :
 - Sujet : {topic}
 - Mots-clés cibles indicatifs : {keywords_str}
 
+RAPPORT DE SCORING & RECOMMANDATIONS :
+---
+{sections["scoring"]}
+---
+
 ARTICLE INITIAL :
 ---
-{article}
+{sections["article"]}
 ---
+"""
+        return [
+            {"role": "system", "content": REGENERATE_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
 
-RAPPORT DE SCORING & RECOMMANDATIONS :
+    # L'article n'est jamais tronqué ; le rapport de scoring l'est en premier si besoin
+    plan = build_prompt(
+        "regenerate_with_scoring", render,
+        [Section("article", article, priority=0), Section("scoring", scoring_markdown, priority=1, min_tokens=400)],
+        source_text=article,
+    )
+
+    if stream:
+        return _stream_completion(
+            "regenerate_with_scoring", plan.messages, temperature=0.7, max_tokens=plan.max_tokens, fallback=article,
+            topic=topic,
+        )
+
+    try:
+        response, route = _create_completion(
+            "regenerate_with_scoring",
+            messages=plan.messages,
+            temperature=0.7,
+            max_tokens=plan.max_tokens,
+        )
+
+        improved_article = response.choices[0].message.content
+
+        # Tracking tokens
+        if hasattr(response, "usage") and response.usage:
+            try:
+                from utils.token_tracker import track_openai_usage
+
+                track_openai_usage(
+                    operation="regenerate_with_scoring",
+                    model=route["model"],
+                    latency_seconds=route["latency_seconds"],
+                    usage=usage_to_dict(response.usage),
+                    topic=topic,
+                )
+            except Exception as e:
+                print(f"⚠️  Erreur tracking tokens (regenerate_with_scoring): {e}")
+
+        return improved_article or article
+
+    except Exception as e:
+        print(f"⚠️  Erreur regenerate_article_with_scoring: {e}")
+    return article
+
+
+# Modes de réécriture après scoring : "full" (article complet à chaque itération) ou
+# "incremental" (seules les sections H2 visées par les actions du scoring sont réécrites)
+REGENERATION_MODES = ("full", "incremental")
+REGENERATION_MODE = os.getenv("ARTICLE_REGENERATION_MODE", "full")
+
+REGENERATE_SECTION_SYSTEM_PROMPT = """
+Tu es un expert en copywriting B2B et SEO pour le secteur médical, travaillant pour Rounded.
+
+Ta mission : améliorer UNE section d'un article en appliquant les recommandations du scoring qui la concernent.
+Les autres sections ne changent pas : le plan complet de l'article est fourni pour éviter les redites.
+
+RÈGLES STRICTES :
+1. Applique TOUTES les actions listées pour cette section, et les consignes générales quand elles s'y appliquent
+2. Garde le titre de la section ("## ..." tel quel, sauf si une action demande de le modifier), le même angle et les mêmes messages business
+3. Ne rédige QUE cette section : pas d'introduction ni de conclusion d'article, pas de contenu d'une autre section
+4. N'invente PAS de nouveaux chiffres précis si aucun chiffre n'était présent
+5. Ne rajoute PAS de nouveaux liens externes non mentionnés dans la section initiale
+6. Section FAQ : titre "## FAQ", 4 à 6 questions en ### avec des réponses courtes et concrètes
+7. Section conclusion : CTA clair en fin de section ; mentionne Donna (https://callrounded.com/cas-usage/secretariat-medical)
+   uniquement si elle l'était déjà ou si le sujet est l'IA vocale pour le secrétariat médical
+8. INTERDICTION ABSOLUE : Ne jamais citer de concurrents ou d'autres entreprises
+
+Le message utilisateur fournit le contexte, le plan de l'article, les actions à appliquer puis, en dernier,
+la section à réécrire (vide pour une nouvelle section).
+
+Retourne UNIQUEMENT la section réécrite en Markdown, sans commentaire autour.
+"""
+
+RESCORE_SYSTEM_PROMPT = """
+Tu es un expert en évaluation de contenu éditorial et SEO pour des articles de blog B2B.
+
+Un article déjà évalué vient d'être modifié de façon ciblée : seules certaines sections ont été réécrites.
+Ta mission : METTRE À JOUR le scoring précédent d'après les sections modifiées, sans réévaluer le reste.
+
+RÈGLES :
+- Pars des scores précédents et ajuste uniquement les dimensions touchées par les modifications
+- Les métriques automatiques fournies sont recalculées sur l'article COMPLET après modification
+- Barème et pondération identiques au scoring précédent :
+  global = content × 0.25 + readability × 0.20 + seo × 0.30 + conversion × 0.20 + credibility × 0.05
+  (content 0-20, readability 0-20, seo 0-30, conversion 0-20, credibility 0-10)
+- "markdown_report" : rapport COURT (200 mots maximum) en Markdown, titre "## Mise à jour du scoring",
+  effet de chaque modification sur les scores, en français
+- "actions" : les actions prioritaires RESTANTES (5 maximum), chacune rattachée à une section :
+  titre EXACT d'une section H2 du plan, ou "introduction", "faq", "conclusion", ou "global"
+
+IMPORTANT - FORMAT JSON STRICT :
+{
+  "global_score": <entier>,
+  "content_score": <entier>,
+  "readability_score": <entier>,
+  "seo_score": <entier>,
+  "conversion_score": <entier>,
+  "credibility_score": <entier>,
+  "markdown_report": "<rapport court>",
+  "actions": [{"section": "<section>", "action": "<recommandation>"}]
+}
+
+Ne renvoie QUE le JSON, sans texte autour.
+"""
+
+
+@traced("regenerate_section")
+def _regenerate_section(
+    section: Dict[str, Any],
+    actions: List[str],
+    general: List[str],
+    article_outline: List[str],
+    topic: str,
+    target_keywords: Optional[List[str]] = None,
+) -> str:
+    """Réécrit (ou rédige, si elle est vide) une section H2 d'après les actions qui la concernent"""
+    keywords_str = ", ".join(target_keywords or []) if target_keywords else ""
+    heading = section["heading"] or "Introduction (titre H1 + paragraphes d'introduction, sans H2)"
+    words = max(150, len(section["text"].split()))
+    actions_str = "\n".join(f"- {a}" for a in actions)
+    general_str = "\n".join(f"- {a}" for a in general) or "- aucune"
+    plan_str = "\n".join(f"- {h}" for h in article_outline)
+
+    def render(sections: Dict[str, str]) -> List[Dict[str, str]]:
+        user_prompt = f"""
+Contexte :
+- Sujet : {topic}
+- Mots-clés cibles indicatifs : {keywords_str}
+
+Plan de l'article (sections H2) :
+{plan_str}
+
+ACTIONS À APPLIQUER À CETTE SECTION :
+{actions_str}
+
+CONSIGNES GÉNÉRALES DU SCORING :
+{general_str}
+
+SECTION À RÉÉCRIRE : {heading}
+Longueur cible : environ {words} mots
 ---
-{scoring_markdown}
+{sections["section"] or "(nouvelle section à rédiger)"}
 ---
+"""
+        return [
+            {"role": "system", "content": REGENERATE_SECTION_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
 
-Maintenant, réécris l'article COMPLET en appliquant les recommandations.
+    plan = build_prompt(
+        "regenerate_section", render, [Section("section", section["text"], priority=0)], source_text=section["text"],
+    )
+    response, route = _create_completion(
+        "regenerate_section",
+        messages=plan.messages,
+        temperature=0.7,
+        max_tokens=plan.max_tokens,
+    )
+    if hasattr(response, "usage") and response.usage:
+        try:
+            from utils.token_tracker import track_openai_usage
+            track_openai_usage(
+                operation="regenerate_section",
+                model=route["model"],
+                latency_seconds=route["latency_seconds"],
+                usage=usage_to_dict(response.usage),
+                topic=topic,
+            )
+        except Exception as e:
+            print(f"⚠️  Erreur tracking tokens (regenerate_section): {e}")
+    return (response.choices[0].message.content or "").strip()
 
-STRUCTURE FINALE OBLIGATOIRE :
-1. Introduction
-2. Sections H2 principales (contenu de l'article)
-3. FAQ (si recommandée dans le scoring) → PLACER ICI, juste avant la conclusion, JAMAIS en plein milieu
-4. Conclusion
 
-IMPORTANT : Si tu ajoutes une FAQ, elle DOIT être placée à la fin de l'article, juste avant la conclusion. 
-NE PLACE JAMAIS la FAQ en plein milieu du contenu - cela casse la structure et n'est pas professionnel.
+@traced()
+def regenerate_article_incremental(
+    article: str,
+    scoring: Optional[Dict[str, Any]],
+    topic: str,
+    target_keywords: Optional[List[str]] = None,
+    on_part=None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Réécriture ciblée : seules les sections H2 visées par les actions du
+    scoring sont réécrites, en parallèle ; les autres sont conservées telles
+    quelles. Les tokens générés suivent la taille des modifications, pas
+    celle de l'article.
+
+    on_part (optionnel) reçoit chaque section réécrite, dans l'ordre de l'article.
+
+    Returns:
+        {"article": str, "changed": [sections modifiées (Markdown)], "mode": "incremental"},
+        ou None si une réécriture complète est préférable (voir plan_section_edits)
+    """
+    if not llm_available("regenerate_section"):
+        return None
+
+    plan = plan_section_edits(split_sections(article), scoring)
+    if plan is None:
+        print("ℹ️  Actions du scoring non rattachables à quelques sections : réécriture complète")
+        return None
+    sections, edits, general = plan
+    article_outline = sections_outline(sections)
+    print(f"🔁 Réécriture ciblée de {len(edits)}/{len(sections)} section(s) : "
+          + ", ".join(sections[i]["heading"] or "introduction" for i in sorted(edits)))
+
+    rewritten: Dict[int, str] = {}
+    with ThreadPoolExecutor(max_workers=len(edits)) as pool:
+        # Copie du contexte par tâche (run id / span parent du tracing)
+        futures = {
+            pool.submit(
+                contextvars.copy_context().run, _regenerate_section,
+                sections[index], actions, general, article_outline, topic, target_keywords,
+            ): index
+            for index, actions in edits.items()
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                rewritten[index] = future.result()
+            except Exception as e:
+                # Section conservée : les autres réécritures restent valables
+                print(f"⚠️  Erreur réécriture de la section {sections[index]['heading'] or 'introduction'}: {e}")
+
+    changed = []
+    for index in sorted(rewritten):
+        text = rewritten[index]
+        if text and text.strip() != sections[index]["text"].strip():
+            sections[index] = {**sections[index], "text": text + "\n\n"}
+            changed.append(text)
+            if on_part:
+                on_part(text + "\n\n")
+
+    print(f"✅ {len(changed)} section(s) modifiée(s), {len(sections) - len(changed)} conservée(s)")
+    return {"article": join_sections(sections), "changed": changed, "mode": "incremental"}
+
+
+@traced()
+def rescore_changed_sections(
+    previous_scoring: Dict[str, Any],
+    article: str,
+    changed_sections: List[str],
+    topic: str,
+    target_keywords: Optional[List[str]] = None,
+    article_title: Optional[str] = None,
+    iteration: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Met à jour le scoring après une réécriture ciblée : seules les sections
+    modifiées sont envoyées (avec les métriques recalculées sur l'article
+    complet et les scores précédents) et le rapport renvoyé est court.
+    Sans modification, le scoring précédent est conservé sans appel.
+    Repli sur score_article_quality (article complet) en cas d'erreur.
+    """
+    if not changed_sections or not previous_scoring or previous_scoring.get("global_score") is None:
+        if not changed_sections:
+            print("ℹ️  Aucune section modifiée : scoring précédent conservé")
+            return previous_scoring
+        return score_article_quality(article, topic, target_keywords, article_title=article_title, iteration=iteration)
+    if not llm_available("rescore_sections"):
+        return previous_scoring
+
+    context = _scoring_context(article, topic, target_keywords, article_title)
+    plan_str = "\n".join(f"- {h}" for h in sections_outline(split_sections(article)))
+    scores_str = "\n".join(
+        f"- {key} : {previous_scoring.get(key)}"
+        for key in ("global_score", "content_score", "readability_score", "seo_score", "conversion_score", "credibility_score")
+    )
+    changed = "\n\n".join(changed_sections)
+
+    def render(sections: Dict[str, str]) -> List[Dict[str, str]]:
+        user_prompt = f"""{context}
+Plan de l'article après modification (sections H2) :
+{plan_str}
+
+SCORES PRÉCÉDENTS :
+{scores_str}
 
-Retourne UNIQUEMENT l'article réécrit en Markdown, sans commentaire autour.
+RAPPORT PRÉCÉDENT :
+---
+{sections["report"]}
+---
+
+SECTIONS MODIFIÉES ({len(changed_sections)}) :
+---
+{sections["changed"]}
+---
 """
+        return [
+            {"role": "system", "content": RESCORE_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    plan = build_prompt(
+        "rescore_sections", render,
+        [Section("changed", changed, priority=0), Section("report", previous_scoring.get("markdown", ""), priority=1, max_tokens=1_000)],
+    )
 
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.7,
-            max_tokens=4000,
+        response, route = _create_completion(
+            "rescore_sections",
+            messages=plan.messages,
+            response_format={"type": "json_object"},
+            temperature=0.2,
+            max_tokens=plan.max_tokens,
         )
 
-        improved_article = response.choices[0].message.content
-
-        # Tracking tokens
-        if hasattr(response, "usage") and response.usage:
+        usage = usage_to_dict(response.usage) if getattr(response, "usage", None) else None
+        if usage:
             try:
                 from utils.token_tracker import track_openai_usage
-
                 track_openai_usage(
-                    operation="regenerate_with_scoring",
-                    model="gpt-4o-mini",
-                    usage={
-                        "prompt_tokens": response.usage.prompt_tokens,
-                        "completion_tokens": response.usage.completion_tokens,
-                        "total_tokens": response.usage.total_tokens,
-                    },
+                    operation="rescore_sections",
+                    model=route["model"],
+                    latency_seconds=route["latency_seconds"],
+                    usage=usage,
                     topic=topic,
+                    article_title=article_title,
                 )
             except Exception as e:
-                print(f"⚠️  Erreur tracking tokens (regenerate_with_scoring): {e}")
-
-        return improved_article or article
-
+                print(f"⚠️  Erreur tracking tokens (rescore_sections): {e}")
+
+        result = _normalize_scoring(json.loads(response.choices[0].message.content))
+        if usage:
+            _record_scoring("rescore_sections", result, route, usage, topic, target_keywords, article_title, iteration)
+        # Rapport complet conservé sous la mise à jour (affiché dans l'interface)
+        if previous_scoring.get("markdown"):
+            result["markdown"] = f"{result['markdown']}\n\n---\n\n### Rapport précédent\n\n{previous_scoring['markdown']}"
+        print(f"✅ Scoring mis à jour sur {len(changed_sections)} section(s) : "
+              f"{previous_scoring.get('global_score')} → {result['global_score']}")
+        return result
     except Exception as e:
-        print(f"⚠️  Erreur regenerate_article_with_scoring: {e}")
-    return article
+        print(f"⚠️  Erreur mise à jour du scoring ({e}) : scoring de l'article complet")
+        return score_article_quality(article, topic, target_keywords, article_title=article_title, iteration=iteration)
 
 
 def load_target_keywords() -> List[str]:
     """Charge les mots-clés cibles depuis data/keywords.json (si présent)"""
-    json_path = Path("data/keywords.json")
+    json_path = BASE_DIR / "data" / "keywords.json"
     try:
         if not json_path.exists():
             return []
@@ -1324,64 +2191,20 @@ def select_target_keywords(topic: str, all_keywords: List[str], min_k: int = 2,
     return selected[:max_k]
 
 
-def optimize_seo(article: str, target_keywords: Optional[List[str]] = None) -> Dict[str, Any]:
-    """Optimise SEO et retourne les métadonnées complètes avec intégration avancée des mots-clés"""
-    if not openai_client:
-        # Fallback simple
-        slug = article[:50].lower().replace(' ', '-').replace("'", '').replace(",", '').replace("?", '').replace(".", '')
-        slug = re.sub(r'[^a-z0-9-]', '', slug)
-        title = article.split('\n')[0].replace('#', '').strip()[:60]
-        summary = article[:155]
-        return {
-            "title": title,
-            "summary": summary,
-            "blog_post": article,
-            "slug": slug,
-            "readTime": "5 min",
-            "tag": "actualites-tendances",
-            "keywords": target_keywords or [],
-            "metaTitle": title[:60],
-            "metaDescription": summary[:160],
-            "ogTitle": title,
-            "ogDescription": summary[:160],
-            "canonicalUrl": f"https://callrounded.com/blog/{slug}",
-            "translationGroup": slug
-        }
-    
-    print("🔍 Optimisation SEO avancée...")
-    
-    # Analyser la densité actuelle des mots-clés dans l'article
-    keyword_analysis = ""
-    if target_keywords:
-        article_lower = article.lower()
-        keyword_analysis = "\n\nANALYSE ACTUELLE DES MOTS-CLÉS:\n"
-        for kw in target_keywords:
-            count = article_lower.count(kw.lower())
-            keyword_analysis += f"- '{kw}': {count} occurrence(s)\n"
-    
-    # Calculer le temps de lecture estimé
-    word_count = len(article.split())
-    read_time = max(3, round(word_count / 200))  # ~200 mots/min
-    
-    system_prompt = """Tu es un expert SEO français spécialisé en optimisation de contenu B2B pour le secteur médical.
+SEO_SYSTEM_PROMPT = """Tu es un expert SEO français spécialisé en optimisation de contenu B2B pour le secteur médical.
 
-Ta mission : Optimiser l'article pour le SEO tout en gardant un contenu naturel et lisible.
+Ta mission : rédiger les métadonnées SEO de l'article fourni. Le contenu de l'article est définitif :
+il est publié tel quel (converti localement en HTML), ne le réécris pas et ne le renvoie pas.
 
 RÈGLES SEO STRICTES :
 
-1. INTÉGRATION DES MOTS-CLÉS :
-   - Le mot-clé principal DOIT apparaître dans :
-     * Le titre H1 (début si possible)
-     * Au moins 1 titre H2
-     * Les 100 premiers mots de l'article
-     * La conclusion (derniers 100 mots)
-   - Densité optimale : 1-2% pour le mot-clé principal, 0.5-1% pour les mots-clés secondaires
-   - Utilise des variations naturelles (synonymes, pluriels, formes conjuguées)
+1. MOT-CLÉ PRINCIPAL :
+   - Choisis le mot-clé principal (1-2 mots) parmi les mots-clés cibles fournis, sinon d'après le contenu
+   - Il DOIT apparaître dans le titre (début si possible), le metaTitle et la metaDescription
    - Évite le keyword stuffing (sur-optimisation)
 
-2. OPTIMISATION DES TITRES :
-   - H2 : Intègre le mot-clé principal dans au moins 2-3 titres H2
-   - H3 : Utilise des mots-clés secondaires ou des variations dans les H3
+2. TITRE :
+   - Max 65 caractères, mot-clé principal inclus
    - Structure : Mot-clé + valeur ajoutée (ex: "IA vocale : comment améliorer la productivité")
 
 3. META TAGS :
@@ -1391,16 +2214,9 @@ RÈGLES SEO STRICTES :
 
 4. MOTS-CLÉS LSI (Latent Semantic Indexing) :
    - Ajoute 3-5 mots-clés sémantiquement liés (ex: si "IA vocale" → "assistant vocal", "robot conversationnel", "automatisation téléphonique")
-   - Ces mots-clés doivent être naturellement intégrés dans le contenu
+   - Choisis-les parmi les notions réellement traitées dans l'article
 
-5. STRUCTURE HTML :
-   - Convertis Markdown en HTML propre
-   - Utilise <h2> pour les titres principaux, <h3> pour les sous-titres
-   - <strong> pour les mots-clés importants (avec modération)
-   - <p> pour les paragraphes
-   - <ul><li> pour les listes
-
-6. SLUG :
+5. SLUG :
    - URL-friendly (lowercase, tirets, pas d'accents)
    - Inclut le mot-clé principal
    - Max 60 caractères
@@ -1409,7 +2225,6 @@ FORMAT DE RETOUR (JSON strict) :
 {
   "title": "Titre optimisé SEO (max 65 chars, mot-clé principal inclus)",
   "summary": "Résumé accrocheur (155-160 chars, mot-clé principal + CTA)",
-  "blog_post": "Contenu HTML complet avec mots-clés intégrés naturellement",
   "slug": "slug-optimise-avec-mot-cle",
   "readTime": "X min",
   "tag": "actualites-tendances" ou "guides-pratiques",
@@ -1418,156 +2233,358 @@ FORMAT DE RETOUR (JSON strict) :
   "metaTitle": "Titre meta SEO (50-60 chars, mot-clé au début)",
   "metaDescription": "Description meta (155-160 chars, mot-clé + CTA)",
   "ogTitle": "Titre Open Graph",
-  "ogDescription": "Description Open Graph (155-160 chars)",
-  "canonicalUrl": "https://callrounded.com/blog/{slug}",
-  "translationGroup": "{slug}",
-  "keywordDensity": {
-    "mainKeyword": "X%",
-    "secondaryKeywords": ["mot-clé 2: Y%", "mot-clé 3: Z%"]
-  }
-}"""
-    
-    # Si des mots-clés cibles existent, on les ajoute explicitement au prompt SEO
-    keywords_context = ""
-    if target_keywords:
-        main_keyword = target_keywords[0] if target_keywords else ""
-        secondary_keywords = ", ".join(target_keywords[1:4]) if len(target_keywords) > 1 else ""
-        keywords_context = f"""
+  "ogDescription": "Description Open Graph (155-160 chars)"
+}
+
+Le message utilisateur fournit les mots-clés cibles éventuels puis l'article (en dernier).
+Retourne UNIQUEMENT le JSON des métadonnées, sans texte autour."""
+
+
+def _fallback_seo(article: str, target_keywords: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Métadonnées minimales dérivées de l'article (pas de client OpenAI ou erreur)"""
+    slug = article[:50].lower().replace(' ', '-').replace("'", '').replace(",", '').replace("?", '').replace(".", '')
+    slug = re.sub(r'[^a-z0-9-]', '', slug)
+    title = article.split('\n')[0].replace('#', '').strip()[:60]
+    summary = article[:155]
+    return {
+        "title": title,
+        "summary": summary,
+        "blog_post": markdown_to_html(article),
+        "slug": slug,
+        "readTime": "5 min",
+        "tag": "actualites-tendances",
+        "keywords": target_keywords or [],
+        "metaTitle": title[:60],
+        "metaDescription": summary[:160],
+        "ogTitle": title,
+        "ogDescription": summary[:160],
+        "canonicalUrl": f"https://callrounded.com/blog/{slug}",
+        "translationGroup": slug
+    }
+
 
-MOTS-CLÉS CIBLES À OPTIMISER :
-- Mot-clé principal : "{main_keyword}" (DOIT être dans le titre, H2, début, fin)
+def _seo_keywords_context(article: str, target_keywords: Optional[List[str]] = None) -> str:
+    """Mots-clés cibles et densité actuelle, envoyés avant l'article à optimiser"""
+    if not target_keywords:
+        return ""
+
+    # Analyser la densité actuelle des mots-clés dans l'article
+    article_lower = article.lower()
+    keyword_analysis = "\n\nANALYSE ACTUELLE DES MOTS-CLÉS:\n"
+    for kw in target_keywords:
+        count = article_lower.count(kw.lower())
+        keyword_analysis += f"- '{kw}': {count} occurrence(s)\n"
+
+    main_keyword = target_keywords[0] if target_keywords else ""
+    secondary_keywords = ", ".join(target_keywords[1:4]) if len(target_keywords) > 1 else ""
+    return f"""MOTS-CLÉS CIBLES :
+- Mot-clé principal : "{main_keyword}" (DOIT être dans le titre, le metaTitle et la metaDescription)
 - Mots-clés secondaires : {secondary_keywords if secondary_keywords else "Aucun"}
-{keyword_analysis}
+{keyword_analysis}"""
+
+
+def _normalize_seo(result: Dict[str, Any], article: str, target_keywords: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Nettoie les métadonnées SEO renvoyées par le modèle et complète les champs manquants"""
+    # Calculer le temps de lecture estimé
+    word_count = len(article.split())
+    read_time = max(3, round(word_count / 200))  # ~200 mots/min
 
-IMPORTANT :
-- Intègre "{main_keyword}" naturellement dans le titre, au moins 2 H2, les 100 premiers mots, et la conclusion
-- Utilise les mots-clés secondaires dans les H3 et le corps de l'article
-- Densité cible : 1-2% pour "{main_keyword}", 0.5-1% pour les autres
-- Ajoute 3-5 mots-clés LSI sémantiquement liés"""
+    # Nettoyer les titres pour enlever les caractères problématiques
+    title = result.get("title", "").strip()
+    title = title.replace('\n', ' ').replace('\r', ' ')
+    title = re.sub(r'\s+', ' ', title)
+    result["title"] = title
+    
+    # S'assurer que tous les champs sont présents
+    slug = result.get("slug", article[:50].lower().replace(' ', '-'))
+    slug = re.sub(r'[^a-z0-9-]', '', slug.lower())
+    
+    # Optimiser metaTitle avec mot-clé principal si disponible
+    meta_title = result.get("metaTitle", title)[:60].strip()
+    if target_keywords and target_keywords[0] not in meta_title.lower():
+        # Essayer d'inclure le mot-clé principal
+        main_kw = target_keywords[0]
+        if len(meta_title) + len(main_kw) + 3 <= 60:
+            meta_title = f"{main_kw}: {meta_title}"
+    meta_title = meta_title.replace('\n', ' ').replace('\r', ' ')
+    meta_title = re.sub(r'\s+', ' ', meta_title)
+    result["metaTitle"] = meta_title[:60]
+    
+    # Optimiser metaDescription avec mot-clé et CTA
+    meta_desc = result.get("metaDescription", result.get("summary", ""))[:160].strip()
+    if target_keywords and target_keywords[0] not in meta_desc.lower():
+        main_kw = target_keywords[0]
+        if len(meta_desc) + len(main_kw) + 10 <= 160:
+            meta_desc = f"{main_kw}: {meta_desc}"
+    # Ajouter un CTA si pas présent
+    if "découvrir" not in meta_desc.lower() and "apprendre" not in meta_desc.lower():
+        if len(meta_desc) + 15 <= 160:
+            meta_desc = f"{meta_desc} Découvrez comment."
+    result["metaDescription"] = meta_desc[:160]
+    
+    og_title = result.get("ogTitle", title).strip()
+    og_title = og_title.replace('\n', ' ').replace('\r', ' ')
+    og_title = re.sub(r'\s+', ' ', og_title)
+    result["ogTitle"] = og_title
+    
+    result.setdefault("ogDescription", result.get("metaDescription", "")[:160].strip())
+    result.setdefault("canonicalUrl", f"https://callrounded.com/blog/{slug}")
+    result.setdefault("translationGroup", slug)
+    result.setdefault("readTime", f"{read_time} min")
+    
+    # S'assurer que les mots-clés cibles sont inclus
+    if target_keywords:
+        existing_keywords = result.get("keywords", [])
+        # Ajouter les mots-clés cibles s'ils ne sont pas déjà présents
+        for kw in target_keywords:
+            if kw not in existing_keywords:
+                existing_keywords.append(kw)
+        result["keywords"] = existing_keywords[:8]  # Max 8 mots-clés
+    
+    # Vérifier que focusKeyword est défini
+    if not result.get("focusKeyword") and target_keywords:
+        result["focusKeyword"] = target_keywords[0]
+
+    # Corps HTML rendu localement depuis le Markdown (le modèle ne renvoie que les métadonnées)
+    result["blog_post"] = markdown_to_html(article)
+    return result
+
+
+@traced()
+def optimize_seo(article: str, target_keywords: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Retourne les métadonnées SEO de l'article (titre, slug, meta, mots-clés...).
+    Le modèle ne renvoie que les métadonnées ; blog_post est rendu localement
+    depuis le Markdown (utils.markdown_renderer).
+    """
+    if not llm_available("optimize_seo"):
+        # Fallback simple
+        return _fallback_seo(article, target_keywords)
+    
+    print("🔍 Optimisation SEO avancée...")
     
-    user_prompt = f"""Article à optimiser SEO :
+    # Si des mots-clés cibles existent, on les ajoute explicitement au prompt SEO
+    keywords_context = _seo_keywords_context(article, target_keywords)
+    
+    def render(sections: Dict[str, str]) -> List[Dict[str, str]]:
+        user_prompt = f"""{keywords_context}
 
-{article}
+Article :
 
-{keywords_context if keywords_context else ""}
+{sections["article"]}"""
+        return [
+            {"role": "system", "content": SEO_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
 
-Optimise cet article en respectant TOUTES les règles SEO ci-dessus. Retourne UNIQUEMENT le JSON, sans texte autour."""
+    # Sortie courte (métadonnées) ; l'article est plafonné, les métadonnées ne demandent pas les annexes
+    plan = build_prompt("optimize_seo", render, [Section("article", article, priority=1, min_tokens=1500, max_tokens=4000)])
     
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+        response, route = _create_completion(
+            "optimize_seo",
+            messages=plan.messages,
             response_format={"type": "json_object"},
             temperature=0.3,  # Plus bas pour plus de cohérence SEO
-            max_tokens=4000
+            max_tokens=plan.max_tokens
         )
         
-        # Tracker les tokens
+        # Tracker les tokens (avant le parsing : un JSON invalide est facturé aussi)
         if hasattr(response, 'usage') and response.usage:
             try:
                 from utils.token_tracker import track_openai_usage
                 track_openai_usage(
                     operation="optimize_seo",
-                    model="gpt-4o-mini",
-                    usage={
-                        "prompt_tokens": response.usage.prompt_tokens,
-                        "completion_tokens": response.usage.completion_tokens,
-                        "total_tokens": response.usage.total_tokens
-                    },
-                    article_title=result.get("title", "") if 'result' in locals() else None
+                    model=route["model"],
+                    latency_seconds=route["latency_seconds"],
+                    usage=usage_to_dict(response.usage),
                 )
             except Exception as e:
                 print(f"⚠️  Erreur tracking tokens: {e}")
         
-        result = json.loads(response.choices[0].message.content)
-        
-        # Nettoyer les titres pour enlever les caractères problématiques
-        title = result.get("title", "").strip()
-        title = title.replace('\n', ' ').replace('\r', ' ')
-        title = re.sub(r'\s+', ' ', title)
-        result["title"] = title
+        result = _normalize_seo(json.loads(response.choices[0].message.content), article, target_keywords)
         
-        # S'assurer que tous les champs sont présents
-        slug = result.get("slug", article[:50].lower().replace(' ', '-'))
-        slug = re.sub(r'[^a-z0-9-]', '', slug.lower())
-        
-        # Optimiser metaTitle avec mot-clé principal si disponible
-        meta_title = result.get("metaTitle", title)[:60].strip()
-        if target_keywords and target_keywords[0] not in meta_title.lower():
-            # Essayer d'inclure le mot-clé principal
-            main_kw = target_keywords[0]
-            if len(meta_title) + len(main_kw) + 3 <= 60:
-                meta_title = f"{main_kw}: {meta_title}"
-        meta_title = meta_title.replace('\n', ' ').replace('\r', ' ')
-        meta_title = re.sub(r'\s+', ' ', meta_title)
-        result["metaTitle"] = meta_title[:60]
-        
-        # Optimiser metaDescription avec mot-clé et CTA
-        meta_desc = result.get("metaDescription", result.get("summary", ""))[:160].strip()
-        if target_keywords and target_keywords[0] not in meta_desc.lower():
-            main_kw = target_keywords[0]
-            if len(meta_desc) + len(main_kw) + 10 <= 160:
-                meta_desc = f"{main_kw}: {meta_desc}"
-        # Ajouter un CTA si pas présent
-        if "découvrir" not in meta_desc.lower() and "apprendre" not in meta_desc.lower():
-            if len(meta_desc) + 15 <= 160:
-                meta_desc = f"{meta_desc} Découvrez comment."
-        result["metaDescription"] = meta_desc[:160]
-        
-        og_title = result.get("ogTitle", title).strip()
-        og_title = og_title.replace('\n', ' ').replace('\r', ' ')
-        og_title = re.sub(r'\s+', ' ', og_title)
-        result["ogTitle"] = og_title
-        
-        result.setdefault("ogDescription", result.get("metaDescription", "")[:160].strip())
-        result.setdefault("canonicalUrl", f"https://callrounded.com/blog/{slug}")
-        result.setdefault("translationGroup", slug)
-        result.setdefault("readTime", f"{read_time} min")
-        
-        # S'assurer que les mots-clés cibles sont inclus
-        if target_keywords:
-            existing_keywords = result.get("keywords", [])
-            # Ajouter les mots-clés cibles s'ils ne sont pas déjà présents
-            for kw in target_keywords:
-                if kw not in existing_keywords:
-                    existing_keywords.append(kw)
-            result["keywords"] = existing_keywords[:8]  # Max 8 mots-clés
-        
-        # Vérifier que focusKeyword est défini
-        if not result.get("focusKeyword") and target_keywords:
-            result["focusKeyword"] = target_keywords[0]
-        
-        print("✅ SEO optimisé avec intégration avancée des mots-clés")
+        print("✅ Métadonnées SEO générées")
         return result
     except Exception as e:
         print(f"⚠️  Erreur SEO: {e}")
         # Fallback
-        slug = article[:50].lower().replace(' ', '-').replace("'", '').replace(",", '').replace("?", '').replace(".", '')
-        slug = re.sub(r'[^a-z0-9-]', '', slug)
-        title = article.split('\n')[0].replace('#', '').strip()[:60]
-        summary = article[:155]
+        return _fallback_seo(article, target_keywords)
+
+
+
+# Étapes combinées (sortie JSON structurée par schéma) : SEO + scoring de l'article final
+# en un appel, traduction + SEO anglais en un appel. COMBINED_STAGES=0 : appels séparés.
+COMBINED_STAGES = os.getenv("COMBINED_STAGES", "1") != "0"
+
+SEO_SCORING_SYSTEM_PROMPT = """Tu réalises en une seule réponse deux tâches sur le même article final :
+A. MÉTADONNÉES SEO → objet "seo"
+B. SCORING QUALITÉ → objet "scoring" (évalue l'article tel qu'il est fourni)
+
+Le format exact de la réponse est imposé par le schéma JSON : ignore les exemples de format JSON
+des consignes ci-dessous (mêmes champs, regroupés dans "seo" et "scoring").
+
+=== A. MÉTADONNÉES SEO ===
+""" + SEO_SYSTEM_PROMPT + """
+
+=== B. SCORING QUALITÉ ===
+""" + SCORING_SYSTEM_PROMPT
+
+SEO_SCORING_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "seo_and_scoring",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "seo": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string"},
+                        "summary": {"type": "string"},
+                        "slug": {"type": "string"},
+                        "readTime": {"type": "string"},
+                        "tag": {"type": "string", "enum": ["actualites-tendances", "guides-pratiques"]},
+                        "keywords": {"type": "array", "items": {"type": "string"}},
+                        "focusKeyword": {"type": "string"},
+                        "metaTitle": {"type": "string"},
+                        "metaDescription": {"type": "string"},
+                        "ogTitle": {"type": "string"},
+                        "ogDescription": {"type": "string"},
+                    },
+                    "required": [
+                        "title", "summary", "slug", "readTime", "tag", "keywords",
+                        "focusKeyword", "metaTitle", "metaDescription", "ogTitle", "ogDescription",
+                    ],
+                    "additionalProperties": False,
+                },
+                "scoring": {
+                    "type": "object",
+                    "properties": {
+                        "global_score": {"type": "integer"},
+                        "content_score": {"type": "integer"},
+                        "readability_score": {"type": "integer"},
+                        "seo_score": {"type": "integer"},
+                        "conversion_score": {"type": "integer"},
+                        "credibility_score": {"type": "integer"},
+                        "markdown_report": {"type": "string"},
+                        "actions": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {"section": {"type": "string"}, "action": {"type": "string"}},
+                                "required": ["section", "action"],
+                                "additionalProperties": False,
+                            },
+                        },
+                    },
+                    "required": [
+                        "global_score", "content_score", "readability_score", "seo_score",
+                        "conversion_score", "credibility_score", "markdown_report", "actions",
+                    ],
+                    "additionalProperties": False,
+                },
+            },
+            "required": ["seo", "scoring"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+@traced()
+def optimize_seo_and_score(
+    article: str,
+    topic: str,
+    target_keywords: Optional[List[str]] = None,
+    article_title: Optional[str] = None,
+    iteration: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Métadonnées SEO et scoring de l'article final en un seul appel : l'article
+    n'est envoyé (et relu par le modèle) qu'une fois au lieu de deux.
+
+    Returns:
+        {"seo": format optimize_seo, "scoring": format score_article_quality}
+        En cas d'échec (JSON invalide, réponse tronquée...), repli sur les deux appels séparés.
+    """
+    if not llm_available("optimize_seo_and_score"):
+        return {"seo": _fallback_seo(article, target_keywords), "scoring": _empty_scoring()}
+
+    print("🔍 Métadonnées SEO + scoring (appel combiné)...")
+
+    keywords_context = _seo_keywords_context(article, target_keywords)
+    scoring_context = _scoring_context(article, topic, target_keywords, article_title)
+
+    def render(sections: Dict[str, str]) -> List[Dict[str, str]]:
+        user_prompt = f"""{keywords_context}
+{scoring_context}
+ARTICLE FINAL (métadonnées SEO et évaluation) :
+---
+{sections["article"]}
+---
+"""
+        return [
+            {"role": "system", "content": SEO_SCORING_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    plan = build_prompt("optimize_seo_and_score", render, [Section("article", article, priority=0)])
+
+    try:
+        response, route = _create_completion(
+            "optimize_seo_and_score",
+            messages=plan.messages,
+            response_format=SEO_SCORING_RESPONSE_FORMAT,
+            temperature=0.2,
+            max_tokens=plan.max_tokens,
+        )
+
+        usage = usage_to_dict(response.usage) if getattr(response, "usage", None) else None
+        if usage:
+            try:
+                from utils.token_tracker import track_openai_usage
+                track_openai_usage(
+                    operation="optimize_seo_and_score",
+                    model=route["model"],
+                    latency_seconds=route["latency_seconds"],
+                    usage=usage,
+                    topic=topic,
+                    article_title=article_title,
+                )
+            except Exception as e:
+                print(f"⚠️  Erreur tracking tokens (optimize_seo_and_score): {e}")
+
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            raise ValueError(f"réponse tronquée à {plan.max_tokens} tokens")
+        data = json.loads(choice.message.content)
+        result = {
+            "seo": _normalize_seo(data["seo"], article, target_keywords),
+            "scoring": _normalize_scoring(data["scoring"]),
+        }
+        if usage:
+            _record_scoring("optimize_seo_and_score", result["scoring"], route, usage, topic, target_keywords,
+                            article_title, iteration)
+        print(f"✅ Métadonnées SEO générées et article évalué (score global : {result['scoring']['global_score']})")
+        return result
+    except Exception as e:
+        print(f"⚠️  Erreur appel combiné SEO + scoring ({e}) : repli sur deux appels séparés")
         return {
-            "title": title,
-            "summary": summary,
-            "blog_post": article,
-            "slug": slug,
-            "readTime": "5 min",
-            "tag": "actualites-tendances",
-            "keywords": target_keywords or [],
-            "metaTitle": title[:60],
-            "metaDescription": summary[:160],
-            "ogTitle": title,
-            "ogDescription": summary[:160],
-            "canonicalUrl": f"https://callrounded.com/blog/{slug}",
-            "translationGroup": slug
+            "seo": optimize_seo(article, target_keywords),
+            "scoring": score_article_quality(article, topic, target_keywords, article_title=article_title, iteration=iteration),
         }
 
 
-def save_article_for_review(article_data: Dict[str, Any], topic: str, english_data: Dict[str, Any] = None, custom_filename: str = None) -> Path:
-    """Sauvegarde l'article dans un fichier pour review au format blog Rounded (FR + EN)."""
+def save_article_for_review(article_data: Dict[str, Any], topic: str, english_data: Dict[str, Any] = None, custom_filename: str = None, scoring: Dict[str, Any] = None, generated_at: Optional[datetime] = None) -> Path:
+    """Sauvegarde l'article dans un fichier pour review au format blog Rounded (FR + EN).
+
+    scoring (optionnel) : rapport de score_article_quality, dont les scores sont
+    conservés dans le sidecar pour l'historique.
+    generated_at (optionnel) : date de génération d'origine, pour réécrire un
+    article existant (ex: nouvelle traduction) sans changer sa date.
+    """
     if custom_filename:
         filename = custom_filename
         filepath = ARTICLES_DIR / filename
@@ -1588,18 +2605,25 @@ def save_article_for_review(article_data: Dict[str, Any], topic: str, english_da
     html_fr = article_data.get("blog_post", article_data.get("original_content", ""))
     markdown_fr = article_data.get("original_content", "")
 
+    # HTML (pour Sanity) dans le blob store adressé par contenu : écrit une seule fois,
+    # avant le sidecar qui y fait référence ; un HTML identique au Markdown pointe sur celui-ci
+    html_refs = {"fr_html": None if html_fr == markdown_fr else put_blob(filepath.parent, html_fr)}
+
     # Date de publication souhaitée : veille (J-1)
-    published_date = datetime.now() - timedelta(days=1)
+    generated_at = generated_at or datetime.now()
+    published_date = generated_at - timedelta(days=1)
 
     # En-tête au format "blog Rounded" (comme l'exemple 20251211_135947...)
-    content = f"""# {title_fr}
+    # Les corps sont des segments nommés pour que le sidecar puisse pointer dessus
+    segments = [
+        (None, f"""# {title_fr}
 
 **Sujet original:** {topic}  
 **Slug:** {slug_fr}  
 **Catégorie:** {tag_fr}  
 **Temps de lecture:** {read_time}  
 **Focus Keyword:** {focus_kw}  
-**Généré le:** {datetime.now().strftime("%d/%m/%Y %H:%M:%S")}
+**Généré le:** {generated_at.strftime("%d/%m/%Y %H:%M:%S")}
 
 ---
 
@@ -1617,14 +2641,18 @@ def save_article_for_review(article_data: Dict[str, Any], topic: str, english_da
 
 ## Contenu HTML (pour Sanity)
 
-{html_fr}
+"""),
+        (None, html_body_note(html_refs["fr_html"])),
+        (None, """
 
 ---
 
 ## Contenu Markdown (version originale)
 
-{markdown_fr}
-"""
+"""),
+        ("fr_markdown", markdown_fr),
+        (None, "\n"),
+    ]
 
     # Ajouter une section EN après pour référence (optionnelle)
     if english_data:
@@ -1633,8 +2661,10 @@ def save_article_for_review(article_data: Dict[str, Any], topic: str, english_da
         summary_en = english_data.get("summary", "")
         html_en = english_data.get("blog_post", english_data.get("original_content", ""))
         markdown_en = english_data.get("original_content", html_en)
+        html_refs["en_html"] = None if html_en == markdown_en else put_blob(filepath.parent, html_en)
 
-        content += f"""
+        segments += [
+            (None, f"""
 ---
 
 ## Version ANGLAISE
@@ -1651,14 +2681,39 @@ def save_article_for_review(article_data: Dict[str, Any], topic: str, english_da
 
 ### Contenu HTML EN (pour Sanity)
 
-{html_en}
+"""),
+            (None, html_body_note(html_refs["en_html"])),
+            (None, """
 
 ### Contenu Markdown EN (version originale)
 
-{markdown_en}
-"""
+"""),
+            ("en_markdown", markdown_en),
+            (None, "\n"),
+        ]
     
-    filepath.write_text(content, encoding='utf-8')
+    content, body_refs = assemble_review_file(segments)
+    for name, ref in html_refs.items():
+        body_refs[name] = ref or body_refs[name.replace("_html", "_markdown")]
+    # Écriture binaire : les offsets du sidecar sont en octets (pas de conversion de fins de ligne)
+    atomic_write_bytes(filepath, content.encode('utf-8'))
+
+    # Sidecar structuré (champs Sanity + références des corps) pour l'historique et la publication
+    try:
+        metadata = build_review_metadata(
+            filepath,
+            topic,
+            article_data,
+            english_data,
+            body_refs,
+            published_at=published_date.isoformat(),
+            generated_at=generated_at,
+            scoring=scoring,
+        )
+        write_review_metadata(filepath, metadata)
+    except Exception as e:
+        print(f"⚠️  Erreur écriture des métadonnées de review: {e}")
+
     return filepath
 
 
@@ -1715,6 +2770,7 @@ def ask_validation() -> bool:
         return False
 
 
+@traced()
 def fetch_sanity_references(category_slug: str) -> Dict[str, str]:
     """Récupère les références Sanity"""
     if not SANITY_TOKEN:
@@ -1737,7 +2793,7 @@ def fetch_sanity_references(category_slug: str) -> Dict[str, str]:
     }
     
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        response = requests.post(url, headers=headers, json=payload, timeout=30, hooks=requests_hooks())
         if response.status_code == 200:
             result = response.json()
             return result.get("result", {})
@@ -1749,29 +2805,8 @@ def fetch_sanity_references(category_slug: str) -> Dict[str, str]:
 
 def add_article_to_knowledge_base(title: str, slug: str, date: str = None):
     """Ajoute un article à la base de connaissances pour éviter les doublons"""
-    json_path = Path("data/articles_existants.json")
-    
     try:
-        if json_path.exists():
-            with open(json_path, 'r', encoding='utf-8') as f:
-                articles = json.load(f)
-        else:
-            articles = []
-        
-        # Vérifier si l'article existe déjà
-        existing = any(art.get("titre") == title or art.get("slug") == slug for art in articles)
-        if not existing:
-            articles.append({
-                "date": date or datetime.now().strftime("%Y-%m-%d"),
-                "auteur": "Matthieu HUBERT",
-                "titre": title,
-                "slug": slug,
-                "description": ""
-            })
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(articles, f, ensure_ascii=False, indent=2)
-            
+        if get_knowledge_base().add(title, slug, date):
             print(f"✅ Article ajouté à la base de connaissances")
     except Exception as e:
         print(f"⚠️  Erreur lors de l'ajout à la base: {e}")
@@ -1803,14 +2838,157 @@ def extract_title_from_markdown(content: str) -> str:
     return ""
 
 
+def _build_english_article(english_content: str, english_seo: Dict[str, Any], article_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Article anglais (format publish_to_production) à partir de la traduction et de ses métadonnées SEO"""
+    # Extraire le titre depuis le contenu markdown si l'IA ne le fournit pas correctement
+    extracted_title = extract_title_from_markdown(english_content)
+    
+    # Nettoyer le titre pour enlever les caractères problématiques
+    # Utiliser le titre extrait du markdown si le titre SEO est vide ou problématique
+    title = english_seo.get("title", extracted_title).strip()
+    if not title or len(title) < 5:
+        title = extracted_title
+    
+    # Garder les caractères normaux mais s'assurer qu'il n'y a pas de problèmes d'encodage
+    title = title.replace('\n', ' ').replace('\r', ' ')
+    # Nettoyer les espaces multiples
+    title = re.sub(r'\s+', ' ', title)
+    # S'assurer que le titre ne dépasse pas 100 caractères (limite raisonnable)
+    if len(title) > 100:
+        title = title[:97] + "..."
+    
+    meta_title = english_seo.get("metaTitle", title).strip()[:60]
+    meta_title = meta_title.replace('\n', ' ').replace('\r', ' ')
+    meta_title = re.sub(r'\s+', ' ', meta_title)
+    
+    og_title = english_seo.get("ogTitle", title).strip()
+    og_title = og_title.replace('\n', ' ').replace('\r', ' ')
+    og_title = re.sub(r'\s+', ' ', og_title)
+    
+    return {
+        "original_content": english_content,
+        "blog_post": markdown_to_html(english_content),
+        "title": title,
+        "summary": english_seo.get("summary", "").strip(),
+        "slug": english_seo.get("slug", article_data.get("slug", "") + "-en"),
+        "metaTitle": meta_title,
+        "metaDescription": english_seo.get("metaDescription", "")[:160].strip(),
+        "ogTitle": og_title,
+        "ogDescription": english_seo.get("ogDescription", "")[:160].strip(),
+        "canonicalUrl": english_seo.get("canonicalUrl", f"https://callrounded.com/blog/{english_seo.get('slug', '')}"),
+        "translationGroup": article_data.get("translationGroup", ""),  # Même Translation Group
+        "language": "en"
+    }
+
+
+TRANSLATE_SEO_SYSTEM_PROMPT = """You are a professional translator and SEO copywriter specializing in medical and healthcare technology content.
+
+In a single answer:
+1. Translate the French article (Markdown) to English into "article_markdown" while:
+- Maintaining the same structure and style
+- Keeping the same tone (professional but accessible)
+- Preserving all technical terms appropriately
+- Keeping mentions of "Donna" and links to https://callrounded.com/cas-usage/secretariat-medical
+- Maintaining the same formatting (headings, lists, paragraphs)
+- Keeping the same length and depth
+2. Write the English SEO metadata of the translated article:
+- title: SEO-optimized title in English (max 65 chars)
+- summary: Meta description in English (155-160 chars)
+- slug: URL-friendly slug in English (lowercase, hyphens)
+- metaTitle: SEO title (50-60 chars)
+- metaDescription: SEO meta description (155-160 chars)
+- ogTitle: Open Graph title
+- ogDescription: Open Graph description (155-160 chars)
+
+The response format is enforced by the JSON schema."""
+
+TRANSLATE_SEO_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "translation_with_seo",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "article_markdown": {"type": "string"},
+                "title": {"type": "string"},
+                "summary": {"type": "string"},
+                "slug": {"type": "string"},
+                "metaTitle": {"type": "string"},
+                "metaDescription": {"type": "string"},
+                "ogTitle": {"type": "string"},
+                "ogDescription": {"type": "string"},
+            },
+            "required": [
+                "article_markdown", "title", "summary", "slug",
+                "metaTitle", "metaDescription", "ogTitle", "ogDescription",
+            ],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _translate_with_seo(article_data: Dict[str, Any], original_content: str) -> Optional[Dict[str, Any]]:
+    """Traduction + métadonnées SEO anglaises en un seul appel (None en cas d'échec)"""
+    plan = build_prompt(
+        "translate_article_seo",
+        lambda sections: [
+            {"role": "system", "content": TRANSLATE_SEO_SYSTEM_PROMPT},
+            {"role": "user", "content": f"French article to translate:\n\n{sections['article']}"}
+        ],
+        [Section("article", original_content, priority=0)],
+        source_text=original_content,
+    )
+    try:
+        response, route = _create_completion(
+            "translate_article_seo",
+            messages=plan.messages,
+            response_format=TRANSLATE_SEO_RESPONSE_FORMAT,
+            temperature=0.5,
+            max_tokens=plan.max_tokens
+        )
+
+        if hasattr(response, 'usage') and response.usage:
+            try:
+                from utils.token_tracker import track_openai_usage
+                track_openai_usage(
+                    operation="translate_article_seo",
+                    model=route["model"],
+                    latency_seconds=route["latency_seconds"],
+                    usage=usage_to_dict(response.usage),
+                    article_title=article_data.get("title", "")
+                )
+            except Exception as e:
+                print(f"⚠️  Erreur tracking tokens: {e}")
+
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            raise ValueError(f"réponse tronquée à {plan.max_tokens} tokens")
+        data = json.loads(choice.message.content)
+        english_content = data.pop("article_markdown", "").strip()
+        if not english_content:
+            raise ValueError("traduction vide")
+        return _build_english_article(english_content, data, article_data)
+    except Exception as e:
+        print(f"⚠️  Erreur traduction + SEO combinés ({e}) : repli sur deux appels séparés")
+        return None
+
+
+@traced()
 def generate_english_version(article_data: Dict[str, Any]) -> Dict[str, Any]:
     """Génère une version anglaise de l'article"""
-    if not openai_client:
+    if not llm_available("translate_article"):
         return None
     
     print("🌐 Génération de la version anglaise...")
     
     original_content = article_data.get("original_content", article_data.get("blog_post", ""))
+
+    if COMBINED_STAGES:
+        english_article = _translate_with_seo(article_data, original_content)
+        if english_article:
+            return english_article
     
     system_prompt = """You are a professional translator specializing in medical and healthcare technology content.
 
@@ -1825,14 +3003,20 @@ Translate the French article to English while:
 Return the translated article in the same format (Markdown with headings, paragraphs, lists)."""
     
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+        plan = build_prompt(
+            "translate_article",
+            lambda sections: [
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Translate this French article to English:\n\n{original_content}"}
+                {"role": "user", "content": f"Translate this French article to English:\n\n{sections['article']}"}
             ],
+            [Section("article", original_content, priority=0)],
+            source_text=original_content,
+        )
+        response, route = _create_completion(
+            "translate_article",
+            messages=plan.messages,
             temperature=0.7,
-            max_tokens=4000
+            max_tokens=plan.max_tokens
         )
         
         # Tracker les tokens
@@ -1841,12 +3025,9 @@ Return the translated article in the same format (Markdown with headings, paragr
                 from utils.token_tracker import track_openai_usage
                 track_openai_usage(
                     operation="translate_article",
-                    model="gpt-4o-mini",
-                    usage={
-                        "prompt_tokens": response.usage.prompt_tokens,
-                        "completion_tokens": response.usage.completion_tokens,
-                        "total_tokens": response.usage.total_tokens
-                    },
+                    model=route["model"],
+                    latency_seconds=route["latency_seconds"],
+                    usage=usage_to_dict(response.usage),
                     article_title=article_data.get("title", "")
                 )
             except Exception as e:
@@ -1854,9 +3035,6 @@ Return the translated article in the same format (Markdown with headings, paragr
         
         english_content = response.choices[0].message.content
         
-        # Extraire le titre depuis le contenu markdown si l'IA ne le fournit pas correctement
-        extracted_title = extract_title_from_markdown(english_content)
-        
         # Générer les métadonnées SEO en anglais
         seo_prompt = """You are an expert SEO copywriter. Based on the English article, return JSON with:
 - title: SEO-optimized title in English (max 65 chars)
@@ -1868,14 +3046,21 @@ Return the translated article in the same format (Markdown with headings, paragr
 - ogDescription: Open Graph description (155-160 chars)
 - canonicalUrl: Full canonical URL (https://callrounded.com/blog/{slug}-en)"""
         
-        seo_response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+        # Les métadonnées ne demandent pas l'article entier : début de l'article seulement
+        seo_plan = build_prompt(
+            "optimize_seo_en",
+            lambda sections: [
                 {"role": "system", "content": seo_prompt},
-                {"role": "user", "content": english_content}
+                {"role": "user", "content": sections["article"]}
             ],
+            [Section("article", english_content, priority=1, min_tokens=800, max_tokens=2000)],
+        )
+        seo_response, seo_route = _create_completion(
+            "optimize_seo",
+            messages=seo_plan.messages,
             response_format={"type": "json_object"},
-            temperature=0.7
+            temperature=0.7,
+            max_tokens=seo_plan.max_tokens
         )
         
         # Tracker les tokens
@@ -1884,55 +3069,16 @@ Return the translated article in the same format (Markdown with headings, paragr
                 from utils.token_tracker import track_openai_usage
                 track_openai_usage(
                     operation="optimize_seo",
-                    model="gpt-4o-mini",
-                    usage={
-                        "prompt_tokens": seo_response.usage.prompt_tokens,
-                        "completion_tokens": seo_response.usage.completion_tokens,
-                        "total_tokens": seo_response.usage.total_tokens
-                    },
+                    model=seo_route["model"],
+                    latency_seconds=seo_route["latency_seconds"],
+                    usage=usage_to_dict(seo_response.usage),
                     article_title=article_data.get("title", "")
                 )
             except Exception as e:
                 print(f"⚠️  Erreur tracking tokens: {e}")
         
         english_seo = json.loads(seo_response.choices[0].message.content)
-        
-        # Nettoyer le titre pour enlever les caractères problématiques
-        # Utiliser le titre extrait du markdown si le titre SEO est vide ou problématique
-        title = english_seo.get("title", extracted_title).strip()
-        if not title or len(title) < 5:
-            title = extracted_title
-        
-        # Garder les caractères normaux mais s'assurer qu'il n'y a pas de problèmes d'encodage
-        title = title.replace('\n', ' ').replace('\r', ' ')
-        # Nettoyer les espaces multiples
-        title = re.sub(r'\s+', ' ', title)
-        # S'assurer que le titre ne dépasse pas 100 caractères (limite raisonnable)
-        if len(title) > 100:
-            title = title[:97] + "..."
-        
-        meta_title = english_seo.get("metaTitle", title).strip()[:60]
-        meta_title = meta_title.replace('\n', ' ').replace('\r', ' ')
-        meta_title = re.sub(r'\s+', ' ', meta_title)
-        
-        og_title = english_seo.get("ogTitle", title).strip()
-        og_title = og_title.replace('\n', ' ').replace('\r', ' ')
-        og_title = re.sub(r'\s+', ' ', og_title)
-        
-        return {
-            "original_content": english_content,
-            "blog_post": english_content,  # Plain text pour Sanity
-            "title": title,
-            "summary": english_seo.get("summary", "").strip(),
-            "slug": english_seo.get("slug", article_data.get("slug", "") + "-en"),
-            "metaTitle": meta_title,
-            "metaDescription": english_seo.get("metaDescription", "")[:160].strip(),
-            "ogTitle": og_title,
-            "ogDescription": english_seo.get("ogDescription", "")[:160].strip(),
-            "canonicalUrl": english_seo.get("canonicalUrl", f"https://callrounded.com/blog/{english_seo.get('slug', '')}"),
-            "translationGroup": article_data.get("translationGroup", ""),  # Même Translation Group
-            "language": "en"
-        }
+        return _build_english_article(english_content, english_seo, article_data)
     except Exception as e:
         print(f"⚠️  Erreur génération version anglaise: {e}")
         return None
@@ -1968,6 +3114,7 @@ def convert_html_to_plain_text(html_content: str) -> str:
     return text
 
 
+@traced()
 def publish_to_production(article_data: Dict[str, Any], references: Dict[str, str], language: str = "fr") -> bool:
     """Publie directement en PRODUCTION avec tous les champs Sanity"""
     if not SANITY_TOKEN:
@@ -2094,7 +3241,7 @@ def publish_to_production(article_data: Dict[str, Any], references: Dict[str, st
     }
     
     try:
-        response = requests.post(url, headers=headers, json=mutation, timeout=30)
+        response = requests.post(url, headers=headers, json=mutation, timeout=30, hooks=requests_hooks())
         if response.status_code == 200:
             result = response.json()
             print(f"✅ Article publié en PRODUCTION ({language.upper()}) !")
@@ -2126,6 +3273,197 @@ def publish_to_production(article_data: Dict[str, Any], references: Dict[str, st
         return False
 
 
+MAX_SCORING_ITERATIONS = 3
+
+
+def run_article_pipeline(ctx) -> Dict[str, Any]:
+    """
+    Pipeline complet de rédaction utilisé par l'interface Streamlit, exécuté
+    en arrière-plan par utils.jobs (submit_job(..., runner=run_article_pipeline)).
+
+    generate → style → scoring → jusqu'à 3× (régénération + scoring) → SEO
+    → analyse SEO → version anglaise. Avec COMBINED_STAGES, le scoring de
+    chaque réécriture produit aussi les métadonnées SEO (optimize_seo_and_score) :
+    celles de la version retenue sont réutilisées, sans appel SEO séparé. Chaque étape est un checkpoint
+    (ctx.run_stage) : après un redémarrage, la reprise du job repart de la
+    première étape non terminée. Les étapes de rédaction (generate, style,
+    regenerate_N) sont streamées : leurs deltas alimentent la sortie live
+    du job, affichée au fil de l'eau par l'interface.
+
+    ctx.params attendus : chosen_variant, web_results, target_keywords, topic,
+    generation_mode (optionnel : "sequential" ou "sections", défaut GENERATION_MODE),
+    regeneration_mode (optionnel : "full" ou "incremental", défaut REGENERATION_MODE),
+    speculative_draft (optionnel : {"group", "key"} de start_speculative_drafts, brouillon
+    en un seul appel repris en mode "sequential", annulé en mode "sections").
+    En mode incremental, chaque itération ne réécrit que les sections visées par
+    le scoring (regenerate_article_incremental) et ne réévalue que ces sections
+    (rescore_changed_sections) ; repli sur la réécriture complète sinon.
+
+    Returns:
+        {final_article, english_article, scoring_before, scoring_after, seo_analysis}
+    """
+    # Toutes les étapes partagent le run id de la génération (idées → rédaction → publication)
+    with trace_run(ctx.params.get("trace_run_id") or ctx.job_id):
+        return _run_article_pipeline(ctx)
+
+
+def _run_article_pipeline(ctx) -> Dict[str, Any]:
+    params = ctx.params
+    chosen_variant = params["chosen_variant"]
+
+    def streamed(func, *args, **kwargs):
+        """Étape en streaming : les deltas alimentent la sortie live du job (suivie par l'UI)"""
+        return lambda: collect_stream(func(*args, stream=True, **kwargs), on_delta=ctx.emit)
+
+    topic = params.get("topic", "")
+    target_keywords = params.get("target_keywords") or []
+    article_title = chosen_variant.get("title", topic)
+
+    # 1. Génération de l'article brut (un appel streamé, ou sections en parallèle)
+    sections_mode = (params.get("generation_mode") or GENERATION_MODE) == "sections"
+    if sections_mode:
+        write_step = lambda: generate_article_by_sections(
+            chosen_variant, params.get("web_results", ""), target_keywords, on_part=ctx.emit,
+        )
+    else:
+        write_step = streamed(generate_article, chosen_variant, params.get("web_results", ""), target_keywords)
+
+    # Brouillon spéculatif de la variante choisie (lancé pendant le choix) repris s'il est disponible.
+    # Il est rédigé en un seul appel : en mode sections (choisi après son lancement), il est annulé
+    draft = params.get("speculative_draft") or {}
+    if draft.get("group") and sections_mode:
+        cancel_drafts(draft["group"])
+        generate_step = write_step
+    elif draft.get("group"):
+        generate_step = lambda: claim_draft(draft["group"], str(draft.get("key")), on_delta=ctx.emit) or write_step()
+    else:
+        generate_step = write_step
+    raw_article = ctx.run_stage("generate", generate_step, label="✍️ Rédaction de l'article...", percent=5)
+
+    # 2. Raffinement du style
+    styled_article = ctx.run_stage(
+        "style", streamed(apply_style_refinement, raw_article),
+        label="🎨 Raffinement du style...", percent=20,
+    )
+
+    # 3. Scoring initial (avant réécriture finale)
+    scoring_before = ctx.run_stage(
+        "score_before", score_article_quality, styled_article, topic, target_keywords,
+        article_title=article_title, iteration=0, label="📊 Scoring initial...", percent=35,
+    )
+
+    # 4. Régénération jusqu'à amélioration du score
+    improved_article = styled_article
+    scoring_after = None
+    seo_result = None
+    scoring_reference = scoring_before
+    score_before_value = (scoring_before or {}).get('global_score') or 0
+
+    regeneration_mode = params.get("regeneration_mode") or REGENERATION_MODE
+
+    for iteration in range(1, MAX_SCORING_ITERATIONS + 1):
+        percent = 35 + iteration * 10
+        incremental = None
+        if regeneration_mode == "incremental":
+            incremental = ctx.run_stage(
+                f"regenerate_sections_{iteration}", regenerate_article_incremental,
+                improved_article, scoring_reference, topic, target_keywords, on_part=ctx.emit,
+                label=f"🔁 Réécriture ciblée {iteration}/{MAX_SCORING_ITERATIONS}...", percent=percent,
+            )
+
+        if incremental:
+            improved_article = incremental["article"]
+            scoring_after = ctx.run_stage(
+                f"rescore_{iteration}", rescore_changed_sections, scoring_reference, improved_article,
+                incremental["changed"], topic, target_keywords, article_title=article_title, iteration=iteration,
+                label=f"📊 Scoring des sections modifiées {iteration}/{MAX_SCORING_ITERATIONS}...", percent=percent + 5,
+            )
+            # Métadonnées SEO d'une version antérieure : recalculées sur la version finale
+            seo_result = None
+        else:
+            improved_article = ctx.run_stage(
+                f"regenerate_{iteration}",
+                streamed(
+                    regenerate_article_with_scoring,
+                    improved_article,
+                    scoring_reference.get("markdown", "") if scoring_reference else "",
+                    topic,
+                    target_keywords,
+                ),
+                label=f"🔁 Réécriture {iteration}/{MAX_SCORING_ITERATIONS}...", percent=percent,
+            )
+            if COMBINED_STAGES:
+                combined = ctx.run_stage(
+                    f"seo_score_{iteration}", optimize_seo_and_score, improved_article, topic, target_keywords,
+                    article_title=article_title, iteration=iteration, label=f"📊 Scoring + SEO {iteration}/{MAX_SCORING_ITERATIONS}...",
+                    percent=percent + 5,
+                )
+                scoring_after, seo_result = combined["scoring"], combined["seo"]
+            else:
+                scoring_after = ctx.run_stage(
+                    f"score_{iteration}", score_article_quality, improved_article, topic, target_keywords,
+                    article_title=article_title, iteration=iteration, label=f"📊 Scoring {iteration}/{MAX_SCORING_ITERATIONS}...", percent=percent + 5,
+                )
+
+        score_after_value = (scoring_after or {}).get('global_score') or 0
+        if score_after_value > score_before_value:
+            print(f"✅ Score amélioré : {score_before_value} → {score_after_value} (itération {iteration})")
+            break
+        elif iteration < MAX_SCORING_ITERATIONS:
+            print(f"⚠️  Score non amélioré ({score_after_value} vs {score_before_value}), réitération {iteration + 1}/{MAX_SCORING_ITERATIONS}")
+            scoring_reference = scoring_after
+        else:
+            print(f"⚠️  Score final : {score_after_value} (itération {iteration}/{MAX_SCORING_ITERATIONS})")
+
+    # 5. Optimisation SEO sur la version améliorée (déjà faite par l'appel combiné)
+    def _optimize():
+        optimized = seo_result if seo_result is not None else optimize_seo(improved_article, target_keywords)
+        optimized["original_content"] = improved_article
+        return optimized
+
+    final_article = ctx.run_stage("seo", _optimize, label="🔍 Optimisation SEO...", percent=75)
+
+    # 6. Analyse SEO avancée (locale, pas d'appel API)
+    def _analyze():
+        try:
+            from utils.seo_analyzer import analyze_seo_comprehensive
+            return analyze_seo_comprehensive(
+                improved_article,
+                final_article.get("title", ""),
+                final_article.get("metaTitle", ""),
+                final_article.get("metaDescription", ""),
+                target_keywords,
+                final_article.get("focusKeyword")
+            )
+        except Exception as e:
+            print(f"⚠️  Erreur analyse SEO: {e}")
+            return None
+
+    seo_analysis = ctx.run_stage("seo_analysis", _analyze, label="🔎 Analyse SEO...", percent=80)
+
+    # 7. Version anglaise
+    english_article = ctx.run_stage(
+        "translate", generate_english_version, final_article,
+        label="🌐 Génération de la version anglaise...", percent=85,
+    )
+
+    # 7.5. Lisibilité de la version anglaise (règles de syllabes EN)
+    if english_article and seo_analysis:
+        try:
+            from utils.readability import analyze_readability
+            seo_analysis["readability_en"] = analyze_readability(english_article.get("original_content", ""), "en")
+        except Exception as e:
+            print(f"⚠️  Erreur lisibilité EN: {e}")
+
+    return {
+        "final_article": final_article,
+        "english_article": english_article,
+        "scoring_before": scoring_before,
+        "scoring_after": scoring_after,
+        "seo_analysis": seo_analysis,
+    }
+
+
 def main():
     """Workflow complet"""
     print("=" * 70)
@@ -2133,9 +3471,10 @@ def main():
     print("=" * 70)
     print()
     
-    # Récupérer le sujet et la variante éventuelle
+    # Récupérer le sujet, la variante et le mode de rédaction éventuels
     variant_arg = None
     topic = None
+    generation_mode = GENERATION_MODE
     
     if len(sys.argv) > 1:
         # Chercher --variant dans les arguments
@@ -2147,6 +3486,14 @@ def main():
                 args = args[:idx] + args[idx+2:]
             else:
                 args = args[:idx]
+        # --mode sequential|sections (rédaction en un appel ou par sections en parallèle)
+        if "--mode" in args:
+            idx = args.index("--mode")
+            if idx + 1 < len(args):
+                generation_mode = args[idx + 1]
+                args = args[:idx] + args[idx+2:]
+            else:
+                args = args[:idx]
         topic = " ".join(args) if args else None
     else:
         try:
@@ -2154,6 +3501,10 @@ def main():
         except (EOFError, KeyboardInterrupt):
             print("\n❌ Annulé")
             sys.exit(1)
+
+    if generation_mode not in GENERATION_MODES:
+        print(f"⚠️  Mode de rédaction {generation_mode} inconnu, utilisation du mode séquentiel")
+        generation_mode = "sequential"
     
     if not topic:
         print("❌ Un sujet est requis")
@@ -2208,6 +3559,11 @@ def main():
         
         print("=" * 70)
         print()
+
+        # Pré-rédaction pendant le choix interactif (SPECULATIVE_DRAFTS=top|all)
+        speculative_group = None if variant_arg else start_speculative_drafts(
+            topic_variants, web_results, target_keywords, generation_mode=generation_mode,
+        )
         
         # 4. Demander de choisir la variante de sujet
         if variant_arg:
@@ -2237,13 +3593,24 @@ def main():
         
         # 5. Générer l'article complet pour la variante choisie
         print("📝 Étape 4/9: Génération de l'article complet...")
-        raw_article = generate_article(chosen_variant, web_results, target_keywords)
+        # Brouillon spéculatif de la variante choisie si disponible (les autres sont annulés)
+        raw_article = claim_draft(speculative_group, str(chosen_num - 1)) if speculative_group else None
+        if not raw_article:
+            if generation_mode == "sections":
+                raw_article = generate_article_by_sections(chosen_variant, web_results, target_keywords)
+            else:
+                raw_article = generate_article(chosen_variant, web_results, target_keywords)
         styled = apply_style_refinement(raw_article)
         print("✅ Article généré et stylisé\n")
 
-        # 6. SEO pour l'article choisi
+        # 6. SEO pour l'article choisi (+ scoring dans le même appel si COMBINED_STAGES)
         print("🔍 Étape 5/9: Optimisation SEO...")
-        article_data = optimize_seo(styled, target_keywords)
+        scoring = None
+        if COMBINED_STAGES:
+            combined = optimize_seo_and_score(styled, topic, target_keywords, article_title=chosen_variant.get("title", topic))
+            article_data, scoring = combined["seo"], combined["scoring"]
+        else:
+            article_data = optimize_seo(styled, target_keywords)
         article_data["original_content"] = styled
         print("✅ SEO optimisé\n")
 
@@ -2257,7 +3624,7 @@ def main():
         
         # 8. Créer le fichier de review (FR + EN)
         print("💾 Étape 7/9: Création du fichier de review (FR + EN)...")
-        final_filepath = save_article_for_review(article_data, chosen_variant.get("title", topic), english_data)
+        final_filepath = save_article_for_review(article_data, chosen_variant.get("title", topic), english_data, scoring=scoring)
         print(f"✅ Fichier de review créé: {final_filepath.name}\n")
         
         # 9. Afficher résumé et demander validation
@@ -2344,5 +3711,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with trace_run():
+        main()
 
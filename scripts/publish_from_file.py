@@ -5,7 +5,6 @@ Script pour publier un article directement depuis un fichier de review
 
 import os
 import sys
-import json
 import requests
 import uuid
 import re
@@ -16,6 +15,9 @@ from dotenv import load_dotenv
 
 # Ajouter le chemin parent pour les imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.article_archive import is_archived, restore_article
+from utils.knowledge_base import get_knowledge_base
+from utils.review_metadata import load_review_metadata, read_body
 
 load_dotenv()
 
@@ -26,7 +28,7 @@ SANITY_TOKEN_ENV = os.getenv("SANITY_TOKEN", "")
 SANITY_TOKEN = SANITY_TOKEN_ENV if SANITY_TOKEN_ENV else "skyTy1Xvie474Pt4OYYa7s0HqD1aGgCb7RZyxFOYJ9HBq15hHOPzMaI6BxPdhMnOi1yT0zQ3ubBlnVV7us72zp40zB5iN1mlCVbl7wUMux4EZveQkZlRyvqUs0rxKT1y9ahmoskzhphhzUYSKrA4DGtHMI3cCgtlVUTgyZkcz2P9OQa22mz2"
 SANITY_PROJECT_ID = "8y6orojx"
 SANITY_DATASET = "production"  # Changé de "development" à "production"
-SANITY_API_URL = f"https://{SANITY_PROJECT_ID}.api.sanity.io/v2025-12-11"
+SANITY_API_URL = os.getenv("SANITY_API_URL", f"https://{SANITY_PROJECT_ID}.api.sanity.io/v2025-12-11")
 
 
 def generate_key():
@@ -461,36 +463,48 @@ def parse_marks(text: str):
 
 def add_to_knowledge_base(title: str, slug: str):
     """Ajoute l'article à la base de connaissances"""
-    json_path = Path(__file__).parent.parent / "data" / "articles_existants.json"
-    
     try:
-        if json_path.exists():
-            with open(json_path, 'r', encoding='utf-8') as f:
-                articles = json.load(f)
-        else:
-            articles = []
-        
-        # Vérifier si l'article existe déjà
-        existing = any(art.get("titre") == title or art.get("slug") == slug for art in articles)
-        if not existing:
-            articles.insert(0, {
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "auteur": "Matthieu HUBERT",
-                "titre": title,
-                "slug": slug,
-                "description": ""
-            })
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(articles, f, ensure_ascii=False, indent=2)
-            
+        if get_knowledge_base().add(title, slug):
             print(f"✅ Article ajouté à la base de connaissances")
     except Exception as e:
         print(f"⚠️  Erreur lors de l'ajout à la base: {e}")
 
 
+SANITY_FIELDS = [
+    "title", "slug", "excerpt", "metaTitle", "metaDescription", "canonicalUrl",
+    "ogTitle", "ogDescription", "translationGroup", "publishedAt",
+]
+
+
 def parse_review_file(filepath: Path) -> Dict[str, Any]:
-    """Parse le fichier de review pour extraire les données"""
+    """
+    Extrait les données d'un fichier de review.
+
+    Utilise le sidecar <nom>.meta.json écrit par save_article_for_review : les champs
+    Sanity y sont déjà structurés et le corps est lu directement à sa position dans
+    le fichier. Les anciens fichiers sans sidecar sont parsés par regex.
+    """
+    metadata = load_review_metadata(filepath)
+    if metadata and metadata.get("fr"):
+        data = {"fr": {}, "en": {}}
+        for language in ("fr", "en"):
+            fields = metadata.get(language)
+            if not fields:
+                continue
+            body = read_body(filepath, fields.get("body_ref"))
+            if body is None:
+                # Corps modifié à la main depuis la génération : relire le fichier complet
+                print(f"⚠️  Corps {language.upper()} modifié depuis la génération, lecture par regex")
+                return parse_review_file_legacy(filepath)
+            data[language] = {key: fields.get(key, "") for key in SANITY_FIELDS}
+            data[language]["body"] = body.strip()
+        return data
+    
+    return parse_review_file_legacy(filepath)
+
+
+def parse_review_file_legacy(filepath: Path) -> Dict[str, Any]:
+    """Parse un ancien fichier de review (sans sidecar) pour extraire les données"""
     content = filepath.read_text(encoding='utf-8')
     
     # Extraire les sections
@@ -847,6 +861,10 @@ def main():
             sys.exit(1)
         filepath = articles[0]
     
+    if not filepath.exists() and is_archived(filepath.name):
+        # Article archivé (articles/archive/) : remis dans articles/ avant publication
+        filepath = restore_article(filepath.name)
+    
     if not filepath.exists():
         print(f"❌ Fichier non trouvé: {filepath}")
         sys.exit(1)
@@ -20,6 +20,9 @@ from typing import Dict, Any
 from dotenv import load_dotenv
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.durable_io import atomic_write_text
+
 load_dotenv()
 
 # Configuration
@@ -226,7 +229,7 @@ def save_article_for_review(article_data: Dict[str, Any], topic: str) -> Path:
 {article_data.get('original_content', 'N/A')}
 """
     
-    filepath.write_text(content, encoding='utf-8')
+    atomic_write_text(filepath, content)
     return filepath
 
 
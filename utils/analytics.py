@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 """
 Analytics et reporting pour les articles générés
-- Statistiques d'évolution des scores
+- Statistiques d'évolution des scores (historique indexé utils.score_history)
 - Tendances des coûts
 - Taux de publication
-- Temps de génération
+- Temps de génération (mesurés via utils.tracing)
 """
 
 import json
@@ -12,7 +12,12 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from collections import defaultdict
-import re
+
+from utils.article_archive import list_archived
+from utils.durable_io import read_json, write_json
+from utils.review_metadata import get_review_metadata, format_generated_at
+from utils.score_history import daily_scores, improvement_stats
+from utils.tracing import load_spans, get_run_durations, get_stage_latency_stats, percentile
 
 BASE_DIR = Path(__file__).parent.parent
 ARTICLES_DIR = BASE_DIR / "articles"
@@ -22,67 +27,45 @@ ANALYTICS_FILE = BASE_DIR / "data" / "analytics.json"
 
 def load_analytics_data() -> Dict[str, Any]:
     """Charge les données analytics"""
-    if not ANALYTICS_FILE.exists():
-        return {
-            "articles": [],
-            "scores_history": [],
-            "costs_history": []
-        }
-    
-    try:
-        with open(ANALYTICS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"⚠️  Erreur chargement analytics: {e}")
+    data = read_json(ANALYTICS_FILE)
+    if not isinstance(data, dict):
         return {
             "articles": [],
             "scores_history": [],
             "costs_history": []
         }
+    return data
 
 
 def save_analytics_data(data: Dict[str, Any]):
     """Sauvegarde les données analytics"""
     try:
-        ANALYTICS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(ANALYTICS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        write_json(ANALYTICS_FILE, data)
     except Exception as e:
         print(f"⚠️  Erreur sauvegarde analytics: {e}")
 
 
 def extract_article_metadata(article_file: Path) -> Optional[Dict[str, Any]]:
-    """Extrait les métadonnées d'un article depuis le fichier"""
+    """Extrait les métadonnées d'un article depuis son sidecar (.meta.json)"""
     try:
-        content = article_file.read_text(encoding="utf-8")
-        
-        # Extraire le slug
-        slug_match = re.search(r'\*\*Slug:\*\* (.+)', content)
-        slug = slug_match.group(1).strip() if slug_match else None
-        
-        # Extraire la date
-        date_match = re.search(r'\*\*Généré le:\*\* (.+)', content)
-        date_str = date_match.group(1).strip() if date_match else None
+        # Le sidecar évite de relire le corps ; les anciens fichiers sont parsés une fois puis complétés
+        metadata = get_review_metadata(article_file)
+        stat = article_file.stat()
         
-        # Extraire le titre
-        title_match = re.search(r'^# (.+)$', content, re.MULTILINE)
-        title = title_match.group(1) if title_match else article_file.stem
-        
-        # Compter les mots
-        word_count = len(content.split())
+        word_count = metadata.get("word_count") or 0
         
         # Estimer le temps de lecture
         read_time = max(3, round(word_count / 200))
         
         return {
             "filename": article_file.name,
-            "title": title,
-            "slug": slug,
-            "date": date_str,
+            "title": metadata.get("title") or article_file.stem,
+            "slug": metadata.get("slug"),
+            "date": format_generated_at(metadata),
             "word_count": word_count,
             "read_time": read_time,
-            "file_size": article_file.stat().st_size,
-            "created_at": datetime.fromtimestamp(article_file.stat().st_mtime).isoformat()
+            "file_size": stat.st_size,
+            "created_at": metadata.get("generated_at") or datetime.fromtimestamp(stat.st_mtime).isoformat()
         }
     except Exception as e:
         print(f"⚠️  Erreur extraction métadonnées {article_file.name}: {e}")
@@ -90,7 +73,7 @@ def extract_article_metadata(article_file: Path) -> Optional[Dict[str, Any]]:
 
 
 def get_all_articles_metadata() -> List[Dict[str, Any]]:
-    """Récupère les métadonnées de tous les articles"""
+    """Récupère les métadonnées de tous les articles (récents et archivés)"""
     if not ARTICLES_DIR.exists():
         return []
     
@@ -100,15 +83,33 @@ def get_all_articles_metadata() -> List[Dict[str, Any]]:
         if metadata:
             articles.append(metadata)
     
+    # Articles archivés : métadonnées de l'index de l'archive, sans décompresser les fichiers
+    present = {a["filename"] for a in articles}
+    for filename, record in list_archived().items():
+        if filename in present:
+            continue
+        summary = record["metadata"]
+        word_count = summary.get("word_count") or 0
+        articles.append({
+            "filename": filename,
+            "title": summary.get("title") or Path(filename).stem,
+            "slug": summary.get("slug"),
+            "date": format_generated_at(summary),
+            "word_count": word_count,
+            "read_time": max(3, round(word_count / 200)),
+            "file_size": record["size"],
+            "created_at": summary.get("generated_at") or datetime.fromtimestamp(record["mtime"]).isoformat(),
+            "archived": True,
+        })
+    
     # Trier par date de création (plus récent en premier)
     articles.sort(key=lambda x: x.get("created_at", ""), reverse=True)
     return articles
 
 
-def get_score_evolution() -> List[Dict[str, Any]]:
-    """Récupère l'évolution des scores au fil du temps"""
-    analytics = load_analytics_data()
-    return analytics.get("scores_history", [])
+def get_score_evolution(days: int = 90) -> List[Dict[str, Any]]:
+    """Score global moyen par jour et moyenne glissante 7 jours (data/score_history.jsonl)"""
+    return daily_scores("global_score", days=days, window=7)
 
 
 def get_cost_trends(days: int = 30) -> List[Dict[str, Any]]:
@@ -179,46 +180,32 @@ def get_publication_stats() -> Dict[str, Any]:
     }
 
 
-def get_generation_time_stats() -> Dict[str, Any]:
-    """Calcule les statistiques de temps de génération"""
-    try:
-        with open(TOKEN_HISTORY_FILE, "r", encoding="utf-8") as f:
-            history = json.load(f)
-    except:
-        return {}
-    
-    # Grouper par opération "generate_article" (génération complète)
-    generation_entries = [
-        e for e in history
-        if e.get("operation") in ["generate_article", "style_refinement", "optimize_seo"]
-    ]
-    
-    if not generation_entries:
+def get_generation_time_stats(days: Optional[int] = 30) -> Dict[str, Any]:
+    """
+    Statistiques de temps de génération mesurées (data/traces.jsonl).
+
+    Un run = une génération (toutes les étapes partagent le même run id) ;
+    sa durée est la somme des spans de premier niveau. Les latences par
+    étape (p50 / p95) viennent de get_stage_latency_stats.
+    """
+    spans = load_spans(days)
+    generation_runs = {s.get("run_id") for s in spans if s.get("stage") == "generate_article"}
+    if not generation_runs:
         return {}
     
-    # Estimer le temps basé sur les tokens (approximation)
-    # GPT-4o-mini: ~1000 tokens/seconde
-    total_tokens = sum(e.get("total_tokens", 0) for e in generation_entries)
-    estimated_time_seconds = total_tokens / 1000
-    
-    # Grouper par article (même topic/title)
-    articles_times = defaultdict(list)
-    for entry in generation_entries:
-        article_id = entry.get("article_title") or entry.get("topic", "unknown")
-        articles_times[article_id].append(entry.get("total_tokens", 0))
-    
-    # Temps moyen par article
-    avg_tokens_per_article = sum(
-        sum(tokens) for tokens in articles_times.values()
-    ) / len(articles_times) if articles_times else 0
-    
-    avg_time_per_article = avg_tokens_per_article / 1000  # secondes
+    run_durations = get_run_durations(days)
+    durations = [run_durations[run_id] for run_id in generation_runs if run_id in run_durations]
+    total_time = sum(durations)
+    avg_time_per_article = total_time / len(durations) if durations else 0
     
     return {
-        "total_generations": len(articles_times),
-        "total_time_seconds": round(estimated_time_seconds, 1),
+        "total_generations": len(generation_runs),
+        "total_time_seconds": round(total_time, 1),
         "avg_time_per_article_seconds": round(avg_time_per_article, 1),
-        "avg_time_per_article_minutes": round(avg_time_per_article / 60, 1)
+        "avg_time_per_article_minutes": round(avg_time_per_article / 60, 1),
+        "p50_time_per_article_seconds": round(percentile(durations, 50), 1),
+        "p95_time_per_article_seconds": round(percentile(durations, 95), 1),
+        "stages": get_stage_latency_stats(days),
     }
 
 
@@ -251,7 +238,8 @@ def get_comprehensive_stats() -> Dict[str, Any]:
             "trends_30d": cost_trends
         },
         "scores": {
-            "evolution": score_evolution
+            "evolution": score_evolution,
+            "improvement": improvement_stats(30),
         },
         "timestamp": datetime.now().isoformat()
     }
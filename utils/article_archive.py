@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Archive compressée des fichiers de review (articles/archive/)
+- Les articles anciens (ou déjà publiés) quittent articles/ : les parcours du
+  dossier (historique, analytics, compteur de mots-clés) ne voient plus que
+  les articles récents
+- Un fichier compressé par article (zstd si le paquet zstandard est installé,
+  gzip sinon) : lire un article ne décompresse que lui
+- Sidecar .meta.json conservé tel quel à côté du fichier compressé (références
+  des corps, champs Sanity)
+- Index articles/archive/index.json : champs du catalogue de chaque article
+  archivé, sans ouvrir le moindre fichier
+- Lecture transparente : load_metadata / read_review_body / read_review_text
+  cherchent dans articles/ puis dans l'archive ; write_metadata met à jour le
+  sidecar d'un article archivé sans le restaurer
+
+ARCHIVE_AFTER_DAYS : âge (jours depuis la génération) au-delà duquel un article
+est archivé par scripts/archive_articles.py.
+"""
+
+import gzip
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.durable_io import atomic_write_bytes, file_lock, read_json, update_json, write_json
+from utils.review_metadata import (
+    body_hash,
+    delete_review_files,
+    get_review_metadata,
+    load_review_metadata,
+    read_body,
+    sidecar_path,
+    write_review_metadata,
+)
+
+try:
+    import zstandard
+except ImportError:  # Optionnel : gzip (bibliothèque standard) à la place
+    zstandard = None
+
+BASE_DIR = Path(__file__).parent.parent
+ARTICLES_DIR = BASE_DIR / "articles"
+ARCHIVE_DIR = ARTICLES_DIR / "archive"
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+
+INDEX_VERSION = 1
+ZSTD_LEVEL = 10
+
+# Champs du sidecar repris dans l'index (ceux du catalogue et des analytics)
+INDEX_FIELDS = ("title", "slug", "topic", "summary", "keywords", "tag", "generated_at", "word_count", "scores")
+
+_lock = threading.Lock()
+_cache: Dict[str, Any] = {"key": None, "index": None}
+_keyword_cache: Dict[str, Any] = {"key": None, "counts": {}}
+
+
+def index_path() -> Path:
+    return ARCHIVE_DIR / "index.json"
+
+
+def _empty_index() -> Dict[str, Any]:
+    return {"version": INDEX_VERSION, "articles": {}}
+
+
+def _compress(data: bytes) -> tuple:
+    """(codec, données compressées)"""
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return "gzip", gzip.compress(data, compresslevel=9)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("article archivé en zstd : installer le paquet zstandard pour le lire")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _index_key() -> Optional[int]:
+    try:
+        return index_path().stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _current_index() -> Dict[str, Any]:
+    """Index de l'archive, relu seulement si index.json a changé"""
+    key = _index_key()
+    with _lock:
+        if _cache["index"] is not None and _cache["key"] == key:
+            return _cache["index"]
+        index = read_json(index_path(), None) if key is not None else None
+        if not isinstance(index, dict) or not isinstance(index.get("articles"), dict):
+            index = _empty_index()
+        _cache.update({"key": key, "index": index})
+        return index
+
+
+def index_key() -> Optional[int]:
+    """Clé d'invalidation des caches qui incluent l'archive (mtime de index.json)"""
+    return _index_key()
+
+
+def list_archived() -> Dict[str, Dict[str, Any]]:
+    """Articles archivés : {nom du fichier: entrée d'index} (ne pas modifier les entrées)"""
+    return _current_index()["articles"]
+
+
+def is_archived(filename: str) -> bool:
+    return filename in list_archived()
+
+
+def _archive_paths(filename: str, record: Dict[str, Any]) -> tuple:
+    """(fichier compressé, sidecar) d'un article archivé"""
+    return ARCHIVE_DIR / record["blob"], sidecar_path(ARCHIVE_DIR / filename)
+
+
+def _read_archived_bytes(filename: str) -> Optional[bytes]:
+    """Contenu décompressé d'un article archivé (None s'il n'est pas dans l'archive)"""
+    record = list_archived().get(filename)
+    if record is None:
+        return None
+    blob_path, _ = _archive_paths(filename, record)
+    try:
+        return _decompress(record["codec"], blob_path.read_bytes())
+    except Exception as e:
+        print(f"⚠️  Erreur lecture archive {filename}: {e}")
+        return None
+
+
+def _index_summary(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Champs du sidecar repris dans l'index de l'archive"""
+    summary = {field: metadata.get(field) for field in INDEX_FIELDS}
+    summary["has_en"] = bool(metadata.get("en"))
+    return summary
+
+
+def _published_slugs() -> set:
+    # Import tardif : la base de connaissances dépend du catalogue, qui dépend de l'archive
+    from utils.knowledge_base import get_knowledge_base
+
+    return {a["slug"] for a in get_knowledge_base().articles() if a.get("slug")}
+
+
+def select_candidates(older_than_days: int = ARCHIVE_AFTER_DAYS, published: bool = False,
+                      directory: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    Articles de articles/ à archiver : générés il y a plus de older_than_days
+    jours, ou (published=True) déjà dans la base de connaissances.
+    """
+    directory = directory or ARTICLES_DIR
+    cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+    published_slugs = _published_slugs() if published else set()
+    candidates = []
+    for path in sorted(directory.glob("*.md")):
+        try:
+            metadata = get_review_metadata(path)
+        except Exception as e:
+            print(f"⚠️  Erreur métadonnées {path.name}: {e}")
+            continue
+        generated_at = metadata.get("generated_at") or datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+        if generated_at < cutoff:
+            reason = "age"
+        elif metadata.get("slug") and metadata["slug"] in published_slugs:
+            reason = "published"
+        else:
+            continue
+        candidates.append({"path": path, "reason": reason, "generated_at": generated_at})
+    return candidates
+
+
+def archive_article(review_path: Path, reason: str = "manual") -> Optional[Dict[str, Any]]:
+    """
+    Déplace un fichier de review (et son sidecar) dans l'archive compressée.
+
+    Ordre des écritures : fichier compressé et sidecar, puis index, puis
+    suppression des originaux. Après un crash, l'article est au pire présent
+    deux fois (l'original l'emporte) mais jamais perdu.
+
+    Returns:
+        L'entrée d'index, ou None si le fichier n'existe plus
+    """
+    review_path = Path(review_path)
+    filename = review_path.name
+    # Verrou du fichier de review : save_article_for_review ne peut pas le réécrire pendant le déplacement
+    with file_lock(review_path):
+        if not review_path.exists():
+            return None
+        metadata = get_review_metadata(review_path)
+        data = review_path.read_bytes()
+        stat = review_path.stat()
+        codec, compressed = _compress(data)
+        blob = f"{filename}.{'zst' if codec == 'zstd' else 'gz'}"
+
+        atomic_write_bytes(ARCHIVE_DIR / blob, compressed)
+        write_json(sidecar_path(ARCHIVE_DIR / filename), metadata)
+
+        record = {
+            "blob": blob,
+            "codec": codec,
+            "size": len(data),
+            "compressed_size": len(compressed),
+            "mtime": stat.st_mtime,
+            "archived_at": datetime.now().isoformat(),
+            "reason": reason,
+            "metadata": _index_summary(metadata),
+        }
+        with update_json(index_path(), _empty_index) as index:
+            previous = index["articles"].get(filename)
+            index["articles"][filename] = record
+        if previous and previous["blob"] != blob:
+            (ARCHIVE_DIR / previous["blob"]).unlink(missing_ok=True)
+
+        delete_review_files(review_path)
+    return record
+
+
+def archive_articles(older_than_days: int = ARCHIVE_AFTER_DAYS, published: bool = False,
+                     dry_run: bool = False) -> List[Dict[str, Any]]:
+    """Archive les articles sélectionnés par select_candidates ; retourne les articles traités"""
+    done = []
+    for candidate in select_candidates(older_than_days, published):
+        if dry_run:
+            done.append(candidate)
+            continue
+        try:
+            record = archive_article(candidate["path"], candidate["reason"])
+        except Exception as e:
+            print(f"⚠️  Erreur archivage {candidate['path'].name}: {e}")
+            continue
+        if record:
+            done.append({**candidate, "record": record})
+    return done
+
+
+def restore_article(filename: str, directory: Optional[Path] = None) -> Optional[Path]:
+    """
+    Remet un article archivé dans articles/ (avant de le modifier ou de le publier).
+
+    Returns:
+        Le chemin du fichier de review, ou None si l'article n'est pas archivé
+    """
+    directory = directory or ARTICLES_DIR
+    review_path = directory / filename
+    with file_lock(review_path):
+        record = list_archived().get(filename)
+        if record is None:
+            return review_path if review_path.exists() else None
+        data = _read_archived_bytes(filename)
+        if data is None:
+            raise RuntimeError(f"{filename} : fichier archivé illisible")
+        blob_path, archived_sidecar = _archive_paths(filename, record)
+        metadata = load_review_metadata(ARCHIVE_DIR / filename)
+
+        atomic_write_bytes(review_path, data)
+        if metadata is not None:
+            write_json(sidecar_path(review_path), metadata)
+        with update_json(index_path(), _empty_index) as index:
+            index["articles"].pop(filename, None)
+        blob_path.unlink(missing_ok=True)
+        archived_sidecar.unlink(missing_ok=True)
+    print(f"✅ {filename} restauré depuis l'archive")
+    return review_path
+
+
+def delete_archived(filename: str) -> bool:
+    """Supprime un article de l'archive (fichier compressé, sidecar et entrée d'index)"""
+    with file_lock(ARTICLES_DIR / filename):
+        with update_json(index_path(), _empty_index) as index:
+            record = index["articles"].pop(filename, None)
+        if record is None:
+            return False
+        blob_path, archived_sidecar = _archive_paths(filename, record)
+        blob_path.unlink(missing_ok=True)
+        archived_sidecar.unlink(missing_ok=True)
+    return True
+
+
+def load_metadata(review_path: Path) -> Optional[Dict[str, Any]]:
+    """Sidecar d'un fichier de review, dans articles/ ou dans l'archive"""
+    review_path = Path(review_path)
+    if review_path.exists() or not is_archived(review_path.name):
+        return load_review_metadata(review_path)
+    return load_review_metadata(ARCHIVE_DIR / review_path.name)
+
+
+def write_metadata(review_path: Path, metadata: Dict[str, Any]) -> Path:
+    """
+    Écrit le sidecar d'un fichier de review, dans articles/ ou dans l'archive.
+
+    Un article archivé reste archivé : son sidecar et son entrée d'index sont
+    mis à jour sur place (scores, champs SEO), sans décompresser le fichier.
+    """
+    review_path = Path(review_path)
+    with file_lock(review_path):
+        if review_path.exists() or not is_archived(review_path.name):
+            return write_review_metadata(review_path, metadata)
+        path = write_review_metadata(ARCHIVE_DIR / review_path.name, metadata)
+        with update_json(index_path(), _empty_index) as index:
+            record = index["articles"].get(review_path.name)
+            if record is not None:
+                record["metadata"] = _index_summary(metadata)
+    return path
+
+
+def read_review_body(review_path: Path, ref: Optional[Dict[str, Any]]) -> Optional[str]:
+    """read_body avec repli sur l'archive (seul le fichier de l'article est décompressé)"""
+    review_path = Path(review_path)
+    # Les blobs (articles/blobs/) ne sont pas archivés : seul le fichier de review est compressé
+    if review_path.exists() or not ref or ref.get("blob"):
+        return read_body(review_path, ref)
+    data = _read_archived_bytes(review_path.name)
+    if data is None:
+        return None
+    try:
+        text = data[ref["offset"]:ref["offset"] + ref["length"]].decode("utf-8")
+    except (KeyError, UnicodeDecodeError):
+        return None
+    return text if body_hash(text) == ref.get("sha256") else None
+
+
+def read_review_text(review_path: Path) -> Optional[str]:
+    """Contenu complet d'un fichier de review, dans articles/ ou dans l'archive (None s'il n'existe pas)"""
+    review_path = Path(review_path)
+    try:
+        return review_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        data = _read_archived_bytes(review_path.name)
+        return data.decode("utf-8") if data is not None else None
+
+
+def archived_keyword_counts(keywords: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Occurrences de mots-clés dans les articles archivés :
+    {mot-clé en minuscules: {"total_occurrences": int, "articles": [...]}}
+
+    Un seul passage sur l'archive pour tous les mots-clés absents du cache ;
+    le cache est vidé quand l'index change (archivage, restauration).
+    """
+    wanted = {k.lower() for k in keywords}
+    key = _index_key()
+    with _lock:
+        if _keyword_cache["key"] != key:
+            _keyword_cache.update({"key": key, "counts": {}})
+        counts = _keyword_cache["counts"]
+        missing = [k for k in wanted if k not in counts]
+    if missing:
+        found = {k: {"total_occurrences": 0, "articles": []} for k in missing}
+        patterns = {k: re.compile(re.escape(k)) for k in missing}
+        for filename in sorted(list_archived()):
+            data = _read_archived_bytes(filename)
+            if data is None:
+                continue
+            content = data.decode("utf-8", errors="replace").lower()
+            for keyword, pattern in patterns.items():
+                count = len(pattern.findall(content))
+                if count > 0:
+                    found[keyword]["total_occurrences"] += count
+                    found[keyword]["articles"].append(filename)
+        with _lock:
+            if _keyword_cache["key"] == key:
+                counts.update(found)
+        counts = {**counts, **found}
+    return {k: counts[k] for k in wanted}
+
+
+def archive_stats() -> Dict[str, Any]:
+    """Taille de l'archive : nombre d'articles, octets d'origine et compressés"""
+    records = list_archived().values()
+    size = sum(r["size"] for r in records)
+    compressed = sum(r["compressed_size"] for r in records)
+    return {
+        "articles": len(records),
+        "size": size,
+        "compressed_size": compressed,
+        "ratio": round(size / compressed, 1) if compressed else None,
+    }
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Catalogue des articles en review (articles/*.md)
+- Construit à partir des sidecars .meta.json (jamais des corps d'articles)
+- Inclut les articles archivés (articles/archive/, via l'index de l'archive)
+- Mis en cache dans le process, invalidé par le mtime du dossier articles/ et
+  de l'index de l'archive
+- Index plein texte (titre, slug, résumé, mots-clés, sujet) avec recherche par préfixe
+- Tri, filtres et pagination côté serveur
+"""
+
+import bisect
+import re
+import threading
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set
+
+from utils import article_archive
+from utils.review_metadata import get_review_metadata, format_generated_at
+
+BASE_DIR = Path(__file__).parent.parent
+ARTICLES_DIR = BASE_DIR / "articles"
+
+SORT_FIELDS = {
+    "date": lambda e: e["generated_at"] or "",
+    "title": lambda e: e["title_key"],
+    "score": lambda e: e["global_score"] if e["global_score"] is not None else -1,
+    "words": lambda e: e["word_count"],
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+_lock = threading.Lock()
+_cache: Dict[str, Any] = {"key": None, "catalog": None}
+
+
+def normalize_text(text: str) -> str:
+    """Minuscules sans accents (« Énergie » et « energie » doivent se retrouver)"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    """Découpe un texte normalisé en tokens alphanumériques"""
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+def _directory_key(directory: Path) -> Optional[tuple]:
+    """
+    Clé d'invalidation du cache : mtime du dossier et de l'index de l'archive.
+
+    Créer, supprimer ou renommer un fichier (y compris l'écriture atomique
+    des sidecars par rename) modifie le mtime du dossier ; l'archivage et la
+    restauration modifient aussi l'index de l'archive.
+    """
+    try:
+        stat = directory.stat()
+    except FileNotFoundError:
+        return None
+    return (str(directory), stat.st_mtime_ns, article_archive.index_key())
+
+
+def _build_entry(article_file: Path) -> Dict[str, Any]:
+    """Construit l'entrée de catalogue d'un article à partir de son sidecar"""
+    metadata = get_review_metadata(article_file)
+    stat = article_file.stat()
+    return _entry_from_metadata(article_file, metadata, stat.st_size, stat.st_mtime)
+
+
+def _archived_entry(filename: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Entrée de catalogue d'un article archivé, depuis l'index de l'archive (aucun fichier ouvert)"""
+    metadata = dict(record["metadata"], en=record["metadata"].get("has_en"))
+    entry = _entry_from_metadata(Path(filename), metadata, record["size"], record["mtime"])
+    entry["archived"] = True
+    return entry
+
+
+def _entry_from_metadata(article_file: Path, metadata: Dict[str, Any], size: int, mtime: float) -> Dict[str, Any]:
+    """Champs du catalogue (recherche, tri, filtres, affichage) d'un sidecar"""
+    scores = metadata.get("scores") or {}
+    word_count = metadata.get("word_count") or 0
+    title = metadata.get("title") or article_file.stem
+    keywords = metadata.get("keywords") or []
+    if isinstance(keywords, str):
+        keywords = [k.strip() for k in keywords.split(",") if k.strip()]
+
+    return {
+        "filename": article_file.name,
+        "title": title,
+        "title_key": normalize_text(title),
+        "slug": metadata.get("slug") or "",
+        "topic": metadata.get("topic") or "",
+        "summary": metadata.get("summary") or "",
+        "keywords": keywords,
+        "tag": metadata.get("tag"),
+        "has_en": bool(metadata.get("en")),
+        "date": format_generated_at(metadata),
+        "generated_at": metadata.get("generated_at") or datetime.fromtimestamp(mtime).isoformat(),
+        "word_count": word_count,
+        "read_time": max(3, round(word_count / 200)),
+        "file_size": size,
+        "scores": scores,
+        "global_score": scores.get("global_score"),
+        "archived": False,
+    }
+
+
+def _index_entry(index: Dict[str, Set[int]], position: int, entry: Dict[str, Any]):
+    """Ajoute les tokens d'une entrée à l'index inversé"""
+    fields = [entry["title"], entry["slug"], entry["summary"], entry["topic"], " ".join(entry["keywords"])]
+    for token in tokenize(" ".join(fields)):
+        index.setdefault(token, set()).add(position)
+
+
+def _load_catalog(directory: Path) -> Dict[str, Any]:
+    """Retourne le catalogue du dossier, reconstruit seulement si son mtime a changé"""
+    key = _directory_key(directory)
+    with _lock:
+        if key is not None and _cache["key"] == key:
+            return _cache["catalog"]
+
+        entries = []
+        if key is not None:
+            for article_file in directory.glob("*.md"):
+                try:
+                    entries.append(_build_entry(article_file))
+                except Exception as e:
+                    print(f"⚠️  Erreur catalogue {article_file.name}: {e}")
+
+        # Articles archivés : entrées lues dans l'index de l'archive (l'original l'emporte s'il existe encore)
+        if key is not None and directory.resolve() == article_archive.ARCHIVE_DIR.parent.resolve():
+            present = {entry["filename"] for entry in entries}
+            for filename, record in article_archive.list_archived().items():
+                if filename not in present:
+                    entries.append(_archived_entry(filename, record))
+
+        entries.sort(key=SORT_FIELDS["date"], reverse=True)
+        index: Dict[str, Set[int]] = {}
+        for position, entry in enumerate(entries):
+            _index_entry(index, position, entry)
+
+        # Nouveau dict à chaque reconstruction : une requête en cours garde un catalogue cohérent
+        catalog = {"entries": entries, "index": index, "tokens": sorted(index)}
+        # Un sidecar backfillé pendant la construction modifie le mtime : on relit la clé
+        _cache.update({"key": _directory_key(directory), "catalog": catalog})
+        return catalog
+
+
+def get_catalog(directory: Path = ARTICLES_DIR) -> List[Dict[str, Any]]:
+    """Retourne toutes les entrées du catalogue (plus récentes en premier)"""
+    return list(_load_catalog(directory)["entries"])
+
+
+def invalidate_catalog():
+    """Force la reconstruction du catalogue au prochain accès"""
+    with _lock:
+        _cache["key"] = None
+
+
+def _search_positions(catalog: Dict[str, Any], query: str) -> Optional[Set[int]]:
+    """
+    Positions des entrées qui contiennent tous les termes de la requête.
+
+    Chaque terme est recherché comme préfixe ("fact" trouve "facturation"),
+    ce qui permet une recherche pendant la saisie. None = pas de filtre.
+    """
+    terms = tokenize(query)
+    if not terms:
+        return None
+
+    tokens = catalog["tokens"]
+    index = catalog["index"]
+    result: Optional[Set[int]] = None
+    for term in terms:
+        matches: Set[int] = set()
+        start = bisect.bisect_left(tokens, term)
+        for token in tokens[start:]:
+            if not token.startswith(term):
+                break
+            matches |= index[token]
+        result = matches if result is None else result & matches
+        if not result:
+            return set()
+    return result
+
+
+def query_catalog(
+    search: str = "",
+    sort_by: str = "date",
+    descending: bool = True,
+    tag: Optional[str] = None,
+    keyword: Optional[str] = None,
+    min_score: Optional[float] = None,
+    page: int = 1,
+    page_size: int = 20,
+    directory: Path = ARTICLES_DIR,
+) -> Dict[str, Any]:
+    """
+    Recherche, filtre, trie et pagine le catalogue.
+
+    Returns:
+        {
+            "items": [...],   # entrées de la page demandée uniquement
+            "total": int,     # nombre d'entrées après recherche / filtres
+            "page": int,      # page effective (bornée)
+            "pages": int,
+            "catalog_size": int,
+        }
+    """
+    catalog = _load_catalog(directory)
+    entries = catalog["entries"]
+
+    positions = _search_positions(catalog, search or "")
+    if positions is None:
+        results = entries
+    else:
+        results = [entries[i] for i in sorted(positions)]
+
+    if tag:
+        results = [e for e in results if e["tag"] == tag]
+    if keyword:
+        keyword_key = normalize_text(keyword)
+        results = [e for e in results if any(normalize_text(k) == keyword_key for k in e["keywords"])]
+    if min_score is not None:
+        results = [e for e in results if e["global_score"] is not None and e["global_score"] >= min_score]
+
+    sort_key = SORT_FIELDS.get(sort_by, SORT_FIELDS["date"])
+    results = sorted(results, key=sort_key, reverse=descending)
+
+    total = len(results)
+    page_size = max(1, page_size)
+    pages = max(1, (total + page_size - 1) // page_size)
+    page = min(max(1, page), pages)
+    start = (page - 1) * page_size
+
+    return {
+        "items": results[start:start + page_size],
+        "total": total,
+        "page": page,
+        "pages": pages,
+        "catalog_size": len(entries),
+    }
+
+
+def get_catalog_facets(directory: Path = ARTICLES_DIR) -> Dict[str, List[str]]:
+    """Valeurs disponibles pour les filtres (catégories et mots-clés)"""
+    entries = _load_catalog(directory)["entries"]
+    tags = sorted({e["tag"] for e in entries if e["tag"]})
+    keywords = sorted({k for e in entries for k in e["keywords"]}, key=normalize_text)
+    return {"tags": tags, "keywords": keywords}
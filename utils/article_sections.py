@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Découpage d'un article Markdown en sections H2 (réécriture ciblée après scoring)
+- split_sections : préambule (titre H1 + introduction) puis une section par titre H2 ;
+  "".join des textes redonne exactement l'article d'origine
+- Rôle de chaque section : intro, faq, conclusion ou body
+- plan_section_edits : rattache les actions du rapport de scoring aux sections
+  (champ "actions" du scoring, sinon lignes du rapport Markdown), ajoute une
+  section FAQ avant la conclusion si elle est demandée et absente
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+H2_SPLIT_PATTERN = re.compile(r"^(?=##\s)", re.MULTILINE)
+H2_PATTERN = re.compile(r"^##\s+(.*?)\s*#*\s*$", re.MULTILINE)
+NUMBER_PREFIX_PATTERN = re.compile(r"^\d+[.)]\s*")
+ACTION_LINE_PATTERN = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.*\S)")
+
+# Cibles spéciales des actions (en plus des titres H2 exacts)
+TARGET_INTRO = "introduction"
+TARGET_FAQ = "faq"
+TARGET_CONCLUSION = "conclusion"
+TARGET_GLOBAL = "global"
+
+# Au-delà de cette part de sections à réécrire, une réécriture complète est plus simple
+MAX_EDITED_SHARE = 0.6
+
+FAQ_MARKERS = ("faq", "questions frequentes", "foire aux questions")
+CONCLUSION_MARKERS = ("conclusion", "en resume", "pour conclure", "en bref")
+
+# Repli sans champ "actions" : mots du rapport Markdown → section visée
+INFERRED_TARGETS = (
+    (FAQ_MARKERS, TARGET_FAQ),
+    (("introduction", "accroche", "chapo"), TARGET_INTRO),
+    (("cta", "appel a l'action", "appels a l'action", "conversion", "conclusion"), TARGET_CONCLUSION),
+)
+
+
+def _normalize(text: str) -> str:
+    """Minuscules sans accents ni numérotation, pour comparer des titres"""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii")
+    text = NUMBER_PREFIX_PATTERN.sub("", text.strip().lower().replace("*", ""))
+    return re.sub(r"\s+", " ", text).strip(" :.-")
+
+
+def section_role(heading: str, index: int) -> str:
+    """intro (préambule), faq, conclusion ou body d'après le titre H2"""
+    if index == 0 and not heading:
+        return "intro"
+    normalized = _normalize(heading)
+    if any(marker in normalized for marker in FAQ_MARKERS):
+        return "faq"
+    if any(normalized.startswith(marker) for marker in CONCLUSION_MARKERS):
+        return "conclusion"
+    return "body"
+
+
+def split_sections(article: str) -> List[Dict[str, Any]]:
+    """
+    Découpe l'article avant chaque titre H2 (les H3 restent dans leur section).
+
+    Returns:
+        [{"heading": titre H2 ("" pour le préambule), "text": Markdown complet, "role": str}, ...]
+    """
+    sections = []
+    for chunk in H2_SPLIT_PATTERN.split(article or ""):
+        if not chunk:
+            continue
+        match = H2_PATTERN.match(chunk)
+        heading = match.group(1) if match else ""
+        sections.append({"heading": heading, "text": chunk, "role": section_role(heading, len(sections))})
+    return sections
+
+
+def join_sections(sections: List[Dict[str, Any]]) -> str:
+    """Réassemble les sections (séparées par une ligne vide)"""
+    parts = [s["text"].strip("\n") for s in sections if s["text"].strip()]
+    return "\n\n".join(parts) + "\n"
+
+
+def outline(sections: List[Dict[str, Any]]) -> List[str]:
+    """Titres H2 de l'article, dans l'ordre"""
+    return [s["heading"] for s in sections if s["heading"]]
+
+
+def find_section(sections: List[Dict[str, Any]], target: str) -> Optional[int]:
+    """Index de la section visée (titre H2 exact ou approché, ou cible spéciale), None si introuvable"""
+    normalized = _normalize(target)
+    if not normalized or normalized == TARGET_GLOBAL:
+        return None
+    if normalized in (TARGET_INTRO, "intro", "preambule"):
+        return 0 if sections and sections[0]["role"] == "intro" else None
+    for role in ("faq", "conclusion"):
+        if normalized == role or (role == "faq" and normalized in FAQ_MARKERS):
+            matches = [i for i, s in enumerate(sections) if s["role"] == role]
+            return matches[-1] if matches else None
+    headings = [_normalize(s["heading"]) for s in sections]
+    if normalized in headings:
+        return headings.index(normalized)
+    # Titre cité partiellement par le rapport ("la section sur la confidentialité des données")
+    for index, heading in enumerate(headings):
+        if heading and (heading in normalized or normalized in heading):
+            return index
+    return None
+
+
+def _infer_target(action: str, sections: List[Dict[str, Any]]) -> str:
+    """Section probable d'une recommandation en texte libre (titre cité, FAQ, CTA...)"""
+    normalized = _normalize(action)
+    for index, section in enumerate(sections):
+        heading = _normalize(section["heading"])
+        if heading and heading in normalized:
+            return section["heading"]
+    for markers, target in INFERRED_TARGETS:
+        if any(marker in normalized for marker in markers):
+            return target
+    return TARGET_GLOBAL
+
+
+def actions_from_report(markdown_report: str, sections: List[Dict[str, Any]], limit: int = 8) -> List[Dict[str, str]]:
+    """
+    Repli pour les scorings sans champ "actions" : éléments de liste de la
+    partie "actions" du rapport (ou de tout le rapport à défaut).
+    """
+    lines = (markdown_report or "").splitlines()
+    start = next((i for i, line in enumerate(lines) if line.lstrip().startswith("#") and "action" in line.lower()), None)
+    if start is not None:
+        end = next((i for i in range(start + 1, len(lines)) if lines[i].lstrip().startswith("#")), len(lines))
+        lines = lines[start + 1:end]
+    actions = []
+    for line in lines:
+        match = ACTION_LINE_PATTERN.match(line)
+        if match:
+            actions.append({"section": _infer_target(match.group(1), sections), "action": match.group(1)})
+    return actions[:limit]
+
+
+def plan_section_edits(
+    sections: List[Dict[str, Any]],
+    scoring: Optional[Dict[str, Any]],
+    max_share: float = MAX_EDITED_SHARE,
+) -> Optional[Tuple[List[Dict[str, Any]], Dict[int, List[str]], List[str]]]:
+    """
+    Rattache les recommandations du scoring aux sections de l'article.
+
+    Une action "faq" sans section FAQ crée une section vide (à rédiger) juste
+    avant la conclusion. Les actions "global" ne déclenchent pas de réécriture
+    à elles seules : elles sont transmises aux sections réécrites.
+
+    Returns:
+        (sections, {index: [actions]}, [actions globales]), ou None si une
+        réécriture complète est préférable (aucune action rattachée, article
+        sans H2, ou plus de max_share des sections concernées)
+    """
+    if not scoring or len(sections) < 2:
+        return None
+    actions = scoring.get("actions") or actions_from_report(scoring.get("markdown", ""), sections)
+
+    sections = [dict(s) for s in sections]
+    edits: Dict[int, List[str]] = {}
+    general: List[str] = []
+    for item in actions:
+        target, action = str(item.get("section") or ""), str(item.get("action") or "").strip()
+        if not action:
+            continue
+        index = find_section(sections, target)
+        if index is None and _normalize(target) in (TARGET_FAQ,) + FAQ_MARKERS:
+            # FAQ demandée mais absente : nouvelle section avant la conclusion
+            index = next((i for i, s in enumerate(sections) if s["role"] == "conclusion"), len(sections))
+            sections.insert(index, {"heading": "FAQ", "text": "", "role": "faq"})
+            edits = {(i + 1 if i >= index else i): a for i, a in edits.items()}
+        if index is None:
+            general.append(action)
+            continue
+        edits.setdefault(index, []).append(action)
+
+    existing = sum(1 for s in sections if s["text"])
+    if not edits or len([i for i in edits if sections[i]["text"]]) > max_share * existing:
+        return None
+    return sections, edits, general
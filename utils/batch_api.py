@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Mode batch OpenAI (Batch API, -50 %) pour les traitements de masse non interactifs
+- Les fonctions d'étape sont exécutées telles quelles dans une session batch :
+  leurs appels chat.completions sont collectés (BatchDeferred) au lieu d'être
+  envoyés, puis rejoués avec les réponses du batch au passage suivant
+- Une étape à plusieurs appels enchaînés (traduction puis SEO) prend plusieurs
+  tours : chaque tour = un fichier JSONL soumis, suivi, puis téléchargé
+- État persistant par traitement dans data/batches/<id>/ (state.json + JSONL
+  d'entrée / sortie par tour) : chaque étape est reprise après un redémarrage
+  sans resoumettre un batch déjà créé (recherche par métadonnées)
+"""
+
+import contextvars
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from utils.durable_io import atomic_write_bytes, atomic_write_text, write_json
+
+BASE_DIR = Path(__file__).parent.parent
+BATCHES_DIR = BASE_DIR / "data" / "batches"
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+# Intervalle entre deux consultations du statut d'un batch (secondes)
+POLL_SECONDS = float(os.getenv("BATCH_POLL_SECONDS", "60"))
+
+# Statuts OpenAI terminaux (les autres : validating, in_progress, finalizing, cancelling)
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# Statuts d'un tour du traitement
+ROUND_PREPARED = "prepared"
+ROUND_SUBMITTED = "submitted"
+ROUND_COLLECTED = "collected"
+
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+
+
+class BatchInterrupt(BaseException):
+    """
+    Interrompt une fonction d'étape en session batch. Hérite de BaseException
+    pour traverser les `except Exception` des étapes (qui renverraient sinon
+    leur valeur de repli comme si l'appel avait abouti).
+    """
+
+
+class BatchDeferred(BatchInterrupt):
+    """Requête collectée pour le prochain batch : l'étape reprendra au tour suivant"""
+
+
+class BatchRequestFailed(BatchInterrupt):
+    """Requête en erreur dans le batch (ou sans réponse dans un batch terminé)"""
+
+
+class BatchSession:
+    """
+    Session d'un élément (un article) : identifiants de requête déterministes
+    "<élément>|<opération>|<n>", réponses connues rejouées, autres collectées.
+    """
+
+    def __init__(self, item_key: str, results: Dict[str, Dict[str, Any]], submitted: Optional[set] = None,
+                 fresh: Optional[set] = None):
+        self.item_key = item_key
+        self.results = results
+        self.submitted = submitted or set()
+        # Réponses du dernier tour : seules celles-ci sont comptées par le token_tracker
+        # (les tours précédents sont rejoués à chaque passage des étapes à plusieurs appels)
+        self.fresh = fresh or set()
+        self.counts: Dict[str, int] = {}
+        self.requests: List[Dict[str, Any]] = []
+
+    def intercept(self, operation: str, model: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Corps de la réponse du batch pour cet appel, sinon collecte la requête (BatchDeferred)"""
+        index = self.counts.get(operation, 0)
+        self.counts[operation] = index + 1
+        custom_id = f"{self.item_key}|{operation}|{index}"
+        result = self.results.get(custom_id)
+        if result is not None:
+            if result.get("error") or (result.get("response") or {}).get("status_code") != 200:
+                raise BatchRequestFailed(f"{custom_id} : {result.get('error') or result.get('response')}")
+            body = result["response"]["body"]
+            return body if custom_id in self.fresh else {**body, "usage": None}
+        if custom_id in self.submitted:
+            raise BatchRequestFailed(f"{custom_id} : aucune réponse dans le batch")
+        self.requests.append({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {"model": model, **params},
+        })
+        raise BatchDeferred(custom_id)
+
+
+_session: contextvars.ContextVar = contextvars.ContextVar("batch_session", default=None)
+
+
+def active_session() -> Optional[BatchSession]:
+    """Session batch du contexte courant (None hors mode batch)"""
+    return _session.get()
+
+
+@contextmanager
+def batch_session(session: BatchSession) -> Iterator[BatchSession]:
+    token = _session.set(session)
+    try:
+        yield session
+    finally:
+        _session.reset(token)
+
+
+def _job_dir(job_id: str) -> Path:
+    return BATCHES_DIR / job_id
+
+
+def _save_state(state: Dict[str, Any]):
+    """Écrit l'état du traitement (fichier temporaire puis rename)"""
+    directory = _job_dir(state["id"])
+    directory.mkdir(parents=True, exist_ok=True)
+    state["updated_at"] = datetime.now().isoformat()
+    write_json(directory / "state.json", state)
+
+
+def load_state(job_id: str) -> Optional[Dict[str, Any]]:
+    path = _job_dir(job_id) / "state.json"
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️  Erreur lecture traitement batch {job_id}: {e}")
+        return None
+
+
+def list_jobs() -> List[Dict[str, Any]]:
+    """Traitements batch connus, du plus récent au plus ancien"""
+    if not BATCHES_DIR.exists():
+        return []
+    states = [load_state(path.name) for path in BATCHES_DIR.iterdir() if (path / "state.json").exists()]
+    return sorted((s for s in states if s), key=lambda s: s.get("created_at", ""), reverse=True)
+
+
+def create_job(task: str, items: List[str], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Nouveau traitement batch (task : nom de la tâche, items : clés des éléments à traiter)"""
+    state = {
+        "id": f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{task}_{uuid.uuid4().hex[:6]}",
+        "task": task,
+        "params": params or {},
+        "status": JOB_RUNNING,
+        "created_at": datetime.now().isoformat(),
+        "items": items,
+        "done": [],
+        "failed": {},
+        "rounds": [],
+    }
+    _save_state(state)
+    return state
+
+
+def _read_jsonl(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return records
+
+
+def _load_results(state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Réponses de tous les tours téléchargés, par custom_id"""
+    directory = _job_dir(state["id"])
+    results = {}
+    for round_ in state["rounds"]:
+        for name in (round_.get("error_output"), round_.get("output")):
+            if name:
+                results.update({r["custom_id"]: r for r in _read_jsonl(directory / name) if r.get("custom_id")})
+    return results
+
+
+def _round_ids(state: Dict[str, Any], round_: Dict[str, Any]) -> set:
+    return {r["custom_id"] for r in _read_jsonl(_job_dir(state["id"]) / round_["input"])}
+
+
+def _submitted_ids(state: Dict[str, Any]) -> set:
+    """custom_id des tours terminés (une requête sans réponse n'est pas resoumise)"""
+    ids = set()
+    for round_ in state["rounds"]:
+        if round_["status"] == ROUND_COLLECTED:
+            ids |= _round_ids(state, round_)
+    return ids
+
+
+def _prepare_round(state: Dict[str, Any], run_item: Callable[[str], Any], apply_item: Callable[[str, Any], None]) -> bool:
+    """
+    Rejoue les éléments restants avec les réponses connues : les éléments
+    terminés sont appliqués, les requêtes manquantes forment le tour suivant.
+
+    Returns:
+        True si un nouveau tour a été préparé, False si le traitement est terminé
+    """
+    results = _load_results(state)
+    submitted = _submitted_ids(state)
+    fresh = _round_ids(state, state["rounds"][-1]) if state["rounds"] else set()
+    requests: List[Dict[str, Any]] = []
+    pending = [item for item in state["items"] if item not in state["done"] and item not in state["failed"]]
+    for item in pending:
+        session = BatchSession(item, results, submitted, fresh)
+        try:
+            with batch_session(session):
+                value = run_item(item)
+        except BatchDeferred:
+            requests.extend(session.requests)
+            continue
+        except BatchRequestFailed as e:
+            state["failed"][item] = str(e)
+            print(f"⚠️  {item} : requête batch en erreur ({e})")
+            _save_state(state)
+            continue
+        except Exception as e:
+            state["failed"][item] = str(e)
+            print(f"⚠️  {item} : erreur ({e})")
+            _save_state(state)
+            continue
+        try:
+            apply_item(item, value)
+        except Exception as e:
+            state["failed"][item] = f"application : {e}"
+            print(f"⚠️  {item} : erreur d'enregistrement ({e})")
+        else:
+            state["done"].append(item)
+        # Sauvegarde après chaque élément : une reprise n'applique pas deux fois le même résultat
+        _save_state(state)
+
+    if not requests:
+        state["status"] = JOB_DONE
+        _save_state(state)
+        return False
+
+    number = len(state["rounds"]) + 1
+    name = f"round_{number}_input.jsonl"
+    atomic_write_text(_job_dir(state["id"]) / name, "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in requests))
+    state["rounds"].append({"number": number, "status": ROUND_PREPARED, "input": name, "requests": len(requests)})
+    _save_state(state)
+    print(f"📦 Tour {number} : {len(requests)} requête(s) collectée(s) dans {name}")
+    return True
+
+
+def _find_batch(client, job_id: str, number: int) -> Optional[Any]:
+    """Batch déjà créé pour ce tour (arrêt entre la création et l'enregistrement de son id)"""
+    try:
+        for batch in client.batches.list(limit=100):
+            metadata = getattr(batch, "metadata", None) or {}
+            if metadata.get("job") == job_id and str(metadata.get("round")) == str(number):
+                return batch
+    except Exception as e:
+        print(f"⚠️  Erreur recherche des batchs existants: {e}")
+    return None
+
+
+def _submit_round(client, state: Dict[str, Any], round_: Dict[str, Any]):
+    """Envoie le fichier JSONL du tour puis crée le batch (chaque id est enregistré dès obtention)"""
+    directory = _job_dir(state["id"])
+    if not round_.get("file_id"):
+        with open(directory / round_["input"], "rb") as f:
+            round_["file_id"] = client.files.create(file=f, purpose="batch").id
+        _save_state(state)
+    batch = _find_batch(client, state["id"], round_["number"])
+    if batch is None:
+        batch = client.batches.create(
+            input_file_id=round_["file_id"],
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW,
+            metadata={"job": state["id"], "round": str(round_["number"])},
+        )
+    round_["batch_id"] = batch.id
+    round_["status"] = ROUND_SUBMITTED
+    round_["submitted_at"] = datetime.now().isoformat()
+    _save_state(state)
+    print(f"🚀 Tour {round_['number']} soumis : batch {batch.id}")
+
+
+def _download(client, file_id: str, path: Path):
+    content = client.files.content(file_id)
+    data = content.read() if hasattr(content, "read") else content.content
+    atomic_write_bytes(path, data)
+
+
+def _poll_round(client, state: Dict[str, Any], round_: Dict[str, Any]) -> bool:
+    """Statut du batch ; télécharge les sorties s'il est terminé. True si le tour est collecté"""
+    batch = client.batches.retrieve(round_["batch_id"])
+    counts = getattr(batch, "request_counts", None)
+    progress = f" ({counts.completed + counts.failed}/{counts.total})" if counts else ""
+    round_["batch_status"] = batch.status
+    if batch.status not in TERMINAL_STATUSES:
+        print(f"⏳ Batch {batch.id} : {batch.status}{progress}")
+        _save_state(state)
+        return False
+
+    directory = _job_dir(state["id"])
+    if getattr(batch, "output_file_id", None):
+        round_["output"] = f"round_{round_['number']}_output.jsonl"
+        _download(client, batch.output_file_id, directory / round_["output"])
+    if getattr(batch, "error_file_id", None):
+        round_["error_output"] = f"round_{round_['number']}_errors.jsonl"
+        _download(client, batch.error_file_id, directory / round_["error_output"])
+    round_["status"] = ROUND_COLLECTED
+    round_["completed_at"] = datetime.now().isoformat()
+    _save_state(state)
+    print(f"📥 Batch {batch.id} : {batch.status}{progress}, réponses téléchargées")
+    return True
+
+
+def run_job(
+    client,
+    state: Dict[str, Any],
+    run_item: Callable[[str], Any],
+    apply_item: Callable[[str, Any], None],
+    wait: bool = True,
+    poll_seconds: float = POLL_SECONDS,
+) -> Dict[str, Any]:
+    """
+    Fait avancer un traitement batch jusqu'à la fin (ou jusqu'au premier batch
+    en cours si wait=False) ; peut être relancé à tout moment pour reprendre.
+
+    Args:
+        client: client OpenAI (files / batches)
+        run_item: exécute la fonction d'étape pour un élément (dans la session batch)
+        apply_item: enregistre le résultat d'un élément terminé
+    """
+    while state["status"] != JOB_DONE:
+        round_ = state["rounds"][-1] if state["rounds"] else None
+        if round_ is None or round_["status"] == ROUND_COLLECTED:
+            if not _prepare_round(state, run_item, apply_item):
+                break
+        elif round_["status"] == ROUND_PREPARED:
+            _submit_round(client, state, round_)
+        elif not _poll_round(client, state, round_):
+            if not wait:
+                break
+            time.sleep(poll_seconds)
+
+    if state["status"] == JOB_DONE:
+        print(f"✅ Traitement {state['id']} terminé : {len(state['done'])} élément(s), {len(state['failed'])} en erreur")
+    return state
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Stockage adressé par contenu des corps d'articles (articles/blobs/)
+- Un blob par contenu distinct, nommé par son SHA-256 (blobs/<2 premiers>/<hash>) :
+  un même HTML n'est écrit qu'une fois, quel que soit le nombre de fichiers de
+  review qui y font référence
+- Référence dans le sidecar : {"blob": hash, "length": octets, "sha256": hash},
+  lue par review_metadata.read_body comme les références par offset
+- Écriture atomique (utils.durable_io) ; un blob existant n'est jamais réécrit
+- Nettoyage (collect_garbage) : blobs qui ne sont plus référencés par aucun
+  sidecar (articles/ et articles/archive/), après un délai de grâce
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+
+from utils.durable_io import atomic_write_bytes
+
+BLOBS_DIRNAME = "blobs"
+
+# Un blob écrit juste avant son sidecar ne doit pas être supprimé entre les deux
+GC_GRACE_SECONDS = 3600
+
+
+def blobs_dir(directory: Path) -> Path:
+    """Dossier des blobs d'un dossier de fichiers de review"""
+    return Path(directory) / BLOBS_DIRNAME
+
+
+def blob_path(directory: Path, digest: str) -> Path:
+    return blobs_dir(directory) / digest[:2] / digest
+
+
+def put_blob(directory: Path, text: str) -> Dict[str, Any]:
+    """
+    Enregistre un corps (s'il n'existe pas déjà) et retourne sa référence.
+
+    Un blob déjà présent est seulement « touché » : son mtime repousse le
+    nettoyage tant que le sidecar qui va le référencer n'est pas écrit.
+    """
+    data = (text or "").encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    path = blob_path(directory, digest)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        atomic_write_bytes(path, data)
+    return {"blob": digest, "length": len(data), "sha256": digest}
+
+
+def read_blob(directory: Path, ref: Dict[str, Any]) -> Optional[str]:
+    """Contenu d'un blob (None s'il est absent ou ne correspond plus à son hash)"""
+    try:
+        data = blob_path(directory, ref["blob"]).read_bytes()
+    except (OSError, KeyError):
+        return None
+    if hashlib.sha256(data).hexdigest() != ref.get("sha256"):
+        return None
+    return data.decode("utf-8")
+
+
+def _refs(metadata: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    for language in ("fr", "en"):
+        fields = metadata.get(language) or {}
+        for key in ("body_ref", "html_ref"):
+            if isinstance(fields.get(key), dict):
+                yield fields[key]
+
+
+def referenced_blobs(sidecar_dirs: Iterable[Path]) -> Set[str]:
+    """Hash des blobs référencés par les sidecars (*.meta.json) des dossiers donnés"""
+    referenced = set()
+    for directory in sidecar_dirs:
+        for path in Path(directory).glob("*.meta.json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError) as e:
+                # Sidecar illisible : ses blobs sont peut-être encore utiles, on ne nettoie rien
+                raise RuntimeError(f"{path.name} illisible, nettoyage annulé : {e}") from e
+            referenced.update(ref["blob"] for ref in _refs(metadata) if ref.get("blob"))
+    return referenced
+
+
+def blob_stats(directory: Path) -> Dict[str, int]:
+    """Nombre et taille totale des blobs"""
+    count = size = 0
+    for path in blobs_dir(directory).glob("*/*"):
+        if path.name.startswith("."):
+            continue
+        count += 1
+        size += path.stat().st_size
+    return {"blobs": count, "size": size}
+
+
+def collect_garbage(directory: Path, sidecar_dirs: Iterable[Path], dry_run: bool = False,
+                    grace_seconds: int = GC_GRACE_SECONDS) -> Dict[str, int]:
+    """Supprime les blobs non référencés plus anciens que grace_seconds"""
+    referenced = referenced_blobs(sidecar_dirs)
+    cutoff = time.time() - grace_seconds
+    removed = freed = 0
+    for path in blobs_dir(directory).glob("*/*"):
+        if path.name in referenced or path.name.startswith("."):
+            continue
+        stat = path.stat()
+        if stat.st_mtime > cutoff:
+            continue
+        removed += 1
+        freed += stat.st_size
+        if not dry_run:
+            path.unlink(missing_ok=True)
+    return {"removed": removed, "freed": freed}
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Écritures durables des fichiers de data/ et articles/
+- Écriture atomique : fichier temporaire propre à l'écrivain, fsync, rename,
+  puis fsync du dossier (après un crash : l'ancien ou le nouveau fichier, jamais
+  un mélange)
+- Verrou consultatif fcntl partagé entre threads et process (CLI + Streamlit +
+  workers) ; posé sur un fichier de data/.locks/ et non sur le fichier lui-même,
+  dont le rename remplace l'inode. Le fichier de verrou n'existe que pendant
+  qu'il est tenu : supprimé par son détenteur à la libération (un process qui
+  attendait sur l'ancien inode le détecte et recommence)
+- Transactions lecture-modification-écriture sous verrou (update_json) : un
+  fichier illisible n'est jamais écrasé par une valeur par défaut
+- Lectures sans verrou : le rename garantit qu'un lecteur voit un fichier complet
+
+DURABLE_IO_FSYNC=0 désactive les fsync (tests, disques lents) ; atomicité et
+verrous sont conservés. DURABLE_IO_LOCKS_DIR déplace les fichiers de verrou
+(benchmarks et tests dans un dossier temporaire).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows : verrou limité au process
+    fcntl = None
+
+BASE_DIR = Path(__file__).parent.parent
+LOCKS_DIR = Path(os.getenv("DURABLE_IO_LOCKS_DIR") or BASE_DIR / "data" / ".locks")
+
+FSYNC_ENABLED = os.getenv("DURABLE_IO_FSYNC", "1") != "0"
+
+PathLike = Union[str, Path]
+
+# Verrous du process (un par fichier tenu ou attendu) : fcntl.flock ne se réentre pas.
+# Entrée retirée dès que plus aucun thread ne l'utilise (process Streamlit de longue durée).
+_registry_lock = threading.Lock()
+_thread_locks: Dict[str, list] = {}  # chemin -> [RLock, threads utilisateurs, profondeur]
+
+
+class CorruptFileError(ValueError):
+    """Fichier JSON illisible : la transaction est annulée plutôt que d'écraser son contenu"""
+
+
+def lock_path(path: PathLike) -> Path:
+    """Fichier de verrou d'un chemin (nom lisible + empreinte du chemin absolu)"""
+    path = Path(path).absolute()
+    digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:12]
+    # LOCKS_DIR lu à chaque appel : redirigeable par les benchmarks
+    return LOCKS_DIR / f"{path.name}.{digest}.lock"
+
+
+def _acquire_entry(key: str) -> list:
+    with _registry_lock:
+        entry = _thread_locks.get(key)
+        if entry is None:
+            entry = _thread_locks[key] = [threading.RLock(), 0, 0]
+        entry[1] += 1
+        return entry
+
+
+def _release_entry(key: str, entry: list):
+    with _registry_lock:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _thread_locks[key]
+
+
+def _lock_file(path: Path):
+    """
+    Ouvre et verrouille le fichier de verrou de path.
+
+    Le détenteur précédent a pu supprimer le fichier pendant l'attente : le
+    verrou obtenu ne vaut que si le chemin désigne toujours l'inode verrouillé.
+    """
+    target = lock_path(path)
+    while True:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(target, "a")
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            current = os.stat(target)
+        except FileNotFoundError:
+            current = None
+        held = os.fstat(handle.fileno())
+        if current is not None and (current.st_ino, current.st_dev) == (held.st_ino, held.st_dev):
+            return target, handle
+        handle.close()
+
+
+def _unlock_file(target: Path, handle):
+    """Supprime le fichier de verrou (encore tenu) puis le libère"""
+    try:
+        target.unlink()
+    except OSError:
+        pass
+    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    handle.close()
+
+
+@contextmanager
+def file_lock(path: PathLike) -> Iterator[None]:
+    """
+    Verrou exclusif sur un fichier (threads du process et autres process).
+
+    Réentrant dans un même thread : un writer appelé sous le verrou (ex:
+    write_json dans update_json) ne se bloque pas lui-même.
+    """
+    path = Path(path).absolute()
+    key = str(path)
+    entry = _acquire_entry(key)
+    try:
+        with entry[0]:
+            depth = entry[2]
+            entry[2] = depth + 1
+            locked = None
+            try:
+                if depth == 0 and fcntl is not None:
+                    locked = _lock_file(path)
+                yield
+            finally:
+                if locked is not None:
+                    _unlock_file(*locked)
+                entry[2] = depth
+    finally:
+        _release_entry(key, entry)
+
+
+def _fsync_directory(directory: Path):
+    """Rend le rename durable (entrée de dossier écrite sur disque)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: PathLike, data: bytes):
+    """Remplace le fichier par data (temporaire + fsync + rename), sous verrou"""
+    path = Path(path)
+    with file_lock(path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Nom propre à l'écrivain : deux process ne partagent jamais le même temporaire
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                if FSYNC_ENABLED:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+        if FSYNC_ENABLED:
+            _fsync_directory(path.parent)
+
+
+def atomic_write_text(path: PathLike, text: str, encoding: str = "utf-8"):
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+def write_json(path: PathLike, data: Any, indent: int = 2):
+    """Écrit un fichier JSON (format des fichiers de data/ : indenté, UTF-8 lisible)"""
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=indent))
+
+
+def read_json(path: PathLike, default: Any = None, strict: bool = False) -> Any:
+    """
+    Contenu JSON du fichier ; default s'il n'existe pas.
+
+    strict=False : default (avec un avertissement) si le fichier est illisible ;
+    strict=True : CorruptFileError.
+    """
+    path = Path(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        if strict:
+            raise CorruptFileError(f"{path.name} illisible : {e}") from e
+        print(f"⚠️  Erreur lecture {path.name}: {e}")
+        return default
+
+
+@contextmanager
+def update_json(path: PathLike, default: Callable[[], Any] = dict) -> Iterator[Any]:
+    """
+    Transaction lecture-modification-écriture sur un fichier JSON.
+
+        with update_json(TOKEN_HISTORY_FILE, list) as history:
+            history.append(entry)
+
+    Le verrou est tenu de la lecture à l'écriture (aucune mise à jour perdue
+    entre process). La valeur est réécrite à la sortie du bloc, sauf exception.
+    Un fichier illisible lève CorruptFileError au lieu d'être remplacé.
+    """
+    with file_lock(path):
+        data = read_json(path, None, strict=True)
+        if data is None:
+            data = default()
+        yield data
+        write_json(path, data)
+
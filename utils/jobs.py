@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Exécution de tâches longues en arrière-plan (pipeline de génération d'articles)
+- Pool de threads partagé par le process (plusieurs utilisateurs en parallèle)
+- Table de jobs persistante : un fichier JSON par job dans data/jobs/
+- Checkpoints par étape : les étapes terminées survivent à un redémarrage
+  et ne sont pas rejouées lors de la reprise du job
+- Suivi de progression par polling (get_job)
+- Sortie live des étapes en streaming (ctx.emit / follow_live_output)
+"""
+
+import json
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from utils.durable_io import write_json
+
+BASE_DIR = Path(__file__).parent.parent
+JOBS_DIR = BASE_DIR / "data" / "jobs"
+
+# Nombre de jobs exécutés simultanément (les autres attendent dans la file)
+MAX_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_INTERRUPTED = "interrupted"
+ACTIVE_STATUSES = (STATUS_PENDING, STATUS_RUNNING)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.RLock()
+# Jobs soumis dans ce process (les autres "running" ont été interrompus par un redémarrage)
+_active_jobs: set = set()
+# Sortie live de l'étape en cours, par job (en mémoire uniquement : seul le résultat final est persisté)
+_live_output: Dict[str, Dict[str, Any]] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="job")
+        return _executor
+
+
+def _job_path(job_id: str) -> Path:
+    return JOBS_DIR / f"{job_id}.json"
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def _save_job(job: Dict[str, Any]):
+    """Écrit l'état du job (fichier temporaire puis rename)"""
+    JOBS_DIR.mkdir(parents=True, exist_ok=True)
+    job["updated_at"] = _now()
+    write_json(_job_path(job["id"]), job)
+
+
+def _load_job(job_id: str) -> Optional[Dict[str, Any]]:
+    path = _job_path(job_id)
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️  Erreur lecture job {job_id}: {e}")
+        return None
+
+
+class JobContext:
+    """
+    Contexte passé au runner d'un job : checkpoints d'étapes et progression.
+
+    run_stage(name, func, ...) exécute une étape et enregistre son résultat ;
+    si l'étape a déjà été terminée (reprise après redémarrage), le résultat
+    enregistré est renvoyé sans rappeler func.
+    """
+
+    def __init__(self, job: Dict[str, Any]):
+        self.job = job
+        self.job_id = job["id"]
+        self.params = job.get("params", {})
+
+    def is_done(self, name: str) -> bool:
+        return self.job["stages"].get(name, {}).get("status") == STATUS_DONE
+
+    def get_result(self, name: str, default: Any = None) -> Any:
+        return self.job["stages"].get(name, {}).get("result", default)
+
+    def emit(self, delta: str):
+        """Ajoute un delta de texte à la sortie live de l'étape en cours"""
+        with _lock:
+            live = _live_output.get(self.job_id)
+            if live is not None and not live["done"]:
+                live["chunks"].append(delta)
+
+    def progress(self, percent: int, message: str = ""):
+        """Met à jour la progression affichée (0-100)"""
+        with _lock:
+            self.job["progress"] = max(0, min(100, int(percent)))
+            if message:
+                self.job["message"] = message
+            _save_job(self.job)
+
+    def run_stage(self, name: str, func: Callable, *args, label: str = "", percent: Optional[int] = None, **kwargs) -> Any:
+        """Exécute une étape (ou renvoie son résultat enregistré) et persiste le checkpoint"""
+        if self.is_done(name):
+            return self.get_result(name)
+
+        with _lock:
+            self.job["current_stage"] = name
+            self.job["message"] = label or name
+            if percent is not None:
+                self.job["progress"] = percent
+            self.job["stages"][name] = {"status": STATUS_RUNNING, "started_at": _now()}
+            _save_job(self.job)
+            _live_output[self.job_id] = {"stage": name, "label": label or name, "chunks": [], "done": False}
+
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            with _lock:
+                _live_output[self.job_id]["done"] = True
+
+        with _lock:
+            stage = self.job["stages"][name]
+            stage.update({"status": STATUS_DONE, "finished_at": _now(), "result": result})
+            _save_job(self.job)
+        return result
+
+
+def _run(job: Dict[str, Any], runner: Callable[[JobContext], Any]):
+    """Exécute le runner dans un thread du pool et enregistre le résultat final"""
+    ctx = JobContext(job)
+    with _lock:
+        job["status"] = STATUS_RUNNING
+        job["error"] = None
+        _save_job(job)
+    try:
+        result = runner(ctx)
+        with _lock:
+            job.update({"status": STATUS_DONE, "result": result, "progress": 100, "current_stage": None})
+            _save_job(job)
+    except Exception as e:
+        print(f"❌ Erreur job {job['id']}: {e}")
+        with _lock:
+            job.update({"status": STATUS_FAILED, "error": str(e), "traceback": traceback.format_exc()})
+            _save_job(job)
+    finally:
+        with _lock:
+            _active_jobs.discard(job["id"])
+            _live_output.pop(job["id"], None)
+
+
+def _start(job: Dict[str, Any], runner: Callable[[JobContext], Any]):
+    with _lock:
+        _active_jobs.add(job["id"])
+        job["status"] = STATUS_PENDING
+        _save_job(job)
+    _get_executor().submit(_run, job, runner)
+
+
+def submit_job(kind: str, params: Dict[str, Any], runner: Callable[[JobContext], Any], label: str = "") -> str:
+    """
+    Crée un job persistant et le lance en arrière-plan.
+
+    Args:
+        kind: type de job (ex: "article")
+        params: paramètres JSON-sérialisables (accessibles via ctx.params)
+        runner: fonction runner(ctx: JobContext) -> résultat JSON-sérialisable
+        label: libellé affiché dans la liste des jobs
+
+    Returns:
+        Identifiant du job
+    """
+    job_id = uuid.uuid4().hex[:12]
+    job = {
+        "id": job_id,
+        "kind": kind,
+        "label": label,
+        "status": STATUS_PENDING,
+        "created_at": _now(),
+        "updated_at": _now(),
+        "params": params,
+        "stages": {},
+        "current_stage": None,
+        "progress": 0,
+        "message": "En attente...",
+        "result": None,
+        "error": None,
+    }
+    _start(job, runner)
+    return job_id
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Retourne l'état courant d'un job (lu depuis data/jobs/).
+
+    Un job resté "running" / "pending" sans être actif dans ce process a été
+    interrompu (redémarrage de l'app) : il est signalé comme "interrupted".
+    """
+    job = _load_job(job_id)
+    if job and job.get("status") in ACTIVE_STATUSES:
+        with _lock:
+            if job_id not in _active_jobs:
+                job["status"] = STATUS_INTERRUPTED
+    return job
+
+
+def resume_job(job_id: str, runner: Callable[[JobContext], Any]) -> bool:
+    """
+    Relance un job interrompu ou échoué ; les étapes déjà terminées sont réutilisées.
+
+    Returns:
+        True si le job a été relancé
+    """
+    with _lock:
+        if job_id in _active_jobs:
+            return False
+    job = _load_job(job_id)
+    if not job or job.get("status") == STATUS_DONE:
+        return False
+    _start(job, runner)
+    return True
+
+
+def list_jobs(kind: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """Liste les jobs les plus récents (sans les résultats d'étapes, pour l'affichage)"""
+    if not JOBS_DIR.exists():
+        return []
+    jobs = []
+    for path in sorted(JOBS_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True):
+        job = get_job(path.stem)
+        if not job or (kind and job.get("kind") != kind):
+            continue
+        jobs.append({k: v for k, v in job.items() if k not in ("stages", "result", "params")})
+        if len(jobs) >= limit:
+            break
+    return jobs
+
+
+def delete_job(job_id: str) -> bool:
+    """Supprime le fichier d'un job terminé, échoué ou interrompu"""
+    with _lock:
+        if job_id in _active_jobs:
+            return False
+    path = _job_path(job_id)
+    if path.exists():
+        path.unlink()
+        return True
+    return False
+
+
+def get_live_output(job_id: str) -> Optional[Dict[str, Any]]:
+    """Sortie live de l'étape en cours : {"stage", "label", "text", "done"} ou None"""
+    with _lock:
+        live = _live_output.get(job_id)
+        if live is None:
+            return None
+        return {"stage": live["stage"], "label": live["label"], "text": "".join(live["chunks"]), "done": live["done"]}
+
+
+def follow_live_output(job_id: str, poll_interval: float = 0.05) -> Iterator[str]:
+    """
+    Générateur qui suit la sortie live de l'étape en cours d'un job
+    (texte déjà produit, puis chaque nouveau delta) jusqu'à la fin de l'étape.
+
+    Utilisable directement avec st.write_stream.
+    """
+    with _lock:
+        live = _live_output.get(job_id)
+    if live is None:
+        return
+    sent = 0
+    while True:
+        with _lock:
+            chunks = live["chunks"][sent:]
+            done = live["done"] or _live_output.get(job_id) is not live
+        if chunks:
+            sent += len(chunks)
+            yield "".join(chunks)
+        elif done:
+            return
+        else:
+            time.sleep(poll_interval)
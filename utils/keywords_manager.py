@@ -3,12 +3,14 @@
 Gestionnaire de mots-clés avec métadonnées SEO
 """
 
-import json
 import re
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from utils.article_archive import archived_keyword_counts
+from utils.durable_io import read_json, update_json, write_json
+
 BASE_DIR = Path(__file__).parent.parent
 KEYWORDS_METADATA_FILE = BASE_DIR / "data" / "keywords_metadata.json"
 KEYWORDS_FILE = BASE_DIR / "data" / "keywords.json"
@@ -17,59 +19,39 @@ ARTICLES_DIR = BASE_DIR / "articles"
 
 def load_keywords_metadata() -> Dict[str, Dict[str, Any]]:
     """Charge les métadonnées des mots-clés"""
-    if not KEYWORDS_METADATA_FILE.exists():
-        return {}
-    
-    try:
-        with open(KEYWORDS_METADATA_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"⚠️  Erreur chargement métadonnées mots-clés: {e}")
-        return {}
+    metadata = read_json(KEYWORDS_METADATA_FILE, {})
+    return metadata if isinstance(metadata, dict) else {}
 
 
 def save_keywords_metadata(metadata: Dict[str, Dict[str, Any]]):
     """Sauvegarde les métadonnées des mots-clés"""
     try:
-        KEYWORDS_METADATA_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(KEYWORDS_METADATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        write_json(KEYWORDS_METADATA_FILE, metadata)
     except Exception as e:
         print(f"⚠️  Erreur sauvegarde métadonnées mots-clés: {e}")
 
 
 def load_keywords_list() -> List[str]:
     """Charge la liste des mots-clés depuis keywords.json"""
-    if not KEYWORDS_FILE.exists():
-        return []
-    
-    try:
-        with open(KEYWORDS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, list):
-            return data
-        elif isinstance(data, dict):
-            return data.get("default", [])
-        return []
-    except Exception as e:
-        print(f"⚠️  Erreur chargement mots-clés: {e}")
-        return []
+    data = read_json(KEYWORDS_FILE, [])
+    if isinstance(data, list):
+        return data
+    elif isinstance(data, dict):
+        return data.get("default", [])
+    return []
 
 
 def save_keywords_list(keywords: List[str]):
     """Sauvegarde la liste des mots-clés dans keywords.json"""
     try:
-        KEYWORDS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        data = {"default": keywords}
-        with open(KEYWORDS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        write_json(KEYWORDS_FILE, {"default": keywords})
     except Exception as e:
         print(f"⚠️  Erreur sauvegarde mots-clés: {e}")
 
 
 def count_keyword_in_articles(keyword: str) -> Dict[str, Any]:
     """
-    Compte les occurrences d'un mot-clé dans les articles existants
+    Compte les occurrences d'un mot-clé dans les articles existants (y compris archivés)
     
     Returns:
         {
@@ -81,6 +63,9 @@ def count_keyword_in_articles(keyword: str) -> Dict[str, Any]:
     if not ARTICLES_DIR.exists():
         return {"total_occurrences": 0, "articles_count": 0, "articles": []}
     
+    # Articles archivés : comptés en un passage par l'archive (en cache jusqu'au prochain archivage)
+    archived = archived_keyword_counts([keyword])[keyword.lower()]
+    
     keyword_lower = keyword.lower()
     total_occurrences = 0
     articles_with_keyword = []
@@ -96,6 +81,9 @@ def count_keyword_in_articles(keyword: str) -> Dict[str, Any]:
         except Exception as e:
             print(f"⚠️  Erreur lecture {article_file.name}: {e}")
     
+    total_occurrences += archived["total_occurrences"]
+    articles_with_keyword += [f for f in archived["articles"] if f not in articles_with_keyword]
+    
     return {
         "total_occurrences": total_occurrences,
         "articles_count": len(articles_with_keyword),
@@ -146,6 +134,8 @@ def get_all_keywords_with_stats() -> List[Dict[str, Any]]:
     """
     keywords_list = load_keywords_list()
     metadata = load_keywords_metadata()
+    # Un seul passage sur l'archive pour tous les mots-clés
+    archived_keyword_counts(keywords_list)
     
     result = []
     for keyword in keywords_list:
@@ -169,48 +159,61 @@ def get_all_keywords_with_stats() -> List[Dict[str, Any]]:
     return result
 
 
+def _keywords_of(data: Any) -> List[str]:
+    """Liste modifiable des mots-clés d'un keywords.json (liste ou {"default": [...]})"""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return data.setdefault("default", [])
+    raise ValueError("format de keywords.json inattendu")
+
+
 def add_keyword(keyword: str, volume: Optional[int] = None, complexity: Optional[str] = None):
     """Ajoute un nouveau mot-clé"""
-    keywords_list = load_keywords_list()
-    if keyword not in keywords_list:
-        keywords_list.append(keyword)
-        save_keywords_list(keywords_list)
-    
-    # Ajouter/update métadonnées
-    metadata = load_keywords_metadata()
-    if keyword not in metadata:
-        metadata[keyword] = {}
-    if volume is not None:
-        metadata[keyword]["volume"] = volume
-    if complexity:
-        metadata[keyword]["complexity"] = complexity
-    metadata[keyword]["created_at"] = datetime.now().isoformat()
-    save_keywords_metadata(metadata)
+    try:
+        with update_json(KEYWORDS_FILE, lambda: {"default": []}) as data:
+            keywords_list = _keywords_of(data)
+            if keyword not in keywords_list:
+                keywords_list.append(keyword)
+        
+        # Ajouter/update métadonnées
+        with update_json(KEYWORDS_METADATA_FILE) as metadata:
+            if keyword not in metadata:
+                metadata[keyword] = {}
+            if volume is not None:
+                metadata[keyword]["volume"] = volume
+            if complexity:
+                metadata[keyword]["complexity"] = complexity
+            metadata[keyword]["created_at"] = datetime.now().isoformat()
+    except Exception as e:
+        print(f"⚠️  Erreur sauvegarde mots-clés: {e}")
 
 
 def update_keyword(keyword: str, volume: Optional[int] = None, complexity: Optional[str] = None):
     """Met à jour les métadonnées d'un mot-clé"""
-    metadata = load_keywords_metadata()
-    if keyword not in metadata:
-        metadata[keyword] = {}
-    if volume is not None:
-        metadata[keyword]["volume"] = volume
-    if complexity:
-        metadata[keyword]["complexity"] = complexity
-    metadata[keyword]["updated_at"] = datetime.now().isoformat()
-    save_keywords_metadata(metadata)
+    try:
+        with update_json(KEYWORDS_METADATA_FILE) as metadata:
+            if keyword not in metadata:
+                metadata[keyword] = {}
+            if volume is not None:
+                metadata[keyword]["volume"] = volume
+            if complexity:
+                metadata[keyword]["complexity"] = complexity
+            metadata[keyword]["updated_at"] = datetime.now().isoformat()
+    except Exception as e:
+        print(f"⚠️  Erreur sauvegarde métadonnées mots-clés: {e}")
 
 
 def delete_keyword(keyword: str):
     """Supprime un mot-clé"""
-    keywords_list = load_keywords_list()
-    if keyword in keywords_list:
-        keywords_list.remove(keyword)
-        save_keywords_list(keywords_list)
-    
-    # Supprimer métadonnées
-    metadata = load_keywords_metadata()
-    if keyword in metadata:
-        del metadata[keyword]
-        save_keywords_metadata(metadata)
-
+    try:
+        with update_json(KEYWORDS_FILE, lambda: {"default": []}) as data:
+            keywords_list = _keywords_of(data)
+            if keyword in keywords_list:
+                keywords_list.remove(keyword)
+        
+        # Supprimer métadonnées
+        with update_json(KEYWORDS_METADATA_FILE) as metadata:
+            metadata.pop(keyword, None)
+    except Exception as e:
+        print(f"⚠️  Erreur sauvegarde mots-clés: {e}")
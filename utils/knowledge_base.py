@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Base de connaissances des articles publiés (data/articles_existants.json)
+- Chargée une fois par process, relue seulement si le fichier a changé (mtime)
+- Index par slug et par titre normalisé : test d'existence en O(1)
+- Écriture atomique et verrouillée (utils.durable_io) : jamais de JSON à moitié
+  écrit, ni d'ajout perdu entre la CLI et l'app
+- Chemin résolu depuis la racine du projet, quel que soit le dossier courant
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.article_catalog import tokenize
+from utils.durable_io import CorruptFileError, file_lock, write_json
+
+BASE_DIR = Path(__file__).parent.parent
+KNOWLEDGE_BASE_FILE = BASE_DIR / "data" / "articles_existants.json"
+
+DEFAULT_AUTHOR = "Matthieu HUBERT"
+
+
+def normalize_title(title: str) -> str:
+    """Clé de titre : minuscules, sans accents ni ponctuation (« L'IA : » ≡ « l ia »)"""
+    return " ".join(tokenize(title or ""))
+
+
+class KnowledgeBase:
+    """Articles existants d'un fichier JSON, en cache dans le process"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._mtime: Optional[int] = None
+        self._load_error: Optional[str] = None
+        self._articles: List[Dict[str, Any]] = []
+        self._by_slug: Dict[str, Dict[str, Any]] = {}
+        self._by_title: Dict[str, Dict[str, Any]] = {}
+
+    def _index(self, articles: List[Dict[str, Any]]):
+        self._articles = articles
+        self._by_slug = {a["slug"]: a for a in articles if a.get("slug")}
+        self._by_title = {normalize_title(a["titre"]): a for a in articles if a.get("titre")}
+
+    def _refresh(self):
+        """Recharge le fichier s'il a changé depuis la dernière lecture (appelé sous verrou)"""
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._mtime = None
+            self._load_error = None
+            self._index([])
+            return
+        if mtime == self._mtime:
+            return
+        self._load_error = None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                articles = json.load(f)
+            if not isinstance(articles, list):
+                raise ValueError("liste JSON attendue")
+        except Exception as e:
+            print(f"⚠️  Erreur chargement base de connaissances: {e}")
+            self._load_error = str(e)
+            articles = []
+        self._mtime = mtime
+        self._index([a for a in articles if isinstance(a, dict)])
+
+    def articles(self) -> List[Dict[str, Any]]:
+        """Copie des articles (ordre du fichier : plus récents en premier)"""
+        with self._lock:
+            self._refresh()
+            return [dict(a) for a in self._articles]
+
+    def titles(self) -> List[str]:
+        with self._lock:
+            self._refresh()
+            return [a["titre"] for a in self._articles if a.get("titre")]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._articles)
+
+    def find(self, title: str = "", slug: str = "") -> Optional[Dict[str, Any]]:
+        """Article de même slug ou de même titre normalisé (None s'il n'existe pas)"""
+        with self._lock:
+            self._refresh()
+            article = self._by_slug.get(slug) if slug else None
+            if article is None and title:
+                article = self._by_title.get(normalize_title(title))
+            return dict(article) if article else None
+
+    def contains(self, title: str = "", slug: str = "") -> bool:
+        return self.find(title, slug) is not None
+
+    def _write(self, articles: List[Dict[str, Any]]):
+        """Écrit le fichier (atomique, sous verrou) et met le cache à jour"""
+        write_json(self.path, articles)
+        self._mtime = self.path.stat().st_mtime_ns
+        self._index(articles)
+
+    def add(self, title: str, slug: str, date: Optional[str] = None,
+            author: str = DEFAULT_AUTHOR, description: str = "") -> bool:
+        """
+        Ajoute un article en tête de liste s'il n'existe pas déjà (slug ou titre).
+
+        Returns:
+            True si l'article a été ajouté, False s'il était déjà présent
+        """
+        with self._lock, file_lock(self.path):
+            # Relecture sous verrou juste avant l'écriture : un autre process a pu ajouter un article
+            self._refresh()
+            if self._load_error:
+                # Fichier illisible : ne pas le remplacer par une liste d'un seul article
+                raise CorruptFileError(f"{self.path.name} illisible : {self._load_error}")
+            if (slug and slug in self._by_slug) or (title and normalize_title(title) in self._by_title):
+                return False
+            entry = {
+                "date": date or datetime.now().strftime("%Y-%m-%d"),
+                "auteur": author,
+                "titre": title,
+                "slug": slug,
+                "description": description,
+            }
+            self._write([entry] + self._articles)
+            return True
+
+
+_instances: Dict[Path, KnowledgeBase] = {}
+_instances_lock = threading.Lock()
+
+
+def get_knowledge_base(path: Optional[Path] = None) -> KnowledgeBase:
+    """Base de connaissances partagée du process (une instance par fichier)"""
+    path = Path(path or KNOWLEDGE_BASE_FILE).resolve()
+    with _instances_lock:
+        kb = _instances.get(path)
+        if kb is None:
+            kb = _instances[path] = KnowledgeBase(path)
+    return kb
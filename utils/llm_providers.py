@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Fournisseurs LLM appelés par les étapes du pipeline
+- openai : API OpenAI (client tracé, régulateur de débit utils.rate_governor)
+- local : serveur compatible OpenAI (llama.cpp, vLLM...) à LOCAL_LLM_BASE_URL,
+  sans quota ni régulateur
+- stub : réponses synthétiques en process (utils.mock_responses), sans réseau,
+  pour les tests et les traitements hors ligne
+- Choix par étape via la table de routage (utils.model_router) : un modèle
+  "local:qwen2.5-7b-instruct" ou "stub:article" vise ce fournisseur, un modèle
+  sans préfixe vise LLM_PROVIDER (openai par défaut)
+
+Chaque fournisseur expose client(timeout, max_retries) : un objet compatible
+avec openai_client.chat.completions.create (réponses et chunks de streaming
+avec les mêmes attributs).
+"""
+
+import importlib.util
+import os
+import threading
+import uuid
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.mock_responses import chat_completion_body, chat_completion_chunk, chat_completion_content, estimate_tokens
+
+PROVIDERS = ("openai", "local", "stub")
+DEFAULT_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+
+# Serveur compatible OpenAI (llama.cpp : port 8080, vLLM : port 8000)
+LOCAL_LLM_BASE_URL = os.getenv("LOCAL_LLM_BASE_URL", "http://127.0.0.1:8080/v1")
+LOCAL_LLM_API_KEY = os.getenv("LOCAL_LLM_API_KEY", "local")
+# Nom du modèle servi, utilisé quand l'étape demande un modèle OpenAI (ex: "gpt-4o-mini")
+LOCAL_LLM_MODEL = os.getenv("LOCAL_LLM_MODEL", "")
+
+# Longueur des articles synthétiques du fournisseur stub (mots)
+STUB_ARTICLE_WORDS = int(os.getenv("STUB_ARTICLE_WORDS", "1200"))
+
+
+class OpenAIProvider:
+    """API OpenAI ou serveur compatible (base_url) ; client créé au premier appel"""
+
+    def __init__(self, name: str, api_key: Optional[str], base_url: Optional[str] = None,
+                 governed: bool = True, served_model: str = ""):
+        self.name = name
+        self.api_key = api_key
+        self.base_url = base_url
+        self.governed = governed
+        self.served_model = served_model
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return bool(self.api_key) and importlib.util.find_spec("openai") is not None
+
+    def model_name(self, model: str) -> str:
+        """Modèle à envoyer au serveur (un serveur local ne connaît pas les noms OpenAI)"""
+        if self.served_model and (not model or model.startswith("gpt-")):
+            return self.served_model
+        return model
+
+    def _build(self):
+        from openai import OpenAI
+        from utils.tracing import openai_http_client
+
+        transport = None
+        if self.governed:
+            from utils.rate_governor import governed_transport
+            # Appels OpenAI : régulateur de débit partagé (RPM / TPM / concurrence, 429 mis en file)
+            transport = governed_transport()
+        kwargs = {"base_url": self.base_url} if self.base_url else {}
+        # Le client httpx enregistre les temps de réponse HTTP dans les traces
+        return OpenAI(api_key=self.api_key, http_client=openai_http_client(transport=transport), **kwargs)
+
+    def client(self, timeout: Optional[float] = None, max_retries: Optional[int] = None):
+        if not self.available:
+            raise RuntimeError(f"Fournisseur {self.name} non configuré (clé API manquante)")
+        with self._lock:
+            if self._client is None:
+                self._client = self._build()
+        options = {}
+        if timeout is not None:
+            options["timeout"] = timeout
+        if max_retries is not None:
+            options["max_retries"] = max_retries
+        return self._client.with_options(**options) if options else self._client
+
+
+def response_from_dict(value: Any) -> Any:
+    """Dict JSON → objet à attributs (même accès que les modèles du SDK openai)"""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: response_from_dict(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [response_from_dict(v) for v in value]
+    return value
+
+
+class StubProvider:
+    """Réponses synthétiques calculées en process (mêmes contenus que le serveur mock)"""
+
+    name = "stub"
+    available = True
+
+    def __init__(self, article_words: int = STUB_ARTICLE_WORDS):
+        self.article_words = article_words
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def model_name(self, model: str) -> str:
+        return model or "stub"
+
+    def client(self, timeout: Optional[float] = None, max_retries: Optional[int] = None):
+        return self
+
+    def _create(self, model: str, messages: List[Dict[str, Any]], response_format: Optional[Dict[str, Any]] = None,
+                max_tokens: Optional[int] = None, stream: bool = False,
+                stream_options: Optional[Dict[str, Any]] = None, **kwargs):
+        content = chat_completion_content(messages, response_format, self.article_words)
+        finish_reason = "stop"
+        if max_tokens and estimate_tokens(content) > max_tokens:
+            content = content[:max_tokens * 4]
+            finish_reason = "length"
+        prompt_tokens = sum(estimate_tokens(str(m.get("content") or "")) for m in messages)
+        if not stream:
+            return response_from_dict(chat_completion_body(content, model, prompt_tokens, finish_reason))
+        include_usage = bool((stream_options or {}).get("include_usage"))
+        return self._stream(model, content, prompt_tokens, finish_reason, include_usage)
+
+    def _stream(self, model: str, content: str, prompt_tokens: int, finish_reason: str,
+                include_usage: bool) -> Iterator[Any]:
+        """Chunks de streaming (générateur : close() l'interrompt comme un flux HTTP)"""
+        completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+
+        def chunk(delta: Dict[str, Any], **kwargs):
+            # Champs absents du delta à None, comme dans les modèles du SDK
+            return response_from_dict(chat_completion_chunk(completion_id, model, {"role": None, "content": None, **delta}, **kwargs))
+
+        yield chunk({"role": "assistant", "content": ""})
+        for start in range(0, len(content), 16):
+            yield chunk({"content": content[start:start + 16]})
+        yield chunk({}, finish_reason=finish_reason)
+        if include_usage:
+            completion_tokens = estimate_tokens(content)
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                     "total_tokens": prompt_tokens + completion_tokens, "prompt_tokens_details": {"cached_tokens": 0}}
+            yield chunk({}, usage=usage)
+
+
+_providers: Dict[str, Any] = {}
+_registry_lock = threading.Lock()
+
+
+def get_provider(name: str):
+    """Fournisseur partagé du process (créé au premier appel)"""
+    if name not in PROVIDERS:
+        raise ValueError(f"Fournisseur LLM inconnu : {name} (attendu : {', '.join(PROVIDERS)})")
+    with _registry_lock:
+        provider = _providers.get(name)
+        if provider is None:
+            if name == "openai":
+                provider = OpenAIProvider("openai", os.getenv("OPENAI_API_KEY"))
+            elif name == "local":
+                provider = OpenAIProvider("local", LOCAL_LLM_API_KEY, base_url=LOCAL_LLM_BASE_URL,
+                                          governed=False, served_model=LOCAL_LLM_MODEL)
+            else:
+                provider = StubProvider()
+            _providers[name] = provider
+    return provider
+
+
+def parse_model(spec: str) -> Tuple[str, str]:
+    """"local:qwen2.5-7b-instruct" → ("local", "qwen2.5-7b-instruct") ; sans préfixe : LLM_PROVIDER"""
+    provider, sep, model = (spec or "").partition(":")
+    if sep and provider in PROVIDERS:
+        return provider, model
+    return DEFAULT_PROVIDER, spec
+
+
+def resolve(spec: str) -> Tuple[Any, str]:
+    """(fournisseur, nom du modèle à envoyer) d'un modèle de la table de routage"""
+    provider_name, model = parse_model(spec)
+    provider = get_provider(provider_name)
+    return provider, provider.model_name(model)
+
+
+def qualified_model(spec: str) -> str:
+    """Nom du modèle pour le suivi des tokens : préfixé par le fournisseur hors OpenAI (coût nul)"""
+    provider_name, model = parse_model(spec)
+    if provider_name == "openai":
+        return model
+    return f"{provider_name}:{get_provider(provider_name).model_name(model)}"
+
+
+def is_available(spec: str) -> bool:
+    """True si le fournisseur du modèle est utilisable (clé API présente, ou local / stub)"""
+    try:
+        return get_provider(parse_model(spec)[0]).available
+    except ValueError:
+        return False
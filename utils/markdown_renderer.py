@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Rendu Markdown → HTML local et déterministe (champ blog_post)
+- Produit exactement le sous-ensemble compris par utils.sanity_utils.html_to_sanity_blocks :
+  <h2>, <h3>, <p>, <ul><li>, et en ligne <strong> et <a href="...">
+- Un élément par ligne (html_to_sanity_blocks lit le HTML ligne à ligne),
+  une liste <ul> complète sur une seule ligne
+- Le titre H1 initial est omis (champ title du document Sanity) ; les autres
+  H1 deviennent des H2, les H4+ des H3
+- Listes numérotées : paragraphes conservant leur numéro (pas de <ol> côté Sanity)
+- Italique, code en ligne, citations et tableaux rendus en texte simple
+"""
+
+import html
+import re
+from typing import List
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+BULLET_PATTERN = re.compile(r"^\s*[-*+•]\s+(.*)$")
+ORDERED_PATTERN = re.compile(r"^\s*(\d+)[.)]\s+(.*)$")
+RULE_PATTERN = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+TABLE_SEPARATOR_PATTERN = re.compile(r"^\s*\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?\s*$")
+
+LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(\s*<?([^)\s>]+)>?(?:\s+\"[^\"]*\")?\s*\)")
+AUTOLINK_PATTERN = re.compile(r"<(https?://[^>\s]+)>")
+BOLD_PATTERN = re.compile(r"\*\*(.+?)\*\*|__(.+?)__")
+ITALIC_PATTERN = re.compile(r"(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])|(?<![\w_])_(?!\s)(.+?)(?<!\s)_(?![\w_])")
+CODE_PATTERN = re.compile(r"`([^`]+)`")
+
+# Marqueurs temporaires (caractères privés Unicode) : les balises générées ne sont pas échappées
+_OPEN, _CLOSE, _LINK = "\ue000", "\ue001", "\ue002"
+LINK_PLACEHOLDER_PATTERN = re.compile(_LINK + r"(\d+)" + _LINK)
+
+
+def render_inline(text: str) -> str:
+    """Convertit le Markdown en ligne (gras, liens) en HTML ; le reste est échappé"""
+    links: List[str] = []
+
+    def keep_link(label: str, url: str) -> str:
+        # Lien mis de côté jusqu'à la fin : URL transmise telle quelle à Sanity (pas d'échappement)
+        url = url.replace('"', "%22")
+        links.append(f'<a href="{url}">{html.escape(ITALIC_PATTERN.sub(lambda m: m.group(1) or m.group(2), label), quote=False)}</a>')
+        return f"{_LINK}{len(links) - 1}{_LINK}"
+
+    text = CODE_PATTERN.sub(r"\1", text)
+    text = LINK_PATTERN.sub(lambda m: keep_link(m.group(1), m.group(2)), text)
+    text = AUTOLINK_PATTERN.sub(lambda m: keep_link(m.group(1), m.group(1)), text)
+    text = BOLD_PATTERN.sub(lambda m: f"{_OPEN}strong{_CLOSE}{m.group(1) or m.group(2)}{_OPEN}/strong{_CLOSE}", text)
+    text = ITALIC_PATTERN.sub(lambda m: m.group(1) or m.group(2), text)
+
+    text = html.escape(text, quote=False).replace(_OPEN, "<").replace(_CLOSE, ">")
+    return LINK_PLACEHOLDER_PATTERN.sub(lambda m: links[int(m.group(1))], text)
+
+
+def markdown_to_html(markdown: str, drop_title: bool = True) -> str:
+    """
+    Rend un article Markdown en HTML pour html_to_sanity_blocks.
+
+    Args:
+        markdown: article Markdown (original_content)
+        drop_title: omettre le premier titre H1 (déjà dans le champ title)
+
+    Returns:
+        HTML, un élément par ligne
+    """
+    output: List[str] = []
+    paragraph: List[str] = []
+    bullets: List[str] = []
+    title_dropped = not drop_title
+
+    def flush_paragraph():
+        if paragraph:
+            output.append(f"<p>{render_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+
+    def flush_bullets():
+        if bullets:
+            output.append("<ul>" + "".join(f"<li>{render_inline(item)}</li>" for item in bullets) + "</ul>")
+            bullets.clear()
+
+    for raw_line in (markdown or "").replace("\r\n", "\n").split("\n"):
+        line = raw_line.strip()
+
+        if not line or RULE_PATTERN.match(line) or TABLE_SEPARATOR_PATTERN.match(line):
+            flush_paragraph()
+            flush_bullets()
+            continue
+
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            flush_paragraph()
+            flush_bullets()
+            level, text = len(heading.group(1)), heading.group(2)
+            if level == 1 and not title_dropped and not output:
+                title_dropped = True
+                continue
+            tag = "h2" if level <= 2 else "h3"
+            # Les titres sont rendus sans marques (html_to_sanity_blocks les nettoie)
+            output.append(f"<{tag}>{html.escape(BOLD_PATTERN.sub(lambda m: m.group(1) or m.group(2), text), quote=False)}</{tag}>")
+            continue
+
+        bullet = BULLET_PATTERN.match(raw_line)
+        if bullet:
+            flush_paragraph()
+            bullets.append(bullet.group(1).strip())
+            continue
+
+        ordered = ORDERED_PATTERN.match(raw_line)
+        if ordered:
+            flush_paragraph()
+            flush_bullets()
+            output.append(f"<p>{ordered.group(1)}. {render_inline(ordered.group(2).strip())}</p>")
+            continue
+
+        if line.startswith(">"):
+            line = line.lstrip("> ").strip()
+        if line.startswith("|") and line.endswith("|"):
+            # Ligne de tableau : cellules séparées par " | " dans un paragraphe
+            flush_paragraph()
+            flush_bullets()
+            cells = [cell.strip() for cell in line.strip("|").split("|")]
+            output.append(f"<p>{render_inline(' | '.join(cells))}</p>")
+            continue
+
+        if bullets and raw_line[:1] in (" ", "\t"):
+            # Suite d'un élément de liste sur la ligne suivante (indentée)
+            bullets[-1] += " " + line
+            continue
+
+        flush_bullets()
+        paragraph.append(line)
+
+    flush_paragraph()
+    flush_bullets()
+    return "\n".join(output)
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Réponses simulées des API externes (OpenAI, Perplexity, Sanity, blog Rounded)
+- Déterministes : même requête → même réponse (graine dérivée des messages)
+- Formes identiques à celles attendues par les parseurs de generate_article.py
+  (variantes, scoring, SEO FR, SEO EN, articles Markdown, citations, références)
+- Réponses prédéfinies optionnelles (fichier JSON) prioritaires sur les réponses générées
+- Utilisées par le serveur de benchmark hors ligne (scripts/bench/mock_server.py)
+"""
+
+import hashlib
+import json
+import random
+import re
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Vocabulaire des textes générés (longueur de mots proche d'un vrai article)
+FR_WORDS = (
+    "cabinet médical secrétariat patients rendez-vous agent vocal appels téléphoniques "
+    "médecins planning automatisation disponibilité urgence consultation accueil "
+    "organisation temps gestion qualité suivi relance données santé équipe efficacité "
+    "solution outil pratique quotidien réduction absences satisfaction sécurité conformité"
+).split()
+EN_WORDS = (
+    "medical practice secretary patients appointments voice agent phone calls doctors "
+    "schedule automation availability emergency consultation reception organization time "
+    "management quality follow-up reminder health data team efficiency solution tool daily"
+).split()
+
+CITATIONS = [
+    "https://www.has-sante.fr/jcms/etude-secretariat-medical",
+    "https://drees.solidarites-sante.gouv.fr/publications/acces-aux-soins",
+    "https://www.ordre.medecin.fr/demographie-medicale",
+    "https://www.doctolib.fr/etudes/absences-rendez-vous",
+]
+
+BLOG_TITLES = [
+    "Comment réduire les appels manqués au cabinet médical",
+    "Secrétariat médical : les avantages d'un agent vocal IA",
+    "Gérer les urgences téléphoniques sans surcharger l'équipe",
+    "Rendez-vous non honorés : 5 leviers pour les réduire",
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation grossière du nombre de tokens (≈ 4 caractères par token)"""
+    return max(1, len(text or "") // 4)
+
+
+def _rng(messages: List[Dict[str, Any]]) -> random.Random:
+    digest = hashlib.sha256(json.dumps(messages, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def _sentence(rng: random.Random, words: List[str], length: int) -> str:
+    text = " ".join(rng.choice(words) for _ in range(length))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random, words: List[str], sentences: int = 4) -> str:
+    return " ".join(_sentence(rng, words, rng.randint(10, 22)) for _ in range(sentences))
+
+
+def generate_markdown_article(rng: random.Random, words: int = 1200, english: bool = False, title: str = "") -> str:
+    """Article Markdown (titre H1, sections H2, paragraphes, listes) d'environ `words` mots"""
+    vocabulary = EN_WORDS if english else FR_WORDS
+    title = title or _sentence(rng, vocabulary, 7).rstrip(".")
+    parts = [f"# {title}", _paragraph(rng, vocabulary, 3)]
+    count = sum(len(p.split()) for p in parts)
+    section = 1
+    while count < words:
+        heading = _sentence(rng, vocabulary, 5).rstrip(".")
+        body = [f"## {section}. {heading}", _paragraph(rng, vocabulary), _paragraph(rng, vocabulary, 3)]
+        if section % 2 == 0:
+            body.append("\n".join(f"- **{rng.choice(vocabulary)}** : {_sentence(rng, vocabulary, 8)}" for _ in range(3)))
+        parts.extend(body)
+        count += sum(len(p.split()) for p in body)
+        section += 1
+    return "\n\n".join(parts)
+
+
+def _slugify(text: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return slug[:60] or "article"
+
+
+def _last_user_content(messages: List[Dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return str(message.get("content") or "")
+    return ""
+
+
+def _system_content(messages: List[Dict[str, Any]]) -> str:
+    return "\n".join(str(m.get("content") or "") for m in messages if m.get("role") == "system")
+
+
+def _article_title(markdown: str, default: str = "Article") -> str:
+    match = re.search(r"^#\s+(.+)$", markdown, re.MULTILINE)
+    return match.group(1).strip() if match else default
+
+
+def _variants_json(rng: random.Random) -> Dict[str, Any]:
+    variants = []
+    for index in range(1, 4):
+        variants.append({
+            "title": f"Variante {index} : " + _sentence(rng, FR_WORDS, 6).rstrip("."),
+            "angle": _sentence(rng, FR_WORDS, 14),
+            "outline": [_sentence(rng, FR_WORDS, 5).rstrip(".") for _ in range(5)],
+        })
+    return {"variants": variants}
+
+
+def _scoring_actions(rng: random.Random, article: str) -> List[Dict[str, str]]:
+    """Actions prioritaires rattachées aux sections H2 présentes dans la requête (ou à la FAQ / conclusion)"""
+    headings = re.findall(r"^##\s+(.+?)\s*$", article, re.MULTILINE)
+    targets = rng.sample(headings, min(2, len(headings))) + ["faq", "global"]
+    return [{"section": target, "action": _sentence(rng, FR_WORDS, 10)} for target in targets]
+
+
+def _scoring_json(rng: random.Random, article: str = "") -> Dict[str, Any]:
+    scores = {
+        "content_score": rng.randint(13, 19),
+        "readability_score": rng.randint(12, 19),
+        "seo_score": rng.randint(18, 28),
+        "conversion_score": rng.randint(10, 18),
+        "credibility_score": rng.randint(6, 10),
+    }
+    scores["global_score"] = int(
+        scores["content_score"] / 20 * 25 + scores["readability_score"] / 20 * 20
+        + scores["seo_score"] / 30 * 30 + scores["conversion_score"] / 20 * 20
+        + scores["credibility_score"] / 10 * 5
+    )
+    report = ["# Rapport de scoring", f"**Score global : {scores['global_score']}/100**"]
+    for key, value in scores.items():
+        report.append(f"## {key}\n\n{value} — {_paragraph(rng, FR_WORDS, 2)}")
+    scores["markdown_report"] = "\n\n".join(report)
+    scores["actions"] = _scoring_actions(rng, article)
+    return scores
+
+
+def _seo_fr_json(rng: random.Random, article: str) -> Dict[str, Any]:
+    title = _article_title(article, _sentence(rng, FR_WORDS, 6).rstrip("."))[:65]
+    summary = _sentence(rng, FR_WORDS, 22)[:158]
+    return {
+        "title": title,
+        "slug": _slugify(title),
+        "summary": summary,
+        "keywords": rng.sample(FR_WORDS, 5),
+        "tag": "guides-pratiques",
+        "metaTitle": title[:60],
+        "metaDescription": summary,
+        "ogTitle": title,
+        "ogDescription": summary,
+        "focusKeyword": rng.choice(FR_WORDS),
+    }
+
+
+def _seo_en_json(rng: random.Random, article: str) -> Dict[str, Any]:
+    title = _article_title(article, _sentence(rng, EN_WORDS, 6).rstrip("."))[:65]
+    summary = _sentence(rng, EN_WORDS, 22)[:158]
+    slug = _slugify(title)
+    return {
+        "title": title,
+        "summary": summary,
+        "slug": slug,
+        "metaTitle": title[:60],
+        "metaDescription": summary,
+        "ogTitle": title,
+        "ogDescription": summary,
+        "canonicalUrl": f"https://callrounded.com/blog/{slug}-en",
+    }
+
+
+SECTION_PART_PATTERN = re.compile(r"PARTIE À RÉDIGER : (.+)\nLongueur cible : environ (\d+) mots")
+REWRITE_PART_PATTERN = re.compile(r"SECTION À RÉÉCRIRE : (.+)\nLongueur cible : environ (\d+) mots")
+
+
+def _section_markdown(rng: random.Random, part: str, words: int) -> str:
+    """Une partie d'article (introduction ou section numérotée) d'environ `words` mots"""
+    body = []
+    while sum(len(p.split()) for p in body) < words:
+        body.append(_paragraph(rng, FR_WORDS, rng.randint(3, 5)))
+    if part.startswith("INTRODUCTION"):
+        return "# " + _sentence(rng, FR_WORDS, 7).rstrip(".") + "\n\n" + "\n\n".join(body)
+    number = re.search(r"SECTION (\d+)", part)
+    heading = f"## {number.group(1) if number else 1}. " + _sentence(rng, FR_WORDS, 4).rstrip(".")
+    return heading + "\n\n" + "\n\n".join(body)
+
+
+def _merge_json(rng: random.Random, user: str) -> Dict[str, Any]:
+    expected = re.search(r"transitions attendues\) : (\d+)", user)
+    count = int(expected.group(1)) if expected else 0
+    return {
+        "transitions": [_sentence(rng, FR_WORDS, 12) for _ in range(count)],
+        "conclusion": "## Conclusion\n\n" + _paragraph(rng, FR_WORDS, 4),
+    }
+
+
+def load_canned_responses(path: Optional[Path]) -> List[Dict[str, Any]]:
+    """
+    Charge un fichier de réponses prédéfinies :
+    [{"endpoint": "openai" | "perplexity" | "sanity_query" | "sanity_mutate" | "blog",
+      "match": "sous-chaîne recherchée dans la requête", "response": str | dict}, ...]
+    """
+    if not path:
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            canned = json.load(f)
+        return canned if isinstance(canned, list) else []
+    except Exception as e:
+        print(f"⚠️  Erreur chargement réponses prédéfinies {path}: {e}")
+        return []
+
+
+def find_canned(canned: List[Dict[str, Any]], endpoint: str, request_text: str) -> Optional[Any]:
+    """Première réponse prédéfinie de l'endpoint dont le motif apparaît dans la requête"""
+    for entry in canned:
+        if entry.get("endpoint", "openai") != endpoint:
+            continue
+        if entry.get("match", "") in request_text:
+            return entry.get("response")
+    return None
+
+
+def chat_completion_content(
+    messages: List[Dict[str, Any]],
+    response_format: Optional[Dict[str, Any]] = None,
+    article_words: int = 1200,
+) -> str:
+    """
+    Contenu de la réponse à un appel chat.completions.
+
+    Schémas JSON des étapes combinées (seo_and_scoring, translation_with_seo)
+    reconnus par leur nom. Sinon en mode JSON, la forme est choisie d'après les
+    clés demandées dans le prompt système (variants, markdown_report, focusKeyword,
+    sinon métadonnées SEO EN).
+    En mode texte : article Markdown (en anglais pour une traduction).
+    """
+    rng = _rng(messages)
+    system = _system_content(messages)
+    user = _last_user_content(messages)
+
+    schema_name = ((response_format or {}).get("json_schema") or {}).get("name")
+    if schema_name == "seo_and_scoring":
+        data = {"seo": _seo_fr_json(rng, user), "scoring": _scoring_json(rng, user)}
+        return json.dumps(data, ensure_ascii=False)
+    if schema_name == "translation_with_seo":
+        article = generate_markdown_article(rng, article_words, english=True, title=_article_title(user, ""))
+        data = {"article_markdown": article, **_seo_en_json(rng, article)}
+        data.pop("canonicalUrl")
+        return json.dumps(data, ensure_ascii=False)
+
+    if (response_format or {}).get("type") in ("json_object", "json_schema"):
+        if "variants" in system or "variants" in user:
+            data = _variants_json(rng)
+        elif "transitions" in system and "conclusion" in system:
+            data = _merge_json(rng, user)
+        elif "markdown_report" in system or "global_score" in system:
+            data = _scoring_json(rng, user)
+        elif "focusKeyword" in system:
+            data = _seo_fr_json(rng, user)
+        else:
+            data = _seo_en_json(rng, user)
+        return json.dumps(data, ensure_ascii=False)
+
+    english = "translat" in system.lower()
+    part = SECTION_PART_PATTERN.search(user)
+    if part:
+        # Rédaction par sections : une partie de la longueur demandée
+        return _section_markdown(rng, part.group(1), int(part.group(2)))
+    rewrite = REWRITE_PART_PATTERN.search(user)
+    if rewrite:
+        # Réécriture ciblée : même titre H2, longueur de la section d'origine
+        body = [_paragraph(rng, FR_WORDS, rng.randint(3, 5)) for _ in range(max(1, int(rewrite.group(2)) // 60))]
+        return f"## {rewrite.group(1)}\n\n" + "\n\n".join(body)
+    return generate_markdown_article(rng, article_words, english=english, title=_article_title(user, ""))
+
+
+def chat_completion_body(content: str, model: str, prompt_tokens: int, finish_reason: str = "stop",
+                         cached_tokens: int = 0) -> Dict[str, Any]:
+    """Corps JSON d'une réponse chat.completions non streamée"""
+    completion_tokens = estimate_tokens(content)
+    return {
+        "id": f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": 0,
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": finish_reason,
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        },
+    }
+
+
+def chat_completion_chunk(completion_id: str, model: str, delta: Dict[str, Any], finish_reason: Optional[str] = None,
+                          usage: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Chunk SSE d'une réponse streamée (chunk d'usage final : choices vide)"""
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": model,
+        "choices": [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    if usage:
+        chunk["usage"] = usage
+    return chunk
+
+
+def perplexity_body(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Réponse Perplexity (sonar-pro) : synthèse avec renvois [n] et liste de citations"""
+    rng = _rng(messages)
+    paragraphs = [f"{_paragraph(rng, FR_WORDS, 3)} [{i + 1}]" for i in range(len(CITATIONS))]
+    content = "\n\n".join(paragraphs)
+    prompt_tokens = sum(estimate_tokens(str(m.get("content") or "")) for m in messages)
+    body = chat_completion_body(content, "sonar-pro", prompt_tokens)
+    body["citations"] = list(CITATIONS)
+    return body
+
+
+def sanity_query_body(query: str) -> Dict[str, Any]:
+    """Réponse d'une requête GROQ de références (catégorie + auteur)"""
+    return {"ms": 1, "query": query, "result": {"category": "category-mock", "author": "author-mock"}}
+
+
+def sanity_mutate_body(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Réponse d'une mutation Sanity (un résultat par mutation)"""
+    results = []
+    for mutation in payload.get("mutations", []):
+        for operation, document in mutation.items():
+            results.append({"id": (document or {}).get("_id", uuid.uuid4().hex), "operation": "create"})
+    return {"transactionId": uuid.uuid4().hex, "results": results}
+
+
+def blog_html() -> str:
+    """Page liste du blog (titres en <h2>, comme le site réel)"""
+    items = "\n".join(f"<article><h2>{title}</h2><a>Lire l'article</a></article>" for title in BLOG_TITLES)
+    return f"<html><body><main>{items}</main></body></html>"
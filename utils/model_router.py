@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Routage des modèles OpenAI par étape du pipeline
+- Table de routage data/model_routing.json : chaîne de modèles par étape
+  (noms identiques aux opérations du token_tracker), "default" pour les autres
+- Surcharge par variable d'environnement : MODEL_<ÉTAPE>=gpt-4o,gpt-4o-mini
+  (ex: MODEL_GENERATE_ARTICLE ; MODEL_DEFAULT pour les étapes absentes du fichier)
+- Fournisseur par modèle (utils.llm_providers) : "local:<modèle>" pour un serveur
+  compatible OpenAI, "stub:<modèle>" pour les réponses synthétiques en process
+- Chaîne de repli : en cas d'erreur ou de timeout, le modèle suivant est essayé
+- Plafond de coût journalier (DAILY_COST_CEILING_USD) : à l'approche du plafond,
+  les modèles coûteux sont remplacés par leur équivalent économique
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BASE_DIR = Path(__file__).parent.parent
+ROUTING_FILE = BASE_DIR / "data" / "model_routing.json"
+
+# Table utilisée si data/model_routing.json est absent ou illisible
+DEFAULT_ROUTING: Dict[str, Any] = {
+    "default": {"models": ["gpt-4o-mini"], "timeout_seconds": 120},
+    "downgrade": {"gpt-4o": "gpt-4o-mini"},
+    "downgrade_at": 0.8,
+}
+
+# 0 = pas de plafond journalier
+DAILY_COST_CEILING_USD = float(os.getenv("DAILY_COST_CEILING_USD", "0") or 0)
+
+# Coût du jour relu au plus une fois par intervalle (l'historique est un fichier JSON)
+COST_CACHE_SECONDS = 30
+
+_lock = threading.Lock()
+_routing_cache: Dict[str, Any] = {"mtime": None, "table": None}
+_cost_cache: Dict[str, Any] = {"at": 0.0, "cost": 0.0}
+_downgrade_notified = False
+
+
+def load_routing() -> Dict[str, Any]:
+    """Table de routage (fichier relu seulement s'il a changé)"""
+    try:
+        mtime = ROUTING_FILE.stat().st_mtime
+    except OSError:
+        return DEFAULT_ROUTING
+    with _lock:
+        if _routing_cache["mtime"] == mtime:
+            return _routing_cache["table"]
+    try:
+        with open(ROUTING_FILE, "r", encoding="utf-8") as f:
+            table = json.load(f)
+        if not isinstance(table, dict):
+            raise ValueError("objet JSON attendu")
+    except Exception as e:
+        print(f"⚠️  Erreur chargement routage des modèles ({e}) : routage par défaut")
+        table = DEFAULT_ROUTING
+    with _lock:
+        _routing_cache.update(mtime=mtime, table=table)
+    return table
+
+
+def _stage_config(stage: str, table: Dict[str, Any]) -> Dict[str, Any]:
+    config = dict(table.get("default") or DEFAULT_ROUTING["default"])
+    config.update(table.get("stages", {}).get(stage) or {})
+    return config
+
+
+def _env_models(name: str) -> Optional[List[str]]:
+    value = os.getenv(f"MODEL_{name.upper()}")
+    if not value:
+        return None
+    return [m.strip() for m in value.split(",") if m.strip()] or None
+
+
+def daily_cost() -> float:
+    """Coût estimé (USD) des appels du jour, d'après le token_tracker"""
+    now = time.time()
+    with _lock:
+        if now - _cost_cache["at"] < COST_CACHE_SECONDS:
+            return _cost_cache["cost"]
+    try:
+        from utils.token_tracker import get_daily_cost
+        cost = get_daily_cost()
+    except Exception as e:
+        print(f"⚠️  Erreur calcul du coût journalier: {e}")
+        cost = 0.0
+    with _lock:
+        _cost_cache.update(at=now, cost=cost)
+    return cost
+
+
+def cost_ceiling(table: Optional[Dict[str, Any]] = None) -> float:
+    """Plafond journalier (variable d'environnement prioritaire sur le fichier de routage)"""
+    table = table or load_routing()
+    return DAILY_COST_CEILING_USD or float(table.get("daily_cost_ceiling_usd") or 0)
+
+
+def should_downgrade(table: Optional[Dict[str, Any]] = None) -> bool:
+    """True si le coût du jour a atteint downgrade_at × plafond"""
+    table = table or load_routing()
+    ceiling = cost_ceiling(table)
+    if ceiling <= 0:
+        return False
+    return daily_cost() >= ceiling * float(table.get("downgrade_at", DEFAULT_ROUTING["downgrade_at"]))
+
+
+def route(stage: str) -> Dict[str, Any]:
+    """
+    Modèles à essayer pour une étape, dans l'ordre.
+
+    Returns:
+        {"models": [modèle principal, replis...], "timeout_seconds": float, "downgraded": bool}
+    """
+    global _downgrade_notified
+    table = load_routing()
+    config = _stage_config(stage, table)
+    # Priorité : MODEL_<ÉTAPE>, étape du fichier, MODEL_DEFAULT, "default" du fichier
+    models = _env_models(stage)
+    if not models and stage not in table.get("stages", {}):
+        models = _env_models("default")
+    models = models or list(config.get("models") or DEFAULT_ROUTING["default"]["models"])
+
+    downgraded = should_downgrade(table)
+    if downgraded:
+        mapping = table.get("downgrade") or DEFAULT_ROUTING["downgrade"]
+        models = [mapping.get(m, m) for m in models]
+        if not _downgrade_notified:
+            print(f"💸 Coût du jour proche du plafond ({daily_cost():.2f} / {cost_ceiling(table):.2f} USD) : modèles économiques")
+    _downgrade_notified = downgraded
+    # Doublons retirés (ex: gpt-4o → gpt-4o-mini déjà présent en repli)
+    models = list(dict.fromkeys(models))
+    return {"models": models, "timeout_seconds": float(config.get("timeout_seconds", 120)), "downgraded": downgraded}
+
+
+def primary_model(stage: str) -> str:
+    """Premier modèle de la chaîne (budgets de prompt, estimations)"""
+    return route(stage)["models"][0]
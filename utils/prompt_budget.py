@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Construction des prompts sous budget de tokens
+- Comptage exact avec tiktoken (encodeur mis en cache par modèle), estimation
+  prudente (≈ 3,5 caractères par token) si tiktoken n'est pas disponible
+- Budget de prompt par étape : les sections variables (recherche web, rapport
+  de scoring, contexte...) sont tronquées par ordre de priorité
+- max_tokens choisi d'après la taille de sortie attendue (fixe, ou
+  proportionnelle au texte source pour les réécritures / traductions)
+- Utilisation du budget affichée et ajoutée au span de l'étape (utils.tracing)
+"""
+
+import math
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.tracing import annotate_span
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+MODEL_CONTEXT_WINDOWS = {"gpt-4o-mini": 128_000, "gpt-4o": 128_000}
+MODEL_MAX_OUTPUT_TOKENS = {"gpt-4o-mini": 16_384, "gpt-4o": 16_384}
+
+# Caractères par token pour l'estimation sans tiktoken (volontairement bas : surestime)
+CHARS_PER_TOKEN = 3.5
+
+# Coût fixe par message et amorce de la réponse (format chat OpenAI)
+TOKENS_PER_MESSAGE = 3
+TOKENS_REPLY_PRIMING = 3
+
+TRUNCATION_MARKER = "\n[…]"
+
+# Budgets par étape (noms identiques aux opérations du token_tracker)
+# - prompt : tokens maximum du prompt complet (system + user)
+# - output : sortie attendue fixe, ou ratio × tokens du texte source + margin
+# - min_output / max_output : bornes du max_tokens envoyé à l'API
+STAGE_BUDGETS: Dict[str, Dict[str, Any]] = {
+    "generate_variants": {"prompt": 4_000, "output": 1_200, "max_output": 1_500},
+    "generate_article": {"prompt": 6_000, "output": 4_000, "max_output": 5_000},
+    # Rédaction par sections en parallèle : une partie (~300 mots) puis transitions + conclusion
+    "generate_section": {"prompt": 4_000, "output": 900, "max_output": 1_400},
+    "merge_sections": {"prompt": 8_000, "output": 700, "max_output": 1_000},
+    "style_refinement": {"prompt": 12_000, "ratio": 1.15, "margin": 400, "min_output": 1_500, "max_output": 8_000},
+    "score_article": {"prompt": 14_000, "output": 2_500, "max_output": 3_500},
+    "regenerate_with_scoring": {"prompt": 16_000, "ratio": 1.25, "margin": 500, "min_output": 1_500, "max_output": 8_000},
+    # Réécriture ciblée : une section H2 (ou une FAQ à créer) puis mise à jour courte du scoring
+    "regenerate_section": {"prompt": 4_000, "ratio": 1.3, "margin": 200, "min_output": 900, "max_output": 2_500},
+    "rescore_sections": {"prompt": 8_000, "output": 900, "max_output": 1_400},
+    # Métadonnées seulement (blog_post rendu localement par utils.markdown_renderer)
+    "optimize_seo": {"prompt": 6_000, "output": 700, "max_output": 1_000},
+    "translate_article": {"prompt": 12_000, "ratio": 1.1, "margin": 300, "min_output": 1_500, "max_output": 8_000},
+    "optimize_seo_en": {"prompt": 3_000, "output": 500, "max_output": 800},
+    # Étapes combinées : sortie de l'étape principale + métadonnées / rapport de scoring
+    "optimize_seo_and_score": {"prompt": 18_000, "output": 3_200, "max_output": 4_500},
+    "translate_article_seo": {"prompt": 12_000, "ratio": 1.15, "margin": 700, "min_output": 2_000, "max_output": 8_500},
+}
+
+
+@lru_cache(maxsize=None)
+def get_encoder(model: str = DEFAULT_MODEL):
+    """Encodeur tiktoken du modèle (None si tiktoken est absent ou ne peut pas charger l'encodage)"""
+    try:
+        import tiktoken
+    except ImportError:
+        print("ℹ️  tiktoken non installé : comptage des tokens par estimation")
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Modèle inconnu de cette version de tiktoken : encodage de la famille gpt-4o
+        try:
+            return tiktoken.get_encoding("o200k_base")
+        except Exception:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # Les fichiers d'encodage sont téléchargés au premier usage (hors ligne : échec)
+        print(f"⚠️  Encodeur tiktoken indisponible ({e}) : comptage des tokens par estimation")
+        return None
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """Nombre de tokens d'un texte (exact avec tiktoken, estimé sinon)"""
+    if not text:
+        return 0
+    encoder = get_encoder(model)
+    if encoder is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: List[Dict[str, str]], model: str = DEFAULT_MODEL) -> int:
+    """Tokens de prompt d'une liste de messages chat (contenu + coût fixe par message)"""
+    total = TOKENS_REPLY_PRIMING
+    for message in messages:
+        total += TOKENS_PER_MESSAGE + count_tokens(message.get("content") or "", model)
+    return total
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> str:
+    """
+    Tronque un texte à max_tokens (marqueur de coupure inclus), de préférence
+    à la fin d'un paragraphe ou d'une ligne pour ne pas couper une phrase.
+    """
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    limit = max_tokens - count_tokens(TRUNCATION_MARKER, model)
+    if limit <= 0:
+        return ""
+    encoder = get_encoder(model)
+    if encoder is None:
+        head = text[:int(limit * CHARS_PER_TOKEN)]
+    else:
+        head = encoder.decode(encoder.encode(text, disallowed_special=())[:limit])
+    for separator in ("\n\n", "\n", ". "):
+        cut = head.rfind(separator)
+        if cut >= len(head) * 0.8:
+            head = head[:cut + (1 if separator == ". " else 0)]
+            break
+    return head.rstrip() + TRUNCATION_MARKER
+
+
+class Section:
+    """
+    Partie variable d'un prompt.
+
+    priority : 0 = jamais tronquée ; plus la valeur est grande, plus la section
+    est tronquée tôt quand le prompt dépasse le budget.
+    min_tokens : taille conservée au minimum en cas de troncature.
+    max_tokens : plafond appliqué même sous le budget (ex: recherche web).
+    """
+
+    def __init__(self, name: str, text: str, priority: int = 1, min_tokens: int = 0, max_tokens: Optional[int] = None):
+        self.name = name
+        self.text = text or ""
+        self.priority = priority
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+
+
+class PromptPlan:
+    """Prompt assemblé : messages, max_tokens choisi et utilisation du budget"""
+
+    def __init__(self, stage: str, messages: List[Dict[str, str]], prompt_tokens: int, budget: int,
+                 max_tokens: int, trimmed: Dict[str, tuple], exact: bool):
+        self.stage = stage
+        self.messages = messages
+        self.prompt_tokens = prompt_tokens
+        self.budget = budget
+        self.max_tokens = max_tokens
+        self.trimmed = trimmed
+        self.exact = exact
+
+    @property
+    def utilisation(self) -> float:
+        return self.prompt_tokens / self.budget if self.budget else 0.0
+
+    def report(self):
+        """Affiche l'utilisation du budget et l'ajoute au span courant"""
+        approx = "" if self.exact else "~"
+        print(
+            f"📏 {self.stage} : {approx}{self.prompt_tokens} / {self.budget} tokens de prompt "
+            f"({self.utilisation:.0%}), max_tokens {self.max_tokens}"
+        )
+        for name, (before, after) in self.trimmed.items():
+            print(f"   ✂️  {name} tronqué : {before} → {after} tokens")
+        annotate_span(
+            prompt_tokens=self.prompt_tokens,
+            prompt_budget=self.budget,
+            prompt_utilisation=round(self.utilisation, 3),
+            max_tokens=self.max_tokens,
+            trimmed=sorted(self.trimmed) or None,
+        )
+
+
+def choose_max_tokens(stage: str, prompt_tokens: int, source_tokens: int = 0, model: str = DEFAULT_MODEL) -> int:
+    """max_tokens d'après la sortie attendue de l'étape, borné par le modèle et la fenêtre de contexte"""
+    budget = STAGE_BUDGETS.get(stage, {})
+    if "ratio" in budget:
+        expected = math.ceil(source_tokens * budget["ratio"]) + budget.get("margin", 0)
+    else:
+        expected = budget.get("output", 4_000)
+    expected = max(expected, budget.get("min_output", 0))
+    expected = min(expected, budget.get("max_output", expected), MODEL_MAX_OUTPUT_TOKENS.get(model, 4_096))
+    context_left = MODEL_CONTEXT_WINDOWS.get(model, 128_000) - prompt_tokens
+    return max(1, min(expected, context_left))
+
+
+def build_prompt(
+    stage: str,
+    render: Callable[[Dict[str, str]], List[Dict[str, str]]],
+    sections: Optional[List[Section]] = None,
+    source_text: str = "",
+    model: str = DEFAULT_MODEL,
+    report: bool = True,
+) -> PromptPlan:
+    """
+    Assemble le prompt d'une étape dans son budget.
+
+    Args:
+        stage: clé de STAGE_BUDGETS
+        render: fonction {nom de section: texte} -> messages (le prompt de l'étape)
+        sections: parties variables, tronquées par priorité si le budget est dépassé
+        source_text: texte à réécrire / traduire (taille de sortie proportionnelle)
+
+    Returns:
+        PromptPlan (messages, max_tokens, prompt_tokens, utilisation)
+    """
+    sections = sections or []
+    budget = STAGE_BUDGETS.get(stage, {}).get("prompt", MODEL_CONTEXT_WINDOWS.get(model, 128_000) // 2)
+
+    values = {s.name: s.text for s in sections}
+    sizes = {s.name: count_tokens(s.text, model) for s in sections}
+    targets = dict(sizes)
+    for s in sections:
+        if s.max_tokens is not None:
+            targets[s.name] = min(targets[s.name], s.max_tokens)
+
+    # Coût du prompt hors sections (instructions, métriques, etc.)
+    fixed_tokens = count_message_tokens(render({s.name: "" for s in sections}), model)
+    overflow = fixed_tokens + sum(targets.values()) - budget
+    for s in sorted((s for s in sections if s.priority > 0), key=lambda s: -s.priority):
+        if overflow <= 0:
+            break
+        reducible = max(0, targets[s.name] - s.min_tokens)
+        cut = min(reducible, overflow)
+        targets[s.name] -= cut
+        overflow -= cut
+
+    trimmed = {}
+    for s in sections:
+        if targets[s.name] < sizes[s.name]:
+            values[s.name] = truncate_to_tokens(s.text, targets[s.name], model)
+            trimmed[s.name] = (sizes[s.name], count_tokens(values[s.name], model))
+
+    messages = render(values)
+    prompt_tokens = count_message_tokens(messages, model)
+    if prompt_tokens > budget:
+        print(f"⚠️  {stage} : prompt de {prompt_tokens} tokens au-delà du budget ({budget}), sections prioritaires conservées")
+
+    plan = PromptPlan(
+        stage=stage,
+        messages=messages,
+        prompt_tokens=prompt_tokens,
+        budget=budget,
+        max_tokens=choose_max_tokens(stage, prompt_tokens, count_tokens(source_text, model), model),
+        trimmed=trimmed,
+        exact=get_encoder(model) is not None,
+    )
+    if report:
+        plan.report()
+    return plan
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Régulateur de débit partagé pour les appels OpenAI (tous les threads du process :
+jobs Streamlit simultanés, sections en parallèle, brouillons spéculatifs, lots)
+- Par modèle : seau de requêtes (RPM) et seau de tokens (TPM) rechargés en continu ;
+  un appel réserve ses tokens de prompt estimés + max_tokens (comme le compte OpenAI)
+- Limites et niveaux recalés sur les en-têtes x-ratelimit-* de chaque réponse
+- Concurrence AIMD : +1 appel simultané par fenêtre d'appels réussis, ÷2 sur un 429
+- Un 429 met l'appel en file jusqu'au reset annoncé puis le relance, au lieu d'échouer
+- Statistiques d'attente en file (moyenne, p95, max) pour dimensionner le tier OpenAI
+Intégration : transport httpx (governed_transport) du client OpenAI, voir utils.tracing.openai_http_client
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+from utils.tracing import annotate_span
+
+# Désactivable (OPENAI_RATE_GOVERNOR=0) : appels envoyés directement
+GOVERNOR_ENABLED = os.getenv("OPENAI_RATE_GOVERNOR", "1") != "0"
+
+# Limites initiales (tier 1 gpt-4o-mini), remplacées par x-ratelimit-limit-* dès la première réponse
+DEFAULT_RPM = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+DEFAULT_TPM = int(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+
+INITIAL_CONCURRENCY = 4
+MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+
+# Tentatives après un 429 avant de rendre l'erreur au client OpenAI
+MAX_RATE_LIMIT_RETRIES = 6
+# Attente après un 429 sans en-tête exploitable
+DEFAULT_RETRY_SECONDS = 1.0
+# Estimation des tokens de prompt (≈ 4 caractères par token, comme l'estimation d'OpenAI)
+CHARS_PER_TOKEN = 4
+DEFAULT_MAX_TOKENS = 1024
+
+GOVERNED_PATHS = ("/chat/completions", "/completions", "/embeddings", "/responses")
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Durée OpenAI ("20ms", "1.5s", "6m0s") en secondes, None si absente ou illisible"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    matches = DURATION_PATTERN.findall(value)
+    if not matches:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in matches)
+
+
+def _header_int(headers, name: str) -> Optional[int]:
+    try:
+        return int(float(headers.get(name)))
+    except (TypeError, ValueError):
+        return None
+
+
+class ModelGovernor:
+    """Seaux RPM / TPM, concurrence AIMD et statistiques de file pour un modèle"""
+
+    def __init__(self, model: str, rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM, max_concurrency: int = MAX_CONCURRENCY):
+        self.model = model
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(min(INITIAL_CONCURRENCY, max_concurrency))
+        self.requests_available = float(rpm)
+        self.tokens_available = float(tpm)
+        self.in_flight = 0
+        self.waiting = 0
+        self.blocked_until = 0.0
+        self._refilled_at = time.monotonic()
+        self._cond = threading.Condition()
+        self.stats = {"requests": 0, "rate_limited": 0, "queued": 0, "wait_total": 0.0, "max_waiting": 0}
+        self._waits = deque(maxlen=1000)
+
+    def _refill(self, now: float):
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self.requests_available = min(self.rpm, self.requests_available + elapsed * self.rpm / 60)
+        self.tokens_available = min(self.tpm, self.tokens_available + elapsed * self.tpm / 60)
+
+    def _delay(self, now: float, tokens: int) -> Optional[float]:
+        """Attente avant de pouvoir envoyer l'appel (0 : maintenant, None : attendre une fin d'appel)"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.in_flight >= int(self.concurrency):
+            return None
+        if self.requests_available < 1:
+            return (1 - self.requests_available) * 60 / self.rpm
+        if self.tokens_available < tokens:
+            return (tokens - self.tokens_available) * 60 / self.tpm
+        return 0.0
+
+    def acquire(self, tokens: int) -> float:
+        """Bloque jusqu'à ce que l'appel respecte RPM, TPM et concurrence ; retourne l'attente (s)"""
+        started = time.monotonic()
+        with self._cond:
+            # Un appel plus gros que le TPM entier passe quand le seau est plein
+            tokens = min(tokens, self.tpm)
+            self.waiting += 1
+            self.stats["max_waiting"] = max(self.stats["max_waiting"], self.waiting)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                delay = self._delay(now, tokens)
+                if delay == 0.0:
+                    break
+                # Réveil par release() / un 429, ou à l'échéance du seau (au plus 1 s)
+                self._cond.wait(timeout=1.0 if delay is None else min(delay, 1.0))
+            self.waiting -= 1
+            self.requests_available -= 1
+            self.tokens_available -= tokens
+            self.in_flight += 1
+            waited = time.monotonic() - started
+            self.stats["requests"] += 1
+            self.stats["wait_total"] += waited
+            if waited >= 0.01:
+                self.stats["queued"] += 1
+            self._waits.append(waited)
+        return waited
+
+    def release(self, headers=None, success: bool = True):
+        """Fin d'un appel : recalage sur les en-têtes, croissance additive de la concurrence"""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            if headers is not None:
+                self._sync(headers)
+            if success:
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1 / max(self.concurrency, 1))
+            self._cond.notify_all()
+
+    def rate_limited(self, headers) -> float:
+        """429 reçu : concurrence divisée par deux, file bloquée jusqu'au reset annoncé ; retourne l'attente (s)"""
+        retry_ms = _header_int(headers, "retry-after-ms")
+        delay = (
+            retry_ms / 1000 if retry_ms is not None
+            else parse_reset(headers.get("retry-after"))
+            or max(parse_reset(headers.get("x-ratelimit-reset-requests")) or 0,
+                   parse_reset(headers.get("x-ratelimit-reset-tokens")) or 0)
+            or DEFAULT_RETRY_SECONDS
+        )
+        with self._cond:
+            self.stats["rate_limited"] += 1
+            self.concurrency = max(1.0, self.concurrency / 2)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self._sync(headers)
+            self._cond.notify_all()
+        return delay
+
+    def _sync(self, headers):
+        """Limites (x-ratelimit-limit-*) et niveaux restants (x-ratelimit-remaining-*) annoncés par l'API"""
+        rpm = _header_int(headers, "x-ratelimit-limit-requests")
+        tpm = _header_int(headers, "x-ratelimit-limit-tokens")
+        if rpm:
+            self.rpm = rpm
+        if tpm:
+            self.tpm = tpm
+        self._refill(time.monotonic())
+        remaining_requests = _header_int(headers, "x-ratelimit-remaining-requests")
+        remaining_tokens = _header_int(headers, "x-ratelimit-remaining-tokens")
+        if remaining_requests is not None:
+            self.requests_available = min(self.requests_available, remaining_requests)
+        if remaining_tokens is not None:
+            self.tokens_available = min(self.tokens_available, remaining_tokens)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            waits = sorted(self._waits)
+            count = self.stats["requests"]
+            return {
+                "model": self.model,
+                "rpm_limit": self.rpm,
+                "tpm_limit": self.tpm,
+                "concurrency": round(self.concurrency, 2),
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "requests": count,
+                "queued": self.stats["queued"],
+                "rate_limited": self.stats["rate_limited"],
+                "max_waiting": self.stats["max_waiting"],
+                "wait_avg_ms": round(self.stats["wait_total"] / count * 1000, 1) if count else 0.0,
+                "wait_p95_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0.0,
+                "wait_max_ms": round(waits[-1] * 1000, 1) if waits else 0.0,
+            }
+
+
+_governors: Dict[str, ModelGovernor] = {}
+_registry_lock = threading.Lock()
+
+
+def get_governor(model: str) -> ModelGovernor:
+    """Régulateur partagé du modèle (créé au premier appel)"""
+    with _registry_lock:
+        governor = _governors.get(model)
+        if governor is None:
+            governor = _governors[model] = ModelGovernor(model)
+        return governor
+
+
+def get_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistiques par modèle depuis le démarrage du process"""
+    with _registry_lock:
+        governors = list(_governors.values())
+    return {g.model: g.snapshot() for g in governors}
+
+
+def estimate_request(body: bytes) -> Tuple[str, int]:
+    """(modèle, tokens réservés) d'une requête : prompt estimé + max_tokens"""
+    try:
+        payload = json.loads(body or b"{}")
+    except (ValueError, UnicodeDecodeError):
+        return "unknown", DEFAULT_MAX_TOKENS
+    prompt_chars = sum(len(str(m.get("content") or "")) for m in payload.get("messages") or [] if isinstance(m, dict))
+    prompt_chars += len(str(payload.get("input") or ""))
+    max_tokens = payload.get("max_tokens") or payload.get("max_completion_tokens") or payload.get("max_output_tokens")
+    return str(payload.get("model") or "unknown"), prompt_chars // CHARS_PER_TOKEN + int(max_tokens or DEFAULT_MAX_TOKENS)
+
+
+def _httpx_module():
+    """Module httpx sur lequel repose le SDK openai installé (httpx, ou son fork selon la version)"""
+    try:
+        from openai import DefaultHttpxClient
+    except ImportError:
+        return None
+    for base in DefaultHttpxClient.__mro__[1:]:
+        if base.__name__ == "Client":
+            return sys.modules.get(base.__module__.split(".")[0])
+    return None
+
+
+def governed_transport():
+    """
+    Transport httpx qui fait passer chaque appel OpenAI par le régulateur du
+    modèle (None si désactivé ou httpx indisponible : transport par défaut).
+    """
+    if not GOVERNOR_ENABLED:
+        return None
+    httpx = _httpx_module()
+    if httpx is None:
+        return None
+
+    class _ReleasingStream(httpx.SyncByteStream):
+        """Corps de réponse : la place de concurrence est rendue à la fermeture (fin du streaming)"""
+
+        def __init__(self, stream, on_close):
+            self._stream = stream
+            self._on_close = on_close
+
+        def __iter__(self):
+            for chunk in self._stream:
+                yield chunk
+
+        def close(self):
+            try:
+                self._stream.close()
+            finally:
+                on_close, self._on_close = self._on_close, None
+                if on_close:
+                    on_close()
+
+    class GovernedTransport(httpx.BaseTransport):
+        def __init__(self):
+            self._transport = httpx.HTTPTransport()
+
+        def handle_request(self, request):
+            if not request.url.path.endswith(GOVERNED_PATHS):
+                return self._transport.handle_request(request)
+
+            model, tokens = estimate_request(request.read())
+            governor = get_governor(model)
+            waited_total = 0.0
+            for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                waited_total += governor.acquire(tokens)
+                try:
+                    response = self._transport.handle_request(request)
+                except Exception:
+                    governor.release(success=False)
+                    raise
+
+                if response.status_code == 429 and attempt < MAX_RATE_LIMIT_RETRIES:
+                    response.read()
+                    response.close()
+                    governor.release(success=False)
+                    delay = governor.rate_limited(response.headers)
+                    print(f"⏳ 429 OpenAI ({model}) : appel remis en file, nouvelle tentative dans {delay:.1f}s")
+                    continue
+                break
+
+            if waited_total >= 0.01:
+                annotate_span(rate_limit_wait_ms=round(waited_total * 1000), rate_limit_retries=attempt)
+            headers = response.headers
+            return httpx.Response(
+                status_code=response.status_code,
+                headers=headers,
+                stream=_ReleasingStream(
+                    response.stream, lambda: governor.release(headers, success=response.status_code < 400),
+                ),
+                extensions=response.extensions,
+                request=request,
+            )
+
+        def close(self):
+            self._transport.close()
+
+    return GovernedTransport()
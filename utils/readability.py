@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Lisibilité multilingue (FR / EN)
+- Comptage de syllabes mémoïsé (LRU) par langue
+- Détection automatique de la langue
+- Indices : Flesch Reading Ease, Kandel–Moles (FR), Flesch–Kincaid Grade (EN)
+- Scoring en lot de plusieurs textes
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Iterable
+
+SUPPORTED_LANGUAGES = ("fr", "en")
+
+WORD_PATTERN = re.compile(r"\b[a-zàâäéèêëïîôùûüÿçœæ]+\b")
+SENTENCE_SPLIT_PATTERN = re.compile(r"[.!?]+\s+")
+
+FR_VOWELS = set("aeiouyàâäéèêëïîôùûüÿœæ")
+# Le tréma marque une diérèse : la voyelle forme une nouvelle syllabe (naïf, Noël)
+FR_DIAERESIS = set("ïëü")
+EN_VOWELS = set("aeiouy")
+
+FR_STOP_WORDS = {
+    "le", "la", "les", "des", "est", "et", "une", "du", "pour", "que", "qui",
+    "dans", "pas", "sur", "avec", "ce", "cette", "vous", "nous", "au", "aux",
+    "sont", "leur", "mais", "plus", "ou", "en", "un", "de",
+}
+EN_STOP_WORDS = {
+    "the", "and", "is", "of", "to", "in", "that", "for", "with", "are", "this",
+    "you", "on", "it", "be", "as", "your", "by", "from", "can", "or", "an", "a",
+}
+
+# Nombre de mots examinés pour la détection de langue (suffisant et rapide)
+DETECTION_SAMPLE_WORDS = 400
+
+
+@lru_cache(maxsize=50000)
+def _count_syllables_fr(word: str) -> int:
+    """Estime le nombre de syllabes d'un mot français (mot déjà en minuscules)"""
+    syllable_count = 0
+    prev_was_vowel = False
+
+    for char in word:
+        is_vowel = char in FR_VOWELS
+        if is_vowel and (not prev_was_vowel or char in FR_DIAERESIS):
+            syllable_count += 1
+        prev_was_vowel = is_vowel
+
+    # E muet final : "table", "pages" (mais pas "né", "café")
+    if syllable_count > 1 and len(word) > 2:
+        if word.endswith("e") and word[-2] not in FR_VOWELS:
+            syllable_count -= 1
+        elif word.endswith("es") and len(word) > 3 and word[-3] not in FR_VOWELS:
+            syllable_count -= 1
+
+    return max(1, syllable_count)
+
+
+@lru_cache(maxsize=50000)
+def _count_syllables_en(word: str) -> int:
+    """Estime le nombre de syllabes d'un mot anglais (mot déjà en minuscules)"""
+    if len(word) <= 3:
+        return 1
+
+    # Terminaisons muettes : "make", "makes", "used" (mais pas "table", "wanted")
+    stem = word
+    if stem.endswith("es") and not stem.endswith(("ses", "zes", "ces", "ges", "xes", "shes", "ches")):
+        stem = stem[:-2]
+    elif stem.endswith("ed") and not stem.endswith(("ted", "ded")):
+        stem = stem[:-2]
+    elif stem.endswith("e") and not stem.endswith(("le", "ee")):
+        stem = stem[:-1]
+
+    syllable_count = 0
+    prev_was_vowel = False
+    for char in stem:
+        is_vowel = char in EN_VOWELS
+        if is_vowel and not prev_was_vowel:
+            syllable_count += 1
+        prev_was_vowel = is_vowel
+
+    return max(1, syllable_count)
+
+
+def count_syllables(word: str, language: str = "fr") -> int:
+    """Compte les syllabes d'un mot selon les règles de la langue (résultat mémoïsé)"""
+    word = word.lower()
+    if language == "en":
+        return _count_syllables_en(word)
+    return _count_syllables_fr(word)
+
+
+def detect_language(text: str) -> str:
+    """
+    Détecte la langue d'un texte (fr ou en) à partir des mots-outils
+    et de la présence de caractères accentués.
+    """
+    words = WORD_PATTERN.findall(text[:DETECTION_SAMPLE_WORDS * 8].lower())[:DETECTION_SAMPLE_WORDS]
+    if not words:
+        return "fr"
+
+    fr_hits = sum(1 for w in words if w in FR_STOP_WORDS)
+    en_hits = sum(1 for w in words if w in EN_STOP_WORDS)
+    # Les accents sont un indice fort de français
+    fr_hits += sum(1 for w in words if any(c in "àâéèêëïîôùûç" for c in w))
+
+    return "en" if en_hits > fr_hits else "fr"
+
+
+def get_reading_level(score: float) -> str:
+    """Retourne le niveau de lecture associé à un score de facilité (0-100)"""
+    if score >= 90:
+        return "Très facile"
+    elif score >= 80:
+        return "Facile"
+    elif score >= 70:
+        return "Assez facile"
+    elif score >= 60:
+        return "Standard"
+    elif score >= 50:
+        return "Assez difficile"
+    elif score >= 30:
+        return "Difficile"
+    return "Très difficile"
+
+
+def _empty_result(language: str) -> Dict[str, Any]:
+    return {
+        "score": 0,
+        "level": "Non calculable",
+        "language": language,
+        "index": "kandel_moles" if language == "fr" else "flesch_reading_ease",
+        "sentences": 0,
+        "words": 0,
+        "syllables": 0,
+        "avg_sentence_length": 0,
+        "avg_syllables_per_word": 0,
+        "indices": {},
+    }
+
+
+def analyze_readability(text: str, language: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Calcule les indices de lisibilité d'un texte.
+
+    Le score principal ("score") est l'indice adapté à la langue :
+    - FR : Kandel–Moles (207 - 1.015 × ASL - 73.6 × ASW)
+    - EN : Flesch Reading Ease (206.835 - 1.015 × ASL - 84.6 × ASW)
+
+    Returns:
+        {
+            "score": float,
+            "level": str,
+            "language": "fr" | "en",
+            "index": str,  # nom de l'indice utilisé pour "score"
+            "sentences": int,
+            "words": int,
+            "syllables": int,
+            "avg_sentence_length": float,
+            "avg_syllables_per_word": float,
+            "indices": {
+                "flesch_reading_ease": float,
+                "kandel_moles": float,          # FR uniquement
+                "flesch_kincaid_grade": float,  # EN uniquement
+            }
+        }
+    """
+    language = language if language in SUPPORTED_LANGUAGES else detect_language(text)
+
+    sentences = [s for s in SENTENCE_SPLIT_PATTERN.split(text) if s.strip()]
+    num_sentences = len(sentences)
+
+    words = WORD_PATTERN.findall(text.lower())
+    num_words = len(words)
+
+    if num_sentences == 0 or num_words == 0:
+        return _empty_result(language)
+
+    # Chaque mot distinct n'est compté qu'une fois par texte (et une fois par process via le cache)
+    counter = _count_syllables_en if language == "en" else _count_syllables_fr
+    total_syllables = sum(counter(word) * n for word, n in Counter(words).items())
+
+    avg_sentence_length = num_words / num_sentences
+    avg_syllables_per_word = total_syllables / num_words
+
+    flesch = 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables_per_word)
+    indices = {"flesch_reading_ease": round(max(0, min(100, flesch)), 1)}
+
+    if language == "fr":
+        score = 207 - (1.015 * avg_sentence_length) - (73.6 * avg_syllables_per_word)
+        index_name = "kandel_moles"
+        indices["kandel_moles"] = round(max(0, min(100, score)), 1)
+    else:
+        score = flesch
+        index_name = "flesch_reading_ease"
+        grade = (0.39 * avg_sentence_length) + (11.8 * avg_syllables_per_word) - 15.59
+        indices["flesch_kincaid_grade"] = round(max(0, grade), 1)
+
+    score = max(0, min(100, score))
+
+    return {
+        "score": round(score, 1),
+        "level": get_reading_level(score),
+        "language": language,
+        "index": index_name,
+        "sentences": num_sentences,
+        "words": num_words,
+        "syllables": total_syllables,
+        "avg_sentence_length": round(avg_sentence_length, 1),
+        "avg_syllables_per_word": round(avg_syllables_per_word, 2),
+        "indices": indices,
+    }
+
+
+def score_texts(texts: Iterable[str], language: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Calcule la lisibilité de plusieurs textes en une passe.
+
+    Les caches de syllabes sont partagés entre les textes : sur un lot d'articles
+    du même domaine, la grande majorité des mots n'est comptée qu'une seule fois.
+    Si language est None, la langue est détectée pour chaque texte.
+    """
+    return [analyze_readability(text, language) for text in texts]
+
+
+def syllable_cache_info() -> Dict[str, Any]:
+    """Statistiques des caches de syllabes (utile pour le monitoring)"""
+    return {
+        "fr": _count_syllables_fr.cache_info()._asdict(),
+        "en": _count_syllables_en.cache_info()._asdict(),
+    }
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Métadonnées structurées des fichiers de review (sidecar <nom>.meta.json)
+- Écrit à côté de chaque articles/<nom>.md par save_article_for_review
+- Contient tous les champs Sanity (FR + EN) et les références des corps
+  (offset / longueur / hash dans le fichier .md, ou blob adressé par son hash
+  dans articles/blobs/ pour les HTML)
+- Permet de lister et publier sans re-parser les corps d'articles
+"""
+
+import hashlib
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from utils.blob_store import put_blob, read_blob
+from utils.durable_io import atomic_write_bytes, file_lock, write_json
+
+METADATA_VERSION = 1
+SIDECAR_SUFFIX = ".meta.json"
+
+
+def sidecar_path(review_path: Path) -> Path:
+    """Retourne le chemin du sidecar associé à un fichier de review"""
+    return review_path.with_name(review_path.stem + SIDECAR_SUFFIX)
+
+
+def body_hash(text: str) -> str:
+    """Hash SHA-256 d'un corps d'article (texte UTF-8)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def assemble_review_file(segments: List[Tuple[Optional[str], str]]) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+    """
+    Assemble le contenu d'un fichier de review à partir de segments.
+
+    Chaque segment est un tuple (nom, texte) : si nom n'est pas None, le segment
+    est un corps d'article dont on retient la position en octets dans le fichier.
+
+    Returns:
+        (contenu, {nom: {"offset": int, "length": int, "sha256": str}})
+    """
+    parts = []
+    refs = {}
+    offset = 0
+    for name, text in segments:
+        text = text or ""
+        length = len(text.encode("utf-8"))
+        if name:
+            refs[name] = {"offset": offset, "length": length, "sha256": body_hash(text)}
+        parts.append(text)
+        offset += length
+    return "".join(parts), refs
+
+
+def html_body_note(ref: Optional[Dict[str, Any]]) -> str:
+    """
+    Texte écrit dans le fichier de review à la place d'un HTML stocké hors du
+    fichier : blob (ref) ou Markdown identique (None).
+    """
+    if ref is None:
+        return "*Identique au contenu Markdown ci-dessous.*"
+    return f"*Stocké une seule fois dans `articles/blobs/{ref['blob'][:2]}/{ref['blob']}` ({ref['length']} octets).*"
+
+
+def build_sanity_fields(article_data: Dict[str, Any], language: str, published_at: str) -> Dict[str, Any]:
+    """Extrait les champs Sanity d'un article (format renvoyé par optimize_seo / generate_english_version)"""
+    slug = article_data.get("slug", "")
+    summary = article_data.get("summary", "")
+    return {
+        "title": article_data.get("title", ""),
+        "slug": slug,
+        "excerpt": summary,
+        "metaTitle": article_data.get("metaTitle", article_data.get("title", ""))[:60],
+        "metaDescription": article_data.get("metaDescription", summary)[:160],
+        "canonicalUrl": article_data.get("canonicalUrl", f"https://callrounded.com/blog/{slug}"),
+        "ogTitle": article_data.get("ogTitle", article_data.get("title", "")),
+        "ogDescription": article_data.get("ogDescription", summary)[:160],
+        "translationGroup": article_data.get("translationGroup", slug),
+        "publishedAt": published_at,
+        "language": language,
+        "tag": article_data.get("tag"),
+        "readTime": article_data.get("readTime"),
+        "focusKeyword": article_data.get("focusKeyword"),
+        "keywords": article_data.get("keywords", []),
+    }
+
+
+SCORE_FIELDS = [
+    "global_score", "content_score", "readability_score",
+    "seo_score", "conversion_score", "credibility_score",
+]
+
+
+def extract_scores(scoring: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Garde uniquement les scores chiffrés d'un rapport score_article_quality (sans le Markdown)"""
+    if not scoring:
+        return None
+    scores = {key: scoring.get(key) for key in SCORE_FIELDS}
+    return scores if any(v is not None for v in scores.values()) else None
+
+
+def build_review_metadata(
+    review_path: Path,
+    topic: str,
+    article_data: Dict[str, Any],
+    english_data: Optional[Dict[str, Any]],
+    body_refs: Dict[str, Dict[str, Any]],
+    published_at: str,
+    generated_at: Optional[datetime] = None,
+    scoring: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Construit le contenu du sidecar d'un fichier de review"""
+    generated_at = generated_at or datetime.now()
+    markdown_fr = article_data.get("original_content", "")
+
+    fr = build_sanity_fields(article_data, "fr", published_at)
+    fr["body_ref"] = body_refs.get("fr_markdown")
+    fr["html_ref"] = body_refs.get("fr_html")
+
+    metadata = {
+        "version": METADATA_VERSION,
+        "filename": review_path.name,
+        "topic": topic,
+        "generated_at": generated_at.isoformat(),
+        "title": fr["title"],
+        "slug": fr["slug"],
+        "summary": fr["excerpt"],
+        "keywords": fr["keywords"],
+        "tag": fr["tag"],
+        "word_count": len(markdown_fr.split()),
+        "body_sha256": body_hash(markdown_fr),
+        "scores": extract_scores(scoring),
+        "fr": fr,
+        "en": None,
+    }
+
+    if english_data:
+        en = build_sanity_fields(english_data, "en", published_at)
+        en["translationGroup"] = fr["translationGroup"]
+        en["body_ref"] = body_refs.get("en_markdown")
+        en["html_ref"] = body_refs.get("en_html")
+        metadata["en"] = en
+
+    return metadata
+
+
+def write_review_metadata(review_path: Path, metadata: Dict[str, Any]) -> Path:
+    """Écrit le sidecar via un fichier temporaire puis un rename (jamais de sidecar à moitié écrit)"""
+    path = sidecar_path(review_path)
+    write_json(path, metadata)
+    return path
+
+
+def load_review_metadata(review_path: Path) -> Optional[Dict[str, Any]]:
+    """Charge le sidecar d'un fichier de review (None s'il n'existe pas ou est illisible)"""
+    path = sidecar_path(review_path)
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        return metadata if isinstance(metadata, dict) else None
+    except Exception as e:
+        print(f"⚠️  Erreur lecture métadonnées {path.name}: {e}")
+        return None
+
+
+def read_body(review_path: Path, ref: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Lit un corps d'article directement à sa position dans le fichier .md, ou
+    dans le blob store (articles/blobs/) pour une référence {"blob": hash}.
+
+    Retourne None si la référence est absente ou si le hash ne correspond plus
+    (fichier modifié à la main depuis la génération).
+    """
+    if not ref:
+        return None
+    if ref.get("blob"):
+        return read_blob(review_path.parent, ref)
+    try:
+        with open(review_path, "rb") as f:
+            f.seek(ref["offset"])
+            data = f.read(ref["length"])
+        text = data.decode("utf-8")
+    except Exception:
+        return None
+    if body_hash(text) != ref.get("sha256"):
+        return None
+    return text
+
+
+def compact_review_file(review_path: Path) -> int:
+    """
+    Sort les HTML d'un fichier de review écrit avant le blob store : chaque HTML
+    va dans articles/blobs/ (ou pointe sur le Markdown s'il est identique) et
+    les offsets du sidecar sont recalculés.
+
+    Returns:
+        Nombre d'octets gagnés dans le fichier de review (0 si rien à faire)
+    """
+    with file_lock(review_path):
+        metadata = load_review_metadata(review_path)
+        if not metadata:
+            return 0
+        data = review_path.read_bytes()
+
+        cuts = []
+        html_refs = {}
+        for language in ("fr", "en"):
+            fields = metadata.get(language) or {}
+            html_ref, body_ref = fields.get("html_ref"), fields.get("body_ref")
+            if not html_ref or "offset" not in html_ref or html_ref == body_ref:
+                continue
+            html = read_body(review_path, html_ref)
+            if html is None:
+                # Corps modifié à la main : le fichier est laissé tel quel
+                continue
+            ref = None if html == read_body(review_path, body_ref) else put_blob(review_path.parent, html)
+            cuts.append((html_ref["offset"], html_ref["length"], html_body_note(ref).encode("utf-8")))
+            html_refs[language] = ref
+        if not cuts:
+            return 0
+
+        cuts.sort()
+        parts, position = [], 0
+        for offset, length, note in cuts:
+            parts += [data[position:offset], note]
+            position = offset + length
+        parts.append(data[position:])
+        content = b"".join(parts)
+
+        def shift(offset: int) -> int:
+            return offset + sum(len(note) - length for start, length, note in cuts if start < offset)
+
+        for language in ("fr", "en"):
+            fields = metadata.get(language) or {}
+            if isinstance(fields.get("body_ref"), dict) and "offset" in fields["body_ref"]:
+                fields["body_ref"] = dict(fields["body_ref"], offset=shift(fields["body_ref"]["offset"]))
+            if language in html_refs:
+                fields["html_ref"] = html_refs[language] or fields["body_ref"]
+
+        atomic_write_bytes(review_path, content)
+        write_review_metadata(review_path, metadata)
+    return len(data) - len(content)
+
+
+def parse_legacy_review_file(review_path: Path) -> Dict[str, Any]:
+    """
+    Extrait les métadonnées d'un ancien fichier de review (sans sidecar) par regex.
+
+    Reconnaît l'en-tête écrit par save_article_for_review (**Slug:**, **Généré le:**)
+    ainsi que l'ancien format "### Slug".
+    """
+    content = review_path.read_text(encoding="utf-8")
+
+    title_match = re.search(r'^# (.+)$', content, re.MULTILINE)
+    slug_match = (re.search(r'\*\*Slug:\*\*\s*(.+)', content)
+                  or re.search(r'### Slug\n(.+)', content))
+    date_match = re.search(r'\*\*Généré le:\*\*\s*(.+)', content)
+    topic_match = re.search(r'\*\*Sujet original:\*\*\s*(.+)', content)
+    summary_match = re.search(r'## Résumé SEO\s*\n\n(.+?)(?=\n---|\n##)', content, re.DOTALL)
+    keywords_match = re.search(r'## Mots-clés\s*\n\n(.+?)(?=\n---|\n##)', content, re.DOTALL)
+
+    generated_at = None
+    if date_match:
+        try:
+            generated_at = datetime.strptime(date_match.group(1).strip(), "%d/%m/%Y %H:%M:%S").isoformat()
+        except ValueError:
+            generated_at = None
+    if not generated_at:
+        generated_at = datetime.fromtimestamp(review_path.stat().st_mtime).isoformat()
+
+    markdown_match = re.search(r'## Contenu Markdown \(version originale\)\s*\n\n(.*?)(?=\n---\n|\Z)', content, re.DOTALL)
+    markdown_fr = markdown_match.group(1).strip() if markdown_match else ""
+
+    keywords = []
+    if keywords_match:
+        keywords = [k.strip() for k in keywords_match.group(1).split(",") if k.strip()]
+
+    title = title_match.group(1).strip() if title_match else review_path.stem
+    slug = slug_match.group(1).strip() if slug_match else ""
+    summary = summary_match.group(1).strip() if summary_match else ""
+
+    return {
+        "version": METADATA_VERSION,
+        "legacy": True,
+        "filename": review_path.name,
+        "topic": topic_match.group(1).strip() if topic_match else "",
+        "generated_at": generated_at,
+        "title": title,
+        "slug": slug,
+        "summary": summary,
+        "keywords": keywords,
+        "tag": None,
+        "word_count": len((markdown_fr or content).split()),
+        "scores": None,
+        "body_sha256": body_hash(markdown_fr) if markdown_fr else None,
+        "fr": None,
+        "en": None,
+    }
+
+
+def get_review_metadata(review_path: Path, backfill: bool = True) -> Dict[str, Any]:
+    """
+    Retourne les métadonnées d'un fichier de review.
+
+    Utilise le sidecar s'il existe ; sinon parse l'ancien fichier une seule fois
+    et (si backfill) écrit le sidecar pour les lectures suivantes.
+    """
+    metadata = load_review_metadata(review_path)
+    if metadata is not None:
+        return metadata
+
+    metadata = parse_legacy_review_file(review_path)
+    if backfill:
+        try:
+            write_review_metadata(review_path, metadata)
+        except Exception as e:
+            print(f"⚠️  Erreur écriture métadonnées {review_path.name}: {e}")
+    return metadata
+
+
+def format_generated_at(metadata: Dict[str, Any]) -> str:
+    """Formate la date de génération pour l'affichage (JJ/MM/AAAA HH:MM:SS)"""
+    value = metadata.get("generated_at")
+    if not value:
+        return "Date inconnue"
+    try:
+        return datetime.fromisoformat(value).strftime("%d/%m/%Y %H:%M:%S")
+    except ValueError:
+        return value
+
+
+def delete_review_files(review_path: Path) -> None:
+    """Supprime un fichier de review et son sidecar"""
+    review_path.unlink()
+    meta_path = sidecar_path(review_path)
+    if meta_path.exists():
+        meta_path.unlink()
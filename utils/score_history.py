@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Historique des scores d'articles (série temporelle)
+- Chaque résultat de scoring (score_article_quality, rescore_changed_sections,
+  optimize_seo_and_score) est ajouté à data/score_history.jsonl : run id de la
+  génération, itération, sous-scores, modèle, tokens et coût estimé
+- Fichier en ajout seul : une ligne par scoring, jamais réécrite
+- Index dérivé (data/score_history.index.json) : agrégats par jour, par
+  mot-clé et par secteur, offsets des lignes de chaque run. Il est mis à jour
+  en lisant uniquement les lignes ajoutées depuis le dernier offset indexé,
+  et reconstruit s'il manque ou ne correspond plus au fichier
+- Requêtes (moyennes glissantes, répartitions, gains avant / après) calculées
+  sur les agrégats journaliers : quelques millisecondes quel que soit l'historique
+"""
+
+import json
+import threading
+from collections import deque
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.durable_io import file_lock, read_json, write_json
+
+BASE_DIR = Path(__file__).parent.parent
+SCORE_HISTORY_FILE = BASE_DIR / "data" / "score_history.jsonl"
+
+INDEX_VERSION = 1
+
+SCORE_FIELDS = (
+    "global_score", "content_score", "readability_score",
+    "seo_score", "conversion_score", "credibility_score",
+)
+
+# Réentrant : les requêtes parcourent l'index sous le verrou qui protège sa mise à jour
+_lock = threading.RLock()
+_cache: Dict[str, Any] = {"path": None, "index": None}
+
+
+def record_score(
+    operation: str,
+    scoring: Dict[str, Any],
+    model: Optional[str] = None,
+    usage: Optional[Dict[str, Any]] = None,
+    cost_usd: Optional[float] = None,
+    topic: Optional[str] = None,
+    article_title: Optional[str] = None,
+    keywords: Optional[Iterable[str]] = None,
+    sector: Optional[str] = None,
+    iteration: Optional[int] = None,
+    run_id: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Ajoute un résultat de scoring à l'historique.
+
+    Args:
+        operation: étape de scoring ("score_article", "rescore_sections", "seo_and_score")
+        scoring: rapport de scoring (seuls les scores chiffrés sont conservés)
+        iteration: 0 pour le scoring initial, N pour la N-ième réécriture (None hors pipeline)
+        run_id: run de la génération (par défaut celui du contexte de trace)
+
+    Returns:
+        L'entrée enregistrée, ou None si le rapport ne contient aucun score
+    """
+    scores = {field: scoring.get(field) for field in SCORE_FIELDS if isinstance(scoring.get(field), (int, float))}
+    if not scores:
+        return None
+    if run_id is None:
+        try:
+            from utils.tracing import get_run_id
+            run_id = get_run_id()
+        except Exception:
+            run_id = None
+    usage = usage or {}
+    entry = {
+        "timestamp": datetime.now().isoformat(),
+        "run_id": run_id,
+        "iteration": iteration,
+        "operation": operation,
+        "model": model,
+        "scores": scores,
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0),
+        "total_tokens": usage.get("total_tokens", 0),
+        "cost_usd": round(cost_usd, 6) if cost_usd is not None else None,
+        "topic": topic or None,
+        "article_title": article_title or None,
+        "keywords": sorted({k.strip().lower() for k in (keywords or []) if k and k.strip()}),
+        "sector": sector,
+    }
+    try:
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        # Ajout sous verrou : les lignes de la CLI et de l'app ne s'entremêlent jamais
+        with file_lock(SCORE_HISTORY_FILE):
+            SCORE_HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(SCORE_HISTORY_FILE, "a", encoding="utf-8") as f:
+                f.write(line)
+    except Exception as e:
+        print(f"⚠️  Erreur enregistrement historique des scores: {e}")
+        return None
+    return entry
+
+
+# --- Index ---
+
+def index_path() -> Path:
+    """Fichier d'index, à côté de l'historique (score_history.index.json)"""
+    return SCORE_HISTORY_FILE.with_name(SCORE_HISTORY_FILE.stem + ".index.json")
+
+
+def _empty_index(inode: Optional[int]) -> Dict[str, Any]:
+    return {
+        "version": INDEX_VERSION,
+        "inode": inode,
+        "offset": 0,
+        "count": 0,
+        "daily": {},
+        "by_keyword": {},
+        "by_sector": {},
+        "runs": {},
+    }
+
+
+def _add_to_bucket(buckets: Dict[str, Any], day: str, entry: Dict[str, Any]):
+    bucket = buckets.setdefault(day, {"n": 0, "sum": {}, "cnt": {}, "cost": 0.0, "tokens": 0})
+    bucket["n"] += 1
+    for field, value in entry["scores"].items():
+        bucket["sum"][field] = bucket["sum"].get(field, 0) + value
+        bucket["cnt"][field] = bucket["cnt"].get(field, 0) + 1
+    bucket["cost"] += entry.get("cost_usd") or 0.0
+    bucket["tokens"] += entry.get("total_tokens") or 0
+
+
+def _index_entry(index: Dict[str, Any], entry: Dict[str, Any], offset: int):
+    day = (entry.get("timestamp") or "")[:10]
+    if not day or not isinstance(entry.get("scores"), dict):
+        return
+    index["count"] += 1
+    _add_to_bucket(index["daily"], day, entry)
+    for keyword in entry.get("keywords") or []:
+        _add_to_bucket(index["by_keyword"].setdefault(keyword, {}), day, entry)
+    _add_to_bucket(index["by_sector"].setdefault(entry.get("sector") or "non classé", {}), day, entry)
+    if entry.get("run_id"):
+        run = index["runs"].setdefault(entry["run_id"], {"day": day, "offsets": [], "first": None, "last": None})
+        run["offsets"].append(offset)
+        score = entry["scores"].get("global_score")
+        if score is not None:
+            if run["first"] is None:
+                run["first"] = score
+            run["last"] = score
+
+
+def _catch_up(index: Dict[str, Any], size: int) -> int:
+    """Indexe les lignes complètes ajoutées depuis index["offset"] ; nombre de lignes lues"""
+    read = 0
+    with open(SCORE_HISTORY_FILE, "rb") as f:
+        f.seek(index["offset"])
+        data = f.read(size - index["offset"])
+    # Dernière ligne incomplète (écriture en cours) : reprise au prochain appel
+    end = data.rfind(b"\n") + 1
+    offset = index["offset"]
+    for raw in data[:end].splitlines(keepends=True):
+        try:
+            _index_entry(index, json.loads(raw), offset)
+        except (ValueError, KeyError, TypeError):
+            pass
+        offset += len(raw)
+        read += 1
+    index["offset"] = offset
+    return read
+
+
+def _current_index() -> Dict[str, Any]:
+    """Index à jour (mémoire du process, puis fichier d'index, puis reconstruction)"""
+    try:
+        stat = SCORE_HISTORY_FILE.stat()
+    except FileNotFoundError:
+        return _empty_index(None)
+    with _lock:
+        index = _cache["index"] if _cache["path"] == str(SCORE_HISTORY_FILE) else None
+        if index is None:
+            index = read_json(index_path())
+        if (not isinstance(index, dict) or index.get("version") != INDEX_VERSION
+                or index.get("inode") != stat.st_ino or index.get("offset", 0) > stat.st_size):
+            index = _empty_index(stat.st_ino)
+        if index["offset"] < stat.st_size and _catch_up(index, stat.st_size):
+            try:
+                write_json(index_path(), index, indent=None)
+            except Exception as e:
+                print(f"⚠️  Erreur écriture index des scores: {e}")
+        _cache.update(path=str(SCORE_HISTORY_FILE), index=index)
+        return index
+
+
+# --- Requêtes ---
+
+def _select_buckets(keyword: Optional[str] = None, sector: Optional[str] = None) -> Dict[str, Any]:
+    index = _current_index()
+    if keyword:
+        return index["by_keyword"].get(keyword.strip().lower(), {})
+    if sector:
+        return index["by_sector"].get(sector, {})
+    return index["daily"]
+
+
+def _since(days: Optional[int]) -> str:
+    return (date.today() - timedelta(days=days - 1)).isoformat() if days else ""
+
+
+def daily_scores(
+    field: str = "global_score",
+    days: Optional[int] = 90,
+    window: int = 7,
+    keyword: Optional[str] = None,
+    sector: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Moyenne journalière d'un score et moyenne glissante sur `window` jours calendaires.
+
+    Returns:
+        [{"date", "count", "average", "rolling_average", "cost_usd"}] par date croissante
+        (jours sans scoring omis)
+    """
+    with _lock:
+        return _daily_scores(_select_buckets(keyword, sector), field, days, window)
+
+
+def _daily_scores(buckets: Dict[str, Any], field: str, days: Optional[int], window: int) -> List[Dict[str, Any]]:
+    since = _since(days)
+    result = []
+    recent: deque = deque()
+    total, count = 0.0, 0
+    # Les jours antérieurs à la période alimentent aussi la première fenêtre glissante
+    window_start = _since(days + window - 1) if days else ""
+    for day in sorted(d for d in buckets if d >= window_start):
+        bucket = buckets[day]
+        value_sum, value_cnt = bucket["sum"].get(field, 0), bucket["cnt"].get(field, 0)
+        recent.append((day, value_sum, value_cnt))
+        total += value_sum
+        count += value_cnt
+        limit = (date.fromisoformat(day) - timedelta(days=window - 1)).isoformat()
+        while recent and recent[0][0] < limit:
+            _, old_sum, old_cnt = recent.popleft()
+            total -= old_sum
+            count -= old_cnt
+        if day < since or not value_cnt:
+            continue
+        result.append({
+            "date": day,
+            "count": bucket["n"],
+            "average": round(value_sum / value_cnt, 1),
+            "rolling_average": round(total / count, 1) if count else None,
+            "cost_usd": round(bucket["cost"], 6),
+        })
+    return result
+
+
+def breakdown(by: str = "keyword", field: str = "global_score", days: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Score moyen par mot-clé cible ou par secteur.
+
+    Returns:
+        [{"key", "count", "average", "cost_usd"}] par nombre de scorings décroissant
+    """
+    since = _since(days)
+    rows = []
+    with _lock:
+        index = _current_index()
+        groups = index["by_keyword"] if by == "keyword" else index["by_sector"]
+        for key, buckets in groups.items():
+            n, value_sum, value_cnt, cost = 0, 0.0, 0, 0.0
+            for day, bucket in buckets.items():
+                if day < since:
+                    continue
+                n += bucket["n"]
+                value_sum += bucket["sum"].get(field, 0)
+                value_cnt += bucket["cnt"].get(field, 0)
+                cost += bucket["cost"]
+            if value_cnt:
+                rows.append({"key": key, "count": n, "average": round(value_sum / value_cnt, 1), "cost_usd": round(cost, 6)})
+    rows.sort(key=lambda r: (-r["count"], r["key"]))
+    return rows
+
+
+def improvement_stats(days: Optional[int] = None) -> Dict[str, Any]:
+    """Gain de score entre le scoring initial et le dernier scoring de chaque génération"""
+    since = _since(days)
+    with _lock:
+        runs = [r for r in _current_index()["runs"].values()
+                if r["day"] >= since and len(r["offsets"]) > 1 and r["first"] is not None and r["last"] is not None]
+    if not runs:
+        return {"runs": 0, "avg_before": None, "avg_after": None, "avg_gain": None, "improved_rate": None}
+    gains = [r["last"] - r["first"] for r in runs]
+    return {
+        "runs": len(runs),
+        "avg_before": round(sum(r["first"] for r in runs) / len(runs), 1),
+        "avg_after": round(sum(r["last"] for r in runs) / len(runs), 1),
+        "avg_gain": round(sum(gains) / len(gains), 1),
+        "improved_rate": round(sum(1 for g in gains if g > 0) / len(gains), 3),
+    }
+
+
+def run_scores(run_id: str) -> List[Dict[str, Any]]:
+    """Scorings d'une génération, dans l'ordre (lecture directe des lignes indexées)"""
+    with _lock:
+        offsets = list((_current_index()["runs"].get(run_id) or {}).get("offsets") or [])
+    entries = []
+    if not offsets:
+        return entries
+    with open(SCORE_HISTORY_FILE, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            try:
+                entries.append(json.loads(f.readline()))
+            except ValueError:
+                continue
+    return entries
+
+
+def history_size() -> int:
+    """Nombre de scorings enregistrés"""
+    with _lock:
+        return _current_index()["count"]
@@ -3,7 +3,7 @@
 Analyse SEO avancée pour les articles
 - Densité des mots-clés
 - Suggestions LSI
-- Score de lisibilité (Flesch Reading Ease)
+- Score de lisibilité (Flesch Reading Ease / Kandel–Moles)
 - Vérification longueur optimale
 - Détection liens internes
 """
@@ -13,6 +13,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from collections import Counter
 import math
 
+from utils.readability import analyze_readability
+
 
 def calculate_keyword_density(text: str, keywords: List[str]) -> Dict[str, float]:
     """
@@ -83,9 +85,13 @@ def suggest_lsi_keywords(text: str, main_keyword: str, max_suggestions: int = 5)
     return list(set(suggestions))[:max_suggestions]
 
 
-def calculate_flesch_reading_ease(text: str) -> Dict[str, Any]:
+def calculate_flesch_reading_ease(text: str, language: Optional[str] = None) -> Dict[str, Any]:
     """
-    Calcule le score de lisibilité Flesch Reading Ease
+    Calcule le score de lisibilité (Flesch Reading Ease / Kandel–Moles)
+    
+    La langue est détectée automatiquement si elle n'est pas fournie :
+    - FR : indice Kandel–Moles (adaptation française de Flesch)
+    - EN : Flesch Reading Ease + Flesch–Kincaid Grade
     
     Score:
     - 90-100 : Très facile (5ème année)
@@ -100,90 +106,17 @@ def calculate_flesch_reading_ease(text: str) -> Dict[str, Any]:
         {
             "score": float,
             "level": str,
+            "language": str,
+            "index": str,
             "sentences": int,
             "words": int,
             "syllables": int,
             "avg_sentence_length": float,
-            "avg_syllables_per_word": float
+            "avg_syllables_per_word": float,
+            "indices": dict
         }
     """
-    # Compter les phrases
-    sentences = re.split(r'[.!?]+\s+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    num_sentences = len(sentences)
-    
-    # Compter les mots
-    words = re.findall(r'\b[a-zàâäéèêëïîôùûüÿç]+\b', text.lower())
-    num_words = len(words)
-    
-    if num_sentences == 0 or num_words == 0:
-        return {
-            "score": 0,
-            "level": "Non calculable",
-            "sentences": 0,
-            "words": 0,
-            "syllables": 0,
-            "avg_sentence_length": 0,
-            "avg_syllables_per_word": 0
-        }
-    
-    # Compter les syllabes (approximation pour le français)
-    def count_syllables_fr(word: str) -> int:
-        """Estime le nombre de syllabes en français"""
-        word = word.lower()
-        # Règles simplifiées pour le français
-        vowels = 'aeiouyàâäéèêëïîôùûüÿ'
-        syllable_count = 0
-        prev_was_vowel = False
-        
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not prev_was_vowel:
-                syllable_count += 1
-            prev_was_vowel = is_vowel
-        
-        # Minimum 1 syllabe
-        return max(1, syllable_count)
-    
-    total_syllables = sum(count_syllables_fr(word) for word in words)
-    
-    # Calculer le score Flesch (adapté pour le français)
-    # Formule simplifiée : 206.835 - (1.015 * ASL) - (84.6 * ASW)
-    # ASL = Average Sentence Length (mots par phrase)
-    # ASW = Average Syllables per Word
-    
-    avg_sentence_length = num_words / num_sentences
-    avg_syllables_per_word = total_syllables / num_words
-    
-    # Score adapté (formule simplifiée)
-    score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables_per_word)
-    score = max(0, min(100, score))
-    
-    # Déterminer le niveau
-    if score >= 90:
-        level = "Très facile"
-    elif score >= 80:
-        level = "Facile"
-    elif score >= 70:
-        level = "Assez facile"
-    elif score >= 60:
-        level = "Standard"
-    elif score >= 50:
-        level = "Assez difficile"
-    elif score >= 30:
-        level = "Difficile"
-    else:
-        level = "Très difficile"
-    
-    return {
-        "score": round(score, 1),
-        "level": level,
-        "sentences": num_sentences,
-        "words": num_words,
-        "syllables": total_syllables,
-        "avg_sentence_length": round(avg_sentence_length, 1),
-        "avg_syllables_per_word": round(avg_syllables_per_word, 2)
-    }
+    return analyze_readability(text, language)
 
 
 def check_optimal_lengths(title: str, meta_title: str, meta_description: str) -> Dict[str, Any]:
@@ -278,7 +211,8 @@ def analyze_seo_comprehensive(
     meta_title: str,
     meta_description: str,
     target_keywords: List[str],
-    main_keyword: Optional[str] = None
+    main_keyword: Optional[str] = None,
+    language: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Analyse SEO complète de l'article
@@ -302,7 +236,7 @@ def analyze_seo_comprehensive(
     lsi_suggestions = suggest_lsi_keywords(article_text, main_kw) if main_kw else []
     
     # Lisibilité
-    readability = calculate_flesch_reading_ease(article_text)
+    readability = calculate_flesch_reading_ease(article_text, language)
     
     # Longueurs optimales
     lengths = check_optimal_lengths(title, meta_title, meta_description)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Brouillons spéculatifs : rédaction lancée en arrière-plan pendant que
+l'utilisateur choisit une variante
+- Un groupe de brouillons par choix (un thread par variante), identifié par un id
+- claim_draft : garde le brouillon choisi (attend sa fin en relayant les deltas)
+  et annule les autres
+- Plafond de tokens par groupe : au-delà, les brouillons non choisis sont annulés
+- Annulation = fermeture du flux de streaming (la génération s'arrête côté serveur)
+- Registre en mémoire uniquement : après un redémarrage, la rédaction est relancée normalement
+"""
+
+import contextvars
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+
+# Tokens générés au maximum par les brouillons non choisis d'un groupe
+DEFAULT_TOKEN_CAP = int(os.getenv("SPECULATIVE_TOKEN_CAP", "12000"))
+# Groupe jamais réclamé (utilisateur parti) : supprimé après ce délai
+GROUP_TTL_SECONDS = 15 * 60
+
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_CANCELLED = "cancelled"
+STATUS_FAILED = "failed"
+
+_lock = threading.RLock()
+_groups: Dict[str, Dict[str, Any]] = {}
+_stats = {"groups": 0, "drafts": 0, "claimed": 0, "reused": 0, "cancelled": 0, "tokens": 0, "tokens_wasted": 0}
+
+StreamFactory = Callable[[], Iterator[Union[str, Dict[str, Any]]]]
+
+
+def _cancel(group: Dict[str, Any], key: str, reason: str):
+    """Demande l'arrêt d'un brouillon en cours (le thread ferme son flux au delta suivant)"""
+    draft = group["drafts"][key]
+    if draft["status"] == STATUS_RUNNING and not draft["cancel"].is_set():
+        draft["cancel"].set()
+        draft["reason"] = reason
+
+
+def _discard(group: Dict[str, Any], key: str, reason: str):
+    """Brouillon non retenu : annulé s'il est en cours, sinon ses tokens sont comptés comme perdus"""
+    draft = group["drafts"][key]
+    if draft["status"] == STATUS_RUNNING:
+        _cancel(group, key, reason)
+    elif draft["status"] == STATUS_DONE and not draft.get("discarded"):
+        draft["discarded"] = True
+        _stats["tokens_wasted"] += draft["tokens"]
+
+
+def _run_draft(group: Dict[str, Any], key: str, factory: StreamFactory):
+    """Consomme le flux d'un brouillon ; s'arrête dès que l'annulation est demandée"""
+    draft = group["drafts"][key]
+    stream = None
+    try:
+        stream = factory()
+        for item in stream:
+            if draft["cancel"].is_set():
+                break
+            with _lock:
+                if isinstance(item, str):
+                    draft["chunks"].append(item)
+                    draft["tokens"] += 1
+                    _stats["tokens"] += 1
+                    if group["claimed"] is None:
+                        group["spent"] += 1
+                        if group["spent"] >= group["token_cap"]:
+                            for other in group["drafts"]:
+                                _cancel(group, other, f"plafond de {group['token_cap']} tokens atteint")
+                else:
+                    draft["content"] = item.get("content", "")
+    except Exception as e:
+        draft["error"] = str(e)
+        print(f"⚠️  Erreur brouillon spéculatif {key}: {e}")
+    finally:
+        if stream is not None and hasattr(stream, "close"):
+            # Ferme la requête HTTP en streaming si le flux a été interrompu
+            stream.close()
+        with _lock:
+            if draft["cancel"].is_set():
+                draft["status"] = STATUS_CANCELLED
+                _stats["cancelled"] += 1
+                _stats["tokens_wasted"] += draft["tokens"]
+                print(f"🗑️  Brouillon spéculatif {key} annulé ({draft.get('reason')}, {draft['tokens']} tokens)")
+            elif draft.get("error") or draft["content"] is None:
+                draft["status"] = STATUS_FAILED
+            else:
+                draft["status"] = STATUS_DONE
+
+
+def _purge_expired():
+    now = time.time()
+    with _lock:
+        for group_id in [g for g, group in _groups.items() if now - group["created"] > GROUP_TTL_SECONDS]:
+            cancel_drafts(group_id)
+
+
+def start_drafts(drafts: Dict[str, StreamFactory], token_cap: Optional[int] = None) -> str:
+    """
+    Lance un brouillon par clé, chacun dans son thread.
+
+    Args:
+        drafts: {clé: fonction sans argument retournant un flux _stream_completion}
+        token_cap: plafond de tokens des brouillons non choisis (défaut SPECULATIVE_TOKEN_CAP)
+
+    Returns:
+        Identifiant du groupe (à passer à claim_draft / cancel_drafts)
+    """
+    _purge_expired()
+    group_id = uuid.uuid4().hex[:12]
+    group = {
+        "created": time.time(),
+        "token_cap": token_cap or DEFAULT_TOKEN_CAP,
+        "spent": 0,
+        "claimed": None,
+        "drafts": {
+            key: {"status": STATUS_RUNNING, "chunks": [], "content": None, "tokens": 0, "cancel": threading.Event()}
+            for key in drafts
+        },
+    }
+    with _lock:
+        _groups[group_id] = group
+        _stats["groups"] += 1
+        _stats["drafts"] += len(drafts)
+    for key, factory in drafts.items():
+        # Copie du contexte : les spans du brouillon restent dans le run de trace courant
+        threading.Thread(
+            target=contextvars.copy_context().run, args=(_run_draft, group, key, factory),
+            name=f"speculative-{key}", daemon=True,
+        ).start()
+    print(f"⚡ {len(drafts)} brouillon(s) spéculatif(s) lancé(s) (plafond {group['token_cap']} tokens)")
+    return group_id
+
+
+def claim_draft(group_id: Optional[str], key: str, on_delta=None, poll_interval: float = 0.05) -> Optional[str]:
+    """
+    Garde le brouillon `key` du groupe et annule les autres. Attend la fin du
+    brouillon en relayant ses deltas (déjà produits puis nouveaux) à on_delta.
+
+    Returns:
+        Contenu final, ou None (groupe inconnu, brouillon annulé ou en erreur) :
+        la rédaction doit alors être lancée normalement
+    """
+    with _lock:
+        group = _groups.pop(group_id, None) if group_id else None
+        if group is None or key not in group["drafts"]:
+            if group is not None:
+                for other in group["drafts"]:
+                    _discard(group, other, "variante non pré-rédigée choisie")
+            return None
+        group["claimed"] = key
+        _stats["claimed"] += 1
+        for other in group["drafts"]:
+            if other != key:
+                _discard(group, other, "autre variante choisie")
+        draft = group["drafts"][key]
+
+    sent = 0
+    while True:
+        with _lock:
+            chunks = draft["chunks"][sent:]
+            status = draft["status"]
+        if chunks:
+            sent += len(chunks)
+            if on_delta:
+                on_delta("".join(chunks))
+        elif status != STATUS_RUNNING:
+            break
+        else:
+            time.sleep(poll_interval)
+
+    if status != STATUS_DONE:
+        print(f"ℹ️  Brouillon spéculatif {key} indisponible ({draft.get('reason') or draft.get('error') or status}) : rédaction normale")
+        return None
+    with _lock:
+        _stats["reused"] += 1
+    print(f"✅ Brouillon spéculatif {key} réutilisé ({draft['tokens']} tokens)")
+    return draft["content"]
+
+
+def cancel_drafts(group_id: Optional[str]):
+    """Annule tous les brouillons d'un groupe (retour arrière, nouveau sujet...)"""
+    with _lock:
+        group = _groups.pop(group_id, None) if group_id else None
+        if group is None:
+            return
+        for key in group["drafts"]:
+            _discard(group, key, "choix abandonné")
+
+
+def get_stats() -> Dict[str, int]:
+    """Compteurs du process : brouillons lancés, réutilisés, annulés, tokens générés / perdus"""
+    with _lock:
+        return dict(_stats)
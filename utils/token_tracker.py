@@ -3,45 +3,94 @@
 Système de suivi des tokens OpenAI
 """
 
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+from utils.durable_io import read_json, update_json, write_json
+
 BASE_DIR = Path(__file__).parent.parent
 TOKEN_HISTORY_FILE = BASE_DIR / "data" / "token_history.json"
+# Coût cumulé par jour, indépendant de la troncature de l'historique (plafond de model_router)
+DAILY_COST_FILE = BASE_DIR / "data" / "token_daily_costs.json"
+DAILY_COST_DAYS = 366
+
+# Prix des tokens d'entrée et de sortie (USD / 1M) et remise sur les tokens servis depuis le cache de prompt
+INPUT_PRICE_PER_MILLION = {"gpt-4o-mini": 0.15, "gpt-4o": 2.50}
+OUTPUT_PRICE_PER_MILLION = {"gpt-4o-mini": 0.60, "gpt-4o": 10.00}
+CACHED_INPUT_DISCOUNT = 0.5
+# Remise Batch API (modèles suivis sous la forme "batch:gpt-4o-mini", utils.batch_api)
+BATCH_DISCOUNT = 0.5
+
+
+def _price_key(model: str) -> Optional[str]:
+    """
+    Modèle de la grille tarifaire (les versions datées "gpt-4o-mini-2024-07-18" sont
+    rattachées à leur famille) ; None pour un fournisseur local ou stub ("local:...")
+    """
+    if ":" in (model or ""):
+        return None
+    matches = [name for name in INPUT_PRICE_PER_MILLION if (model or "").startswith(name)]
+    return max(matches, key=len) if matches else "gpt-4o-mini"
+
+
+def estimate_entry_cost(entry: Dict[str, Any]) -> float:
+    """Coût en USD d'une entrée de l'historique (prompt, cache et complétion au prix de son modèle)"""
+    model = entry.get("model", "")
+    discount = 1.0
+    if model.startswith("batch:"):
+        model, discount = model[len("batch:"):], 1 - BATCH_DISCOUNT
+    model = _price_key(model)
+    if model is None:
+        return 0.0
+    cached = entry.get("cached_tokens", 0)
+    prompt = entry.get("prompt_tokens", 0) - cached + cached * (1 - CACHED_INPUT_DISCOUNT)
+    return discount * (
+        prompt * INPUT_PRICE_PER_MILLION[model]
+        + entry.get("completion_tokens", 0) * OUTPUT_PRICE_PER_MILLION[model]
+    ) / 1_000_000
 
 
 def load_token_history() -> List[Dict[str, Any]]:
     """Charge l'historique des tokens"""
-    if not TOKEN_HISTORY_FILE.exists():
-        return []
-    
-    try:
-        with open(TOKEN_HISTORY_FILE, "r", encoding="utf-8") as f:
-            history = json.load(f)
-        return history if isinstance(history, list) else []
-    except Exception as e:
-        print(f"⚠️  Erreur chargement historique tokens: {e}")
-        return []
+    history = read_json(TOKEN_HISTORY_FILE, [])
+    return history if isinstance(history, list) else []
 
 
 def save_token_history(history: List[Dict[str, Any]]):
     """Sauvegarde l'historique des tokens"""
     try:
-        TOKEN_HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(TOKEN_HISTORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(history, f, indent=2, ensure_ascii=False)
+        write_json(TOKEN_HISTORY_FILE, history)
     except Exception as e:
         print(f"⚠️  Erreur sauvegarde historique tokens: {e}")
 
 
+def usage_to_dict(usage: Any) -> Dict[str, int]:
+    """
+    Convertit l'objet usage d'une réponse OpenAI (ou un dict) en dict, avec
+    les tokens de prompt servis depuis le cache (prompt_tokens_details.cached_tokens).
+    """
+    def read(obj, key):
+        if obj is None:
+            return None
+        return obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
+
+    details = read(usage, "prompt_tokens_details")
+    return {
+        "prompt_tokens": read(usage, "prompt_tokens") or 0,
+        "completion_tokens": read(usage, "completion_tokens") or 0,
+        "total_tokens": read(usage, "total_tokens") or 0,
+        "cached_tokens": read(details, "cached_tokens") or 0,
+    }
+
+
 def track_openai_usage(
     operation: str,
     model: str,
     usage: Dict[str, Any],
     topic: Optional[str] = None,
-    article_title: Optional[str] = None
+    article_title: Optional[str] = None,
+    latency_seconds: Optional[float] = None,
 ) -> None:
     """
     Enregistre l'utilisation de tokens OpenAI
@@ -49,16 +98,17 @@ def track_openai_usage(
     Args:
         operation: Type d'opération (ex: "generate_variants", "generate_article", "optimize_seo", "translate")
         model: Modèle utilisé (ex: "gpt-4o-mini")
-        usage: Objet usage de la réponse OpenAI (contient prompt_tokens, completion_tokens, total_tokens)
+        usage: Usage de la réponse OpenAI (usage_to_dict : prompt_tokens, completion_tokens,
+               total_tokens, cached_tokens)
         topic: Sujet de l'article (optionnel)
         article_title: Titre de l'article (optionnel)
+        latency_seconds: Durée de l'appel (optionnel, latence par modèle)
     """
-    history = load_token_history()
-    
     # Extraire les tokens
     prompt_tokens = usage.get("prompt_tokens", 0)
     completion_tokens = usage.get("completion_tokens", 0)
     total_tokens = usage.get("total_tokens", 0)
+    cached_tokens = usage.get("cached_tokens", 0)
     
     # Créer l'entrée
     entry = {
@@ -68,20 +118,42 @@ def track_openai_usage(
         "prompt_tokens": prompt_tokens,
         "completion_tokens": completion_tokens,
         "total_tokens": total_tokens,
+        "cached_tokens": cached_tokens,
     }
     
     if topic:
         entry["topic"] = topic
     if article_title:
         entry["article_title"] = article_title
+    if latency_seconds is not None:
+        entry["latency_seconds"] = round(latency_seconds, 3)
     
-    history.append(entry)
-    
-    # Garder seulement les 1000 dernières entrées
-    if len(history) > 1000:
-        history = history[-1000:]
+    # Rattacher l'usage au span en cours (traces par étape)
+    try:
+        from utils.tracing import record_tokens
+        record_tokens(entry)
+    except Exception as e:
+        print(f"⚠️  Erreur trace tokens: {e}")
     
-    save_token_history(history)
+    # Ajout sous verrou : deux process qui suivent leurs appels ne perdent aucune entrée
+    try:
+        with update_json(TOKEN_HISTORY_FILE, list) as history:
+            if not isinstance(history, list):
+                raise ValueError("liste JSON attendue")
+            history.append(entry)
+            # Garder seulement les 1000 dernières entrées
+            del history[:-1000]
+            # Agrégat du jour mis à jour dans la même transaction que l'historique
+            with update_json(DAILY_COST_FILE, dict) as daily:
+                if not isinstance(daily, dict):
+                    raise ValueError("objet JSON attendu")
+                day = daily.setdefault(entry["timestamp"][:10], {"calls": 0, "cost": 0.0})
+                day["calls"] += 1
+                day["cost"] += estimate_entry_cost(entry)
+                for old_day in sorted(daily)[:-DAILY_COST_DAYS]:
+                    del daily[old_day]
+    except Exception as e:
+        print(f"⚠️  Erreur sauvegarde historique tokens: {e}")
 
 
 def get_token_statistics() -> Dict[str, Any]:
@@ -94,6 +166,8 @@ def get_token_statistics() -> Dict[str, Any]:
             "total_tokens": 0,
             "total_prompt_tokens": 0,
             "total_completion_tokens": 0,
+            "total_cached_tokens": 0,
+            "cache_hit_rate": 0.0,
             "by_operation": {},
             "by_model": {},
             "recent_entries": []
@@ -102,6 +176,7 @@ def get_token_statistics() -> Dict[str, Any]:
     total_tokens = sum(entry.get("total_tokens", 0) for entry in history)
     total_prompt_tokens = sum(entry.get("prompt_tokens", 0) for entry in history)
     total_completion_tokens = sum(entry.get("completion_tokens", 0) for entry in history)
+    total_cached_tokens = sum(entry.get("cached_tokens", 0) for entry in history)
     
     # Par opération
     by_operation = {}
@@ -112,12 +187,30 @@ def get_token_statistics() -> Dict[str, Any]:
                 "count": 0,
                 "total_tokens": 0,
                 "prompt_tokens": 0,
-                "completion_tokens": 0
+                "completion_tokens": 0,
+                "cached_tokens": 0
             }
         by_operation[op]["count"] += 1
         by_operation[op]["total_tokens"] += entry.get("total_tokens", 0)
         by_operation[op]["prompt_tokens"] += entry.get("prompt_tokens", 0)
         by_operation[op]["completion_tokens"] += entry.get("completion_tokens", 0)
+        by_operation[op]["cached_tokens"] += entry.get("cached_tokens", 0)
+        # Coût et latence de l'étape par modèle (routage utils.model_router)
+        per_model = by_operation[op].setdefault("by_model", {}).setdefault(
+            entry.get("model", "unknown"),
+            {"count": 0, "total_tokens": 0, "cost": 0.0, "latency_total": 0.0, "latency_count": 0},
+        )
+        per_model["count"] += 1
+        per_model["total_tokens"] += entry.get("total_tokens", 0)
+        per_model["cost"] += estimate_entry_cost(entry)
+        if entry.get("latency_seconds") is not None:
+            per_model["latency_total"] += entry["latency_seconds"]
+            per_model["latency_count"] += 1
+    for data in by_operation.values():
+        for per_model in data.get("by_model", {}).values():
+            count = per_model.pop("latency_count")
+            latency_total = per_model.pop("latency_total")
+            per_model["avg_latency_seconds"] = latency_total / count if count else None
     
     # Par modèle
     by_model = {}
@@ -130,6 +223,7 @@ def get_token_statistics() -> Dict[str, Any]:
             }
         by_model[model]["count"] += 1
         by_model[model]["total_tokens"] += entry.get("total_tokens", 0)
+        by_model[model]["cost"] = by_model[model].get("cost", 0.0) + estimate_entry_cost(entry)
     
     # 10 dernières entrées
     recent_entries = history[-10:]
@@ -139,6 +233,9 @@ def get_token_statistics() -> Dict[str, Any]:
         "total_tokens": total_tokens,
         "total_prompt_tokens": total_prompt_tokens,
         "total_completion_tokens": total_completion_tokens,
+        "total_cached_tokens": total_cached_tokens,
+        # Part des tokens de prompt servis depuis le cache du fournisseur
+        "cache_hit_rate": total_cached_tokens / total_prompt_tokens if total_prompt_tokens else 0.0,
         "by_operation": by_operation,
         "by_model": by_model,
         "recent_entries": recent_entries
@@ -158,3 +255,26 @@ def estimate_cost(total_tokens: int, model: str = "gpt-4o-mini") -> float:
     cost_per_million = 0.30
     return (total_tokens / 1_000_000) * cost_per_million
 
+
+def estimate_cache_savings(cached_tokens: int, model: str = "gpt-4o-mini") -> float:
+    """Économie en USD due au cache de prompt (tokens en cache facturés à 50 %)"""
+    price = INPUT_PRICE_PER_MILLION.get(model, INPUT_PRICE_PER_MILLION["gpt-4o-mini"])
+    return (cached_tokens / 1_000_000) * price * CACHED_INPUT_DISCOUNT
+
+
+def get_daily_cost(day: Optional[str] = None) -> float:
+    """
+    Coût estimé (USD) des appels d'un jour (AAAA-MM-JJ, aujourd'hui par défaut).
+
+    Lu dans l'agrégat journalier (tous les appels du jour, même au-delà des
+    1000 entrées conservées dans l'historique) ; à défaut, recalculé sur
+    l'historique pour les jours antérieurs à l'agrégat.
+    """
+    day = day or datetime.now().date().isoformat()
+    daily = read_json(DAILY_COST_FILE, {})
+    if isinstance(daily, dict) and isinstance(daily.get(day), dict):
+        return float(daily[day].get("cost", 0.0))
+    return sum(
+        (estimate_entry_cost(entry) for entry in load_token_history() if str(entry.get("timestamp", "")).startswith(day)),
+        0.0,
+    )
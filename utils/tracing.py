@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Traces d'exécution du pipeline de génération
+- Spans par étape (durée réelle, statut, tentative, tokens, appels HTTP)
+- Identifiant de run partagé par toutes les étapes d'une génération
+- Écriture dans data/traces.jsonl (une ligne JSON par span)
+- Export OpenTelemetry optionnel (OTEL_EXPORTER_OTLP_ENDPOINT + paquets opentelemetry)
+- Statistiques de latence par étape (p50 / p95)
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from utils.durable_io import file_lock
+
+BASE_DIR = Path(__file__).parent.parent
+TRACES_FILE = BASE_DIR / "data" / "traces.jsonl"
+
+# Au-delà de cette taille, le fichier est renommé en traces.jsonl.1 (une seule rotation conservée)
+TRACES_MAX_BYTES = 5 * 1024 * 1024
+
+_run_id: contextvars.ContextVar = contextvars.ContextVar("trace_run_id", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("trace_current_span", default=None)
+
+# Runs dont les compteurs de tentatives restent en mémoire (spans hors trace_run : un run par span)
+MAX_TRACKED_RUNS = 1000
+
+_lock = threading.Lock()
+# Nombre de spans déjà ouverts par étape, pour chaque run : sert de numéro de tentative.
+# Un run est oublié à la sortie de son trace_run, ou au-delà de MAX_TRACKED_RUNS (le plus ancien)
+_attempts: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+
+_otel_tracer = None
+_otel_checked = False
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def get_run_id() -> Optional[str]:
+    return _run_id.get()
+
+
+@contextmanager
+def trace_run(run_id: Optional[str] = None):
+    """Regroupe toutes les étapes exécutées dans le bloc sous un même run id"""
+    token = _run_id.set(run_id or new_run_id())
+    current = _run_id.get()
+    try:
+        yield current
+    finally:
+        _run_id.reset(token)
+        # Compteurs de tentatives libérés, sauf si un trace_run englobant continue ce run
+        if _run_id.get() != current:
+            with _lock:
+                _attempts.pop(current, None)
+
+
+def _get_otel_tracer():
+    """Tracer OpenTelemetry si configuré et installé (None sinon)"""
+    global _otel_tracer, _otel_checked
+    if _otel_checked:
+        return _otel_tracer
+    _otel_checked = True
+    if not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        return None
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        provider = TracerProvider(resource=Resource.create({"service.name": "rounded-blog-generator"}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        _otel_tracer = provider.get_tracer("rounded.generation")
+    except ImportError:
+        print("ℹ️  OTEL_EXPORTER_OTLP_ENDPOINT défini mais opentelemetry n'est pas installé : export désactivé")
+    except Exception as e:
+        print(f"⚠️  Erreur initialisation OpenTelemetry: {e}")
+    return _otel_tracer
+
+
+def _export_otel(span: Dict[str, Any]):
+    tracer = _get_otel_tracer()
+    if tracer is None:
+        return
+    try:
+        start_ns = int(span["start_ts"] * 1e9)
+        otel_span = tracer.start_span(span["stage"], start_time=start_ns)
+        otel_span.set_attribute("run_id", span["run_id"] or "")
+        otel_span.set_attribute("attempt", span["attempt"])
+        otel_span.set_attribute("status", span["status"])
+        for key, value in (span.get("tokens") or {}).items():
+            otel_span.set_attribute(f"tokens.{key}", value)
+        otel_span.set_attribute("http.calls", len(span.get("http") or []))
+        if span.get("error"):
+            otel_span.set_attribute("error.message", span["error"])
+        otel_span.end(end_time=start_ns + int(span["duration_ms"] * 1e6))
+    except Exception as e:
+        print(f"⚠️  Erreur export OpenTelemetry: {e}")
+
+
+def _write_span(span: Dict[str, Any]):
+    """Ajoute le span au fichier de traces (et à l'export OpenTelemetry)"""
+    record = {k: v for k, v in span.items() if k != "start_ts"}
+    try:
+        # Verrou inter-process : rotation et ajouts de la CLI et de l'app ne se croisent pas
+        with _lock, file_lock(TRACES_FILE):
+            TRACES_FILE.parent.mkdir(parents=True, exist_ok=True)
+            if TRACES_FILE.exists() and TRACES_FILE.stat().st_size > TRACES_MAX_BYTES:
+                os.replace(TRACES_FILE, TRACES_FILE.with_name(TRACES_FILE.name + ".1"))
+            with open(TRACES_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except Exception as e:
+        print(f"⚠️  Erreur écriture trace: {e}")
+    _export_otel(span)
+
+
+def _start_span(stage: str, attributes: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    parent = _current_span.get()
+    run_id = _run_id.get() or (parent or {}).get("run_id") or new_run_id()
+    with _lock:
+        stages = _attempts.setdefault(run_id, {})
+        _attempts.move_to_end(run_id)
+        stages[stage] = attempt = stages.get(stage, 0) + 1
+        while len(_attempts) > MAX_TRACKED_RUNS:
+            _attempts.popitem(last=False)
+    return {
+        "run_id": run_id,
+        "span_id": uuid.uuid4().hex[:16],
+        "parent_id": parent["span_id"] if parent else None,
+        "stage": stage,
+        "attempt": attempt,
+        "started_at": datetime.now().isoformat(),
+        "start_ts": time.time(),
+        "_perf": time.perf_counter(),
+        "duration_ms": None,
+        "status": "ok",
+        "error": None,
+        "tokens": None,
+        "http": [],
+        "attributes": dict(attributes or {}),
+    }
+
+
+def _end_span(span: Dict[str, Any], error: Optional[BaseException] = None):
+    span["duration_ms"] = round((time.perf_counter() - span.pop("_perf")) * 1000, 1)
+    if error is not None:
+        span["status"] = "error"
+        span["error"] = str(error)
+    _write_span(span)
+
+
+@contextmanager
+def span(stage: str, **attributes):
+    """Span manuel : with span("publish_to_production", language="fr"): ..."""
+    current = _start_span(stage, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        _current_span.reset(token)
+        _end_span(current, e)
+        raise
+    _current_span.reset(token)
+    _end_span(current)
+
+
+def _traced_generator(generator, current: Dict[str, Any]):
+    """Prolonge le span jusqu'à la fin d'un flux (appels en streaming)"""
+    error = None
+    token = _current_span.set(current)
+    try:
+        for item in generator:
+            if current["attributes"].get("ttft_ms") is None and isinstance(item, str):
+                current["attributes"]["ttft_ms"] = round((time.perf_counter() - current["_perf"]) * 1000, 1)
+            yield item
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # Générateur consommé depuis un autre contexte
+            pass
+        _end_span(current, error)
+
+
+def traced(stage: Optional[str] = None):
+    """
+    Décorateur : enregistre un span autour de chaque appel de la fonction.
+
+    Si la fonction retourne un générateur (mode stream=True), le span couvre
+    toute la consommation du flux et note le délai du premier delta (ttft_ms).
+    """
+    def decorator(func: Callable) -> Callable:
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            current = _start_span(name)
+            token = _current_span.set(current)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                _current_span.reset(token)
+                _end_span(current, e)
+                raise
+            _current_span.reset(token)
+            if inspect.isgenerator(result):
+                current["attributes"]["stream"] = True
+                return _traced_generator(result, current)
+            _end_span(current)
+            return result
+
+        return wrapper
+    return decorator
+
+
+def record_tokens(usage: Dict[str, Any]):
+    """Ajoute l'usage de tokens d'un appel OpenAI au span courant (appelé par token_tracker)"""
+    current = _current_span.get()
+    if current is None:
+        return
+    tokens = current["tokens"] or {}
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens", "cached_tokens"):
+        tokens[key] = tokens.get(key, 0) + (usage.get(key) or 0)
+    current["tokens"] = tokens
+
+
+def annotate_span(**attributes):
+    """Ajoute des attributs au span courant (ignorés hors span ; valeurs None omises)"""
+    current = _current_span.get()
+    if current is None:
+        return
+    current["attributes"].update({k: v for k, v in attributes.items() if v is not None})
+
+
+def record_http(method: str, url: str, status: Optional[int], duration_ms: float):
+    """Ajoute un appel HTTP (méthode, hôte + chemin, statut, durée) au span courant"""
+    current = _current_span.get()
+    if current is None:
+        return
+    parts = urlsplit(str(url))
+    current["http"].append({
+        "method": method,
+        "url": f"{parts.netloc}{parts.path}",
+        "status": status,
+        "duration_ms": round(duration_ms, 1),
+    })
+
+
+def requests_hooks() -> Dict[str, List[Callable]]:
+    """
+    Hooks pour requests (hooks=requests_hooks()) : enregistre chaque réponse
+    avec son temps de réponse (jusqu'à la réception des en-têtes).
+    """
+    def on_response(response, *args, **kwargs):
+        record_http(response.request.method, response.url, response.status_code,
+                    response.elapsed.total_seconds() * 1000)
+    return {"response": [on_response]}
+
+
+def openai_http_client(transport=None):
+    """
+    Client httpx pour OpenAI(http_client=...) qui enregistre les appels HTTP
+    dans le span courant. Retourne None si openai ne fournit pas DefaultHttpxClient.
+
+    transport (optionnel) : transport httpx, ex: utils.rate_governor.governed_transport()
+    """
+    try:
+        from openai import DefaultHttpxClient
+    except ImportError:
+        return None
+
+    def on_request(request):
+        request.extensions["trace_start"] = time.perf_counter()
+
+    def on_response(response):
+        started = response.request.extensions.get("trace_start")
+        duration_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+        record_http(response.request.method, response.request.url, response.status_code, duration_ms)
+
+    if transport is not None:
+        return DefaultHttpxClient(transport=transport, event_hooks={"request": [on_request], "response": [on_response]})
+    return DefaultHttpxClient(event_hooks={"request": [on_request], "response": [on_response]})
+
+
+def load_spans(days: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Charge les spans enregistrés (optionnellement sur les N derniers jours)"""
+    if not TRACES_FILE.exists():
+        return []
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat() if days else None
+    spans = []
+    try:
+        with open(TRACES_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if cutoff and record.get("started_at", "") < cutoff:
+                    continue
+                spans.append(record)
+    except Exception as e:
+        print(f"⚠️  Erreur lecture traces: {e}")
+    return spans
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile par la méthode du rang le plus proche"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct * len(ordered) / 100))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def get_stage_latency_stats(days: Optional[int] = 30) -> Dict[str, Dict[str, Any]]:
+    """
+    Latences réelles par étape.
+
+    Returns:
+        {stage: {"count", "errors", "p50_ms", "p95_ms", "mean_ms", "max_ms", "ttft_p50_ms",
+                 "prompt_utilisation_p50"}}
+    """
+    by_stage: Dict[str, List[Dict[str, Any]]] = {}
+    for record in load_spans(days):
+        if record.get("duration_ms") is None:
+            continue
+        by_stage.setdefault(record["stage"], []).append(record)
+
+    stats = {}
+    for stage, records in by_stage.items():
+        durations = [r["duration_ms"] for r in records]
+        ttfts = [r["attributes"]["ttft_ms"] for r in records if (r.get("attributes") or {}).get("ttft_ms") is not None]
+        utilisations = [r["attributes"]["prompt_utilisation"] for r in records
+                        if (r.get("attributes") or {}).get("prompt_utilisation") is not None]
+        stats[stage] = {
+            "count": len(records),
+            "errors": sum(1 for r in records if r.get("status") == "error"),
+            "p50_ms": percentile(durations, 50),
+            "p95_ms": percentile(durations, 95),
+            "mean_ms": round(sum(durations) / len(durations), 1),
+            "max_ms": max(durations),
+            "ttft_p50_ms": percentile(ttfts, 50) if ttfts else None,
+            "prompt_utilisation_p50": percentile(utilisations, 50) if utilisations else None,
+        }
+    return stats
+
+
+def get_run_durations(days: Optional[int] = 30) -> Dict[str, float]:
+    """Durée totale (s) de chaque run : somme des spans de premier niveau"""
+    runs: Dict[str, float] = {}
+    for record in load_spans(days):
+        if record.get("parent_id") or record.get("duration_ms") is None:
+            continue
+        run_id = record.get("run_id") or "?"
+        runs[run_id] = runs.get(run_id, 0.0) + record["duration_ms"] / 1000
+    return runs